@@ -12,6 +12,11 @@ import re
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from instrumentation import counter, histogram
+
+AI_SOURCE_SECONDS = histogram('jarvis_ai_source_seconds', 'Time spent in each AI response source', ['source'])
+AI_RESPONSES = counter('jarvis_ai_responses', 'AI responses by the source that answered', ['source'])
+
 # Try to import Wikipedia
 try:
     import wikipedia
@@ -76,29 +81,23 @@ class AIAssistant:
     def get_intelligent_response(self, user_input: str, context: Dict[str, Any] = None) -> str:
         """Get intelligent response using available AI services"""
         
-        # First, try to handle with built-in intelligence
-        built_in_response = self.handle_built_in_queries(user_input)
-        if built_in_response:
-            return built_in_response
-        
-        # Try Groq API if available
+        # Sources in order of preference; each is timed so slow ones show up in /metrics
+        sources = [('built_in', self.handle_built_in_queries)]
         if self.groq_api_key:
-            groq_response = self.query_groq_api(user_input)
-            if groq_response:
-                return groq_response
-        
-        # Try knowledge base lookup
-        knowledge_response = self.search_knowledge_base(user_input)
-        if knowledge_response:
-            return knowledge_response
-        
-        # Try Wikipedia search (with better error handling)
+            sources.append(('groq', self.query_groq_api))
+        sources.append(('knowledge_base', self.search_knowledge_base))
         if WIKIPEDIA_AVAILABLE:
-            wiki_response = self.search_wikipedia_safe(user_input)
-            if wiki_response:
-                return wiki_response
+            sources.append(('wikipedia', self.search_wikipedia_safe))
+        
+        for source, handler in sources:
+            with AI_SOURCE_SECONDS.time(source=source):
+                response = handler(user_input)
+            if response:
+                AI_RESPONSES.inc(source=source)
+                return response
         
         # Final fallback - intelligent pattern matching
+        AI_RESPONSES.inc(source='fallback')
         return self.intelligent_fallback(user_input)
     
     def handle_built_in_queries(self, query: str) -> Optional[str]:
@@ -1,8 +1,9 @@
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, Response, jsonify, request, render_template
 from flask_cors import CORS
 import webbrowser
 import subprocess
 import os
+import time
 from datetime import datetime
 from threading import Thread, Lock
 
@@ -24,18 +25,52 @@ except ImportError as e:
     print(f"⚠️ AI Assistant not available: {e}")
 
 # System utilities
-import psutil
 import pyautogui
 from pathlib import Path
+from metrics_sampler import metrics_sampler
+from instrumentation import registry as metrics_registry, counter, gauge, histogram, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from tracing import tracer, traced
+from sampling_profiler import profiler
+from scheduler import scheduler
+from time_parser import parse_schedule_command
+from command_normalizer import normalize_command
+from language_detection import detect_language as detect_command_language
+from translation_service import translation_service, GoogletransBackend
+from app_registry import app_registry
+from spawn_service import spawn_service
+from bulk_operations import bulk_operations, parse_bulk_command, format_size
+from operation_journal import operation_journal, parse_undo_command, describe, UndoError
+from trash_store import trash_store, find_in_trash, FreeDesktopTrash
+from template_engine import template_engine, parse_batch_create
+from directory_browser import directory_browser, InvalidCursor
+from content_index import content_index
+from duplicate_finder import duplicate_finder
+from disk_usage import disk_usage, parse_disk_usage_command
 
 # Photo capture
 try:
     import cv2
+    from camera_manager import camera_manager
     CV2_AVAILABLE = True
 except ImportError:
     CV2_AVAILABLE = False
     print("OpenCV not available - photo capture disabled")
 
+# Background image encoding for photos and screenshots
+from image_output import CAPTURE_SECONDS, CAPTURES, image_writer
+SCREENSHOT_FORMAT = os.environ.get('JARVIS_SCREENSHOT_FORMAT', 'png')
+PHOTO_FORMAT = os.environ.get('JARVIS_PHOTO_FORMAT', 'jpeg')
+IMAGE_QUALITY = int(os.environ.get('JARVIS_IMAGE_QUALITY', '90'))
+
+# Region/monitor/window screenshots and delta screen recording
+try:
+    from screen_capture import ACTIVE_WINDOW, capture_screen, list_monitors, screen_recorder
+    SCREEN_CAPTURE_AVAILABLE = True
+except ImportError as e:
+    SCREEN_CAPTURE_AVAILABLE = False
+    ACTIVE_WINDOW = ':active'
+    print(f"⚠️ Screen capture modes not available: {e}")
+
 # Volume control
 try:
     from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
@@ -58,7 +93,6 @@ except ImportError as e:
 # Multi-language support imports
 try:
     from googletrans import Translator
-    from langdetect import detect
     TRANSLATION_AVAILABLE = True
 except ImportError:
     TRANSLATION_AVAILABLE = False
@@ -78,6 +112,28 @@ except ImportError as e:
     print(f"🎵 Audio processing not available: {e}")
     print("Install with: pip install pyaudio librosa numpy scipy soundfile")
 
+# Audio fingerprinting for real song recognition
+try:
+    from audio_fingerprint import fingerprint_index, recognize_clip, load_audio
+    FINGERPRINTING_AVAILABLE = True
+except ImportError as e:
+    FINGERPRINTING_AVAILABLE = False
+    print(f"🎵 Audio fingerprinting not available: {e}")
+
+try:
+    from lyrics_index import lyrics_index
+    LYRICS_INDEX_AVAILABLE = True
+except ImportError as e:
+    LYRICS_INDEX_AVAILABLE = False
+    print(f"🎵 Lyrics index not available: {e}")
+
+try:
+    from audio_features import feature_extractor
+    FEATURE_EXTRACTION_AVAILABLE = True
+except ImportError as e:
+    FEATURE_EXTRACTION_AVAILABLE = False
+    print(f"🎵 Audio feature extraction not available: {e}")
+
 # File operations imports
 try:
     import send2trash
@@ -122,6 +178,12 @@ IS_MACOS = CURRENT_OS == 'darwin'
 IS_LINUX = CURRENT_OS == 'linux'
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
+
+# 'python app.py' runs with the reloader, so this file executes once in a watcher process
+# and again in the process that serves requests (WERKZEUG_RUN_MAIN=true); background work
+# belongs only in the second. 'flask run' or a WSGI server imports it by name and serves
+DEBUG = True
+SERVING_PROCESS = __name__ != '__main__' or not DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
 CORS(app)
 app.secret_key = 'your-secret-key-123'
 
@@ -170,6 +232,8 @@ if TTS_AVAILABLE:
 # Multi-language setup
 if TRANSLATION_AVAILABLE:
     translator = Translator()
+    if translation_service.backend is None:
+        translation_service.backend = GoogletransBackend(translator)
 else:
     translator = None
 
@@ -226,6 +290,9 @@ RESPONSES = {
     }
 }
 
+# Common replies never need a translator round trip
+translation_service.add_response_table(RESPONSES)
+
 WEBSITE_MAP = {
     'google': 'https://www.google.com',
     'youtube': 'https://www.youtube.com',
@@ -325,48 +392,16 @@ else:  # Linux
         'terminal': ['gnome-terminal', 'konsole', 'xterm'],
     }
 
-reminders = []
+# Spoken names resolve through the registry, which also indexes every installed app
+app_registry.add_aliases(APP_MAP)
 
 def detect_language(text):
-    """Detect the language of input text with improved accuracy"""
-    if not TRANSLATION_AVAILABLE:
-        return 'en'
-    
-    try:
-        # Check for specific Hindi/Gujarati keywords first
-        hindi_keywords = ['समय', 'बैटरी', 'मदद', 'खोलो', 'बंद', 'चालू', 'फाइल', 'फोल्डर', 'क्या', 'है', 'करो', 'बनाओ']
-        gujarati_keywords = ['સમય', 'બેટરી', 'મદદ', 'ખોલો', 'બંધ', 'ચાલુ', 'ફાઇલ', 'ફોલ્ડર', 'શું', 'છે', 'કરો', 'બનાવો']
-        
-        text_lower = text.lower()
-        
-        # Check for Hindi keywords
-        for keyword in hindi_keywords:
-            if keyword in text:
-                return 'hi'
-        
-        # Check for Gujarati keywords
-        for keyword in gujarati_keywords:
-            if keyword in text:
-                return 'gu'
-        
-        # Use automatic detection as fallback
-        detected = detect(text)
-        if detected in ['hi', 'gu', 'en']:
-            return detected
-        return 'en'  # Default to English
-    except:
-        return 'en'
+    """Detect the language of input text - script counts first, n-gram model for romanized text"""
+    return detect_command_language(text)
 
 def translate_text(text, target_lang):
-    """Translate text to target language"""
-    if not TRANSLATION_AVAILABLE or target_lang == 'en':
-        return text
-    
-    try:
-        result = translator.translate(text, dest=target_lang)
-        return result.text
-    except:
-        return text
+    """Translate text to target language (precomputed, cached, then the translator)"""
+    return translation_service.translate(text, target_lang)
 
 def get_response_text(key, lang_code, *args):
     """Get localized response text"""
@@ -383,6 +418,15 @@ def get_response_text(key, lang_code, *args):
 # TTS thread safety
 tts_lock = Lock()
 
+# Metrics exposed on /metrics
+COMMAND_SECONDS = histogram('jarvis_command_seconds', 'process_command latency by intent', ['intent'])
+COMMAND_ERRORS = counter('jarvis_command_errors', 'Commands that raised an exception', ['intent'])
+TTS_SECONDS = histogram('jarvis_tts_seconds', 'Time spent speaking one utterance',
+                        buckets=(0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0))
+TTS_QUEUE_DEPTH = gauge('jarvis_tts_queue_depth', 'speak() calls waiting for the TTS engine')
+FILE_SEARCH_SECONDS = histogram('jarvis_file_search_seconds', 'find_files_and_folders_enhanced latency',
+                                buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+
 def speak(text, language='en'):
     """Enhanced speak function with thread safety and better text cleaning"""
     if not TTS_AVAILABLE or not engine:
@@ -415,7 +459,9 @@ def speak(text, language='en'):
         cleaned_text = cleaned_text[:500] + "..."
     
     # Use thread lock to prevent concurrent TTS calls
+    TTS_QUEUE_DEPTH.inc()
     with tts_lock:
+        TTS_QUEUE_DEPTH.dec()
         try:
             # Stop any ongoing speech first
             try:
@@ -452,8 +498,9 @@ def speak(text, language='en'):
             
             # Speak the text with error handling
             print(f"🔊 Speaking: {cleaned_text[:50]}...")
-            engine.say(cleaned_text)
-            engine.runAndWait()
+            with TTS_SECONDS.time():
+                engine.say(cleaned_text)
+                engine.runAndWait()
             
         except Exception as e:
             print(f"TTS error: {e}")
@@ -482,10 +529,10 @@ def get_wifi_details():
         return "Unable to fetch Wi-Fi details."
 
 def get_battery_status():
-    battery = psutil.sensors_battery()
-    if battery:
-        plugged = "Plugged In" if battery.power_plugged else "Not Plugged In"
-        return f"Battery at {battery.percent}% ({plugged})"
+    metrics = metrics_sampler.latest()
+    if metrics and metrics['battery_percent'] is not None:
+        plugged = "Plugged In" if metrics['power_plugged'] else "Not Plugged In"
+        return f"Battery at {metrics['battery_percent']:.0f}% ({plugged})"
     return "Battery status not available."
 
 def search_files(keyword, folder=BASE_DIR):
@@ -496,13 +543,77 @@ def search_files(keyword, folder=BASE_DIR):
                 matches.append(os.path.join(root, file))
     return matches if matches else ["No files found"]
 
-def set_reminder(msg, delay):
-    def reminder_task():
-        time.sleep(delay)
-        speak(f"Reminder: {msg}")
-    Thread(target=reminder_task).start()
-    return f"Reminder set for {delay} seconds from now"
-
+def format_duration(seconds):
+    """Spoken form of a duration, e.g. '1 hour 30 minutes'"""
+    seconds = int(round(seconds))
+    parts = []
+    for unit, size in (('day', 86400), ('hour', 3600), ('minute', 60), ('second', 1)):
+        value, seconds = divmod(seconds, size)
+        if value:
+            parts.append(f"{value} {unit}{'s' if value != 1 else ''}")
+    return ' '.join(parts[:2]) or '0 seconds'
+
+def announce_scheduled_task(task):
+    """Scheduler dispatcher - speak and notify when a timer or reminder is due"""
+    if task.kind == 'timer':
+        text = f"{task.message} has finished, sir."
+        title = "JARVIS Timer"
+    else:
+        text = f"Reminder: {task.message}"
+        title = "JARVIS Reminder"
+    if NOTIFICATIONS_AVAILABLE:
+        show_notification(title, text)
+    speak(text)
+
+scheduler.dispatcher = announce_scheduled_task
+# The scheduler thread starts with the first timer, or now if saved ones are pending
+scheduler.autostart = SERVING_PROCESS
+if SERVING_PROCESS:
+    scheduler.restore()
+
+def set_reminder(msg, delay=None, at=None, repeat=None):
+    """Schedule a spoken reminder delay seconds from now or at an epoch time"""
+    task = scheduler.add(msg, delay=delay, at=at, kind='reminder', repeat=repeat)
+    when = datetime.fromtimestamp(task.due).strftime("%I:%M %p").lstrip('0')
+    every = f", repeating every {format_duration(repeat)}" if repeat else ""
+    return f"Reminder {task.id} set for {when}{every}, sir."
+
+def schedule_spoken_request(parsed):
+    """Create the timer or reminder described by time_parser.parse_schedule_command"""
+    at = parsed['at'].timestamp() if parsed['at'] else None
+    if parsed['kind'] == 'timer':
+        delay = parsed['delay'] if parsed['delay'] is not None else at - time.time()
+        return set_timer(delay / 60)
+    return set_reminder(parsed['message'], delay=parsed['delay'], at=at, repeat=parsed['repeat'])
+
+def list_reminders(kind=None, limit=10):
+    """Spoken summary of pending timers and reminders"""
+    tasks = scheduler.pending(limit=limit, kind=kind)
+    if not tasks:
+        return "You have no pending timers or reminders, sir."
+    now = time.time()
+    items = [f"{task.id}: {task.message} in {format_duration(max(task.due - now, 0))}" for task in tasks]
+    return f"You have {len(scheduler)} pending, sir. " + "; ".join(items)
+
+def cancel_reminder(task_id):
+    task = scheduler.cancel(task_id)
+    if task is None:
+        return f"I couldn't find timer or reminder {task_id}, sir."
+    return f"Cancelled {task.kind} {task_id}: {task.message}, sir."
+
+def snooze_reminder(task_id=None, minutes=10):
+    """Snooze a task, defaulting to the one that fired most recently"""
+    if task_id is None:
+        last = scheduler.last_fired()
+        if last is None:
+            return "There is nothing to snooze, sir."
+        task_id = last.id
+    task = scheduler.snooze(task_id, minutes * 60)
+    if task is None:
+        return f"I couldn't find timer or reminder {task_id}, sir."
+    return f"Snoozed {task.message} for {format_duration(minutes * 60)}, sir."
+
+@traced()
 def control_volume(action):
     if not PYCAW_AVAILABLE:
         return "Volume control not available - pycaw not installed properly"
@@ -553,105 +664,135 @@ def find_file(directory, filename):
 def open_file(path):
     os.startfile(path)
     return f"Opened {path}"
-def take_screenshot():
-    """Take a screenshot of the screen"""
+def _capture_output_dir():
+    """Desktop if it exists, otherwise the app directory"""
     try:
-        # Create filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Save to Desktop if possible, otherwise to current directory
-        try:
-            desktop_path = Path.home() / 'Desktop'
-            if desktop_path.exists():
-                filename = desktop_path / f"JARVIS_screenshot_{timestamp}.png"
-            else:
-                filename = BASE_DIR / f"JARVIS_screenshot_{timestamp}.png"
-        except:
-            filename = BASE_DIR / f"JARVIS_screenshot_{timestamp}.png"
-        
-        # Take screenshot using pyautogui
-        screenshot = pyautogui.screenshot()
-        screenshot.save(str(filename))
-        
-        # Show notification if available
+        desktop_path = Path.home() / 'Desktop'
+        if desktop_path.exists():
+            return desktop_path
+    except Exception:
+        pass
+    return BASE_DIR
+
+def _notify_image_saved(title):
+    """Callback for the image writer - runs once the file is on disk"""
+    def notify(report):
+        if not report['success']:
+            print(f"❌ {title} could not be saved: {report.get('error')}")
+            return
+        print(f"💾 {report['name']} saved ({report['file_size'] / 1024:.0f} KB, encoded in {report['encode_ms']} ms)")
         if NOTIFICATIONS_AVAILABLE:
-            show_notification("Screenshot Captured", f"Screenshot saved as {filename.name}")
+            show_notification(title, f"Saved as {report['name']}")
+    return notify
+
+@traced()
+def take_screenshot(image_format=None, quality=None, thumbnail=False, region=None, monitor=None, window=None):
+    """
+    Take a screenshot; encoding and saving happen in the background
+    region is (left, top, width, height), monitor is 1-based, window is a title to match
+    """
+    try:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        return f"Screenshot captured successfully and saved as {filename.name}, sir."
+        if not SCREEN_CAPTURE_AVAILABLE and (monitor is not None or window):
+            return "Monitor and window screenshots need the screen capture module, sir."
         
+        with CAPTURE_SECONDS.time(kind='screenshot'):
+            if SCREEN_CAPTURE_AVAILABLE:
+                screenshot = capture_screen(region=region, monitor=monitor, window=window)
+            else:
+                screenshot = pyautogui.screenshot(region=tuple(region) if region else None)
+        
+        job = image_writer.submit(
+            screenshot, _capture_output_dir(), f"JARVIS_screenshot_{timestamp}",
+            image_format=image_format or SCREENSHOT_FORMAT,
+            quality=quality or IMAGE_QUALITY,
+            thumbnail=thumbnail,
+            bgr=False,
+            on_done=_notify_image_saved("Screenshot Captured")
+        )
+        
+        CAPTURES.inc(kind='screenshot', status='success')
+        return f"Screenshot captured successfully and saved as {job.name}, sir."
+        
+    except LookupError as e:
+        CAPTURES.inc(kind='screenshot', status='not_found')
+        return f"{e}, sir."
     except Exception as e:
+        CAPTURES.inc(kind='screenshot', status='error')
         return f"Error taking screenshot: {str(e)}, sir."
 
-def capture_photo():
-    """Enhanced photo capture with cross-platform support"""
+@traced()
+def start_screen_recording(interval=1.0, tile_size=64, region=None, monitor=None, window=None):
+    """Start the lightweight screen recorder, which stores only changed tiles"""
+    if not SCREEN_CAPTURE_AVAILABLE:
+        return "Screen recording not available - NumPy is required, sir."
+    if screen_recorder.running:
+        return "Screen recording is already running, sir."
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = _capture_output_dir() / f"JARVIS_recording_{timestamp}"
+    screen_recorder.start(output_dir, interval=interval, tile_size=tile_size,
+                          region=region, monitor=monitor, window=window)
+    return f"Screen recording started, saving to {output_dir.name}, sir."
+
+def stop_screen_recording():
+    """Stop the screen recorder and summarize what it stored"""
+    if not SCREEN_CAPTURE_AVAILABLE or not screen_recorder.running:
+        return "No screen recording is running, sir."
+    
+    status = screen_recorder.stop()
+    return (f"Screen recording stopped after {status['frames']} frames, "
+            f"{status['changed_ratio'] * 100:.1f}% of tiles changed, sir.")
+
+def parse_screenshot_target(command_lower):
+    """Pick monitor/window options out of a spoken screenshot command"""
+    monitor_match = re.search(r'\b(?:monitor|screen|display)\s+(\d+)', command_lower)
+    if monitor_match:
+        return {'monitor': int(monitor_match.group(1))}
+    window_match = (re.search(r'\bwindow\s+(?:of\s+|called\s+)?(.+)$', command_lower) or
+                    re.search(r'\bof\s+(?:the\s+)?(.+?)\s+window\b', command_lower))
+    if window_match:
+        title = window_match.group(1).strip()
+        # "this window", "my current window" mean whatever has focus, not a title
+        if re.fullmatch(r'(?:(?:this|that|my|the)\s*)?(?:current|active|focused)?', title):
+            return {'window': ACTIVE_WINDOW}
+        return {'window': title}
+    if re.search(r'\b(?:this|current|active|focused)\s+window\b', command_lower):
+        return {'window': ACTIVE_WINDOW}
+    return {}
+
+@traced()
+def capture_photo(image_format=None, quality=None, thumbnail=False):
+    """Enhanced photo capture using the shared warm camera session"""
     if not CV2_AVAILABLE:
         return "Photo capture not available - OpenCV not installed. Please install opencv-python."
     
     try:
-        # Try different camera indices for cross-platform compatibility
-        camera_indices = [0, 1, 2]  # Try multiple camera sources
-        cam = None
+        # The camera manager remembers the working device and keeps it open between photos
+        with CAPTURE_SECONDS.time(kind='photo'):
+            frame = camera_manager.get_frame()
         
-        for index in camera_indices:
-            try:
-                cam = cv2.VideoCapture(index)
-                if cam.isOpened():
-                    # Test if camera is working
-                    ret, test_frame = cam.read()
-                    if ret and test_frame is not None:
-                        break
-                    else:
-                        cam.release()
-                        cam = None
-            except:
-                if cam:
-                    cam.release()
-                cam = None
-                continue
-        
-        if cam is None:
+        if frame is None:
+            CAPTURES.inc(kind='photo', status='no_camera')
             return "No camera found or camera is not accessible, sir."
         
-        # Set camera properties for better quality
-        cam.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        cam.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-        cam.set(cv2.CAP_PROP_FPS, 30)
-        
-        # Capture frame
-        ret, frame = cam.read()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        if ret and frame is not None:
-            # Create filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Save to Desktop if possible, otherwise to current directory
-            try:
-                desktop_path = Path.home() / 'Desktop'
-                if desktop_path.exists():
-                    filename = desktop_path / f"JARVIS_photo_{timestamp}.jpg"
-                else:
-                    filename = BASE_DIR / f"JARVIS_photo_{timestamp}.jpg"
-            except:
-                filename = BASE_DIR / f"JARVIS_photo_{timestamp}.jpg"
-            
-            # Save the image
-            success = cv2.imwrite(str(filename), frame)
-            cam.release()
-            
-            if success:
-                # Show notification if available
-                if NOTIFICATIONS_AVAILABLE:
-                    show_notification("Photo Captured", f"Photo saved as {filename.name}")
-                return f"Photo captured successfully and saved as {filename.name}, sir."
-            else:
-                return "Failed to save the captured photo, sir."
-        else:
-            cam.release()
-            return "Failed to capture photo from camera, sir."
+        # get_frame hands out a copy, so the writer can own it
+        job = image_writer.submit(
+            frame, _capture_output_dir(), f"JARVIS_photo_{timestamp}",
+            image_format=image_format or PHOTO_FORMAT,
+            quality=quality or IMAGE_QUALITY,
+            thumbnail=thumbnail,
+            on_done=_notify_image_saved("Photo Captured")
+        )
+        
+        CAPTURES.inc(kind='photo', status='success')
+        return f"Photo captured successfully and saved as {job.name}, sir."
             
     except Exception as e:
-        if 'cam' in locals() and cam:
-            cam.release()
+        CAPTURES.inc(kind='photo', status='error')
         return f"Error capturing photo: {str(e)}, sir."
 
 # Enhanced File Operations
@@ -666,6 +807,8 @@ def get_available_drives():
                 drives.append(drive_path)
     return drives
 
+@traced()
+@FILE_SEARCH_SECONDS.time()
 def find_files_and_folders_enhanced(name, search_path=None, max_results=20):
     """Enhanced file search across all drives and common locations"""
     matches = []
@@ -795,6 +938,7 @@ def find_files_and_folders(name, search_path=None):
     """Legacy function - calls enhanced version for backward compatibility"""
     return find_files_and_folders_enhanced(name, search_path)
 
+@traced()
 def handle_file_search_command(command_lower, original_command):
     """Handle file search commands with user interaction"""
     # Extract file name from command
@@ -909,6 +1053,10 @@ class SongRecognizer:
                 "youtube_search": "Ed Sheeran Perfect official video"
             }
         }
+        
+        # The built-in songs seed the lyrics index; the catalog folder adds the rest
+        if LYRICS_INDEX_AVAILABLE:
+            lyrics_index.add_songs(dict(info, title=title) for title, info in self.song_database.items())
     
     def record_audio(self, duration=10):
         """Record audio from microphone"""
@@ -951,39 +1099,35 @@ class SongRecognizer:
             return None, f"Recording error: {str(e)}"
     
     def extract_audio_features(self, audio_data):
-        """Extract features from audio for song recognition"""
+        """Extract tempo, pitch, spectral and MFCC features from one shared STFT (cached by audio hash)"""
+        if not FEATURE_EXTRACTION_AVAILABLE:
+            return {}
+        
         try:
-            # Extract basic audio features
-            features = {}
-            
-            # Tempo detection
-            tempo, _ = librosa.beat.beat_track(y=audio_data, sr=self.sample_rate)
-            features['tempo'] = tempo
-            
-            # Pitch/frequency analysis
-            pitches, magnitudes = librosa.piptrack(y=audio_data, sr=self.sample_rate)
-            features['avg_pitch'] = np.mean(pitches[pitches > 0]) if np.any(pitches > 0) else 0
-            
-            # Spectral features
-            spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=self.sample_rate)[0]
-            features['spectral_centroid'] = np.mean(spectral_centroids)
-            
-            # Zero crossing rate
-            zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
-            features['zcr'] = np.mean(zcr)
-            
-            # MFCC features (simplified)
-            mfccs = librosa.feature.mfcc(y=audio_data, sr=self.sample_rate, n_mfcc=13)
-            features['mfccs'] = np.mean(mfccs, axis=1)
-            
-            return features
-            
+            return feature_extractor.extract(audio_data, self.sample_rate)
         except Exception as e:
             print(f"Feature extraction error: {e}")
             return {}
     
+    def recognize_song_from_audio(self, audio_data, sample_rate=None):
+        """Recognize a song from recorded audio using the fingerprint index"""
+        if not FINGERPRINTING_AVAILABLE:
+            return None
+        
+        try:
+            return recognize_clip(audio_data, sample_rate or self.sample_rate)
+        except Exception as e:
+            print(f"Fingerprint matching error: {e}")
+            return None
+    
     def recognize_song_from_lyrics(self, text_input):
         """Recognize song from sung/hummed lyrics or text"""
+        if LYRICS_INDEX_AVAILABLE:
+            try:
+                return lyrics_index.best_match(text_input)
+            except Exception as e:
+                print(f"Lyrics index error: {e}")
+        
         text_lower = text_input.lower()
         
         # Score each song based on keyword matches
@@ -1028,8 +1172,8 @@ class SongRecognizer:
         except Exception as e:
             return f"Error playing song: {str(e)}"
 
-# Global song recognizer instance
-song_recognizer = SongRecognizer() if AUDIO_PROCESSING_AVAILABLE else None
+# Global song recognizer instance (lyrics lookup works without the audio libraries)
+song_recognizer = SongRecognizer()
 
 def handle_open_file_from_search(command_lower):
     """Handle opening files from previous search results"""
@@ -1058,15 +1202,15 @@ def handle_open_file_from_search(command_lower):
     
     return "Please specify which file number to open, sir. For example: 'open file 1' or 'open file 3'."
 
+@traced()
 def handle_song_recognition(command_lower, original_command):
     """Handle song recognition from singing/humming"""
     global song_recognizer
     
-    if not AUDIO_PROCESSING_AVAILABLE or not song_recognizer:
-        return "Sorry sir, audio processing is not available. Please install the required audio libraries: pip install pyaudio librosa numpy scipy soundfile"
-    
     # Check if user wants to sing/hum
     if any(phrase in command_lower for phrase in ['listen to me sing', 'i will sing', 'let me sing', 'recognize this song', 'what song is this']):
+        if not AUDIO_PROCESSING_AVAILABLE:
+            return "Sorry sir, audio processing is not available. Please install the required audio libraries: pip install pyaudio librosa numpy scipy soundfile"
         return start_song_recording()
     
     # Check if user is providing lyrics directly
@@ -1100,8 +1244,14 @@ def start_song_recording():
         if audio_data is None:
             return f"Recording failed: {status}"
         
-        # For now, we'll ask user to provide lyrics since audio recognition is complex
-        return "🎵 Recording complete! Since audio recognition is complex, could you please tell me some lyrics from the song you just sang? For example: 'The song goes: shape of you, I'm in love with your body'"
+        match = song_recognizer.recognize_song_from_audio(audio_data)
+        if match:
+            return song_recognizer.search_and_play_song(match['song_title'], match['song_info'])
+        
+        # No fingerprint match - fall back to asking for lyrics
+        if FINGERPRINTING_AVAILABLE and fingerprint_index.building:
+            return "🎵 Recording complete! I'm still indexing your song library, so could you please tell me some lyrics from the song meanwhile? For example: 'The song goes: shape of you, I'm in love with your body'"
+        return "🎵 Recording complete! I couldn't match it against your song library, so could you please tell me some lyrics from the song? For example: 'The song goes: shape of you, I'm in love with your body'"
         
     except Exception as e:
         return f"Error during recording: {str(e)}"
@@ -1127,45 +1277,20 @@ def recognize_song_from_text(lyrics_text):
         return f"Error recognizing song: {str(e)}"
 
 def open_file_or_folder(path):
-    """Open file or folder using system default application - cross-platform"""
+    """Open file or folder using system default application - cross-platform, without waiting"""
     try:
         path_obj = Path(path)
         if path_obj.exists():
-            if IS_WINDOWS:
-                # Windows - use start command
-                if path_obj.is_dir():
-                    result = subprocess.run(['explorer', str(path_obj)], capture_output=True, text=True)
-                else:
-                    result = subprocess.run(['start', '', str(path_obj)], shell=True, capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    return f"Successfully opened: {path_obj.name}"
-                else:
-                    return f"Error opening: {result.stderr}"
-            
-            elif IS_MACOS:
-                # macOS - use open command
-                result = subprocess.run(['open', str(path_obj)], capture_output=True, text=True)
-                if result.returncode == 0:
-                    return f"Successfully opened: {path_obj.name}"
-                else:
-                    return f"Error opening: {result.stderr}"
-            
-            else:  # Linux
-                # Linux - use xdg-open
-                try:
-                    result = subprocess.run(['xdg-open', str(path_obj)], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        return f"Successfully opened: {path_obj.name}"
-                    else:
-                        # Fallback to other methods
-                        if path_obj.is_dir():
-                            subprocess.run(['nautilus', str(path_obj)], capture_output=True)
-                        else:
-                            subprocess.run(['gedit', str(path_obj)], capture_output=True)
-                        return f"Successfully opened: {path_obj.name}"
-                except:
-                    return f"Unable to open {path_obj.name} - no suitable application found"
+            if IS_LINUX:
+                # xdg-open's result arrives later; fall back to a file manager or editor if it fails
+                fallback = ['nautilus' if path_obj.is_dir() else 'gedit', str(path_obj)]
+                def on_exit(record):
+                    if record.error or record.returncode:
+                        spawn_service.spawn(fallback)
+                spawn_service.open_path(path_obj, on_exit=on_exit)
+            else:
+                spawn_service.open_path(path_obj)
+            return f"Successfully opened: {path_obj.name}"
         else:
             return f"Path not found: {path}"
     except Exception as e:
@@ -1184,40 +1309,17 @@ def delete_file_or_folder(path, permanent=False):
         if permanent:
             if path_obj.is_dir():
                 shutil.rmtree(str(path_obj))
-                return f"✅ Permanently deleted {item_type} '{item_name}', sir."
             else:
                 path_obj.unlink()
-                return f"✅ Permanently deleted {item_type} '{item_name}', sir."
+            operation_journal.record('delete', str(path_obj), kind=item_type)
+            return f"✅ Permanently deleted {item_type} '{item_name}', sir."
         else:
-            # Try multiple methods to move to trash
+            # The journal moves it to the trash and remembers where it came from, for restore and undo
             try:
-                # Method 1: Use send2trash library
-                if FILE_OPS_AVAILABLE:
-                    import send2trash
-                    send2trash.send2trash(str(path_obj))
-                    return f"✅ Moved {item_type} '{item_name}' to trash, sir."
-                else:
-                    raise ImportError("send2trash not available")
-            except Exception:
-                try:
-                    # Method 2: Use macOS osascript
-                    script = f'tell application "Finder" to delete POSIX file "{str(path_obj)}"'
-                    result = subprocess.run(['osascript', '-e', script], capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        return f"✅ Moved {item_type} '{item_name}' to trash, sir."
-                    else:
-                        # Method 3: Manual move to trash folder
-                        trash_path = os.path.expanduser('~/.Trash')
-                        if os.path.exists(trash_path):
-                            import time
-                            timestamp = int(time.time())
-                            trash_item_path = os.path.join(trash_path, f"{item_name}_{timestamp}")
-                            shutil.move(str(path_obj), trash_item_path)
-                            return f"✅ Moved {item_type} '{item_name}' to trash, sir."
-                        else:
-                            return f"❌ Could not access trash. Use 'delete permanently' if needed, sir."
-                except Exception as e2:
-                    return f"❌ Error moving to trash: {str(e2)}. Try 'delete permanently' instead, sir."
+                operation_journal.trash(str(path_obj))
+                return f"✅ Moved {item_type} '{item_name}' to trash, sir. Say 'undo' to bring it back."
+            except OSError as e:
+                return f"❌ Error moving to trash: {str(e)}. Try 'delete permanently' instead, sir."
     except PermissionError:
         return f"❌ Permission denied: Cannot delete {path}, sir."
     except Exception as e:
@@ -1236,6 +1338,7 @@ def rename_file_or_folder(old_path, new_name):
             return f"Name already exists: {new_name}"
         
         old_path.rename(new_path)
+        operation_journal.record('rename', str(old_path), str(new_path))
         return f"Renamed {old_path.name} to {new_name}"
     except Exception as e:
         return f"Error renaming: {str(e)}"
@@ -1248,7 +1351,10 @@ def create_folder(path):
             desktop_path = os.path.join(os.path.expanduser('~'), 'Desktop')
             path = os.path.join(desktop_path, path)
         
+        existed = os.path.exists(path)
         os.makedirs(path, exist_ok=True)
+        if not existed:
+            operation_journal.record('create', path, kind='folder')
         folder_name = os.path.basename(path)
         return f"✅ Successfully created folder '{folder_name}' at {path}, sir."
     except PermissionError:
@@ -1287,6 +1393,7 @@ def handle_create_file_command(command_lower, original_command):
         # Create file based on extension
         success = create_file_by_type(file_path, base_name, extension)
         if success:
+            operation_journal.record('create', file_path, kind='file')
             return f"✅ Successfully created {extension.upper()} file '{file_name}' on Desktop, sir."
         else:
             return f"❌ Failed to create {extension.upper()} file '{file_name}', sir."
@@ -1295,166 +1402,33 @@ def handle_create_file_command(command_lower, original_command):
         return f"❌ Error creating file: {str(e)}, sir."
 
 def create_file_by_type(file_path, base_name, extension):
-    """Create different types of files with appropriate content"""
+    """Create a file from the template for its extension (file_templates/<extension>.tmpl)"""
     try:
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        if extension in ['txt', 'text']:
-            # Plain text file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"# {base_name}\n\nCreated by JARVIS on {current_time}\n\nThis is a text document.\n")
-        
-        elif extension in ['md', 'markdown']:
-            # Markdown file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"# {base_name}\n\n**Created by JARVIS** on {current_time}\n\n## Content\n\nThis is a markdown document.\n\n- Item 1\n- Item 2\n- Item 3\n")
-        
-        elif extension in ['html', 'htm']:
-            # HTML file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{base_name}</title>
-</head>
-<body>
-    <h1>{base_name}</h1>
-    <p>Created by JARVIS on {current_time}</p>
-    <p>This is an HTML document.</p>
-</body>
-</html>""")
-        
-        elif extension in ['css']:
-            # CSS file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"""/* {base_name} - Created by JARVIS on {current_time} */
-
-body {{
-    font-family: Arial, sans-serif;
-    margin: 0;
-    padding: 20px;
-    background-color: #f5f5f5;
-}}
-
-.container {{
-    max-width: 800px;
-    margin: 0 auto;
-    background: white;
-    padding: 20px;
-    border-radius: 8px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-}}
-""")
-        
-        elif extension in ['js', 'javascript']:
-            # JavaScript file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"""// {base_name} - Created by JARVIS on {current_time}
-
-console.log('Hello from {base_name}!');
-
-// Your JavaScript code here
-function main() {{
-    console.log('JARVIS created this file on {current_time}');
-}}
-
-main();
-""")
-        
-        elif extension in ['py', 'python']:
-            # Python file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"""#!/usr/bin/env python3
-# {base_name} - Created by JARVIS on {current_time}
-
-def main():
-    print("Hello from {base_name}!")
-    print("Created by JARVIS on {current_time}")
-
-if __name__ == "__main__":
-    main()
-""")
-        
-        elif extension in ['json']:
-            # JSON file
-            import json
-            data = {
-                "name": base_name,
-                "created_by": "JARVIS",
-                "created_on": current_time,
-                "description": "JSON file created by JARVIS",
-                "data": {}
-            }
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-        
-        elif extension in ['xml']:
-            # XML file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"""<?xml version="1.0" encoding="UTF-8"?>
-<document>
-    <metadata>
-        <name>{base_name}</name>
-        <created_by>JARVIS</created_by>
-        <created_on>{current_time}</created_on>
-    </metadata>
-    <content>
-        <description>XML file created by JARVIS</description>
-    </content>
-</document>""")
-        
-        elif extension in ['csv']:
-            # CSV file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"Name,Value,Created By,Created On\n")
-                f.write(f"{base_name},Sample Data,JARVIS,{current_time}\n")
-        
-        elif extension in ['pdf']:
-            # PDF file (requires reportlab)
-            try:
-                from reportlab.pdfgen import canvas
-                from reportlab.lib.pagesizes import letter
-                
-                c = canvas.Canvas(file_path, pagesize=letter)
-                c.drawString(100, 750, f"{base_name}")
-                c.drawString(100, 730, f"Created by JARVIS on {current_time}")
-                c.drawString(100, 700, "This is a PDF document created by JARVIS.")
-                c.save()
-            except ImportError:
-                # Fallback: create empty PDF-like file
-                with open(file_path, 'wb') as f:
-                    # Simple PDF header (not a real PDF, but has .pdf extension)
-                    f.write(b'%PDF-1.4\n')
-                    f.write(f'% {base_name} - Created by JARVIS on {current_time}\n'.encode())
-        
-        elif extension in ['docx', 'doc']:
-            # Word document (requires python-docx)
-            try:
-                from docx import Document
-                
-                doc = Document()
-                doc.add_heading(base_name, 0)
-                doc.add_paragraph(f'Created by JARVIS on {current_time}')
-                doc.add_paragraph('This is a Word document created by JARVIS.')
-                doc.save(file_path)
-            except ImportError:
-                # Fallback: create RTF file with .docx extension
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"{base_name}\n\nCreated by JARVIS on {current_time}\n\nThis is a document file.")
-        
-        else:
-            # Generic file - create as text
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(f"# {base_name}\n\nCreated by JARVIS on {current_time}\n\nFile type: {extension.upper()}\n")
-        
+        template_engine.create(file_path, {'name': base_name})
         return True
-        
     except Exception as e:
         print(f"Error creating file: {e}")
         return False
 
+def handle_batch_create_command(filenames, directory=None):
+    """Create several files from templates at once and journal them as one operation"""
+    directory = directory or os.path.join(os.path.expanduser('~'), 'Desktop')
+    results = template_engine.create_many(directory, filenames)
+    created = [r for r in results if r['success']]
+    batch = f"create-{int(time.time() * 1000)}"
+    for result in created:
+        operation_journal.record('create', result['path'], kind='file', batch=batch)
+    folder = os.path.basename(directory.rstrip(os.sep)) or directory
+    if not created:
+        return f"❌ Couldn't create any of those files: {results[0]['error']}, sir."
+    message = f"✅ Created {len(created)} files in {folder}: {', '.join(os.path.basename(r['path']) for r in created[:5])}"
+    if len(created) > 5:
+        message += f" and {len(created) - 5} more"
+    failed = [r for r in results if not r['success']]
+    if failed:
+        message += f". {len(failed)} failed ({os.path.basename(failed[0]['path'])}: {failed[0]['error']})"
+    return message + ", sir."
+
 def handle_delete_command(command_lower, original_command):
     """Handle delete file/folder commands"""
     try:
@@ -1489,7 +1463,10 @@ def handle_delete_command(command_lower, original_command):
         return f"❌ Error processing delete command: {str(e)}, sir."
 
 def handle_restore_file_command(command_lower, original_command):
-    """Handle file restoration from trash"""
+    """
+    Restore a trashed file to the folder it was deleted from - looked up by name in the
+    operation journal, then in the desktop trash for things deleted outside JARVIS
+    """
     try:
         # Extract file name from command
         file_name = command_lower
@@ -1499,57 +1476,64 @@ def handle_restore_file_command(command_lower, original_command):
         if not file_name:
             return "Please specify the file name to restore, sir. For example: 'restore file test.txt'"
         
-        # Check trash folder
-        trash_path = os.path.expanduser('~/.Trash')
-        if not os.path.exists(trash_path):
-            return "❌ Trash folder not found, sir."
-        
-        # Find files in trash matching the name
-        matches = []
-        for item in os.listdir(trash_path):
-            if file_name.lower() in item.lower():
-                matches.append(item)
-        
+        matches = operation_journal.find_deleted(file_name)
         if not matches:
-            return f"❌ Could not find '{file_name}' in trash, sir."
-        
-        if len(matches) == 1:
-            # Restore the file
-            trash_item_path = os.path.join(trash_path, matches[0])
-            desktop_path = os.path.join(os.path.expanduser('~'), 'Desktop')
-            
-            # Remove timestamp suffix if present
-            original_name = matches[0]
-            if '_' in original_name and original_name.split('_')[-1].isdigit():
-                original_name = '_'.join(original_name.split('_')[:-1])
-            
-            restore_path = os.path.join(desktop_path, original_name)
-            
-            # Check if file already exists at destination
-            counter = 1
-            while os.path.exists(restore_path):
-                name_parts = original_name.rsplit('.', 1)
-                if len(name_parts) == 2:
-                    restore_path = os.path.join(desktop_path, f"{name_parts[0]}_restored_{counter}.{name_parts[1]}")
-                else:
-                    restore_path = os.path.join(desktop_path, f"{original_name}_restored_{counter}")
-                counter += 1
-            
-            shutil.move(trash_item_path, restore_path)
-            restored_name = os.path.basename(restore_path)
-            return f"✅ Successfully restored '{restored_name}' to Desktop, sir."
-        
-        else:
-            # Multiple matches
-            result = f"Found {len(matches)} items in trash matching '{file_name}':\n"
-            for i, match in enumerate(matches[:5], 1):
-                result += f"{i}. {match}\n"
-            result += "\nPlease be more specific, sir."
-            return result
+            return restore_from_trash(file_name)
+        
+        # Exact name matches come first; several deletes of the same name restore the newest
+        if len(matches) == 1 or matches[0].name.lower() == file_name.lower():
+            restored = operation_journal.restore(matches[0])
+            folder = os.path.basename(os.path.dirname(restored)) or restored
+            return f"✅ Successfully restored '{os.path.basename(restored)}' to {folder}, sir."
+        
+        result = f"Found {len(matches)} items in trash matching '{file_name}':\n"
+        for i, entry in enumerate(matches[:5], 1):
+            deleted_at = datetime.fromtimestamp(entry.time).strftime('%Y-%m-%d %H:%M')
+            result += f"{i}. {entry.name} (from {os.path.dirname(entry.path)}, deleted {deleted_at})\n"
+        result += "\nPlease be more specific, sir."
+        return result
             
+    except UndoError as e:
+        return f"❌ Could not restore '{file_name}': {e}, sir."
     except Exception as e:
         return f"❌ Error restoring file: {str(e)}, sir."
 
+def restore_from_trash(file_name):
+    """Restore an item another program moved to the FreeDesktop trash, using its .trashinfo record"""
+    items = find_in_trash(file_name)
+    if not items:
+        return f"❌ Could not find '{file_name}' in trash, sir."
+    if len(items) == 1 or items[0].original_name.lower() == file_name.lower():
+        restored = trash_store.restore(items[0])
+        folder = os.path.basename(os.path.dirname(restored)) or restored
+        return f"✅ Successfully restored '{os.path.basename(restored)}' to {folder}, sir."
+    result = f"Found {len(items)} items in trash matching '{file_name}':\n"
+    for i, item in enumerate(items[:5], 1):
+        deleted_at = datetime.fromtimestamp(item.deleted_at).strftime('%Y-%m-%d %H:%M')
+        result += f"{i}. {item.original_name} (from {os.path.dirname(item.original_path)}, deleted {deleted_at})\n"
+    result += "\nPlease be more specific, sir."
+    return result
+
+def summarize_undo(results):
+    """Spoken summary of OperationJournal.undo() results"""
+    if not results:
+        return "There is nothing to undo, sir."
+    undone = [entry for entry, error in results if error is None]
+    failed = [(entry, error) for entry, error in results if error is not None]
+    if len(undone) == 1 and not failed:
+        return f"✅ Undid the {describe(undone[0])}, sir."
+    message = f"✅ Undid {len(undone)} file operation{'s' if len(undone) != 1 else ''}" if undone else "❌ Nothing could be undone"
+    if failed:
+        entry, error = failed[0]
+        message += f". Couldn't undo the {describe(entry)}: {error}"
+        if len(failed) > 1:
+            message += f" (and {len(failed) - 1} more)"
+    return message + ", sir."
+
+def handle_undo_command(count):
+    """Undo the last count journaled file operations"""
+    return summarize_undo(operation_journal.undo(count))
+
 def handle_open_file_command(file_path):
     """Open file with default application"""
     try:
@@ -1557,13 +1541,7 @@ def handle_open_file_command(file_path):
             return f"❌ File not found: {file_path}, sir."
         
         file_name = os.path.basename(file_path)
-        
-        if IS_MACOS:
-            subprocess.run(['open', file_path])
-        elif IS_WINDOWS:
-            os.startfile(file_path)
-        else:  # Linux
-            subprocess.run(['xdg-open', file_path])
+        spawn_service.open_path(file_path)
         
         return f"✅ Opening '{file_name}' with default application, sir."
         
@@ -1578,9 +1556,11 @@ def copy_file_or_folder(source, destination):
         
         if os.path.isdir(source):
             shutil.copytree(source, destination)
+            operation_journal.record('copy', source, destination, kind='folder')
             return f"Copied folder from {source} to {destination}"
         else:
-            shutil.copy2(source, destination)
+            copied = shutil.copy2(source, destination)
+            operation_journal.record('copy', source, copied, kind='file')
             return f"Copied file from {source} to {destination}"
     except Exception as e:
         return f"Error copying: {str(e)}"
@@ -1591,11 +1571,85 @@ def move_file_or_folder(source, destination):
         if not os.path.exists(source):
             return f"Source not found: {source}"
         
-        shutil.move(source, destination)
+        moved = shutil.move(source, destination)
+        operation_journal.record('move', source, moved)
         return f"Moved from {source} to {destination}"
     except Exception as e:
         return f"Error moving: {str(e)}"
 
+# Folders that can be named in bulk commands ("move all pdfs from downloads to documents")
+BULK_LOCATIONS = {name: Path.home() / name.title()
+                  for name in ('desktop', 'documents', 'downloads', 'pictures', 'music', 'videos', 'movies')}
+BULK_LOCATIONS['home'] = Path.home()
+
+def announce_bulk_job(job):
+    """Speak and notify when a background bulk operation finishes"""
+    counts = job.counts()
+    text = f"Bulk {job.operation} {job.status}: {counts['done_files']} of {counts['total_files']} files"
+    if counts['failed']:
+        text += f", {counts['failed']} failed"
+    text += ", sir."
+    if NOTIFICATIONS_AVAILABLE:
+        show_notification("JARVIS File Operations", text)
+    speak(text)
+
+def start_bulk_command(parsed):
+    """Run a parsed bulk command in the background and describe what it is doing"""
+    operation, selection, destination = parsed
+    job = bulk_operations.prepare(operation, selection, destination, on_done=announce_bulk_job)
+    kind = ', '.join(sorted(selection.extensions)) if selection.extensions else 'all'
+    if not job.total_files:
+        return f"I didn't find any {kind} files in {selection.root.name}, sir."
+    where = f" from {selection.root.name}" + (f" to {destination.name}" if destination else "")
+    
+    def launch():
+        bulk_operations.launch(job)
+        verb = {'copy': 'Copying', 'move': 'Moving', 'delete': 'Moving to trash'}[operation]
+        return f"{verb} {job.total_files} files ({format_size(job.total_bytes)}){where}, sir. This is job {job.id}."
+    
+    if operation != 'delete':
+        return launch()
+    # Deletes get the same yes/no as a single 'delete file'
+    if not IMPROVED_FILE_OPS_AVAILABLE:
+        return "I can't confirm bulk deletes right now, sir, so I haven't deleted anything."
+    return command_processor.request_confirmation(
+        'bulk_delete', {'confirm': launch},
+        f"Are you sure you want to move {job.total_files} {kind} files ({format_size(job.total_bytes)}){where} "
+        f"to the trash, sir? You can say 'undo' afterwards. (yes/no)")
+
+def handle_disk_usage_command(kind, folder, limit=5):
+    """Answer 'what's taking space' from the disk usage cache; a new folder is measured in the background"""
+    folder = Path(folder)
+    name = 'Your home folder' if folder == Path.home() else folder.name
+    if not disk_usage.covered(folder):
+        if not disk_usage.scanning:
+            disk_usage.start(folder)
+        return "I'm still measuring your folders, sir. Please ask me again in a moment."
+    # Answer from the cache now and pick up any changes for next time
+    disk_usage.start(folder)
+    summary = disk_usage.summary(folder, limit)
+    
+    if kind == 'files':
+        if not summary['largest_files']:
+            return f"{name} has no files, sir."
+        items = [f"{Path(f['path']).name} ({format_size(f['size'])}) in {Path(f['path']).parent.name}"
+                 for f in summary['largest_files']]
+        return f"The largest files in {folder.name} are: " + '; '.join(items) + ", sir."
+    
+    folders = [f"{Path(f['path']).name} ({format_size(f['size'])})" for f in summary['folders'] if f['size']]
+    if kind == 'folders':
+        if not folders:
+            return f"{name} has no folders with anything in them, sir."
+        return f"The largest folders in {folder.name} are: " + ', '.join(folders) + ", sir."
+    
+    message = f"{name} uses {format_size(summary['size'])} in {summary['files']:,} files"
+    if folders:
+        message += ". Largest folders: " + ', '.join(folders[:3])
+    if summary['largest_files']:
+        biggest = summary['largest_files'][0]
+        message += f". The biggest file is {Path(biggest['path']).name} ({format_size(biggest['size'])})"
+    return message + ", sir."
+
 def get_file_info(path):
     """Get detailed information about a file or folder"""
     try:
@@ -1621,56 +1675,30 @@ def get_file_info(path):
     except Exception as e:
         return f"Error getting file info: {str(e)}"
 
-def list_directory_contents(path, show_hidden=False):
-    """List contents of a directory - macOS optimized"""
+def list_directory_contents(path, show_hidden=False, limit=20):
+    """Spoken summary of the first page of a directory (folders first, then by name)"""
     try:
-        path_obj = Path(path)
-        if not path_obj.exists():
-            return f"Path not found: {path}"
-        
-        if not path_obj.is_dir():
-            return f"Not a directory: {path}"
-        
-        contents = []
-        
-        for item in path_obj.iterdir():
-            if not show_hidden and item.name.startswith('.'):
-                continue
-            
-            try:
-                stat_info = item.stat()
-                contents.append({
-                    'name': item.name,
-                    'type': 'folder' if item.is_dir() else 'file',
-                    'size': stat_info.st_size if item.is_file() else 0
-                })
-            except (PermissionError, OSError):
-                # Skip items we can't access
-                continue
-        
-        contents.sort(key=lambda x: (x['type'] == 'file', x['name'].lower()))
-        
-        if not contents:
-            return f"No accessible items found in {path_obj.name}"
-        
-        result = f"Contents of {path_obj.name}:\n"
-        for item in contents[:20]:  # Limit to 20 items
-            if item['type'] == 'file':
-                size_mb = item['size'] / (1024 * 1024)
-                if size_mb >= 1:
-                    size_str = f" ({size_mb:.1f} MB)"
-                else:
-                    size_str = f" ({item['size']} bytes)"
-            else:
-                size_str = ""
-            result += f"  📁 {item['name']}{size_str}\n" if item['type'] == 'folder' else f"  📄 {item['name']}{size_str}\n"
-        
-        if len(contents) > 20:
-            result += f"  ... and {len(contents) - 20} more items"
-        
-        return result
+        page = directory_browser.list(path, limit=limit, show_hidden=show_hidden)
+    except FileNotFoundError:
+        return f"Path not found: {path}"
+    except NotADirectoryError:
+        return f"Not a directory: {path}"
     except Exception as e:
         return f"Error listing directory: {str(e)}"
+    
+    name = os.path.basename(page['path']) or page['path']
+    if not page['items']:
+        return f"No accessible items found in {name}"
+    
+    result = f"Contents of {name}:\n"
+    for item in page['items']:
+        if item['type'] == 'folder':
+            result += f"  📁 {item['name']}\n"
+        else:
+            result += f"  📄 {item['name']} ({format_size(item['size'])})\n"
+    if page['total'] > len(page['items']):
+        result += f"  ... and {page['total'] - len(page['items'])} more items"
+    return result
 
 def test_system_permissions():
     """Test if we have necessary permissions for file operations"""
@@ -1885,22 +1913,26 @@ def control_system_settings(action):
     except Exception as e:
         return f"Error performing {action}: {str(e)}"
 
-def get_system_performance():
-    """Get detailed system performance metrics"""
+def get_system_performance(window_seconds=300):
+    """Get system performance metrics from the background sampler"""
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/' if not IS_WINDOWS else 'C:')
-        
-        performance = {
-            'cpu_usage': cpu_percent,
-            'memory_usage': memory.percent,
-            'memory_available': round(memory.available / (1024**3), 2),
-            'disk_free': round(disk.free / (1024**3), 2),
-            'disk_usage': round((disk.used / disk.total) * 100, 2)
-        }
-        
-        return f"System Performance: CPU {cpu_percent}%, Memory {memory.percent}%, Disk {performance['disk_usage']}% used"
+        metrics = metrics_sampler.latest()
+        if not metrics:
+            return "System metrics are not available yet, sir."
+        
+        message = (f"System Performance: CPU {metrics['cpu_percent']:.0f}%, "
+                   f"Memory {metrics['memory_percent']:.0f}%, Disk {metrics['disk_percent']:.0f}% used")
+        
+        window = metrics_sampler.summary(window_seconds)
+        if window['samples'] > 1 and window['cpu_percent']:
+            cpu = window['cpu_percent']
+            message += (f". Over the last {window_seconds // 60} minutes CPU averaged {cpu['avg']:.0f}% "
+                        f"(min {cpu['min']:.0f}%, max {cpu['max']:.0f}%)")
+        # Where the disk space went, if the home folder has been measured already
+        largest = disk_usage.largest_folders(Path.home(), 1) if disk_usage.covered(Path.home()) else []
+        if largest:
+            message += f". The largest folder in your home is {Path(largest[0][1]).name} ({format_size(largest[0][0])})"
+        return message
     except Exception as e:
         return f"Error getting system performance: {str(e)}"
 
@@ -1923,16 +1955,9 @@ def manage_clipboard(action, text=None):
 def set_timer(duration_minutes):
     """Set a timer for specified minutes"""
     try:
-        duration_seconds = duration_minutes * 60
-        
-        def timer_task():
-            time.sleep(duration_seconds)
-            if NOTIFICATIONS_AVAILABLE:
-                show_notification("JARVIS Timer", f"Timer for {duration_minutes} minutes has finished!")
-            speak(f"Timer for {duration_minutes} minutes has finished, sir.")
-        
-        Thread(target=timer_task).start()
-        return f"Timer set for {duration_minutes} minutes, sir."
+        duration = format_duration(duration_minutes * 60)
+        task = scheduler.add(f"Timer for {duration}", delay=duration_minutes * 60, kind='timer')
+        return f"Timer {task.id} set for {duration}, sir."
     except Exception as e:
         return f"Error setting timer: {str(e)}"
 
@@ -1988,165 +2013,72 @@ def get_wikipedia_summary(topic, sentences=2):
         return f"Error retrieving Wikipedia information: {str(e)}"
 
 def open_application_cross_platform(app_name):
-    """Open application across different operating systems with fallbacks"""
+    """Open an application through the registry's cached launch command"""
     try:
-        if app_name in APP_MAP:
-            app_paths = APP_MAP[app_name] if isinstance(APP_MAP[app_name], list) else [APP_MAP[app_name]]
-            
-            for app_path in app_paths:
-                try:
-                    if IS_WINDOWS:
-                        # Expand environment variables
-                        app_path = os.path.expandvars(app_path)
-                        
-                        if app_path.endswith('.exe'):
-                            if os.path.exists(app_path):
-                                subprocess.Popen([app_path])
-                                return f"Opening {app_name} application, sir."
-                            else:
-                                # Try to find in PATH
-                                try:
-                                    subprocess.Popen([os.path.basename(app_path)])
-                                    return f"Opening {app_name} application, sir."
-                                except:
-                                    continue
-                        else:
-                            subprocess.Popen(['start', '', app_path], shell=True)
-                            return f"Opening {app_name} application, sir."
-                    
-                    elif IS_MACOS:
-                        if os.path.exists(app_path):
-                            subprocess.run(['open', '-a', app_path])
-                            return f"Opening {app_name} application, sir."
-                        else:
-                            continue
-                    
-                    else:  # Linux
-                        try:
-                            subprocess.Popen([app_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                            return f"Opening {app_name} application, sir."
-                        except FileNotFoundError:
-                            continue
-                
-                except Exception as e:
-                    print(f"Failed to open {app_path}: {e}")
-                    continue
-            
-            # If all paths failed, try generic approach
-            if IS_WINDOWS:
-                try:
-                    subprocess.Popen(['start', '', app_name], shell=True)
-                    return f"Attempting to open {app_name}, sir."
-                except:
-                    pass
-            elif IS_MACOS:
-                try:
-                    subprocess.run(['open', '-a', app_name])
-                    return f"Attempting to open {app_name}, sir."
-                except:
-                    pass
-            else:  # Linux
-                try:
-                    subprocess.Popen([app_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    return f"Attempting to open {app_name}, sir."
-                except:
-                    pass
-            
-            return f"Application '{app_name}' not found or cannot be opened, sir."
-        else:
-            return f"Application '{app_name}' not found in my database, sir."
+        app = app_registry.launch(app_name)
+        if app:
+            return f"Opening {app.display_name} application, sir."
+        return f"Application '{app_name}' not found or cannot be opened, sir."
     except Exception as e:
         return f"Error opening {app_name}: {str(e)}"
 
 def get_system_info():
     """Get comprehensive system information"""
     try:
-        info = {
-            'os': platform.system(),
-            'os_version': platform.version(),
-            'architecture': platform.architecture()[0],
-            'processor': platform.processor(),
-            'hostname': platform.node(),
-            'python_version': platform.python_version(),
-            'cpu_count': psutil.cpu_count(),
-            'memory_total': round(psutil.virtual_memory().total / (1024**3), 2),
-            'memory_available': round(psutil.virtual_memory().available / (1024**3), 2),
-            'disk_usage': round(psutil.disk_usage('/').free / (1024**3), 2) if not IS_WINDOWS else round(psutil.disk_usage('C:').free / (1024**3), 2)
-        }
+        info = dict(metrics_sampler.static_info())
+        metrics = metrics_sampler.latest() or {}
+        if metrics.get('memory_available_gb') is not None:
+            info['memory_available'] = round(metrics['memory_available_gb'], 2)
+        if metrics.get('disk_free_gb') is not None:
+            info['disk_usage'] = round(metrics['disk_free_gb'], 2)
         return info
     except Exception as e:
         return f"Error getting system info: {str(e)}"
 
 def normalize_multilingual_command(command):
     """Normalize multilingual commands to English equivalents"""
-    # Hindi to English mappings
-    hindi_mappings = {
-        'समय क्या है': 'what time is it',
-        'समय': 'time',
-        'आज की तारीख': 'what is today date',
-        'तारीख': 'date',
-        'बैटरी स्टेटस': 'battery status',
-        'बैटरी': 'battery',
-        'मदद करो': 'help me',
-        'मदद': 'help',
-        'मजाक सुनाओ': 'tell me a joke',
-        'मजाक': 'joke',
-        'खोलो': 'open',
-        'बंद करो': 'close',
-        'चालू करो': 'start',
-        'फाइल बनाओ': 'create file',
-        'फोल्डर बनाओ': 'create folder',
-        'फाइल डिलीट करो': 'delete file',
-        'फोल्डर डिलीट करो': 'delete folder',
-        'वाईफाई': 'wifi',
-        'इंटरनेट': 'internet',
-        'फोटो खींचो': 'take photo',
-        'आवाज बढ़ाओ': 'volume up',
-        'आवाज कम करो': 'volume down',
-    }
-    
-    # Gujarati to English mappings
-    gujarati_mappings = {
-        'સમય શું છે': 'what time is it',
-        'સમય': 'time',
-        'આજની તારીખ': 'what is today date',
-        'તારીખ': 'date',
-        'બેટરી સ્ટેટસ': 'battery status',
-        'બેટરી': 'battery',
-        'મદદ કરો': 'help me',
-        'મદદ': 'help',
-        'મજાક કહો': 'tell me a joke',
-        'મજાક': 'joke',
-        'ખોલો': 'open',
-        'બંધ કરો': 'close',
-        'ચાલુ કરો': 'start',
-        'ફાઇલ બનાવો': 'create file',
-        'ફોલ્ડર બનાવો': 'create folder',
-        'ફાઇલ ડિલીટ કરો': 'delete file',
-        'ફોલ્ડર ડિલીટ કરો': 'delete folder',
-        'વાઈફાઈ': 'wifi',
-        'ઈન્ટરનેટ': 'internet',
-        'ફોટો લો': 'take photo',
-        'અવાજ વધારો': 'volume up',
-        'અવાજ ઘટાડો': 'volume down',
-    }
-    
-    # Apply mappings
-    normalized = command.lower()
-    
-    # Apply Hindi mappings
-    for hindi, english in hindi_mappings.items():
-        if hindi in normalized:
-            normalized = normalized.replace(hindi, english)
-    
-    # Apply Gujarati mappings
-    for gujarati, english in gujarati_mappings.items():
-        if gujarati in normalized:
-            normalized = normalized.replace(gujarati, english)
-    
-    return normalized
+    return normalize_command(command)
+
+# Keyword groups used to label command metrics - first match wins
+COMMAND_INTENTS = [
+    ('screen_recording', ['screen recording', 'record screen', 'record the screen']),
+    ('screenshot', ['screenshot', 'screen shot', 'capture screen']),
+    ('photo', ['take photo', 'capture photo', 'take picture', 'photo']),
+    ('song', ['song', 'lyrics', 'sing']),
+    ('duplicates', ['duplicate files', 'duplicates']),
+    ('disk_usage', ['taking space', 'taking up space', 'disk usage', 'largest files', 'biggest files',
+                    'largest folders', 'biggest folders']),
+    ('content_search', ['that mentions', 'that contains', 'which mentions', 'which contains', 'grep']),
+    ('file_search', ['find file', 'search file', 'locate file', 'look for file']),
+    ('file_ops', ['file', 'folder', 'rename', 'restore', 'recycle']),
+    ('volume', ['volume', 'mute']),
+    ('system_status', ['system performance', 'cpu usage', 'memory usage', 'battery']),
+    ('schedule', ['remind', 'timer', 'alarm', 'wake me', 'याद', 'टाइमर', 'યાદ', 'ટાઈમર']),
+    ('web_search', ['search', 'look up']),
+    ('open', ['open']),
+]
+
+def command_intent(command_lower):
+    """Coarse intent label for metrics"""
+    for intent, phrases in COMMAND_INTENTS:
+        if any(phrase in command_lower for phrase in phrases):
+            return intent
+    return 'conversation'
+
+def process_command(command, language=None):
+    """Process a command and record its latency by intent; language is detected if not given"""
+    if language is None:
+        with tracer.span('detect_language'):
+            language = detect_language(command or '')
+    intent = command_intent((command or '').lower())
+    try:
+        with COMMAND_SECONDS.time(intent=intent), tracer.span('process_command', intent=intent, language=language):
+            return _process_command(command, language)
+    except Exception:
+        COMMAND_ERRORS.inc(intent=intent)
+        raise
 
-def process_command(command, language='en'):
+def _process_command(command, language='en'):
     """AI-First Command Processing - Natural Conversation Like Siri/Google Assistant"""
     if not command or not command.strip():
         return "I didn't hear anything, sir. Could you please repeat that?"
@@ -2156,9 +2088,7 @@ def process_command(command, language='en'):
     
     print(f"🎤 Processing: '{original_command}'")
     
-    # Detect language
-    detected_language = detect_language(command)
-    print(f"🌐 Language: {detected_language}")
+    print(f"🌐 Language: {language}")
     
     # Remove wake words if present
     wake_words = ['hey jarvis', 'jarvis', 'हे जार्विस', 'જાર્વિસ']
@@ -2172,9 +2102,31 @@ def process_command(command, language='en'):
     if not command_lower:
         return "Hello! I'm JARVIS, your AI assistant. How may I help you today, sir?"
     
+    # UNDO FILE OPERATIONS - "undo", "undo the last 3 operations"
+    undo_count = parse_undo_command(command_lower)
+    if undo_count:
+        return handle_undo_command(undo_count)
+    
+    # BATCH FILE CREATION - "create 5 text files called notes"
+    batch_files = parse_batch_create(command_lower)
+    if batch_files:
+        return handle_batch_create_command(batch_files)
+    
+    # DISK USAGE - "what's taking space in downloads", "biggest files in documents"
+    disk_request = parse_disk_usage_command(command_lower, BULK_LOCATIONS)
+    if disk_request:
+        return handle_disk_usage_command(*disk_request)
+    
+    # BULK FILE OPERATIONS - "move all pdfs from downloads to documents"
+    bulk_request = parse_bulk_command(command_lower, BULK_LOCATIONS)
+    if bulk_request:
+        return start_bulk_command(bulk_request)
+    
     # IMPROVED FILE OPERATIONS - HIGHEST PRIORITY
     if IMPROVED_FILE_OPS_AVAILABLE:
-        file_result = command_processor.process_file_command(command_lower, original_command)
+        with tracer.span('file_processor') as span:
+            file_result = command_processor.process_file_command(command_lower, original_command)
+            span.set(handled=bool(file_result))
         if file_result:
             print(f"📁 File operation result: {file_result[:100]}...")
             return file_result
@@ -2212,24 +2164,31 @@ def process_command(command, language='en'):
         if song_result:
             return song_result
     
+    # "remind me in 2 hours to ...", "10 मिनट का टाइमर" - parsed here so the AI doesn't answer them
+    schedule_request = parse_schedule_command(original_command)
+    
     # AI-FIRST APPROACH - Let AI handle most queries naturally
     if AI_AVAILABLE:
         try:
             # Check if it's a direct system command that needs immediate handling
             direct_system_commands = [
-                'screenshot', 'screen shot', 'capture screen',
+                'screenshot', 'screen shot', 'capture screen', 'screen recording',
                 'take photo', 'capture photo', 'take picture',
                 'volume mute', 'mute volume', 'volume unmute', 'unmute volume',
                 'volume up', 'volume down', 'increase volume', 'decrease volume',
                 'create file', 'make file', 'new file', 'create folder', 'make folder', 'new folder',
-                'delete file', 'remove file', 'delete folder', 'remove folder'
+                'delete file', 'remove file', 'delete folder', 'remove folder',
+                'system performance', 'cpu usage', 'memory usage',
+                'battery status', 'battery level', 'battery percentage',
+                'reminders', 'timers', 'cancel reminder', 'cancel timer', 'snooze'
             ]
             
-            is_direct_system_command = any(cmd in command_lower for cmd in direct_system_commands)
+            is_direct_system_command = schedule_request is not None or any(cmd in command_lower for cmd in direct_system_commands)
             
             if not is_direct_system_command:
                 print(f"🤖 Sending to AI: '{original_command}'")
-                ai_response = get_ai_response(original_command)
+                with tracer.span('ai_response'):
+                    ai_response = get_ai_response(original_command)
                 if ai_response and len(ai_response.strip()) > 5:
                     print(f"✅ AI Response: {ai_response[:100]}...")
                     return ai_response
@@ -2238,9 +2197,15 @@ def process_command(command, language='en'):
     
     # DIRECT SYSTEM COMMANDS - Only essential system operations
     
-    # Screenshot
+    # Screen recording
+    if 'screen recording' in command_lower or 'record screen' in command_lower or 'record the screen' in command_lower:
+        if any(word in command_lower for word in ['stop', 'end', 'finish']):
+            return stop_screen_recording()
+        return start_screen_recording(**parse_screenshot_target(command_lower))
+    
+    # Screenshot - "screenshot of monitor 2", "screenshot of the chrome window"
     if any(phrase in command_lower for phrase in ['screenshot', 'screen shot', 'capture screen']):
-        result = take_screenshot()
+        result = take_screenshot(**parse_screenshot_target(command_lower))
         return result
     
     # Photo capture - Enhanced version that auto-opens photos
@@ -2267,6 +2232,28 @@ def process_command(command, language='en'):
             control_volume('decrease')
             return "Volume decreased, sir."
     
+    # System status - answered from the background metrics sampler
+    if any(phrase in command_lower for phrase in ['system performance', 'cpu usage', 'memory usage']):
+        return get_system_performance()
+    if any(phrase in command_lower for phrase in ['battery status', 'battery level', 'battery percentage']) or command_lower.strip() == 'battery':
+        return get_battery_status()
+    
+    # Timers and reminders - list, cancel and snooze
+    if 'snooze' in command_lower:
+        numbers = [int(n) for n in re.findall(r'\d+', command_lower)]
+        minutes = numbers[-1] if numbers and 'minute' in command_lower else 10
+        task_id = numbers[0] if numbers and (len(numbers) > 1 or 'minute' not in command_lower) else None
+        return snooze_reminder(task_id, minutes)
+    if re.search(r'\b(cancel|delete|remove|stop)\s+(the\s+)?(reminder|timer)\b', command_lower):
+        numbers = re.findall(r'\d+', command_lower)
+        if numbers:
+            return cancel_reminder(int(numbers[0]))
+        return list_reminders() + ". Say 'cancel reminder' followed by its number."
+    if re.search(r'\b(list|show|my|pending|what are)\b.*\b(reminders|timers)\b', command_lower):
+        return list_reminders('timer' if 'timer' in command_lower and 'reminder' not in command_lower else None)
+    if schedule_request:
+        return schedule_spoken_request(schedule_request)
+    
     # Website opening
     for site, url in WEBSITE_MAP.items():
         if f"open {site}" in command_lower or site in command_lower:
@@ -2289,31 +2276,18 @@ def process_command(command, language='en'):
                 webbrowser.open(url)
                 return f"Searching Google for '{search_query}', sir."
     
-    # Application opening
+    # Application opening - resolved once and cached by the app registry
     if 'open' in command_lower:
-        for app_name, app_paths in APP_MAP.items():
+        app = app_registry.find_in_command(command_lower)
+        if app:
+            try:
+                app_registry.launch(app)
+                return f"Opening {app.display_name}, sir."
+            except Exception:
+                return f"I couldn't open {app.display_name}, sir."
+        for app_name in APP_MAP:
             if app_name in command_lower:
-                success = False
-                for app_path in app_paths:
-                    try:
-                        if IS_WINDOWS:
-                            if app_path.endswith('.exe'):
-                                subprocess.Popen(app_path, shell=True)
-                            else:
-                                subprocess.Popen(['start', app_path], shell=True)
-                        elif IS_MACOS:
-                            subprocess.Popen(['open', '-a', app_path])
-                        else:  # Linux
-                            subprocess.Popen([app_path])
-                        success = True
-                        break
-                    except Exception:
-                        continue
-                
-                if success:
-                    return f"Opening {app_name.title()}, sir."
-                else:
-                    return f"I couldn't find {app_name} on your system, sir."
+                return f"I couldn't find {app_name} on your system, sir."
     
     # FALLBACK TO AI - Let AI handle everything else naturally
     # ENHANCED FILE SEARCH COMMANDS
@@ -2447,14 +2421,19 @@ def index():
 def handle_command():
     command = request.json.get('command', '')
     
-    # Detect language of the command
-    detected_language = detect_language(command)
-    
-    # Process command with language context
-    response = process_command(command, detected_language)
-    
-    # Start speaking the response in the detected language
-    Thread(target=speak, args=(response, detected_language)).start()
+    # ?trace=1 or an X-Jarvis-Trace header records this request regardless of sampling
+    force_trace = request.args.get('trace') == '1' or request.headers.get('X-Jarvis-Trace') == '1'
+    with tracer.trace('handle_command', force=force_trace, command_length=len(command)) as span:
+        # Detect language of the command
+        with tracer.span('detect_language'):
+            detected_language = detect_language(command)
+        
+        # Process command with language context
+        response = process_command(command, detected_language)
+        span.set(language=detected_language, response_length=len(response or ''))
+        
+        # Start speaking the response in the detected language
+        Thread(target=speak, args=(response, detected_language)).start()
     
     return jsonify({
         'response': response,
@@ -2533,10 +2512,11 @@ def handle_speak():
 
 @app.route('/api/translate', methods=['POST'])
 def handle_translate():
-    text = request.json.get('text', '')
-    target_lang = request.json.get('target_lang', 'en')
+    data = request.get_json(silent=True) or {}
+    text = data.get('text', '')
+    target_lang = data.get('target_lang', 'en')
     
-    if TRANSLATION_AVAILABLE:
+    if translation_service.available:
         translated = translate_text(text, target_lang)
         return jsonify({
             'original': text,
@@ -2549,6 +2529,300 @@ def handle_translate():
             'original': text
         })
 
+@app.route('/api/translate/batch', methods=['POST'])
+def handle_translate_batch():
+    """Translate many strings in one call: {"texts": [...], "target_lang": "hi"}"""
+    data = request.get_json(silent=True) or {}
+    texts = data.get('texts')
+    target_lang = data.get('target_lang', 'en')
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return jsonify({'status': 'error', 'message': 'texts must be a list of strings'}), 400
+    
+    return jsonify({
+        'status': 'success',
+        'target_language': target_lang,
+        'translations': translation_service.translate_many(texts, target_lang),
+        'translator_available': translation_service.available
+    })
+
+@app.route('/api/apps', methods=['GET'])
+def handle_apps():
+    """Search installed applications: /api/apps?q=text&limit=20"""
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', 20, type=int), 200)
+    apps = app_registry.search(query, limit=limit)
+    return jsonify({
+        'status': 'success',
+        'apps': [app.to_dict() for app in apps],
+        'total_indexed': len(app_registry),
+        'stats': app_registry.stats
+    })
+
+@app.route('/api/bulk-operations', methods=['POST'])
+def handle_bulk_operation():
+    """
+    Plan or start a bulk operation:
+    {"operation": "move", "selection": {"root": "~/Downloads", "extensions": [".pdf"], "recursive": false},
+     "destination": "~/Documents", "conflict": "rename", "dry_run": false}
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        preview = max(0, int(data.get('preview', 100)))
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': "'preview' must be a whole number, sir."}), 400
+    try:
+        job = bulk_operations.prepare(
+            data.get('operation'), data.get('selection') or {}, data.get('destination'),
+            rename_template=data.get('rename_template'), conflict=data.get('conflict', 'rename'),
+            permanent=bool(data.get('permanent', False)))
+    except (KeyError, ValueError) as e:
+        return jsonify({'status': 'error', 'message': f"Invalid bulk operation: {e}"}), 400
+    
+    if data.get('dry_run'):
+        return jsonify({
+            'status': 'success',
+            'plan': [op.to_dict() for op in job.ops[:preview]],
+            'skipped': [str(path) for path in job.skipped[:100]],
+            'total_files': job.total_files,
+            'total_bytes': job.total_bytes
+        })
+    bulk_operations.launch(job)
+    return jsonify({'status': 'success', 'job': job.summary()}), 202
+
+@app.route('/api/bulk-operations/<int:job_id>', methods=['GET'])
+def handle_bulk_operation_status(job_id):
+    job = bulk_operations.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+    return jsonify({'status': 'success', 'job': job.summary()})
+
+@app.route('/api/bulk-operations/<int:job_id>/events', methods=['GET'])
+def handle_bulk_operation_events(job_id):
+    """Progress as Server-Sent Events until the job finishes; ?since=N resumes after event N"""
+    job = bulk_operations.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+    
+    since = request.args.get('since', 0, type=int)
+    
+    def generate():
+        for event in job.stream(since=since):
+            if event is None:
+                yield ': keep-alive\n\n'
+            else:
+                yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.route('/api/bulk-operations/<int:job_id>/cancel', methods=['POST'])
+def handle_bulk_operation_cancel(job_id):
+    job = bulk_operations.cancel(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Job not found'}), 404
+    return jsonify({'status': 'success', 'message': f"Cancelling job {job_id}", 'job': job.summary()})
+
+@app.route('/api/operations', methods=['GET'])
+def handle_operations():
+    """Recent file operations from the journal, newest first"""
+    limit = min(request.args.get('limit', 20, type=int), 200)
+    return jsonify({
+        'status': 'success',
+        'operations': operation_journal.history(limit),
+        'undoable': operation_journal.undoable_count(),
+        'stats': operation_journal.stats
+    })
+
+@app.route('/api/operations/undo', methods=['POST'])
+def handle_operations_undo():
+    """Undo the last N operations: {"count": 1}"""
+    data = request.get_json(silent=True) or {}
+    try:
+        count = max(1, int(data.get('count', 1)))
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': "'count' must be a whole number, sir."}), 400
+    results = operation_journal.undo(count)
+    return jsonify({
+        'status': 'success' if results and all(error is None for _, error in results) else 'error',
+        'message': summarize_undo(results),
+        'undone': [{**entry.to_dict(), 'error': error} for entry, error in results]
+    })
+
+@app.route('/api/operations/restore', methods=['POST'])
+def handle_operations_restore():
+    """Restore a trashed item by journal seq or original name: {"seq": 12} or {"name": "report.pdf"}"""
+    data = request.get_json(silent=True) or {}
+    entry = data.get('seq')
+    if entry is not None:
+        try:
+            entry = int(entry)
+        except (TypeError, ValueError):
+            return jsonify({'status': 'error', 'message': "'seq' must be a whole number, sir."}), 400
+    else:
+        matches = operation_journal.find_deleted(data.get('name', ''), limit=1) if data.get('name') else []
+        if not matches:
+            return jsonify({'status': 'error', 'message': 'Nothing in the trash by that name'}), 404
+        entry = matches[0]
+    try:
+        restored = operation_journal.restore(entry, data.get('destination'))
+    except UndoError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    return jsonify({'status': 'success', 'message': f"Restored to {restored}", 'path': restored})
+
+@app.route('/api/trash', methods=['GET'])
+def handle_trash():
+    """Trashed items, newest first: ?q=report finds by original name, ?path= by original location"""
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    if not isinstance(trash_store, FreeDesktopTrash):
+        return jsonify({'status': 'error', 'message': 'Trash listing is only available for FreeDesktop trash'}), 501
+    if request.args.get('q'):
+        items = trash_store.find(request.args['q'], limit)
+    elif request.args.get('path'):
+        items = trash_store.find_path(request.args['path'])[:limit]
+    else:
+        items = trash_store.items(limit, since=request.args.get('since', type=float))
+    return jsonify({'status': 'success', 'items': [item.to_dict() for item in items], 'total': len(trash_store)})
+
+@app.route('/api/templates', methods=['GET'])
+def handle_templates():
+    """File templates by extension, with the variables each one uses"""
+    return jsonify({
+        'status': 'success',
+        'templates': {name: sorted(t.variables) for name, t in template_engine.templates.items()},
+        'directories': [str(d) for d in template_engine.template_dirs]
+    })
+
+@app.route('/api/files/batch-create', methods=['POST'])
+def handle_batch_create():
+    """Create many files from templates: {"directory": "~/Desktop", "files": ["a.md", "b.pdf"], "variables": {}}"""
+    data = request.get_json(silent=True) or {}
+    files = data.get('files') or []
+    if not files or any(os.sep in name or name in ('.', '..') for name in files):
+        return jsonify({'status': 'error', 'message': 'Give a list of plain file names in "files"'}), 400
+    directory = os.path.expanduser(data.get('directory') or '~/Desktop')
+    results = template_engine.create_many(directory, files, data.get('variables'))
+    batch = f"create-{int(time.time() * 1000)}"
+    for result in results:
+        if result['success']:
+            operation_journal.record('create', result['path'], kind='file', batch=batch)
+    return jsonify({'status': 'success' if all(r['success'] for r in results) else 'partial', 'files': results})
+
+@app.route('/api/files/list', methods=['GET'])
+def handle_list_directory():
+    """
+    One page of a directory: ?path=~/Downloads&sort=name|size|modified|type&order=asc|desc
+    &limit=100&hidden=1, then &cursor=<next_cursor> for the following page
+    """
+    try:
+        page = directory_browser.list(
+            request.args.get('path', '~'),
+            sort=request.args.get('sort', 'name'),
+            reverse=request.args.get('order', 'asc') == 'desc',
+            limit=request.args.get('limit', 100, type=int),
+            cursor=request.args.get('cursor'),
+            show_hidden=request.args.get('hidden') in ('1', 'true'),
+            folders_first=request.args.get('folders_first', '1') not in ('0', 'false'))
+    except (FileNotFoundError, NotADirectoryError) as e:
+        return jsonify({'status': 'error', 'message': f"Not a directory: {e}"}), 404
+    except PermissionError as e:
+        return jsonify({'status': 'error', 'message': f"Permission denied: {e}"}), 403
+    except InvalidCursor as e:
+        return jsonify({'status': 'error', 'message': f"{e}; start again without a cursor"}), 400
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    return jsonify({'status': 'success', **page})
+
+@app.route('/api/disk-usage', methods=['GET'])
+def handle_disk_usage():
+    """
+    Size of ?path= (default home) with its largest folders and files, from the tree cache.
+    Scans run in the background: a folder not measured yet answers 202 until it is;
+    ?refresh=1 starts a rescan (only changed directories are listed), ?full=1 relists everything
+    """
+    path = os.path.abspath(os.path.expanduser(request.args.get('path', '~')))
+    limit = max(1, min(request.args.get('limit', 10, type=int), 20))
+    if not os.path.isdir(path):
+        return jsonify({'status': 'error', 'message': f"Not a directory: {path}"}), 404
+    full = request.args.get('full') in ('1', 'true')
+    if full or request.args.get('refresh') in ('1', 'true') or not disk_usage.covered(path):
+        if not disk_usage.scanning:
+            disk_usage.start(path, full=full)
+        if not disk_usage.covered(path):
+            return jsonify({'status': 'scanning', 'message': 'Still measuring that folder, sir.'}), 202
+    return jsonify({'status': 'success', **disk_usage.summary(path, limit), 'stats': disk_usage.stats,
+                    'scanning': disk_usage.scanning})
+
+@app.route('/api/files/duplicates', methods=['GET'])
+def handle_find_duplicates():
+    """
+    Groups of identical files under ?path= (repeatable; default Desktop, Documents, Downloads, Pictures).
+    The scan runs in the background: 202 until it finishes, then the results; ?refresh=1 rescans
+    """
+    roots = request.args.getlist('path') or None
+    min_size = max(request.args.get('min_size', 1, type=int), 1)
+    limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+    groups = None if request.args.get('refresh') in ('1', 'true') else duplicate_finder.results_for(roots, min_size)
+    if groups is None or duplicate_finder.scanning:
+        if not duplicate_finder.scanning:
+            duplicate_finder.start(roots, min_size)
+        return jsonify({'status': 'scanning', 'message': 'Comparing files, sir. Ask again in a moment.'}), 202
+    return jsonify({
+        'status': 'success',
+        'groups': [group.to_dict() for group in groups[:limit]],
+        'count': len(groups),
+        'reclaimable': sum(group.reclaimable for group in groups),
+        'stats': duplicate_finder.stats,
+    })
+
+@app.route('/api/files/duplicates/trash', methods=['POST'])
+def handle_trash_duplicates():
+    """
+    Move duplicates from the last scan to the trash as one undoable batch: every extra
+    copy, or just {"paths": [...]} - the last remaining copy of a file is never removed
+    """
+    data = request.get_json(silent=True) or {}
+    paths = data.get('paths')
+    if paths is not None and not isinstance(paths, list):
+        return jsonify({'status': 'error', 'message': "'paths' must be a list, sir."}), 400
+    if not duplicate_finder.last_groups:
+        return jsonify({'status': 'error', 'message': 'Please scan for duplicates first, sir.'}), 409
+    result = duplicate_finder.trash_duplicates(paths=paths)
+    return jsonify({
+        'status': 'success' if result['trashed'] or not result['errors'] else 'error',
+        'message': f"Moved {len(result['trashed'])} duplicate file(s) to the trash, sir.",
+        'trashed': result['trashed'],
+        'bytes': result['bytes'],
+        'errors': [{'path': path, 'error': error} for path, error in result['errors']],
+    })
+
+@app.route('/api/search/content', methods=['GET'])
+def handle_content_search():
+    """Documents containing every word of ?q=, best first, with a snippet around the match"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'status': 'error', 'message': 'Please provide a search query with ?q=, sir.'}), 400
+    if not content_index.ready.is_set():
+        content_index.start()
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    return jsonify({
+        'status': 'success',
+        'query': query,
+        'results': content_index.search(query, limit),
+        'indexed_files': len(content_index),
+        'building': content_index.building,
+    })
+
+@app.route('/api/search/content/reindex', methods=['POST'])
+def handle_content_reindex():
+    """Rescan the indexed folders now instead of waiting for the next periodic update"""
+    content_index.start()
+    return jsonify({'status': 'success', 'message': 'Updating the document index, sir.', **content_index.stats})
+
+@app.route('/api/processes', methods=['GET'])
+def handle_processes():
+    """Apps and openers launched by JARVIS, with exit status once reaped"""
+    limit = min(request.args.get('limit', 50, type=int), 100)
+    return jsonify({'status': 'success', **spawn_service.processes(limit)})
+
 @app.route('/api/system-status', methods=['GET'])
 def handle_system_status():
     permissions = test_system_permissions()
@@ -2557,14 +2831,20 @@ def handle_system_status():
         'file_ops_available': FILE_OPS_AVAILABLE,
         'translation_available': TRANSLATION_AVAILABLE,
         'tts_available': TTS_AVAILABLE,
-        'cv2_available': CV2_AVAILABLE
+        'cv2_available': CV2_AVAILABLE,
+        'camera': camera_manager.status() if CV2_AVAILABLE else None,
+        'metrics': {
+            'latest': metrics_sampler.latest(),
+            'windows': metrics_sampler.summaries()
+        }
     })
 
 @app.route('/api/capture-photo', methods=['POST'])
 def handle_photo_capture():
     """Handle photo capture requests"""
     try:
-        result = capture_photo()
+        data = request.get_json(silent=True) or {}
+        result = capture_photo(data.get('format'), data.get('quality'), bool(data.get('thumbnail')))
         return jsonify({
             'status': 'success',
             'message': result
@@ -2579,7 +2859,9 @@ def handle_photo_capture():
 def handle_screenshot():
     """Handle screenshot requests"""
     try:
-        result = take_screenshot()
+        data = request.get_json(silent=True) or {}
+        result = take_screenshot(data.get('format'), data.get('quality'), bool(data.get('thumbnail')),
+                                 region=data.get('region'), monitor=data.get('monitor'), window=data.get('window'))
         return jsonify({
             'status': 'success',
             'message': result
@@ -2590,6 +2872,168 @@ def handle_screenshot():
             'message': f"Screenshot failed: {str(e)}"
         })
 
+@app.route('/api/screen-recording', methods=['POST'])
+def handle_screen_recording():
+    """Start, stop or inspect the delta screen recorder"""
+    if not SCREEN_CAPTURE_AVAILABLE:
+        return jsonify({'status': 'error', 'message': 'Screen recording not available'}), 503
+    
+    data = request.get_json(silent=True) or {}
+    action = data.get('action', 'status')
+    if action == 'start':
+        try:
+            interval = float(data.get('interval', 1.0))
+            tile_size = int(data.get('tile_size', 64))
+        except (TypeError, ValueError):
+            return jsonify({'status': 'error', 'message': "'interval' and 'tile_size' must be numbers, sir."}), 400
+        if not interval > 0 or tile_size < 8:
+            return jsonify({'status': 'error',
+                            'message': "'interval' must be positive and 'tile_size' at least 8, sir."}), 400
+        message = start_screen_recording(
+            interval=interval, tile_size=tile_size,
+            region=data.get('region'), monitor=data.get('monitor'), window=data.get('window'))
+    elif action == 'stop':
+        message = stop_screen_recording()
+    elif action == 'status':
+        message = None
+    else:
+        return jsonify({'status': 'error', 'message': f"Unknown action '{action}'"}), 400
+    
+    return jsonify({
+        'status': 'success',
+        'message': message,
+        'recording': screen_recorder.status(),
+        'monitors': list_monitors()
+    })
+
+def _cache_metrics():
+    """Hit/miss counters kept by other modules, read at scrape time"""
+    hits, misses = [], []
+    if FEATURE_EXTRACTION_AVAILABLE:
+        hits.append(({'cache': 'audio_features'}, feature_extractor.stats['hits']))
+        misses.append(({'cache': 'audio_features'}, feature_extractor.stats['misses']))
+    if CV2_AVAILABLE:
+        # A camera "hit" is a photo served from a fresh frame without waiting
+        hits.append(({'cache': 'camera_frame'}, camera_manager.stats['instant_hits']))
+        misses.append(({'cache': 'camera_frame'}, camera_manager.stats['waits']))
+    return [
+        ('jarvis_cache_hits', 'counter', 'Cache hits by cache', hits),
+        ('jarvis_cache_misses', 'counter', 'Cache misses by cache', misses),
+        ('jarvis_image_jobs_pending', 'gauge', 'Images waiting to be encoded', [({}, image_writer.pending)]),
+    ]
+
+metrics_registry.register_collector(_cache_metrics)
+
+@app.route('/metrics', methods=['GET'])
+def handle_metrics():
+    """Prometheus text exposition of JARVIS internals"""
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/api/debug/traces', methods=['GET'])
+def handle_debug_traces():
+    """Recent sampled command traces as JSON, or ?format=chrome for chrome://tracing / Perfetto"""
+    # Traces carry the text of recent commands, so they get the same check as the profiler
+    if not _is_admin_request():
+        return jsonify({'status': 'error', 'message': 'Forbidden'}), 403
+    limit = request.args.get('limit', 50, type=int)
+    min_duration_ms = request.args.get('min_ms', 0, type=float)
+    if request.args.get('format') == 'chrome':
+        return jsonify(tracer.export_chrome(limit, min_duration_ms))
+    return jsonify({
+        'sample_rate': tracer.sample_rate,
+        'stats': tracer.stats,
+        'traces': tracer.export_json(limit, min_duration_ms)
+    })
+
+def _is_admin_request():
+    """Admin endpoints answer local requests only, plus the admin token when one is configured"""
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        return False
+    admin_token = os.environ.get('JARVIS_ADMIN_TOKEN')
+    return not admin_token or request.headers.get('X-Jarvis-Admin-Token') == admin_token
+
+@app.route('/api/admin/profiler', methods=['GET', 'POST'])
+def handle_profiler():
+    """
+    POST {"action": "start", "seconds": 10, "interval": 0.005} starts sampling
+    (add "wait": true to block and get the stacks back), {"action": "stop"} ends it.
+    GET returns collapsed stacks as text, or ?format=json for status and top functions.
+    """
+    if not _is_admin_request():
+        return jsonify({'status': 'error', 'message': 'Forbidden'}), 403
+    
+    if request.method == 'GET':
+        if request.args.get('format') == 'json':
+            return jsonify({'status': profiler.status(), 'top_functions': profiler.top_functions()})
+        return Response(profiler.collapsed(request.args.get('min_count', 1, type=int)), mimetype='text/plain')
+    
+    data = request.get_json(silent=True) or {}
+    action = data.get('action', 'start')
+    if action == 'stop':
+        profiler.stop()
+        return jsonify({'status': 'success', 'profiler': profiler.status()})
+    if action != 'start':
+        return jsonify({'status': 'error', 'message': f"Unknown action '{action}'"}), 400
+    
+    try:
+        seconds = float(data.get('seconds', 10))
+        interval = float(data.get('interval', 0.005))
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': "'seconds' and 'interval' must be numbers"}), 400
+    started = profiler.start(duration=seconds, interval=interval,
+                             include_lines=bool(data.get('include_lines')),
+                             thread_prefix=data.get('thread_prefix'))
+    if not started:
+        return jsonify({'status': 'error', 'message': 'Profiler already running', 'profiler': profiler.status()}), 409
+    if data.get('wait'):
+        profiler.wait()
+        return Response(profiler.collapsed(), mimetype='text/plain')
+    return jsonify({'status': 'success', 'profiler': profiler.status()})
+
+@app.route('/api/reminders', methods=['GET', 'POST'])
+def handle_reminders():
+    """
+    GET lists pending timers/reminders. POST actions:
+    {"action": "create", "message": "...", "delay_seconds": 600 | "at": epoch, "repeat_seconds": 3600, "kind": "reminder"}
+    {"action": "cancel", "id": 3}, {"action": "snooze", "id": 3, "minutes": 10}
+    """
+    if request.method == 'GET':
+        return jsonify({
+            'pending': [task.to_dict() for task in scheduler.pending(limit=request.args.get('limit', 100, type=int))],
+            'count': len(scheduler),
+            'stats': scheduler.stats
+        })
+    
+    data = request.get_json(silent=True) or {}
+    action = data.get('action', 'create')
+    try:
+        if action == 'create':
+            if not data.get('message'):
+                return jsonify({'status': 'error', 'message': 'message is required'}), 400
+            task = scheduler.add(data['message'], delay=data.get('delay_seconds'), at=data.get('at'),
+                                 kind=data.get('kind', 'reminder'), repeat=data.get('repeat_seconds'))
+        elif action == 'cancel':
+            task = scheduler.cancel(int(data.get('id', 0)))
+        elif action == 'snooze':
+            task = scheduler.snooze(int(data.get('id', 0)), float(data.get('minutes', 10)) * 60)
+        else:
+            return jsonify({'status': 'error', 'message': f"Unknown action '{action}'"}), 400
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    if task is None:
+        return jsonify({'status': 'error', 'message': 'Timer or reminder not found'}), 404
+    return jsonify({'status': 'success', 'task': task.to_dict()})
+
+@app.route('/api/image-jobs', methods=['GET'])
+def handle_image_jobs():
+    """Recent photo/screenshot saves with encode time and file size"""
+    limit = request.args.get('limit', 10, type=int)
+    return jsonify({
+        'pending': image_writer.pending,
+        'recent': image_writer.recent_reports(limit)
+    })
+
 @app.route('/api/ai-query', methods=['POST'])
 def api_ai_query():
     """API endpoint for AI-powered queries"""
@@ -2625,11 +3069,13 @@ def api_ai_query():
 def api_song_recognition():
     """API endpoint for song recognition"""
     try:
-        data = request.json
+        data = request.get_json(silent=True) or request.form
         action = data.get('action', '')
         lyrics = data.get('lyrics', '')
         
-        if not AUDIO_PROCESSING_AVAILABLE:
+        # Recording needs the microphone stack; lyrics and uploaded clips don't
+        needs_microphone = action == 'start_recording' or (action == 'recognize_audio' and 'audio' not in request.files)
+        if needs_microphone and not AUDIO_PROCESSING_AVAILABLE:
             return jsonify({
                 'status': 'error',
                 'message': 'Audio processing not available. Please install required libraries.'
@@ -2639,13 +3085,19 @@ def api_song_recognition():
             song_title, song_info = song_recognizer.recognize_song_from_lyrics(lyrics)
             
             if song_title and song_info:
-                return jsonify({
+                response = {
                     'status': 'success',
                     'song_title': song_title,
                     'artist': song_info['artist'],
                     'youtube_search': song_info['youtube_search'],
                     'message': f"Found: {song_title} by {song_info['artist']}"
-                })
+                }
+                if LYRICS_INDEX_AVAILABLE:
+                    response['alternatives'] = [
+                        {'song_title': match['title'], 'artist': match['artist'], 'score': match['score']}
+                        for match in lyrics_index.search(lyrics, limit=5)[1:]
+                    ]
+                return jsonify(response)
             else:
                 return jsonify({
                     'status': 'not_found',
@@ -2653,6 +3105,50 @@ def api_song_recognition():
                     'youtube_search': f"https://www.youtube.com/results?search_query={lyrics.replace(' ', '+')}"
                 })
         
+        elif action == 'recognize_audio':
+            if not FINGERPRINTING_AVAILABLE:
+                return jsonify({
+                    'status': 'error',
+                    'message': 'Audio fingerprinting not available'
+                })
+            
+            # Use an uploaded clip if provided, otherwise record from the microphone
+            upload = request.files.get('audio')
+            if upload:
+                import tempfile
+                suffix = Path(upload.filename or 'clip.wav').suffix or '.wav'
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+                    upload.save(tmp)
+                try:
+                    audio_data = load_audio(tmp.name)
+                finally:
+                    os.unlink(tmp.name)
+                match = recognize_clip(audio_data)
+            else:
+                duration = min(float(data.get('duration', 10)), 15)
+                audio_data, status = song_recognizer.record_audio(duration=duration)
+                if audio_data is None:
+                    return jsonify({'status': 'error', 'message': status})
+                match = song_recognizer.recognize_song_from_audio(audio_data)
+            
+            if match:
+                return jsonify({
+                    'status': 'success',
+                    'song_title': match['song_title'],
+                    'artist': match['song_info']['artist'],
+                    'youtube_search': match['song_info']['youtube_search'],
+                    'confidence': match['confidence'],
+                    'offset_seconds': match['offset_seconds'],
+                    'match_time_ms': match['match_time_ms'],
+                    'message': f"Found: {match['song_title']} by {match['song_info']['artist']}"
+                })
+            return jsonify({
+                'status': 'not_found',
+                'message': 'No matching song in the fingerprint library',
+                'library_size': len(fingerprint_index),
+                'indexing': fingerprint_index.building
+            })
+        
         elif action == 'start_recording':
             return jsonify({
                 'status': 'success',
@@ -2701,5 +3197,17 @@ def test_file_operation():
         })
 
 if __name__ == '__main__':
+    if SERVING_PROCESS:
+        # Start sampling right away so the first status request already has history
+        metrics_sampler.start()
+        # Load the PDF/Word libraries now rather than on the first 'create file'
+        template_engine.warm()
+        # Index document contents in the background; unchanged files come from the text cache
+        content_index.start()
+        # Measure the home folder so 'what's taking space' is answered from the tree cache
+        disk_usage.start()
+        # Load the song fingerprints and pick up tracks added to the library since last run
+        if FINGERPRINTING_AVAILABLE:
+            fingerprint_index.ensure_loaded()
     # Bind to localhost on port 8888 explicitly
-    app.run(host='127.0.0.1', port=8888, debug=True)
+    app.run(host='127.0.0.1', port=8888, debug=DEBUG)
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Application Registry for JARVIS AI Assistant
+Resolves installed applications once - PATH executables, Linux .desktop files,
+macOS .app bundles and Windows Start Menu shortcuts - into a searchable index
+that is rebuilt only when PATH or an application directory changes
+"""
+
+import os
+import platform
+import re
+import shlex
+import time
+from bisect import bisect_left
+from pathlib import Path
+from threading import RLock
+
+from spawn_service import spawn_service
+
+CHECK_INTERVAL = 2.0   # seconds between checks of PATH and directory mtimes
+MAX_RESOLVED = 1000    # cached name lookups, including misses
+
+# Exec= field codes from the Desktop Entry spec; the app is launched without arguments
+_FIELD_CODE_RE = re.compile(r'%[fFuUdDnNickvm]')
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def _key(name):
+    return ' '.join(name.lower().replace('_', ' ').split())
+
+
+def _default_app_dirs(system):
+    home = Path.home()
+    if system == 'Linux':
+        data_home = os.environ.get('XDG_DATA_HOME') or str(home / '.local' / 'share')
+        data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+        dirs = [data_home, *data_dirs.split(':'),
+                str(home / '.local/share/flatpak/exports/share'), '/var/lib/flatpak/exports/share']
+        return [Path(d) / 'applications' for d in dirs if d]
+    if system == 'Darwin':
+        return [Path('/Applications'), Path('/Applications/Utilities'), Path('/System/Applications'),
+                Path('/System/Applications/Utilities'), home / 'Applications']
+    if system == 'Windows':
+        start_menu = Path('Microsoft') / 'Windows' / 'Start Menu' / 'Programs'
+        return [Path(os.environ[var]) / start_menu for var in ('ProgramData', 'APPDATA') if os.environ.get(var)]
+    return []
+
+
+def parse_desktop_file(path):
+    """The [Desktop Entry] group of a .desktop file as a dict, or None if unreadable"""
+    entry = {}
+    in_group = False
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith('['):
+                    if in_group:
+                        break
+                    in_group = line == '[Desktop Entry]'
+                    continue
+                if in_group and '=' in line:
+                    key, value = line.split('=', 1)
+                    entry[key.strip()] = value.strip()
+    except OSError:
+        return None
+    return entry
+
+
+def desktop_exec_argv(exec_line):
+    """Exec= value to an argv list, with field codes removed"""
+    try:
+        argv = shlex.split(exec_line.replace('%%', '\0'))
+    except ValueError:
+        return None
+    argv = [_FIELD_CODE_RE.sub('', arg).replace('\0', '%') for arg in argv]
+    return [arg for arg in argv if arg] or None
+
+
+class AppEntry:
+    __slots__ = ('name', 'display_name', 'command', 'source', 'keywords')
+
+    def __init__(self, name, display_name, command, source, keywords=()):
+        self.name = name
+        self.display_name = display_name
+        self.command = command
+        self.source = source
+        self.keywords = tuple(keywords)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'display_name': self.display_name,
+            'command': self.command,
+            'source': self.source,
+            'keywords': list(self.keywords),
+        }
+
+
+class AppRegistry:
+    def __init__(self, system=None, path=None, app_dirs=None, check_interval=CHECK_INTERVAL):
+        """
+        Args:
+            system: 'Linux', 'Darwin' or 'Windows'; defaults to the running OS
+            path: PATH to scan; defaults to the live environment variable on every check
+            app_dirs: .desktop / .app / Start Menu directories to scan
+        """
+        self.system = system or platform.system()
+        self._path = path
+        self.app_dirs = [Path(d) for d in app_dirs] if app_dirs is not None else _default_app_dirs(self.system)
+        self.check_interval = check_interval
+        self.aliases = {}
+        self._lock = RLock()
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._executables = {}
+        self._apps = {}
+        self._resolved = {}
+        self._tokens = []      # sorted (token, app key) pairs for prefix search
+        self.stats = {'scans': 0, 'hits': 0, 'misses': 0}
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    @property
+    def path(self):
+        return self._path if self._path is not None else os.environ.get('PATH', '')
+
+    def _path_dirs(self):
+        seen = set()
+        for directory in self.path.split(os.pathsep):
+            if directory and directory not in seen:
+                seen.add(directory)
+                yield directory
+
+    def _current_fingerprint(self):
+        mtimes = []
+        for directory in [*self._path_dirs(), *map(str, self.app_dirs)]:
+            try:
+                mtimes.append(os.stat(directory).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return self.path, tuple(mtimes)
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._fingerprint is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        fingerprint = self._current_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._scan()
+            self._fingerprint = fingerprint
+
+    def invalidate(self):
+        with self._lock:
+            self._fingerprint = None
+
+    def _scan(self):
+        executables = {}
+        if self.system == 'Windows':
+            extensions = [ext.lower() for ext in os.environ.get('PATHEXT', '.COM;.EXE;.BAT;.CMD').split(';') if ext]
+        for directory in self._path_dirs():
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        name = entry.name
+                        if self.system == 'Windows':
+                            stem, ext = os.path.splitext(name.lower())
+                            if ext not in extensions:
+                                continue
+                            executables.setdefault(stem, entry.path)
+                            executables.setdefault(name.lower(), entry.path)
+                        elif name not in executables:
+                            try:
+                                if entry.is_file() and os.access(entry.path, os.X_OK):
+                                    executables[name] = entry.path
+                            except OSError:
+                                continue
+            except OSError:
+                continue
+
+        apps = {}
+        for directory in self.app_dirs:
+            if self.system == 'Linux':
+                self._scan_desktop_files(directory, executables, apps)
+            elif self.system == 'Darwin':
+                self._scan_bundles(directory, apps)
+            elif self.system == 'Windows':
+                self._scan_shortcuts(directory, apps)
+
+        self._executables = executables
+        self._apps = apps
+        self._resolved = {}
+        self._tokens = sorted({(token, key) for key, app in apps.items()
+                               for text in (app.name, app.display_name, *app.keywords)
+                               for token in _TOKEN_RE.findall(text.lower())})
+        self.stats['scans'] += 1
+
+    def _scan_desktop_files(self, directory, executables, apps):
+        if not directory.is_dir():
+            return
+        for path in sorted(directory.rglob('*.desktop')):
+            entry = parse_desktop_file(path)
+            if not entry or entry.get('Type', 'Application') != 'Application':
+                continue
+            if entry.get('NoDisplay') == 'true' or entry.get('Hidden') == 'true':
+                continue
+            argv = desktop_exec_argv(entry.get('Exec', ''))
+            if not argv:
+                continue
+            try_exec = entry.get('TryExec')
+            if try_exec and not (os.path.isabs(try_exec) and os.access(try_exec, os.X_OK)) \
+                    and try_exec not in executables:
+                continue
+            display_name = entry.get('Name') or path.stem
+            keywords = [k for k in entry.get('Keywords', '').split(';') if k]
+            if entry.get('GenericName'):
+                keywords.append(entry['GenericName'])
+            key = _key(display_name)
+            # Earlier directories (the user's own) win, as in the spec
+            if key not in apps:
+                apps[key] = AppEntry(path.stem, display_name, argv, 'desktop', keywords)
+
+    def _scan_bundles(self, directory, apps):
+        try:
+            bundles = [p for p in directory.iterdir() if p.suffix == '.app']
+        except OSError:
+            return
+        for bundle in bundles:
+            key = _key(bundle.stem)
+            if key not in apps:
+                apps[key] = AppEntry(bundle.stem, bundle.stem, ['open', '-a', str(bundle)], 'bundle')
+
+    def _scan_shortcuts(self, directory, apps):
+        if not directory.is_dir():
+            return
+        for shortcut in directory.rglob('*.lnk'):
+            key = _key(shortcut.stem)
+            if key not in apps:
+                apps[key] = AppEntry(shortcut.stem, shortcut.stem, ['cmd', '/c', 'start', '', str(shortcut)],
+                                     'shortcut')
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def add_aliases(self, aliases):
+        """Spoken names mapped to candidate executables/paths, like app.APP_MAP"""
+        with self._lock:
+            for name, candidates in aliases.items():
+                self.aliases[_key(name)] = candidates if isinstance(candidates, list) else [candidates]
+            self._resolved = {}
+
+    def _resolve_candidate(self, candidate):
+        if self.system == 'Windows':
+            candidate = os.path.expandvars(candidate)
+            if os.path.isabs(candidate):
+                if os.path.exists(candidate):
+                    return [candidate]
+                candidate = os.path.basename(candidate)
+            path = self._executables.get(candidate.lower())
+            return [path] if path else None
+        if self.system == 'Darwin' and candidate.endswith('.app'):
+            return ['open', '-a', candidate] if os.path.exists(candidate) else None
+        if os.path.isabs(candidate):
+            return [candidate] if os.access(candidate, os.X_OK) else None
+        path = self._executables.get(candidate)
+        return [path] if path else None
+
+    def _resolve_uncached(self, key):
+        for candidate in self.aliases.get(key, ()):
+            command = self._resolve_candidate(candidate)
+            if command:
+                return AppEntry(key, key.title(), command, 'alias')
+        app = self._apps.get(key)
+        if app:
+            return app
+        command = self._resolve_candidate(key.replace(' ', '-'))
+        if command:
+            return AppEntry(key, key, command, 'path')
+        return None
+
+    def resolve(self, name):
+        """AppEntry for an exact app name, alias or executable - None if not installed"""
+        key = _key(name)
+        with self._lock:
+            self._ensure_fresh()
+            if key in self._resolved:
+                self.stats['hits'] += 1
+                return self._resolved[key]
+            self.stats['misses'] += 1
+            app = self._resolve_uncached(key)
+            if len(self._resolved) >= MAX_RESOLVED:
+                self._resolved.clear()
+            # Misses are cached too, so unknown names never cost a failed spawn
+            self._resolved[key] = app
+            return app
+
+    def search(self, query, limit=10):
+        """Installed apps whose name, display name or keywords start with every query word"""
+        words = _TOKEN_RE.findall(query.lower())
+        with self._lock:
+            self._ensure_fresh()
+            if not words:
+                return sorted(self._apps.values(), key=lambda a: a.display_name.lower())[:limit]
+            matches = None
+            for word in words:
+                keys = set()
+                i = bisect_left(self._tokens, (word, ''))
+                while i < len(self._tokens) and self._tokens[i][0].startswith(word):
+                    keys.add(self._tokens[i][1])
+                    i += 1
+                matches = keys if matches is None else matches & keys
+                if not matches:
+                    return []
+            query_key = _key(query)
+            ranked = sorted(matches, key=lambda k: (k != query_key, not k.startswith(query_key), len(k), k))
+            return [self._apps[k] for k in ranked[:limit]]
+
+    def find_in_command(self, command):
+        """
+        App named after 'open' in a spoken command - exact names only, longest first;
+        bare PATH tools are skipped so 'open file 1' never runs /usr/bin/file
+        """
+        match = re.search(r'\b(?:open|launch|start)\s+(?:the\s+)?(.+?)(?:\s+(?:app|application))?\s*$', command.lower())
+        if not match:
+            return None
+        words = match.group(1).split()
+        for end in range(len(words), 0, -1):
+            app = self.resolve(' '.join(words[:end]))
+            if app and app.source != 'path':
+                return app
+        return None
+
+    def launch(self, name_or_app):
+        """Start an app detached; a cached command whose binary vanished triggers one rescan"""
+        app = self.resolve(name_or_app) if isinstance(name_or_app, str) else name_or_app
+        if app is None:
+            return None
+        program = app.command[0]
+        if os.path.isabs(program) and not os.path.exists(program):
+            self.invalidate()
+            app = self.resolve(app.display_name)
+            if app is None:
+                return None
+        spawn_service.spawn(app.command)
+        return app
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_fresh()
+            return len(self._apps)
+
+# Global instance
+app_registry = AppRegistry()
+
+def find_app(name):
+    return app_registry.resolve(name)
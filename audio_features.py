@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Audio Feature Extraction for JARVIS AI Assistant
+Computes tempo, pitch, spectral and MFCC features from a single shared STFT,
+with batch processing across a process pool and a feature cache keyed by audio hash
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# librosa has a better beat tracker; everything else is derived with NumPy
+try:
+    import librosa
+    LIBROSA_AVAILABLE = True
+except ImportError:
+    LIBROSA_AVAILABLE = False
+
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+N_MFCC = 13
+PITCH_FMIN = 50.0
+PITCH_FMAX = 2000.0
+TEMPO_MIN_BPM = 60.0
+TEMPO_MAX_BPM = 200.0
+
+# Bump when the feature definitions change so old cache entries are ignored
+FEATURE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path.home() / '.jarvis' / 'features'
+
+
+@lru_cache(maxsize=8)
+def _hann_window(n_fft):
+    return np.hanning(n_fft + 1)[:-1].astype(np.float32)
+
+
+@lru_cache(maxsize=8)
+def mel_filterbank(sr, n_fft=N_FFT, n_mels=N_MELS):
+    """Triangular mel filters with shape (n_mels, n_fft // 2 + 1)"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    fft_freqs = np.fft.rfftfreq(n_fft, 1.0 / sr)
+    mel_points = mel_to_hz(np.linspace(hz_to_mel(0.0), hz_to_mel(sr / 2.0), n_mels + 2))
+
+    lower = mel_points[:-2, None]
+    center = mel_points[1:-1, None]
+    upper = mel_points[2:, None]
+    rising = (fft_freqs - lower) / (center - lower)
+    falling = (upper - fft_freqs) / (upper - center)
+    filters = np.maximum(0.0, np.minimum(rising, falling))
+
+    # Slaney-style area normalization
+    filters *= (2.0 / (mel_points[2:] - mel_points[:-2]))[:, None]
+    return filters.astype(np.float32)
+
+
+@lru_cache(maxsize=8)
+def _dct_matrix(n_mfcc, n_mels):
+    """Orthonormal DCT-II basis used to turn log-mel frames into MFCCs"""
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)[:, None]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2.0 * n_mels)) * np.sqrt(2.0 / n_mels)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+def audio_hash(audio_data, sr):
+    """Stable hash of the samples and extraction settings"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{FEATURE_VERSION}:{sr}:{N_FFT}:{HOP_LENGTH}:".encode())
+    digest.update(np.ascontiguousarray(audio_data, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+def file_hash(path, sr):
+    """Hash of the raw file bytes - avoids decoding audio just to check the cache"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{FEATURE_VERSION}:{sr}:{N_FFT}:{HOP_LENGTH}:".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _estimate_tempo(onset_envelope, sr):
+    """Tempo in BPM from the onset envelope"""
+    if LIBROSA_AVAILABLE:
+        tempo, _ = librosa.beat.beat_track(onset_envelope=onset_envelope, sr=sr, hop_length=HOP_LENGTH)
+        return float(np.atleast_1d(tempo)[0])
+
+    # Autocorrelation fallback: strongest periodicity in the allowed BPM range
+    envelope = onset_envelope - onset_envelope.mean()
+    if not np.any(envelope):
+        return 0.0
+    spectrum = np.fft.rfft(envelope, n=2 * len(envelope))
+    autocorr = np.fft.irfft(np.abs(spectrum) ** 2)[:len(envelope)]
+
+    frames_per_second = sr / float(HOP_LENGTH)
+    min_lag = max(1, int(frames_per_second * 60.0 / TEMPO_MAX_BPM))
+    max_lag = min(len(autocorr) - 1, int(frames_per_second * 60.0 / TEMPO_MIN_BPM))
+    if max_lag <= min_lag:
+        return 0.0
+    lags = np.arange(min_lag, max_lag + 1)
+    bpms = 60.0 * frames_per_second / lags
+    # Log-normal prior around 120 BPM to avoid half/double tempo picks
+    prior = np.exp(-0.5 * np.log2(bpms / 120.0) ** 2)
+    lag = lags[int(np.argmax(autocorr[min_lag:max_lag + 1] * prior))]
+    return float(60.0 * frames_per_second / lag)
+
+
+def _estimate_pitch(magnitude, sr):
+    """Mean dominant pitch over voiced frames, with parabolic peak interpolation"""
+    freqs = np.fft.rfftfreq(N_FFT, 1.0 / sr)
+    band = np.nonzero((freqs >= PITCH_FMIN) & (freqs <= PITCH_FMAX))[0]
+    if len(band) < 3:
+        return 0.0
+
+    band_mag = magnitude[band]
+    peak_idx = np.argmax(band_mag, axis=0)
+    peak_mag = band_mag[peak_idx, np.arange(band_mag.shape[1])]
+    voiced = peak_mag > 0.1 * peak_mag.max() if peak_mag.size and peak_mag.max() > 0 else np.zeros(0, dtype=bool)
+    if not np.any(voiced):
+        return 0.0
+
+    idx = np.clip(peak_idx[voiced], 1, len(band) - 2)
+    cols = np.nonzero(voiced)[0]
+    alpha = band_mag[idx - 1, cols]
+    beta = band_mag[idx, cols]
+    gamma = band_mag[idx + 1, cols]
+    denom = alpha - 2 * beta + gamma
+    shift = np.where(np.abs(denom) > 1e-12, 0.5 * (alpha - gamma) / np.where(denom == 0, 1, denom), 0.0)
+    bin_width = freqs[1] - freqs[0]
+    return float(np.mean(freqs[band[idx]] + shift * bin_width))
+
+
+def compute_features(audio_data, sr):
+    """
+    Extract every feature from one framing + STFT pass
+    Returns tempo, avg_pitch, spectral_centroid, zcr and mfccs (13 means)
+    """
+    y = np.asarray(audio_data, dtype=np.float32)
+    if y.ndim > 1:
+        y = y.mean(axis=1)
+
+    # Centered frames, like librosa's default STFT
+    y = np.pad(y, N_FFT // 2, mode='reflect' if len(y) > N_FFT // 2 else 'constant')
+    frames = sliding_window_view(y, N_FFT)[::HOP_LENGTH]
+
+    # The one STFT everything below is derived from - shape (freq bins, frames)
+    magnitude = np.abs(np.fft.rfft(frames * _hann_window(N_FFT), axis=1)).T
+    power = magnitude ** 2
+
+    mel = mel_filterbank(sr) @ power
+    log_mel = 10.0 * np.log10(np.maximum(mel, 1e-10))
+    log_mel = np.maximum(log_mel, log_mel.max() - 80.0)
+
+    mfccs = _dct_matrix(N_MFCC, N_MELS) @ log_mel
+
+    freqs = np.fft.rfftfreq(N_FFT, 1.0 / sr)[:, None]
+    mag_sum = magnitude.sum(axis=0)
+    centroid = np.where(mag_sum > 0, (freqs * magnitude).sum(axis=0) / np.where(mag_sum == 0, 1, mag_sum), 0.0)
+
+    # Zero crossings come from the same frames as the STFT
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+    onset_envelope = np.maximum(0.0, np.diff(log_mel, axis=1)).mean(axis=0)
+
+    return {
+        'tempo': _estimate_tempo(onset_envelope, sr) if len(onset_envelope) > 1 else 0.0,
+        'avg_pitch': _estimate_pitch(magnitude, sr),
+        'spectral_centroid': float(np.mean(centroid)),
+        'zcr': float(np.mean(zcr)),
+        'mfccs': np.mean(mfccs, axis=1),
+    }
+
+
+def _extract_file_worker(path, sr):
+    """Process pool worker - decodes and extracts one file"""
+    from audio_fingerprint import load_audio
+    return compute_features(load_audio(path, target_sr=sr), sr)
+
+
+def _to_json(features):
+    data = dict(features)
+    data['mfccs'] = [float(v) for v in features['mfccs']]
+    return data
+
+
+def _from_json(data):
+    features = dict(data)
+    features['mfccs'] = np.asarray(data['mfccs'], dtype=np.float32)
+    return features
+
+
+class AudioFeatureExtractor:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, memory_cache_size=256):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory_cache_size = memory_cache_size
+        self._memory_cache = OrderedDict()
+        self._lock = Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def _cache_get(self, key):
+        with self._lock:
+            if key in self._memory_cache:
+                self._memory_cache.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._memory_cache[key]
+
+        if self.cache_dir:
+            cache_file = self.cache_dir / f"{key}.json"
+            try:
+                features = _from_json(json.loads(cache_file.read_text()))
+                self._remember(key, features)
+                with self._lock:
+                    self.stats['hits'] += 1
+                return features
+            except (OSError, ValueError, KeyError):
+                pass
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+
+    def _remember(self, key, features):
+        with self._lock:
+            self._memory_cache[key] = features
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+
+    def _cache_put(self, key, features):
+        self._remember(key, features)
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_dir / f"{key}.json.tmp"
+                tmp_file.write_text(json.dumps(_to_json(features)))
+                os.replace(tmp_file, self.cache_dir / f"{key}.json")
+            except OSError as e:
+                print(f"Feature cache write error: {e}")
+
+    def extract(self, audio_data, sr):
+        """Extract features for an in-memory clip, using the cache when possible"""
+        key = audio_hash(audio_data, sr)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        features = compute_features(audio_data, sr)
+        self._cache_put(key, features)
+        return features
+
+    def extract_file(self, path, sr=22050):
+        """Extract features for an audio file, using the cache when possible"""
+        key = file_hash(path, sr)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        features = _extract_file_worker(str(path), sr)
+        self._cache_put(key, features)
+        return features
+
+    def extract_batch(self, paths, sr=22050, max_workers=None):
+        """
+        Extract features for many files across a process pool
+        Cached files are answered without decoding; returns {path: features or None}
+        """
+        results = {}
+        pending = {}
+
+        for path in paths:
+            path = str(path)
+            try:
+                key = file_hash(path, sr)
+            except OSError as e:
+                print(f"Feature extraction skipped {path}: {e}")
+                results[path] = None
+                continue
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[path] = cached
+            else:
+                pending[path] = key
+
+        if pending:
+            workers = max_workers or min(len(pending), os.cpu_count() or 1)
+            if workers <= 1 or len(pending) == 1:
+                outputs = {}
+                for path in pending:
+                    try:
+                        outputs[path] = _extract_file_worker(path, sr)
+                    except Exception as e:
+                        print(f"Feature extraction error for {path}: {e}")
+                        outputs[path] = None
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = {path: pool.submit(_extract_file_worker, path, sr) for path in pending}
+                    outputs = {}
+                    for path, future in futures.items():
+                        try:
+                            outputs[path] = future.result()
+                        except Exception as e:
+                            print(f"Feature extraction error for {path}: {e}")
+                            outputs[path] = None
+
+            for path, features in outputs.items():
+                if features is not None:
+                    self._cache_put(pending[path], features)
+                results[path] = features
+
+        return results
+
+# Global instance
+feature_extractor = AudioFeatureExtractor()
+
+def extract_audio_features(audio_data, sr):
+    return feature_extractor.extract(audio_data, sr)
+
+def extract_features_batch(paths, sr=22050, max_workers=None):
+    return feature_extractor.extract_batch(paths, sr, max_workers)
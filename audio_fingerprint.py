@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Audio Fingerprinting for JARVIS AI Assistant
+Constellation-style spectral peak hashing for recognizing songs from short clips
+"""
+
+import os
+import json
+import wave
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from threading import Thread, RLock, Lock
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Optional decoders for non-WAV reference tracks
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+try:
+    import librosa
+    LIBROSA_AVAILABLE = True
+except ImportError:
+    LIBROSA_AVAILABLE = False
+
+# Fingerprint parameters - index and queries must use the same values
+SAMPLE_RATE = 11025
+N_FFT = 1024
+HOP_LENGTH = 256
+PEAK_NEIGHBORHOOD_TIME = 11   # frames
+PEAK_NEIGHBORHOOD_FREQ = 15   # bins
+PEAKS_PER_SECOND = 30
+FAN_VALUE = 10
+MAX_TIME_DELTA = 200          # frames (~4.6 s)
+MIN_MATCH_COUNT = 8
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg', '.mp3', '.m4a', '.aiff')
+
+DEFAULT_LIBRARY_DIR = Path(os.getenv('JARVIS_SONG_LIBRARY', Path.home() / 'Music'))
+DEFAULT_INDEX_PATH = Path.home() / '.jarvis' / 'fingerprints.npz'
+RESCAN_INTERVAL = 300         # seconds before a query re-checks the library for new tracks
+POOL_MIN_FILES = 4            # fewer new tracks than this are fingerprinted in-process
+
+_WINDOW = np.hanning(N_FFT).astype(np.float32)
+
+
+def _to_mono_float(samples):
+    """Convert an audio array to mono float32 in [-1, 1]"""
+    samples = np.asarray(samples)
+    if samples.ndim > 1:
+        # (frames, channels) from soundfile/wave
+        samples = samples.mean(axis=1)
+    if np.issubdtype(samples.dtype, np.integer):
+        samples = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max)
+    return samples.astype(np.float32, copy=False)
+
+
+def resample(samples, orig_sr, target_sr=SAMPLE_RATE):
+    """Resample audio to the fingerprint sample rate"""
+    if orig_sr == target_sr:
+        return samples
+    if LIBROSA_AVAILABLE:
+        return librosa.resample(samples, orig_sr=orig_sr, target_sr=target_sr).astype(np.float32)
+
+    # Linear interpolation fallback - good enough for peak positions
+    duration = len(samples) / float(orig_sr)
+    target_len = int(duration * target_sr)
+    old_times = np.arange(len(samples)) / float(orig_sr)
+    new_times = np.arange(target_len) / float(target_sr)
+    return np.interp(new_times, old_times, samples).astype(np.float32)
+
+
+def load_audio(path, target_sr=SAMPLE_RATE):
+    """
+    Load an audio file as mono float32 samples at target_sr
+    WAV files are read with the standard library; other formats need soundfile or librosa
+    """
+    path = Path(path)
+
+    if path.suffix.lower() == '.wav':
+        with wave.open(str(path), 'rb') as wav_file:
+            channels = wav_file.getnchannels()
+            sample_width = wav_file.getsampwidth()
+            orig_sr = wav_file.getframerate()
+            raw = wav_file.readframes(wav_file.getnframes())
+
+        dtypes = {1: np.uint8, 2: np.int16, 4: np.int32}
+        if sample_width not in dtypes:
+            raise ValueError(f"Unsupported WAV sample width: {sample_width * 8} bits")
+
+        samples = np.frombuffer(raw, dtype=dtypes[sample_width])
+        if sample_width == 1:
+            # 8-bit WAV is unsigned
+            samples = (samples.astype(np.int16) - 128).astype(np.int8)
+        samples = samples.reshape(-1, channels)
+        return resample(_to_mono_float(samples), orig_sr, target_sr)
+
+    if SOUNDFILE_AVAILABLE:
+        try:
+            samples, orig_sr = sf.read(str(path), dtype='float32', always_2d=True)
+            return resample(_to_mono_float(samples), orig_sr, target_sr)
+        except Exception:
+            # soundfile can't decode mp3/m4a on older libsndfile - try librosa
+            pass
+
+    if LIBROSA_AVAILABLE:
+        samples, _ = librosa.load(str(path), sr=target_sr, mono=True)
+        return samples.astype(np.float32)
+
+    raise ValueError(f"Cannot decode {path.name} - install soundfile or librosa for non-WAV audio")
+
+
+def spectrogram(samples):
+    """Log-magnitude STFT with shape (frames, frequency bins)"""
+    if len(samples) < N_FFT:
+        samples = np.pad(samples, (0, N_FFT - len(samples)))
+    frames = sliding_window_view(samples, N_FFT)[::HOP_LENGTH]
+    magnitude = np.abs(np.fft.rfft(frames * _WINDOW, axis=1))
+    return np.log(magnitude + 1e-6).astype(np.float32)
+
+
+def _max_filter(values, size, axis):
+    """Sliding maximum along one axis, computed with shifted copies to keep memory O(n)"""
+    result = values.copy()
+    half = size // 2
+    length = values.shape[axis]
+    for shift in range(1, half + 1):
+        if shift >= length:
+            break
+        forward = [slice(None)] * values.ndim
+        backward = [slice(None)] * values.ndim
+        forward[axis] = slice(shift, None)
+        backward[axis] = slice(None, -shift)
+        # Compare each cell with its neighbour `shift` steps away on both sides
+        np.maximum(result[tuple(backward)], values[tuple(forward)], out=result[tuple(backward)])
+        np.maximum(result[tuple(forward)], values[tuple(backward)], out=result[tuple(forward)])
+    return result
+
+
+def find_peaks(spec):
+    """
+    Find constellation peaks in a spectrogram
+    Returns (frame_indices, frequency_bins) sorted by time
+    """
+    local_max = _max_filter(_max_filter(spec, PEAK_NEIGHBORHOOD_TIME, 0), PEAK_NEIGHBORHOOD_FREQ, 1)
+    is_peak = (spec == local_max) & (spec > spec.mean())
+    frames, bins = np.nonzero(is_peak)
+
+    # Keep peak density constant regardless of loudness by taking the strongest ones
+    duration = spec.shape[0] * HOP_LENGTH / float(SAMPLE_RATE)
+    max_peaks = max(1, int(duration * PEAKS_PER_SECOND))
+    if len(frames) > max_peaks:
+        strengths = spec[frames, bins]
+        keep = np.argpartition(strengths, -max_peaks)[-max_peaks:]
+        frames, bins = frames[keep], bins[keep]
+
+    order = np.lexsort((bins, frames))
+    return frames[order], bins[order]
+
+
+def compute_fingerprints(samples, sr=SAMPLE_RATE):
+    """
+    Compute constellation hashes for an audio clip
+    Each hash packs (anchor bin, target bin, frame delta) into a uint32
+    Returns (hashes, anchor_offsets) as numpy arrays
+    """
+    samples = _to_mono_float(samples)
+    if sr != SAMPLE_RATE:
+        samples = resample(samples, sr, SAMPLE_RATE)
+
+    frames, bins = find_peaks(spectrogram(samples))
+
+    hashes = []
+    offsets = []
+    for k in range(1, FAN_VALUE + 1):
+        if k >= len(frames):
+            break
+        delta = frames[k:] - frames[:-k]
+        valid = (delta > 0) & (delta <= MAX_TIME_DELTA)
+        anchor_bins = bins[:-k][valid].astype(np.uint32)
+        target_bins = bins[k:][valid].astype(np.uint32)
+        hashes.append((anchor_bins << 20) | (target_bins << 10) | delta[valid].astype(np.uint32))
+        offsets.append(frames[:-k][valid].astype(np.uint32))
+
+    if not hashes:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint32)
+    return np.concatenate(hashes), np.concatenate(offsets)
+
+
+def _track_metadata(path):
+    """Derive title/artist from 'Artist - Title.ext' style file names"""
+    stem = Path(path).stem
+    if ' - ' in stem:
+        artist, title = stem.split(' - ', 1)
+    else:
+        artist, title = 'Unknown Artist', stem
+    title = title.strip()
+    artist = artist.strip()
+    return {
+        'title': title.lower(),
+        'artist': artist,
+        'youtube_search': f"{artist} {title} official video" if artist != 'Unknown Artist' else f"{title} song",
+        'path': str(path),
+        'mtime_ns': Path(path).stat().st_mtime_ns,
+    }
+
+
+def _fingerprint_file(path):
+    """Process pool worker - decodes and fingerprints one reference track"""
+    samples = load_audio(path)
+    hashes, offsets = compute_fingerprints(samples, SAMPLE_RATE)
+    return hashes, offsets, round(len(samples) / float(SAMPLE_RATE), 2)
+
+
+def _fingerprint_files(paths, max_workers=None):
+    """(path, (hashes, offsets, duration) or the exception) for each path, in order"""
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1 or len(paths) < POOL_MIN_FILES:
+        for path in paths:
+            try:
+                yield path, _fingerprint_file(path)
+            except Exception as e:
+                yield path, e
+        return
+    # Decoding and the STFT are CPU bound, so a big library is spread across processes
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(path, pool.submit(_fingerprint_file, path)) for path in paths]
+        for path, future in futures:
+            try:
+                yield path, future.result()
+            except Exception as e:
+                yield path, e
+
+
+class FingerprintIndex:
+    def __init__(self, index_path=DEFAULT_INDEX_PATH, library_dir=DEFAULT_LIBRARY_DIR):
+        self.index_path = Path(index_path)
+        self.library_dir = Path(library_dir)
+        self.tracks = []
+        # Sorted, parallel arrays - searchsorted on hashes gives every (track, offset) for a hash
+        self.hashes = np.empty(0, dtype=np.uint32)
+        self.track_ids = np.empty(0, dtype=np.uint32)
+        self.offsets = np.empty(0, dtype=np.uint32)
+        self._pending = []
+        self._loaded = False
+        self._lock = RLock()            # guards the arrays, tracks and pending list
+        self._build_lock = Lock()       # one library scan at a time
+        self._build_thread = None
+        self._scanned_at = None
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def add_track(self, samples, sr=SAMPLE_RATE, metadata=None):
+        """Fingerprint a reference track and queue it for the index"""
+        hashes, offsets = compute_fingerprints(samples, sr)
+        return self._add_fingerprints(hashes, offsets, round(len(samples) / float(sr), 2), metadata)
+
+    def _add_fingerprints(self, hashes, offsets, duration, metadata=None):
+        info = dict(metadata or {})
+        info['duration'] = duration
+        info['hash_count'] = int(len(hashes))
+        with self._lock:
+            track_id = len(self.tracks)
+            info.setdefault('title', f"track {track_id}")
+            info.setdefault('artist', 'Unknown Artist')
+            info.setdefault('youtube_search', f"{info['artist']} {info['title']}")
+            self.tracks.append(info)
+            self._pending.append((hashes, np.full(len(hashes), track_id, dtype=np.uint32), offsets))
+        return track_id
+
+    def finalize(self):
+        """Merge queued tracks into the sorted arrays"""
+        with self._lock:
+            if not self._pending:
+                return
+            hashes = np.concatenate([self.hashes] + [p[0] for p in self._pending])
+            track_ids = np.concatenate([self.track_ids] + [p[1] for p in self._pending])
+            offsets = np.concatenate([self.offsets] + [p[2] for p in self._pending])
+            order = np.argsort(hashes, kind='stable')
+            # New arrays are swapped in whole, so a match holding the old ones is unaffected
+            self.hashes = hashes[order]
+            self.track_ids = track_ids[order]
+            self.offsets = offsets[order]
+            self._pending = []
+
+    def index_folder(self, folder=None, max_workers=None):
+        """
+        Fingerprint every audio file in a folder that isn't indexed yet, across a
+        process pool when there are several. Returns the number of newly added tracks
+        """
+        folder = Path(folder) if folder else self.library_dir
+        if not folder.exists():
+            return 0
+
+        with self._lock:
+            known_paths = {track.get('path') for track in self.tracks}
+        added = 0
+
+        new_paths = [path for path in self._library_files(folder) if str(path) not in known_paths]
+        for path, result in _fingerprint_files(new_paths, max_workers):
+            if isinstance(result, Exception):
+                print(f"🎵 Skipping {path.name}: {result}")
+                continue
+            hashes, offsets, duration = result
+            self._add_fingerprints(hashes, offsets, duration, _track_metadata(path))
+            added += 1
+
+        self.finalize()
+        print(f"🎵 Indexed {added} new track(s) from {folder}")
+        return added
+
+    @staticmethod
+    def _library_files(folder):
+        return [path for path in sorted(Path(folder).rglob('*'))
+                if path.suffix.lower() in AUDIO_EXTENSIONS and path.is_file()]
+
+    def _library_changed(self):
+        """True if an indexed track was removed or rewritten since it was fingerprinted"""
+        with self._lock:
+            tracks = [track for track in self.tracks if track.get('path')]
+        for track in tracks:
+            try:
+                mtime_ns = os.stat(track['path']).st_mtime_ns
+            except OSError:
+                return True
+            if track.get('mtime_ns') not in (None, mtime_ns):
+                return True
+        return False
+
+    def match(self, samples, sr=SAMPLE_RATE):
+        """
+        Identify a clip against the index
+        Returns a dict with the best track and its alignment, or None if nothing matches
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self.finalize()
+            index_hashes, index_track_ids, index_offsets = self.hashes, self.track_ids, self.offsets
+            tracks = self.tracks
+
+        query_hashes, query_offsets = compute_fingerprints(samples, sr)
+        if len(query_hashes) == 0 or len(index_hashes) == 0:
+            return None
+
+        left = np.searchsorted(index_hashes, query_hashes, side='left')
+        right = np.searchsorted(index_hashes, query_hashes, side='right')
+        counts = right - left
+        total = int(counts.sum())
+        if total == 0:
+            return None
+
+        # Expand each [left, right) range into explicit index positions
+        starts = np.repeat(left, counts)
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        positions = starts + (np.arange(total) - run_starts)
+
+        track_ids = index_track_ids[positions].astype(np.int64)
+        deltas = index_offsets[positions].astype(np.int64) - np.repeat(query_offsets, counts).astype(np.int64)
+
+        # A true match lines up many hashes at the same (track, time offset)
+        keys = (track_ids << 32) | (deltas + (1 << 31))
+        unique_keys, key_counts = np.unique(keys, return_counts=True)
+        best = int(np.argmax(key_counts))
+        match_count = int(key_counts[best])
+        if match_count < MIN_MATCH_COUNT:
+            return None
+
+        track_id = int(unique_keys[best] >> 32)
+        delta = int((unique_keys[best] & 0xFFFFFFFF) - (1 << 31))
+
+        # Confidence relative to the strongest competing track
+        other = key_counts[(unique_keys >> 32) != track_id]
+        runner_up = int(other.max()) if len(other) else 0
+
+        return {
+            'track_id': track_id,
+            'song_title': tracks[track_id]['title'],
+            'song_info': tracks[track_id],
+            'matched_hashes': match_count,
+            'query_hashes': int(len(query_hashes)),
+            'confidence': round(match_count / float(match_count + runner_up), 3),
+            'offset_seconds': round(delta * HOP_LENGTH / float(SAMPLE_RATE), 2),
+            'match_time_ms': round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    def save(self, path=None):
+        """Save the index as a compressed .npz file"""
+        with self._lock:
+            self.finalize()
+            hashes, track_ids, offsets = self.hashes, self.track_ids, self.offsets
+            tracks = json.dumps(self.tracks)
+        path = Path(path) if path else self.index_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(str(path), hashes=hashes, track_ids=track_ids, offsets=offsets,
+                            tracks=np.array(tracks))
+        return path
+
+    def load(self, path=None):
+        """Load a saved index, returning False if there is none"""
+        path = Path(path) if path else self.index_path
+        if not path.exists():
+            return False
+        with np.load(str(path)) as data:
+            hashes = data['hashes']
+            track_ids = data['track_ids']
+            offsets = data['offsets']
+            tracks = json.loads(str(data['tracks']))
+        with self._lock:
+            self.hashes, self.track_ids, self.offsets, self.tracks = hashes, track_ids, offsets, tracks
+            self._pending = []
+            self._loaded = True
+        return True
+
+    def ensure_loaded(self):
+        """
+        Load the saved index; the library folder is fingerprinted in the background,
+        so the first query never waits for it. Returns whether any tracks are indexed yet
+        """
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                try:
+                    self.load()
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"🎵 Fingerprint index unreadable, rebuilding: {e}")
+                self.start()
+            elif self._scanned_at is not None and time.monotonic() - self._scanned_at > RESCAN_INTERVAL:
+                self.start()
+            return len(self.tracks) > 0
+
+    def rebuild(self):
+        """
+        Bring the index in line with the library folder and save it: new files are
+        added, and a removed or rewritten file makes every track be fingerprinted again
+        Returns the number of tracks fingerprinted
+        """
+        with self._build_lock:
+            if self._library_changed():
+                fresh = FingerprintIndex(self.index_path, self.library_dir)
+                added = fresh.index_folder()
+                fresh.finalize()
+                with self._lock:
+                    self.hashes, self.track_ids, self.offsets = fresh.hashes, fresh.track_ids, fresh.offsets
+                    self.tracks = fresh.tracks
+                    self._pending = []
+                changed = True
+            else:
+                added = self.index_folder()
+                changed = added > 0
+            if changed:
+                self.save()
+            self._scanned_at = time.monotonic()
+        return added
+
+    def start(self):
+        """Rebuild in a background thread unless one is already running"""
+        with self._lock:
+            if self._build_thread is not None and self._build_thread.is_alive():
+                return self._build_thread
+            self._build_thread = Thread(target=self._run_rebuild, name='fingerprint-index', daemon=True)
+            self._build_thread.start()
+            return self._build_thread
+
+    def _run_rebuild(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            print(f"🎵 Fingerprint index rebuild failed: {e}")
+            self._scanned_at = time.monotonic()
+
+    @property
+    def building(self):
+        thread = self._build_thread
+        return thread is not None and thread.is_alive()
+
+# Global instance
+fingerprint_index = FingerprintIndex()
+
+def recognize_clip(samples, sr=SAMPLE_RATE):
+    """Match a recorded clip against the reference library"""
+    if not fingerprint_index.ensure_loaded():
+        return None
+    return fingerprint_index.match(samples, sr)
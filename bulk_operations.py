@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Bulk File Operations for JARVIS AI Assistant
+Plans copy/move/delete/rename over glob and filter selections, runs them with
+bounded parallelism, streams progress events and supports cancellation
+"""
+
+import errno
+import fnmatch
+import os
+import re
+import shutil
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from pathlib import Path
+from threading import Thread, Event, Condition, Lock
+
+try:
+    import send2trash
+    SEND2TRASH_AVAILABLE = True
+except ImportError:
+    SEND2TRASH_AVAILABLE = False
+
+from instrumentation import counter, histogram
+from operation_journal import operation_journal
+
+OPERATIONS = ('copy', 'move', 'delete', 'rename')
+CONFLICT_POLICIES = ('rename', 'skip', 'overwrite')
+DEFAULT_WORKERS = 4
+COPY_CHUNK = 8 * 1024 * 1024      # bytes per copy syscall - also the cancellation granularity
+PROGRESS_INTERVAL = 0.1           # minimum seconds between progress events
+EVENT_HISTORY = 1000              # events kept per job for late subscribers
+MAX_JOBS = 20                     # finished jobs kept
+
+FILE_TYPE_GROUPS = {
+    'pdf': ['.pdf'],
+    'image': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.heic', '.tiff', '.svg'],
+    'photo': ['.jpg', '.jpeg', '.png', '.heic'],
+    'video': ['.mp4', '.mkv', '.mov', '.avi', '.webm', '.m4v'],
+    'audio': ['.mp3', '.wav', '.flac', '.m4a', '.aac', '.ogg'],
+    'song': ['.mp3', '.wav', '.flac', '.m4a', '.aac', '.ogg'],
+    'document': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.md'],
+    'spreadsheet': ['.xls', '.xlsx', '.csv', '.ods'],
+    'presentation': ['.ppt', '.pptx', '.odp', '.key'],
+    'archive': ['.zip', '.tar', '.gz', '.rar', '.7z'],
+    'text': ['.txt', '.md'],
+    'screenshot': ['.png', '.jpg', '.jpeg'],
+}
+
+BULK_FILES = counter('jarvis_bulk_files', 'Files processed by bulk operations', ['operation', 'status'])
+BULK_BYTES = counter('jarvis_bulk_bytes', 'Bytes copied or moved by bulk operations', ['operation'])
+BULK_SECONDS = histogram('jarvis_bulk_job_seconds', 'Bulk operation job duration', ['operation'],
+                         buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 1800.0))
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Selection:
+    def __init__(self, root, pattern='*', recursive=False, extensions=None, min_size=None, max_size=None,
+                 modified_after=None, modified_before=None, include_hidden=False):
+        """
+        Files under root matching every filter
+        Args:
+            pattern: glob on the file name, e.g. '*.pdf' or 'report_*'
+            extensions: iterable like ['.pdf', 'jpg'] (case-insensitive)
+            min_size / max_size: bytes
+            modified_after / modified_before: epoch seconds
+        """
+        self.root = Path(root).expanduser()
+        self.pattern = pattern or '*'
+        self.recursive = recursive
+        self.extensions = {('.' + e.lower().lstrip('.')) for e in extensions} if extensions else None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self.include_hidden = include_hidden
+        self._pattern_re = re.compile(fnmatch.translate(self.pattern), re.IGNORECASE)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['root'], data.get('pattern', '*'), bool(data.get('recursive', False)),
+                   data.get('extensions'), data.get('min_size'), data.get('max_size'),
+                   data.get('modified_after'), data.get('modified_before'), bool(data.get('include_hidden', False)))
+
+    def _matches(self, name, stat):
+        if not self._pattern_re.match(name):
+            return False
+        if self.extensions is not None and os.path.splitext(name)[1].lower() not in self.extensions:
+            return False
+        if self.min_size is not None and stat.st_size < self.min_size:
+            return False
+        if self.max_size is not None and stat.st_size > self.max_size:
+            return False
+        if self.modified_after is not None and stat.st_mtime < self.modified_after:
+            return False
+        if self.modified_before is not None and stat.st_mtime > self.modified_before:
+            return False
+        return True
+
+    def files(self):
+        """(path, stat) for each selected file - one scandir pass, symlinks not followed"""
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if not self.include_hidden and entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if self._matches(entry.name, stat):
+                    yield Path(entry.path), stat
+
+
+class PlannedOp:
+    __slots__ = ('source', 'target', 'size')
+
+    def __init__(self, source, target, size):
+        self.source = source
+        self.target = target
+        self.size = size
+
+    def to_dict(self):
+        return {'source': str(self.source), 'target': str(self.target) if self.target else None, 'size': self.size}
+
+
+def _free_name(target, taken):
+    """'name (1).ext', 'name (2).ext'... not on disk and not already planned"""
+    stem, suffix = target.stem, target.suffix
+    n = 1
+    while True:
+        candidate = target.with_name(f"{stem} ({n}){suffix}")
+        if candidate not in taken and not candidate.exists():
+            return candidate
+        n += 1
+
+
+def plan(operation, selection, destination=None, rename_template=None, conflict='rename'):
+    """
+    Resolve a selection to concrete (source, target) pairs before anything is touched
+    Args:
+        destination: target folder for copy/move; subfolders are kept for recursive selections
+        rename_template: for rename, e.g. '{stem}_{n:03d}{suffix}' or 'holiday_{date}{suffix}'
+        conflict: 'rename' (add ' (n)'), 'skip' or 'overwrite' when a target exists
+    Returns (list of PlannedOp, list of skipped source paths)
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{operation}'")
+    if conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"Unknown conflict policy '{conflict}'")
+    if operation in ('copy', 'move') and not destination:
+        raise ValueError(f"{operation} needs a destination")
+    if operation == 'rename' and not rename_template:
+        raise ValueError("rename needs a rename_template")
+
+    destination = Path(destination).expanduser() if destination else None
+    ops, skipped, taken = [], [], set()
+    for n, (source, stat) in enumerate(selection.files(), 1):
+        if operation == 'delete':
+            ops.append(PlannedOp(source, None, stat.st_size))
+            continue
+        if operation == 'rename':
+            new_name = rename_template.format(
+                n=n, name=source.name, stem=source.stem, suffix=source.suffix,
+                date=time.strftime('%Y-%m-%d', time.localtime(stat.st_mtime)))
+            target = source.with_name(new_name)
+        else:
+            target = destination / source.relative_to(selection.root)
+        if target == source:
+            skipped.append(source)
+            continue
+        if target in taken or target.exists():
+            if conflict == 'skip':
+                skipped.append(source)
+                continue
+            if conflict == 'rename' or target in taken:
+                target = _free_name(target, taken)
+        taken.add(target)
+        ops.append(PlannedOp(source, target, stat.st_size))
+    return ops, skipped
+
+
+def _copy_methods():
+    methods = [m for m in ('copy_file_range', 'sendfile') if hasattr(os, m)]
+    return methods + ['read']
+
+
+def copy_file(source, target, cancelled=None, progress=None):
+    """
+    Copy contents and metadata, in-kernel where possible: copy_file_range, then
+    sendfile, then plain reads. Written to a temp name and renamed into place
+    """
+    target = Path(target)
+    partial = target.with_name(f".{target.name}.part")
+    methods = _copy_methods()
+    copied = 0
+    try:
+        with open(source, 'rb', buffering=0) as src, open(partial, 'wb', buffering=0) as dst:
+            in_fd, out_fd = src.fileno(), dst.fileno()
+            while True:
+                if cancelled is not None and cancelled.is_set():
+                    raise JobCancelled()
+                method = methods[0]
+                try:
+                    if method == 'copy_file_range':
+                        sent = os.copy_file_range(in_fd, out_fd, COPY_CHUNK, copied, copied)
+                    elif method == 'sendfile':
+                        # sendfile writes at the output's file position
+                        os.lseek(out_fd, copied, os.SEEK_SET)
+                        sent = os.sendfile(out_fd, in_fd, copied, COPY_CHUNK)
+                    else:
+                        src.seek(copied)
+                        data = src.read(COPY_CHUNK)
+                        dst.seek(copied)
+                        sent = dst.write(data) if data else 0
+                except OSError:
+                    if method == 'read':
+                        raise
+                    # Not supported between these filesystems - fall back to the next method
+                    methods.pop(0)
+                    continue
+                if not sent:
+                    break
+                copied += sent
+                if progress:
+                    progress(sent)
+        shutil.copystat(source, partial)
+        os.replace(partial, target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return copied
+
+
+class BulkJob:
+    def __init__(self, job_id, operation, ops, skipped, max_workers=DEFAULT_WORKERS, permanent=False, on_done=None,
+                 journal=None):
+        self.id = job_id
+        self.operation = operation
+        self.ops = ops
+        self.skipped = skipped
+        self.max_workers = max_workers
+        self.permanent = permanent
+        self.on_done = on_done
+        self.journal = journal
+        # One journal batch per job, so a single undo reverses the whole job
+        self.batch = f"bulk-{job_id}-{int(time.time())}"
+        self.total_files = len(ops)
+        self.total_bytes = sum(op.size for op in ops)
+        self.done_files = 0
+        self.done_bytes = 0
+        self.failed = []
+        self.status = 'pending'     # pending -> running -> completed | cancelled | failed
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = Event()
+        self._lock = Lock()
+        self._events = deque(maxlen=EVENT_HISTORY)
+        self._event_ids = count(1)
+        self._event_cond = Condition()
+        self._last_progress = 0.0
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def _emit(self, kind, **data):
+        with self._event_cond:
+            self._events.append({'seq': next(self._event_ids), 'type': kind, 'time': time.time(), **data})
+            self._event_cond.notify_all()
+
+    def _progress(self, current=None, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        self._emit('progress', current=current, **self.counts())
+
+    def events(self, since=0, timeout=None):
+        """Events after seq 'since'; waits up to timeout seconds for new ones if there are none"""
+        with self._event_cond:
+            if timeout and not self.finished and (not self._events or self._events[-1]['seq'] <= since):
+                self._event_cond.wait(timeout)
+            return [event for event in self._events if event['seq'] > since]
+
+    def stream(self, since=0, heartbeat=15.0):
+        """Generator of events until the job finishes - for Server-Sent Events"""
+        while True:
+            events = self.events(since, timeout=heartbeat)
+            for event in events:
+                since = event['seq']
+                yield event
+            if self.finished and not self.events(since):
+                return
+            if not events:
+                yield None    # heartbeat
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'cancelled', 'failed')
+
+    def counts(self):
+        elapsed = ((self.finished_at or time.time()) - self.started_at) if self.started_at else 0.0
+        return {
+            'done_files': self.done_files,
+            'total_files': self.total_files,
+            'done_bytes': self.done_bytes,
+            'total_bytes': self.total_bytes,
+            'failed': len(self.failed),
+            'elapsed': round(elapsed, 3),
+            'bytes_per_second': round(self.done_bytes / elapsed) if elapsed else 0,
+            'files_per_second': round(self.done_files / elapsed, 1) if elapsed else 0,
+        }
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _add_bytes(self, amount):
+        with self._lock:
+            self.done_bytes += amount
+        self._progress()
+
+    def _run_one(self, op):
+        if self._cancel.is_set():
+            raise JobCancelled()
+        if op.target is not None:
+            op.target.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.operation == 'copy':
+            copy_file(op.source, op.target, self._cancel, self._add_bytes)
+            self._journal(op)
+            return
+        if self.operation in ('move', 'rename'):
+            try:
+                os.replace(op.source, op.target)
+            except OSError as e:
+                if e.errno != errno.EXDEV:   # different filesystem
+                    raise
+                copy_file(op.source, op.target, self._cancel, self._add_bytes)
+                os.unlink(op.source)
+                self._journal(op)
+                return
+            self._journal(op)
+        elif self.operation == 'delete':
+            if self.permanent:
+                os.unlink(op.source)
+                self._journal(op)
+            elif self.journal is not None:
+                self.journal.trash(op.source, batch=self.batch)
+            elif SEND2TRASH_AVAILABLE:
+                send2trash.send2trash(str(op.source))
+            else:
+                raise RuntimeError("Trash is not available; use permanent delete")
+        self._add_bytes(op.size)
+
+    def _journal(self, op):
+        if self.journal is not None:
+            self.journal.record(self.operation, op.source, op.target, 'file', batch=self.batch)
+
+    def _run_safely(self, op):
+        try:
+            self._run_one(op)
+        except JobCancelled:
+            return
+        except Exception as e:
+            with self._lock:
+                self.failed.append((str(op.source), str(e)))
+            BULK_FILES.inc(operation=self.operation, status='error')
+            self._emit('error', path=str(op.source), message=str(e))
+            return
+        with self._lock:
+            self.done_files += 1
+        BULK_FILES.inc(operation=self.operation, status='ok')
+        self._progress(current=str(op.source))
+
+    def run(self):
+        self.status = 'running'
+        self.started_at = time.time()
+        self._emit('started', operation=self.operation, total_files=self.total_files,
+                   total_bytes=self.total_bytes, skipped=len(self.skipped))
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f'bulk-{self.id}') as pool:
+                # Bounded submission keeps memory flat for very large plans
+                pending = deque()
+                for op in self.ops:
+                    if self._cancel.is_set():
+                        break
+                    pending.append(pool.submit(self._run_safely, op))
+                    if len(pending) >= self.max_workers * 4:
+                        pending.popleft().result()
+                for future in pending:
+                    future.result()
+            status = 'cancelled' if self._cancel.is_set() else 'completed'
+        except Exception as e:
+            status = 'failed'
+            self._emit('error', path=None, message=str(e))
+        self.finished_at = time.time()
+        BULK_SECONDS.observe(self.finished_at - self.started_at, operation=self.operation)
+        if self.operation in ('copy', 'move'):
+            BULK_BYTES.inc(self.done_bytes, operation=self.operation)
+        self._progress(force=True)
+        # The terminal event goes out before the job reports finished, so a stream
+        # that sees 'finished' has always been handed the final event too
+        with self._event_cond:
+            self._emit(status, **self.counts())
+            self.status = status
+        if self.on_done:
+            try:
+                self.on_done(self)
+            except Exception as e:
+                print(f"❌ Bulk job callback failed: {e}")
+
+    def summary(self):
+        return {
+            'id': self.id,
+            'operation': self.operation,
+            'status': self.status,
+            'skipped': len(self.skipped),
+            'errors': [{'path': path, 'message': message} for path, message in self.failed[:20]],
+            **self.counts(),
+        }
+
+
+class BulkOperations:
+    def __init__(self, max_workers=DEFAULT_WORKERS, journal=None):
+        """journal: OperationJournal that records every file a job touches, for undo"""
+        self.max_workers = max_workers
+        self.journal = journal
+        self.jobs = {}
+        self._ids = count(1)
+        self._lock = Lock()
+
+    def prepare(self, operation, selection, destination=None, rename_template=None, conflict='rename',
+                permanent=False, on_done=None):
+        """Plan a job without starting it, so its size can be checked or previewed"""
+        if isinstance(selection, dict):
+            selection = Selection.from_dict(selection)
+        ops, skipped = plan(operation, selection, destination, rename_template, conflict)
+        return BulkJob(next(self._ids), operation, ops, skipped, self.max_workers, permanent, on_done,
+                       self.journal)
+
+    def launch(self, job, background=True):
+        with self._lock:
+            self.jobs[job.id] = job
+            finished = [j for j in self.jobs.values() if j.finished]
+            for old in finished[:max(0, len(finished) - MAX_JOBS)]:
+                del self.jobs[old.id]
+        if background:
+            Thread(target=job.run, name=f'bulk-job-{job.id}', daemon=True).start()
+        else:
+            job.run()
+        return job
+
+    def start(self, operation, selection, destination=None, background=True, **options):
+        return self.launch(self.prepare(operation, selection, destination, **options), background)
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job:
+            job.cancel()
+        return job
+
+
+def parse_bulk_command(text, locations):
+    """
+    'move all pdfs from downloads to documents', 'copy images from desktop to pictures',
+    'delete all screenshots from desktop' -> (operation, Selection, destination) or None.
+    Only a plural or 'all' with a known type, or '<extension> files', is a bulk command -
+    'delete the file in downloads' or 'move todo from downloads' names one item instead
+    Args:
+        locations: {'downloads': Path, ...} folder names the user can say
+    """
+    match = re.search(r'\b(copy|move|delete|remove|trash)\s+(all\s+)?(?:(?:the|my)\s+)?(\w+?)(s)?\s+'
+                      r'(files?\s+)?(?:from|in)\s+(?:(?:the|my)\s+)?(\w+)'
+                      r'(?:\s+(?:to|into)\s+(?:(?:the|my)\s+)?(\w+))?', text.lower())
+    if not match:
+        return None
+    verb, everything, kind, plural, files_word, source, target = match.groups()
+    if kind in ('file', 'item', 'thing'):
+        return None
+    operation = 'delete' if verb in ('delete', 'remove', 'trash') else verb
+    source_dir = locations.get(source) or locations.get(source.rstrip('s'))
+    if source_dir is None:
+        return None
+    extensions = FILE_TYPE_GROUPS.get(kind)
+    if extensions is not None:
+        if not (everything or plural or (files_word or '').strip() == 'files'):
+            return None
+    else:
+        # 'move all txt files from ...', 'delete all mp3s ...' - the word is the extension itself
+        explicit = (files_word or '').strip() == 'files' and not plural
+        if not (explicit or (everything and plural)) or not re.fullmatch(r'[a-z0-9]{1,5}', kind):
+            return None
+        extensions = ['.' + kind]
+    destination = None
+    if operation in ('copy', 'move'):
+        destination = locations.get(target) if target else None
+        if destination is None:
+            return None
+    return operation, Selection(source_dir, extensions=extensions), destination
+
+
+def format_size(size):
+    for unit in ('bytes', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'bytes' else f"{size:.1f} {unit}"
+        size /= 1024
+
+# Global instance
+bulk_operations = BulkOperations(max_workers=int(os.environ.get('JARVIS_BULK_WORKERS', DEFAULT_WORKERS)),
+                                 journal=operation_journal)
+
+def start_bulk_operation(operation, selection, destination=None, **options):
+    return bulk_operations.start(operation, selection, destination, **options)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Camera Manager for JARVIS AI Assistant
+Discovers the working camera once and keeps a warm capture session with a
+background grabber thread, so photos come from the latest frame instantly
+"""
+
+import time
+from threading import Thread, Lock, Condition
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+DEFAULT_CAMERA_INDICES = (0, 1, 2)
+DEFAULT_IDLE_TIMEOUT = 60.0   # seconds without a request before the camera is released
+DEFAULT_MAX_FRAME_AGE = 0.5   # seconds - older frames wait for a fresh grab
+DEFAULT_RESOLUTION = (1280, 720)
+
+
+def open_cv2_camera(index, width=DEFAULT_RESOLUTION[0], height=DEFAULT_RESOLUTION[1]):
+    """Default frame source factory - an OpenCV capture configured for photos"""
+    if not CV2_AVAILABLE:
+        return None
+    cam = cv2.VideoCapture(index)
+    if not cam.isOpened():
+        cam.release()
+        return None
+    cam.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cam.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cam.set(cv2.CAP_PROP_FPS, 30)
+    return cam
+
+
+class CameraManager:
+    def __init__(self, source_factory=None, indices=DEFAULT_CAMERA_INDICES,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, max_frame_age=DEFAULT_MAX_FRAME_AGE):
+        """
+        Args:
+            source_factory: callable(index) returning an object with read()/release(),
+                            or None if that index has no camera. Defaults to OpenCV.
+            indices: camera indices to probe during discovery
+            idle_timeout: release the device after this many idle seconds
+            max_frame_age: frames older than this are not handed out
+        """
+        self.source_factory = source_factory or open_cv2_camera
+        self.indices = tuple(indices)
+        self.idle_timeout = idle_timeout
+        self.max_frame_age = max_frame_age
+
+        self.device_index = None
+        self._source = None
+        self._thread = None
+        self._running = False
+        self._lock = Lock()
+        self._frame_ready = Condition(self._lock)
+        self._latest_frame = None
+        self._latest_time = 0.0
+        self._last_request = 0.0
+        self._frame_count = 0
+        self.stats = {'opens': 0, 'frames': 0, 'instant_hits': 0, 'waits': 0}
+
+    @property
+    def available(self):
+        return CV2_AVAILABLE or self.source_factory is not open_cv2_camera
+
+    def _open_source(self):
+        """Open the remembered device, or probe the indices once to find one"""
+        candidates = [self.device_index] if self.device_index is not None else []
+        candidates += [i for i in self.indices if i != self.device_index]
+
+        for index in candidates:
+            source = None
+            try:
+                source = self.source_factory(index)
+                if source is None:
+                    continue
+                ret, frame = source.read()
+                if ret and frame is not None:
+                    self.device_index = index
+                    self.stats['opens'] += 1
+                    return source, frame
+                source.release()
+            except Exception as e:
+                print(f"📷 Camera {index} failed: {e}")
+                if source is not None:
+                    try:
+                        source.release()
+                    except Exception:
+                        pass
+
+        self.device_index = None
+        return None, None
+
+    def start(self):
+        """Open the camera and start the background grabber if it isn't running"""
+        with self._lock:
+            if self._running:
+                return True
+            previous = self._thread
+
+        # Let an idle-stopped grabber finish releasing the device before reopening it
+        if previous is not None and previous.is_alive():
+            previous.join(timeout=2.0)
+
+        source, first_frame = self._open_source()
+        if source is None:
+            return False
+
+        with self._lock:
+            if self._running:
+                # Another caller won the race - keep theirs
+                source.release()
+                return True
+            self._source = source
+            self._latest_frame = first_frame
+            self._latest_time = time.monotonic()
+            self._frame_count += 1
+            self._last_request = time.monotonic()
+            self._running = True
+            self._thread = Thread(target=self._grab_loop, name='camera-grabber', daemon=True)
+            self._thread.start()
+        print(f"📷 Camera {self.device_index} session started")
+        return True
+
+    def _grab_loop(self):
+        source = self._source
+        failures = 0
+        try:
+            while True:
+                with self._lock:
+                    if not self._running:
+                        break
+                    if time.monotonic() - self._last_request > self.idle_timeout:
+                        print("📷 Camera idle - releasing device")
+                        self._running = False
+                        break
+
+                ret, frame = source.read()
+                if not ret or frame is None:
+                    failures += 1
+                    if failures >= 10:
+                        print("📷 Camera stopped delivering frames")
+                        with self._lock:
+                            self._running = False
+                        break
+                    time.sleep(0.05)
+                    continue
+
+                failures = 0
+                with self._lock:
+                    self._latest_frame = frame
+                    self._latest_time = time.monotonic()
+                    self._frame_count += 1
+                    self.stats['frames'] += 1
+                    self._frame_ready.notify_all()
+        finally:
+            try:
+                source.release()
+            except Exception:
+                pass
+            with self._lock:
+                if self._source is source:
+                    self._source = None
+                    self._latest_frame = None
+                self._frame_ready.notify_all()
+
+    def get_frame(self, timeout=3.0):
+        """
+        Latest camera frame, opening the session on first use
+        Returns None if no camera is available or no fresh frame arrives in time
+        """
+        if not self.start():
+            return None
+
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self._last_request = time.monotonic()
+            if self._latest_frame is not None and time.monotonic() - self._latest_time <= self.max_frame_age:
+                self.stats['instant_hits'] += 1
+                return self._latest_frame.copy() if hasattr(self._latest_frame, 'copy') else self._latest_frame
+
+            self.stats['waits'] += 1
+            seen = self._frame_count
+            while self._running and self._frame_count == seen:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._frame_ready.wait(remaining)
+
+            frame = self._latest_frame
+            return frame.copy() if frame is not None and hasattr(frame, 'copy') else frame
+
+    def stop(self):
+        """Release the camera now"""
+        with self._lock:
+            self._running = False
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=2.0)
+
+    def status(self):
+        with self._lock:
+            return {
+                'running': self._running,
+                'device_index': self.device_index,
+                'frame_age': round(time.monotonic() - self._latest_time, 3) if self._latest_frame is not None else None,
+                **self.stats
+            }
+
+# Global instance
+camera_manager = CameraManager()
+
+def get_camera_frame(timeout=3.0):
+    return camera_manager.get_frame(timeout)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Command Normalizer for JARVIS AI Assistant
+Rewrites Hindi, Gujarati (and any other mapped language) phrases to their English
+command equivalents in one left-to-right, longest-match pass over a phrase trie
+"""
+
+import json
+import os
+import unicodedata
+from pathlib import Path
+
+DEFAULT_MAPPING_DIR = Path(__file__).resolve().parent / 'language_mappings'
+
+_END = None   # trie key holding the replacement of a complete phrase
+
+
+def _fold(text):
+    """Canonical form for matching - NFC also unifies precomposed and nukta spellings like ढ़"""
+    return unicodedata.normalize('NFC', text).lower()
+
+
+def _is_word_char(char):
+    # Vowel signs and viramas are marks, not alphanumerics, but still belong to the word
+    return char.isalnum() or char == '_' or unicodedata.category(char)[0] == 'M'
+
+
+class PhraseTrie:
+    def __init__(self, whole_words=True):
+        """
+        Args:
+            whole_words: only replace phrases that start and end on word boundaries,
+                         so 'समय' is not rewritten inside 'समयसीमा'
+        """
+        self.whole_words = whole_words
+        self._root = {}
+        self.size = 0
+        self.max_length = 0
+
+    def add(self, phrase, replacement):
+        phrase = _fold(phrase).strip()
+        if not phrase:
+            return
+        node = self._root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        if _END not in node:
+            self.size += 1
+        node[_END] = replacement
+        self.max_length = max(self.max_length, len(phrase))
+
+    def get(self, phrase):
+        node = self._root
+        for char in _fold(phrase):
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(_END)
+
+    def __contains__(self, phrase):
+        return self.get(phrase) is not None
+
+    def __len__(self):
+        return self.size
+
+    def replace(self, text):
+        """Replace every mapped phrase, preferring the longest match at each position"""
+        root = self._root
+        whole_words = self.whole_words
+        length = len(text)
+        parts = []
+        last = 0
+        i = 0
+        while i < length:
+            node = root.get(text[i])
+            if node is None or (whole_words and i and _is_word_char(text[i - 1])):
+                i += 1
+                continue
+            match_end = None
+            j = i + 1
+            while True:
+                if _END in node and (not whole_words or j == length or not _is_word_char(text[j])):
+                    match_end, replacement = j, node[_END]
+                if j == length:
+                    break
+                node = node.get(text[j])
+                if node is None:
+                    break
+                j += 1
+            if match_end is None:
+                i += 1
+                continue
+            parts.append(text[last:i])
+            parts.append(replacement)
+            last = i = match_end
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return ''.join(parts)
+
+
+class CommandNormalizer:
+    def __init__(self, mapping_dirs=(DEFAULT_MAPPING_DIR,)):
+        """
+        Args:
+            mapping_dirs: directories of <language>.json files, each a flat
+                          {"phrase": "english replacement"} object; later files
+                          override earlier ones for the same phrase
+        """
+        self.trie = PhraseTrie()
+        self.languages = {}
+        for directory in mapping_dirs:
+            self.load_directory(directory)
+
+    def load_directory(self, directory):
+        directory = Path(directory)
+        if not directory.is_dir():
+            return
+        for path in sorted(directory.glob('*.json')):
+            try:
+                mappings = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not load language mappings {path.name}: {e}")
+                continue
+            self.add_mappings(mappings, language=path.stem)
+
+    def add_mappings(self, mappings, language='custom'):
+        for phrase, replacement in mappings.items():
+            self.trie.add(phrase, replacement)
+        self.languages[language] = self.languages.get(language, 0) + len(mappings)
+
+    def normalize(self, command):
+        return self.trie.replace(_fold(command))
+
+# Global instance
+_extra_dirs = [d for d in os.environ.get('JARVIS_LANGUAGE_MAPPINGS', '').split(os.pathsep) if d]
+command_normalizer = CommandNormalizer([DEFAULT_MAPPING_DIR, *_extra_dirs])
+
+def normalize_command(command):
+    """Normalize multilingual commands to English equivalents"""
+    return command_normalizer.normalize(command)
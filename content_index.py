@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Content Index for JARVIS AI Assistant
+Full-text search over the documents in Desktop, Documents and Downloads: text is
+extracted once per file version in a background process pool, cached on disk,
+and kept in a positional inverted index so "find the file that mentions
+invoice 2024" is answered without opening a single file
+"""
+
+import hashlib
+import math
+import os
+import re
+import time
+import zipfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from html import unescape
+from html.parser import HTMLParser
+from pathlib import Path
+from threading import Thread, RLock, Event
+
+from instrumentation import counter, histogram
+
+try:
+    from pypdf import PdfReader
+    PDF_TEXT_AVAILABLE = True
+except ImportError:
+    try:
+        from PyPDF2 import PdfReader
+        PDF_TEXT_AVAILABLE = True
+    except ImportError:
+        PDF_TEXT_AVAILABLE = False
+
+DEFAULT_CACHE_DIR = Path(os.getenv('JARVIS_CONTENT_CACHE', Path.home() / '.jarvis' / 'content_text'))
+DEFAULT_ROOTS = [Path.home() / folder for folder in ('Desktop', 'Documents', 'Downloads')]
+
+TEXT_EXTENSIONS = {'.txt', '.md', '.py', '.csv'}
+HTML_EXTENSIONS = {'.html', '.htm'}
+SKIPPED_DIRS = {'node_modules', '__pycache__', 'venv', '.venv', 'site-packages'}
+
+MAX_FILE_BYTES = 25 * 1024 * 1024   # larger files are almost never documents worth indexing
+MAX_TEXT_CHARS = 2 * 1024 * 1024    # text kept per file; the rest of a huge log is dropped
+POOL_MIN_FILES = 8                  # fewer new files than this are extracted in-process
+RESCAN_INTERVAL = 300.0             # seconds before a search kicks off a background rescan
+PHRASE_BOOST = 2.0
+SNIPPET_CHARS = 80
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+# Words that carry no meaning in a content query
+STOPWORDS = {'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'my', 'me', 'that', 'which',
+             'word', 'words', 'text', 'phrase'}
+
+FILES_INDEXED = counter('jarvis_content_index_files', 'Files processed by the content index by outcome',
+                        ['status'])
+SEARCH_SECONDS = histogram('jarvis_content_search_seconds', 'Time to answer one content search',
+                           buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5))
+BUILD_SECONDS = histogram('jarvis_content_index_build_seconds', 'Time for one incremental index update',
+                          buckets=(0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0))
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+# ----------------------------------------------------------------------
+# Text extraction - module level so the process pool can pickle it
+# ----------------------------------------------------------------------
+
+class _HTMLText(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip:
+            self._skip -= 1
+        elif tag in ('p', 'div', 'br', 'li', 'tr', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def _read_text(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read(MAX_TEXT_CHARS)
+
+
+def _html_text(path):
+    parser = _HTMLText()
+    parser.feed(_read_text(path))
+    parser.close()
+    return ''.join(parser.parts)
+
+
+def _docx_text(path):
+    """Paragraph text straight from word/document.xml - no python-docx needed"""
+    with zipfile.ZipFile(path) as archive:
+        xml = archive.read('word/document.xml').decode('utf-8', errors='replace')
+    xml = re.sub(r'</w:p>|<w:br\s*/>|<w:tab\s*/>', '\n', xml)
+    return unescape(re.sub(r'<[^>]+>', '', xml))
+
+
+def _pdf_text(path):
+    reader = PdfReader(path)
+    pages = []
+    size = 0
+    for page in reader.pages:
+        text = page.extract_text() or ''
+        pages.append(text)
+        size += len(text)
+        if size >= MAX_TEXT_CHARS:
+            break
+    return '\n'.join(pages)
+
+
+EXTRACTORS = {ext: _read_text for ext in TEXT_EXTENSIONS}
+EXTRACTORS.update({ext: _html_text for ext in HTML_EXTENSIONS})
+EXTRACTORS['.docx'] = _docx_text
+if PDF_TEXT_AVAILABLE:
+    # Without a PDF library PDFs are left out entirely - an empty text would be cached
+    # under the file's version and outlive installing pypdf
+    EXTRACTORS['.pdf'] = _pdf_text
+
+
+def extract_text(path):
+    """Plain text of a supported document; raises on unreadable or corrupt files"""
+    extractor = EXTRACTORS.get(os.path.splitext(path)[1].lower())
+    if extractor is None:
+        return ''
+    return extractor(path)[:MAX_TEXT_CHARS]
+
+
+def _positions(text):
+    """token -> positions, for one document"""
+    postings = {}
+    for position, token in enumerate(tokenize(text)):
+        positions = postings.get(token)
+        if positions is None:
+            positions = postings[token] = array('I')
+        positions.append(position)
+    return postings
+
+
+def _index_worker(path, cache_file=None):
+    """
+    Process pool worker - (path, new text or None if it came from the cache, postings, error).
+    Tokenizing here keeps the build's CPU work off the main process too
+    """
+    text = None
+    if cache_file:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except OSError:
+            pass
+    if text is not None:
+        return path, None, _positions(text), None
+    try:
+        text = extract_text(path)
+    except Exception as e:
+        return path, None, None, str(e)
+    return path, text, _positions(text), None
+
+
+class _Document:
+    __slots__ = ('path', 'mtime_ns', 'size', 'length', 'terms')
+
+    def __init__(self, path, mtime_ns, size, length, terms):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.length = length        # tokens in the document
+        self.terms = terms          # distinct tokens, to drop its postings again
+
+
+class ContentIndex:
+    def __init__(self, roots=None, cache_dir=DEFAULT_CACHE_DIR, max_workers=None):
+        """
+        Args:
+            roots: folders to index recursively; defaults to Desktop, Documents and Downloads
+            cache_dir: where extracted text is kept, one file per document version
+        """
+        self.roots = [Path(r) for r in (roots if roots is not None else DEFAULT_ROOTS)]
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_workers = max_workers
+        self._lock = RLock()
+        self._docs = {}             # doc id -> _Document
+        self._by_path = {}          # path -> doc id
+        self._postings = {}         # token -> {doc id: array of positions}
+        self._next_id = 0
+        self._build_thread = None
+        self._scanned_at = None
+        self.ready = Event()
+        self.stats = {'files': 0, 'extracted': 0, 'cached': 0, 'failed': 0, 'removed': 0, 'builds': 0}
+
+    # ------------------------------------------------------------------
+    # Extracted-text cache
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, path, mtime_ns, size):
+        # 'v2' retires caches from when PDFs were stored as empty text without pypdf
+        key = hashlib.sha1(f"v2\0{path}\0{mtime_ns}\0{size}".encode('utf-8', 'surrogateescape')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def _cached_text(self, path, mtime_ns, size):
+        if not self.cache_dir:
+            return None
+        try:
+            return self._cache_path(path, mtime_ns, size).read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def _store_text(self, path, mtime_ns, size, text):
+        if not self.cache_dir:
+            return
+        target = self._cache_path(path, mtime_ns, size)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix('.tmp')
+            tmp.write_text(text, encoding='utf-8', errors='replace')
+            os.replace(tmp, target)
+        except OSError as e:
+            print(f"Content cache write error: {e}")
+
+    def _drop_text(self, doc):
+        if self.cache_dir:
+            try:
+                self._cache_path(doc.path, doc.mtime_ns, doc.size).unlink()
+            except OSError:
+                pass
+
+    def text_of(self, path):
+        """Cached text of an indexed file, or None"""
+        with self._lock:
+            doc = self._docs.get(self._by_path.get(str(path)))
+        if doc is None:
+            return None
+        text = self._cached_text(doc.path, doc.mtime_ns, doc.size)
+        if text is None:
+            try:
+                text = extract_text(doc.path)
+            except Exception:
+                return None
+        return text
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _scan(self):
+        """path -> (mtime_ns, size) for every indexable file under the roots"""
+        found = {}
+        stack = [str(root) for root in self.roots]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.name.startswith('.'):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in SKIPPED_DIRS:
+                                    stack.append(entry.path)
+                            elif os.path.splitext(entry.name)[1].lower() in EXTRACTORS:
+                                st = entry.stat()
+                                if st.st_size <= MAX_FILE_BYTES:
+                                    found[entry.path] = (st.st_mtime_ns, st.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return found
+
+    def _add(self, path, mtime_ns, size, postings):
+        with self._lock:
+            old = self._by_path.get(path)
+            if old is not None:
+                self._remove(old)
+            doc_id = self._next_id
+            self._next_id += 1
+            length = sum(len(positions) for positions in postings.values())
+            self._docs[doc_id] = _Document(path, mtime_ns, size, length, tuple(postings))
+            self._by_path[path] = doc_id
+            for token, positions in postings.items():
+                self._postings.setdefault(token, {})[doc_id] = positions
+
+    def _remove(self, doc_id):
+        """Drop a document's postings; call with the lock held"""
+        doc = self._docs.pop(doc_id)
+        del self._by_path[doc.path]
+        for token in doc.terms:
+            docs = self._postings.get(token)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self._postings[token]
+        return doc
+
+    def update(self):
+        """
+        Bring the index in line with the disk: unchanged files are skipped, changed
+        and new ones are read from the text cache or extracted in a process pool,
+        and files that disappeared are dropped. Returns the number of files changed
+        """
+        started = time.perf_counter()
+        found = self._scan()
+        with self._lock:
+            removed = [doc_id for path, doc_id in self._by_path.items()
+                       if path not in found or found[path] != (self._docs[doc_id].mtime_ns, self._docs[doc_id].size)]
+            changed = set()
+            for doc_id in removed:
+                # Text cached for a version that no longer exists is never read again
+                doc = self._remove(doc_id)
+                self._drop_text(doc)
+                changed.add(doc.path)
+                if doc.path not in found:
+                    self.stats['removed'] += 1
+                    FILES_INDEXED.inc(status='removed')
+            pending = {path: found[path] for path in found if path not in self._by_path}
+
+        jobs = [(path, str(self._cache_path(path, *version)) if self.cache_dir else None)
+                for path, version in pending.items()]
+        for path, text, postings, error in self._run_jobs(jobs):
+            if error is not None:
+                self.stats['failed'] += 1
+                FILES_INDEXED.inc(status='failed')
+                continue
+            mtime_ns, size = pending[path]
+            if text is not None:
+                self._store_text(path, mtime_ns, size, text)
+            self._add(path, mtime_ns, size, postings)
+            status = 'cached' if text is None else 'extracted'
+            self.stats[status] += 1
+            FILES_INDEXED.inc(status=status)
+
+        with self._lock:
+            self.stats['files'] = len(self._docs)
+            self.stats['builds'] += 1
+            self._scanned_at = time.monotonic()
+        self.ready.set()
+        BUILD_SECONDS.observe(time.perf_counter() - started)
+        return len(changed.union(pending))
+
+    def _run_jobs(self, jobs):
+        """Yield _index_worker results, across a process pool when there are enough files"""
+        workers = self.max_workers or min(len(jobs), os.cpu_count() or 1)
+        if workers <= 1 or len(jobs) < POOL_MIN_FILES:
+            for path, cache_file in jobs:
+                yield _index_worker(path, cache_file)
+            return
+        paths, cache_files = zip(*jobs)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(_index_worker, paths, cache_files, chunksize=16)
+
+    def start(self):
+        """Update in a background thread unless one is already running"""
+        with self._lock:
+            if self._build_thread is not None and self._build_thread.is_alive():
+                return self._build_thread
+            self._build_thread = Thread(target=self._run_update, name='content-index', daemon=True)
+            self._build_thread.start()
+            return self._build_thread
+
+    def _run_update(self):
+        try:
+            self.update()
+        except Exception as e:
+            print(f"Content index update failed: {e}")
+            self.ready.set()
+
+    @property
+    def building(self):
+        thread = self._build_thread
+        return thread is not None and thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _phrase_at(position_sets, first_positions):
+        """First position where every term follows the one before it, or None"""
+        for start in first_positions:
+            if all(start + offset in positions for offset, positions in enumerate(position_sets[1:], 1)):
+                return start
+        return None
+
+    def search(self, query, limit=10):
+        """
+        Files containing every word of query, best first:
+        [{'path', 'name', 'score', 'phrase', 'snippet'}]. Exact phrase matches rank
+        above scattered ones; rarer words count for more than common ones
+        """
+        started = time.perf_counter()
+        terms = [t for t in tokenize(query) if t not in STOPWORDS] or tokenize(query)
+        if self._scanned_at is not None and time.monotonic() - self._scanned_at > RESCAN_INTERVAL:
+            self.start()
+        if not terms:
+            return []
+
+        with self._lock:
+            total = max(len(self._docs), 1)
+            term_docs = [self._postings.get(t) for t in terms]
+            if any(docs is None for docs in term_docs):
+                SEARCH_SECONDS.observe(time.perf_counter() - started)
+                return []
+            # Intersect from the rarest term so the candidate set only shrinks
+            by_rarity = sorted(term_docs, key=len)
+            candidates = set(by_rarity[0])
+            for docs in by_rarity[1:]:
+                candidates.intersection_update(docs)
+                if not candidates:
+                    break
+
+            scored = []
+            for doc_id in candidates:
+                doc = self._docs[doc_id]
+                score = 0.0
+                for docs in term_docs:
+                    idf = math.log1p(total / len(docs))
+                    score += (1.0 + math.log(len(docs[doc_id]))) * idf
+                score /= 1.0 + math.log1p(doc.length / 1000.0)
+                phrase = None
+                if len(terms) > 1:
+                    phrase = self._phrase_at([set(docs[doc_id]) for docs in term_docs], term_docs[0][doc_id])
+                    if phrase is not None:
+                        score *= PHRASE_BOOST
+                position = phrase if phrase is not None else term_docs[0][doc_id][0]
+                scored.append((score, doc.path, position, phrase is not None))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        results = []
+        for score, path, position, is_phrase in scored[:limit]:
+            results.append({
+                'path': path,
+                'name': os.path.basename(path),
+                'score': round(score, 4),
+                'phrase': is_phrase,
+                'snippet': self.snippet(path, position),
+            })
+        SEARCH_SECONDS.observe(time.perf_counter() - started)
+        return results
+
+    def snippet(self, path, position, width=SNIPPET_CHARS):
+        """Text around the token at position, from the cached text"""
+        text = self.text_of(path)
+        if not text:
+            return ''
+        for index, match in enumerate(TOKEN_RE.finditer(text)):
+            if index == position:
+                start = max(0, match.start() - width)
+                end = min(len(text), match.end() + width)
+                excerpt = ' '.join(text[start:end].split())
+                return ('…' if start else '') + excerpt + ('…' if end < len(text) else '')
+        return ''
+
+    def __len__(self):
+        with self._lock:
+            return len(self._docs)
+
+
+# "find the file that mentions invoice 2024", "which document contains the budget",
+# "search my files for quarterly report"
+_MENTIONS_RE = re.compile(r'^(?:find|search(?:\s+for)?|show(?:\s+me)?|which|what|locate|look\s+for)\s+'
+                          r'(?:(?:the|a|any|my|all)\s+)?(?:files?|documents?|docs?|notes?)\s+'
+                          r'(?:(?:that|which)\s+)?(?:mentions?|mentioning|contains?|containing|talks?\s+about|'
+                          r'says?|with\s+the\s+(?:words?|text|phrase))\s+(.+)$')
+_SEARCH_IN_RE = re.compile(r'^(?:search|grep|look)\s+(?:through\s+|in\s+)?(?:my\s+)?(?:files|documents|docs)\s+'
+                           r'for\s+(.+)$')
+_GREP_RE = re.compile(r'^grep\s+(?:for\s+(.+)|(["\'].+["\']))$')
+
+
+def parse_content_search(text):
+    """The words a content-search command looks for, else None"""
+    text = text.strip().lower().rstrip('?.!')
+    for pattern in (_MENTIONS_RE, _SEARCH_IN_RE, _GREP_RE):
+        match = pattern.match(text)
+        if match:
+            query = next(group for group in match.groups() if group).strip().strip('"\'')
+            return query or None
+    return None
+
+# Global instance
+content_index = ContentIndex(
+    roots=[Path(d) for d in os.environ.get('JARVIS_CONTENT_ROOTS', '').split(os.pathsep) if d] or None)
+
+def search_content(query, limit=10):
+    return content_index.search(query, limit)
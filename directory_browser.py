@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Directory Browser for JARVIS AI Assistant
+Paginated directory listings over os.scandir: each page is one pass that keeps
+only the next page of entries in a bounded heap, with an opaque cursor for the
+page after it and a short-lived stat cache per directory for size/date sorts
+"""
+
+import base64
+import heapq
+import json
+import os
+import stat as stat_module
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from instrumentation import counter, histogram
+
+SORTS = ('name', 'size', 'modified', 'type')
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+STAT_TTL = 5.0              # seconds cached sizes/dates are trusted while the directory itself is unchanged
+MAX_CACHED_DIRS = 32
+
+LISTINGS = counter('jarvis_directory_listings', 'Directory pages served by sort order', ['sort'])
+LISTING_SECONDS = histogram('jarvis_directory_listing_seconds', 'Time to build one directory page',
+                            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort, reverse, key):
+    raw = json.dumps([sort, reverse, list(key)], separators=(',', ':'), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort, reverse):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, cursor_reverse, key = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Malformed cursor: {e}")
+    if cursor_sort != sort or cursor_reverse != reverse:
+        raise InvalidCursor("Cursor belongs to a different sort order")
+    return tuple(key)
+
+
+class _DirStats:
+    __slots__ = ('mtime_ns', 'checked', 'stats')
+
+    def __init__(self, mtime_ns):
+        self.mtime_ns = mtime_ns
+        self.checked = time.monotonic()
+        self.stats = {}         # name -> (size, mtime, is_dir, is_link)
+
+
+class DirectoryBrowser:
+    def __init__(self, ttl=STAT_TTL, max_cached_dirs=MAX_CACHED_DIRS):
+        self.ttl = ttl
+        self.max_cached_dirs = max_cached_dirs
+        self._cache = OrderedDict()     # directory -> _DirStats, least recently used first
+        self._lock = Lock()
+        self.stats = {'pages': 0, 'stat_calls': 0, 'stat_hits': 0}
+
+    # ------------------------------------------------------------------
+    # Stat cache
+    # ------------------------------------------------------------------
+
+    def _dir_stats(self, path, mtime_ns):
+        """Cached stats for a directory, dropped when it changes or the TTL runs out"""
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is None or cached.mtime_ns != mtime_ns or time.monotonic() - cached.checked > self.ttl:
+                cached = self._cache[path] = _DirStats(mtime_ns)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_cached_dirs:
+                self._cache.popitem(last=False)
+            return cached
+
+    def _stat(self, entry, cache):
+        info = cache.stats.get(entry.name)
+        if info is not None:
+            self.stats['stat_hits'] += 1
+            return info
+        self.stats['stat_calls'] += 1
+        try:
+            st = entry.stat()
+        except OSError:
+            # A broken symlink: describe the link itself
+            st = entry.stat(follow_symlinks=False)
+        is_dir = stat_module.S_ISDIR(st.st_mode)
+        info = (0 if is_dir else st.st_size, st.st_mtime, is_dir, entry.is_symlink())
+        cache.stats[entry.name] = info
+        return info
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(path), None)
+
+    # ------------------------------------------------------------------
+    # Listing
+    # ------------------------------------------------------------------
+
+    def _key(self, entry, sort, reverse, folders_first, cache):
+        """Total order for a sort; the name tie-break makes every key unique within a directory"""
+        if sort in ('size', 'modified'):
+            size, mtime, is_dir, _ = self._stat(entry, cache)
+            primary = size if sort == 'size' else mtime
+        else:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            primary = entry.name.lower() if sort == 'name' else os.path.splitext(entry.name)[1].lower()
+        # Folders lead in both directions: descending pages are taken from the largest keys
+        group = 0
+        if folders_first:
+            group = (1 if is_dir else 0) if reverse else (0 if is_dir else 1)
+        return (group, primary, entry.name)
+
+    def list(self, path, sort='name', reverse=False, limit=DEFAULT_LIMIT, cursor=None, show_hidden=False,
+             folders_first=True):
+        """
+        One page of a directory as a dict for JSON:
+        {'path', 'items': [...], 'next_cursor', 'total', 'sort', 'reverse'}.
+        Pass next_cursor back to get the following page; None means this was the last one
+        """
+        started = time.perf_counter()
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort '{sort}' (use one of {', '.join(SORTS)})")
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        path = os.path.abspath(os.path.expanduser(path))
+        after = decode_cursor(cursor, sort, reverse) if cursor else None
+        directory_stat = os.stat(path)
+        if not stat_module.S_ISDIR(directory_stat.st_mode):
+            raise NotADirectoryError(path)
+        cache = self._dir_stats(path, directory_stat.st_mtime_ns)
+
+        total = 0
+
+        def candidates(it):
+            nonlocal total
+            for entry in it:
+                if not show_hidden and entry.name.startswith('.'):
+                    continue
+                try:
+                    key = self._key(entry, sort, reverse, folders_first, cache)
+                except OSError:
+                    # Vanished or unreadable since scandir returned it
+                    continue
+                total += 1
+                if after is not None and (key <= after if not reverse else key >= after):
+                    continue
+                yield key, entry
+
+        # One pass, with only limit + 1 entries held at a time; keys are unique,
+        # so the heap never has to compare the DirEntry objects
+        pick = heapq.nlargest if reverse else heapq.nsmallest
+        with os.scandir(path) as it:
+            page = pick(limit + 1, candidates(it))
+
+        items = []
+        for key, entry in page[:limit]:
+            try:
+                size, mtime, is_dir, is_link = self._stat(entry, cache)
+            except OSError:
+                continue
+            items.append({
+                'name': entry.name,
+                'path': entry.path,
+                'type': 'folder' if is_dir else 'file',
+                'size': size,
+                'modified': mtime,
+                'extension': '' if is_dir else os.path.splitext(entry.name)[1].lower().lstrip('.'),
+                'hidden': entry.name.startswith('.'),
+                'symlink': is_link,
+            })
+        next_cursor = encode_cursor(sort, reverse, page[limit - 1][0]) if len(page) > limit else None
+
+        self.stats['pages'] += 1
+        LISTINGS.inc(sort=sort)
+        LISTING_SECONDS.observe(time.perf_counter() - started)
+        return {
+            'path': path,
+            'items': items,
+            'next_cursor': next_cursor,
+            'total': total,
+            'sort': sort,
+            'reverse': reverse,
+        }
+
+# Global instance
+directory_browser = DirectoryBrowser()
+
+def list_directory(path, **options):
+    return directory_browser.list(path, **options)
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer for JARVIS AI Assistant
+Per-folder sizes from a parallel os.scandir walk, kept in a persistent tree cache
+keyed by each directory's mtime: a rescan lists only the directories whose
+entries changed and reuses everything else, and the largest folders and files
+are answered from the cache without touching the disk
+"""
+
+import heapq
+import json
+import os
+import re
+import stat as stat_module
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Thread, Lock
+
+from instrumentation import counter, histogram
+
+DEFAULT_CACHE_PATH = Path(os.getenv('JARVIS_DISK_USAGE_CACHE', Path.home() / '.jarvis' / 'disk_usage.json'))
+DEFAULT_WORKERS = 8                 # scandir is I/O bound, so more threads than cores help on cold caches
+TOP_FILES_PER_DIR = 20              # largest files remembered per directory - the most a top-N query returns
+CACHE_VERSION = 1
+
+DIRECTORIES_SCANNED = counter('jarvis_disk_usage_directories', 'Directories visited by disk usage scans',
+                              ['result'])
+SCAN_SECONDS = histogram('jarvis_disk_usage_scan_seconds', 'Time for one disk usage scan',
+                         buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0))
+
+
+class _DirNode:
+    __slots__ = ('mtime_ns', 'files_size', 'file_count', 'children', 'top_files', 'total', 'total_files')
+
+    def __init__(self, mtime_ns, files_size=0, file_count=0, children=(), top_files=()):
+        self.mtime_ns = mtime_ns
+        self.files_size = files_size        # bytes in files directly inside
+        self.file_count = file_count
+        self.children = list(children)      # names of subdirectories
+        self.top_files = list(top_files)    # [(size, name)] largest direct files, biggest first
+        self.total = files_size             # bytes in the whole subtree, filled in after a scan
+        self.total_files = file_count
+
+    def to_list(self):
+        return [self.mtime_ns, self.files_size, self.file_count, self.children, self.top_files,
+                self.total, self.total_files]
+
+    @classmethod
+    def from_list(cls, data):
+        node = cls(data[0], data[1], data[2], data[3], [tuple(item) for item in data[4]])
+        node.total, node.total_files = data[5], data[6]
+        return node
+
+
+class DiskUsage:
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, max_workers=DEFAULT_WORKERS):
+        """
+        Args:
+            cache_path: JSON tree cache kept between runs; None keeps it in memory only
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_workers = max_workers
+        self._nodes = {}            # directory path -> _DirNode
+        self._scanned = {}          # scanned root -> when it finished
+        self._lock = Lock()
+        self._scan_lock = Lock()
+        self._loaded = False
+        self._thread = None
+        self.stats = {'scans': 0, 'listed': 0, 'reused': 0}
+
+    # ------------------------------------------------------------------
+    # Tree cache
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self._nodes = {path: _DirNode.from_list(node) for path, node in data['nodes'].items()}
+                self._scanned = data.get('scanned', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+            print(f"Disk usage cache not loaded: {e}")
+            self._nodes = {}
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            data = json.dumps({
+                'version': CACHE_VERSION,
+                'scanned': self._scanned,
+                'nodes': {path: node.to_list() for path, node in self._nodes.items()},
+            }, separators=(',', ':'))
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix('.tmp')
+            tmp.write_text(data, encoding='utf-8')
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"Disk usage cache write error: {e}")
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _list(self, path, mtime_ns, device):
+        """Read one directory: sizes of its files and the subdirectories to visit"""
+        files_size = file_count = 0
+        children = []
+        top_files = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat_module.S_ISDIR(st.st_mode):
+                    # Other filesystems (network drives, /proc) are not part of this disk
+                    if st.st_dev == device:
+                        children.append(entry.name)
+                    continue
+                if stat_module.S_ISLNK(st.st_mode):
+                    continue
+                files_size += st.st_size
+                file_count += 1
+                if len(top_files) < TOP_FILES_PER_DIR:
+                    heapq.heappush(top_files, (st.st_size, entry.name))
+                elif st.st_size > top_files[0][0]:
+                    heapq.heapreplace(top_files, (st.st_size, entry.name))
+        top_files.sort(reverse=True)
+        return _DirNode(mtime_ns, files_size, file_count, children, top_files)
+
+    def _visit(self, path, device, full):
+        """(path, node, listed) - the cached node when the directory's mtime is unchanged"""
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            return path, None, False
+        with self._lock:
+            cached = self._nodes.get(path)
+        if cached is not None and cached.mtime_ns == st.st_mtime_ns and not full:
+            # A copy, so queries keep seeing the old totals until the scan swaps the tree in
+            return path, _DirNode(cached.mtime_ns, cached.files_size, cached.file_count, cached.children,
+                                  cached.top_files), False
+        try:
+            return path, self._list(path, st.st_mtime_ns, device), True
+        except OSError:
+            # Unreadable: count it as empty rather than failing the whole scan
+            return path, _DirNode(st.st_mtime_ns), True
+
+    def scan(self, path=None, full=False):
+        """
+        Walk path (default: home) level by level across a thread pool. Directories
+        whose mtime is unchanged keep their cached file sizes, so a rescan costs one
+        stat per directory plus a listing of the ones that changed. A file that grows
+        in place doesn't change its directory's mtime; full=True relists everything.
+        Returns the summary of path
+        """
+        started = time.perf_counter()
+        root = os.path.abspath(os.path.expanduser(str(path or Path.home())))
+        device = os.stat(root).st_dev
+        with self._scan_lock:
+            self._load()
+            visited = {}
+            order = []
+            listed = reused = 0
+            frontier = [root]
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='disk-usage') as pool:
+                while frontier:
+                    next_frontier = []
+                    for directory, node, was_listed in pool.map(lambda d: self._visit(d, device, full), frontier):
+                        if node is None:
+                            continue
+                        visited[directory] = node
+                        order.append(directory)
+                        listed += was_listed
+                        reused += not was_listed
+                        next_frontier.extend(os.path.join(directory, child) for child in node.children)
+                    frontier = next_frontier
+
+            # Children come after their parents in BFS order, so totals add up in reverse
+            for directory in reversed(order):
+                node = visited[directory]
+                node.total, node.total_files = node.files_size, node.file_count
+                for child in node.children:
+                    child_node = visited.get(os.path.join(directory, child))
+                    if child_node is not None:
+                        node.total += child_node.total
+                        node.total_files += child_node.total_files
+                node.children = [child for child in node.children if os.path.join(directory, child) in visited]
+
+            prefix = root.rstrip(os.sep) + os.sep
+            with self._lock:
+                # Directories that vanished from this subtree leave the cache too
+                for stale in [p for p in self._nodes if p.startswith(prefix) and p not in visited]:
+                    del self._nodes[stale]
+                self._nodes.update(visited)
+                self._refresh_ancestors(root)
+                self._scanned[root] = time.time()
+
+            self.stats['scans'] += 1
+            self.stats['listed'] += listed
+            self.stats['reused'] += reused
+            DIRECTORIES_SCANNED.inc(listed, result='listed')
+            DIRECTORIES_SCANNED.inc(reused, result='reused')
+            self._save()
+        SCAN_SECONDS.observe(time.perf_counter() - started)
+        return self.summary(root)
+
+    def _refresh_ancestors(self, path):
+        """Re-add totals up the cached tree above a rescanned subtree; call with the lock held"""
+        child = path
+        parent = os.path.dirname(child)
+        while parent != child and parent in self._nodes:
+            node = self._nodes[parent]
+            node.total, node.total_files = node.files_size, node.file_count
+            for name in node.children:
+                child_node = self._nodes.get(os.path.join(parent, name))
+                if child_node is not None:
+                    node.total += child_node.total
+                    node.total_files += child_node.total_files
+            child, parent = parent, os.path.dirname(parent)
+
+    def start(self, path=None, full=False):
+        """Scan in a background thread unless one is already running"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._thread = Thread(target=self._run_scan, args=(path, full), name='disk-usage', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _run_scan(self, path, full=False):
+        try:
+            self.scan(path, full=full)
+        except OSError as e:
+            print(f"Disk usage scan failed: {e}")
+
+    @property
+    def scanning(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # Queries - answered from the cache
+    # ------------------------------------------------------------------
+
+    def _node(self, path):
+        """Cached node for path, or None if no scan has covered it yet"""
+        self._load()
+        with self._lock:
+            return self._nodes.get(os.path.abspath(os.path.expanduser(str(path))))
+
+    def covered(self, path):
+        return self._node(path) is not None
+
+    def _subtree(self, path):
+        """(path, node) for path and every cached directory below it; call with the lock held"""
+        stack = [path]
+        while stack:
+            directory = stack.pop()
+            node = self._nodes.get(directory)
+            if node is None:
+                continue
+            yield directory, node
+            stack.extend(os.path.join(directory, child) for child in node.children)
+
+    def largest_folders(self, path, limit=10, depth=1):
+        """[(size, path)] for the biggest folders up to depth levels below path"""
+        root = os.path.abspath(os.path.expanduser(str(path)))
+        with self._lock:
+            candidates = []
+            level = [root]
+            for _ in range(depth):
+                below = []
+                for directory in level:
+                    node = self._nodes.get(directory)
+                    if node is not None:
+                        below.extend(os.path.join(directory, child) for child in node.children)
+                candidates.extend((self._nodes[d].total, d) for d in below if d in self._nodes)
+                level = below
+            return heapq.nlargest(limit, candidates)
+
+    def largest_files(self, path, limit=10):
+        """[(size, path)] for the biggest files anywhere below path"""
+        root = os.path.abspath(os.path.expanduser(str(path)))
+        with self._lock:
+            top = heapq.nlargest(limit, ((size, directory, name)
+                                         for directory, node in self._subtree(root)
+                                         for size, name in node.top_files))
+        return [(size, os.path.join(directory, name)) for size, directory, name in top]
+
+    def summary(self, path, limit=10):
+        """Totals and the largest folders and files under path, as a dict for JSON"""
+        root = os.path.abspath(os.path.expanduser(str(path)))
+        node = self._node(root)
+        if node is None:
+            return None
+        return {
+            'path': root,
+            'size': node.total,
+            'files': node.total_files,
+            'folders': [{'path': p, 'size': s} for s, p in self.largest_folders(root, limit)],
+            'largest_files': [{'path': p, 'size': s} for s, p in self.largest_files(root, limit)],
+            'scanned_at': max((t for p, t in self._scanned.items()
+                               if root == p or root.startswith(p.rstrip(os.sep) + os.sep)), default=None),
+        }
+
+
+# "what's taking space in downloads", "what is using up my disk space", "show the biggest files in documents"
+_USAGE_RE = re.compile(r"\b(?:what(?:'s| is)|whats)\s+(?:taking|using|eating|filling)\s+(?:up\s+)?"
+                       r"(?:(?:all\s+)?(?:the|my)\s+)?(?:disk\s+|storage\s+)?(?:space|storage|disk)\b")
+_LARGEST_RE = re.compile(r'\b(?:largest|biggest|heaviest)\s+(files?|folders?|directories)\b')
+_DISK_USAGE_RE = re.compile(r'\b(?:disk|storage|space)\s+usage\b')
+_LOCATION_RE = re.compile(r'\b(?:in|on|under|of)\s+(?:(?:the|my)\s+)?(\w+)(?:\s+folder)?\s*$')
+
+
+def parse_disk_usage_command(text, locations):
+    """
+    ('summary' | 'files' | 'folders', folder) for a disk space question, else None
+    Args:
+        locations: {'downloads': Path, ...} folder names the user can say; 'home' is the default
+    """
+    text = text.strip().lower().rstrip('?.!')
+    largest = _LARGEST_RE.search(text)
+    if largest:
+        kind = 'files' if largest.group(1).startswith('file') else 'folders'
+    elif _USAGE_RE.search(text) or _DISK_USAGE_RE.search(text):
+        kind = 'summary'
+    else:
+        return None
+    match = _LOCATION_RE.search(text)
+    location = match.group(1) if match else None
+    if location in (None, 'disk', 'computer', 'drive', 'storage', 'space', 'mac', 'pc', 'laptop'):
+        return kind, locations['home']
+    folder = locations.get(location) or locations.get(location.rstrip('s'))
+    return (kind, folder) if folder is not None else None
+
+# Global instance
+disk_usage = DiskUsage(max_workers=int(os.environ.get('JARVIS_DISK_USAGE_WORKERS', DEFAULT_WORKERS)))
+
+def disk_usage_summary(path=None, limit=10):
+    """Summary from the cache, scanning first if path hasn't been scanned yet"""
+    path = path or Path.home()
+    return disk_usage.summary(path, limit) or disk_usage.scan(path)
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Duplicate Finder for JARVIS AI Assistant
+Finds identical files in stages so most files are never read in full: same size,
+then the same hash of their first and last 64 KB, then the same full hash.
+Files are read through mmap in a thread pool and hashes are cached by
+(inode, mtime) so a repeat scan reads almost nothing
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Thread, Lock
+
+from instrumentation import counter, histogram
+from operation_journal import operation_journal
+
+DEFAULT_CACHE_PATH = Path(os.getenv('JARVIS_DUPLICATE_CACHE', Path.home() / '.jarvis' / 'duplicate_hashes.json'))
+DEFAULT_ROOTS = [Path.home() / folder for folder in ('Desktop', 'Documents', 'Downloads', 'Pictures')]
+DEFAULT_WORKERS = 4
+PARTIAL_BYTES = 64 * 1024           # read from each end of a file for the partial hash
+HASH_CHUNK = 8 * 1024 * 1024        # bytes hashed per call - hashlib releases the GIL for each
+MIN_SIZE = 1                        # empty files are all "duplicates" of each other, which helps nobody
+CACHE_MAX_AGE = 30 * 24 * 3600      # entries not seen for this long are dropped on save
+RESULT_MAX_AGE = 300                # seconds a finished scan answers repeat questions before a rescan
+SKIPPED_DIRS = {'node_modules', '__pycache__', 'venv', '.venv', 'site-packages'}
+
+BYTES_HASHED = counter('jarvis_duplicate_bytes_hashed', 'Bytes read while hashing for duplicates', ['stage'])
+SCAN_SECONDS = histogram('jarvis_duplicate_scan_seconds', 'Time for one duplicate scan',
+                         buckets=(0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0))
+
+
+def _hash_mapped(path, size, ranges):
+    """blake2b of byte ranges of a memory-mapped file, without copying them"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) != size:
+            raise OSError(f"{path} changed while it was being read")
+        view = memoryview(mm)
+        try:
+            for start, end in ranges:
+                for chunk in range(start, end, HASH_CHUNK):
+                    digest.update(view[chunk:min(chunk + HASH_CHUNK, end)])
+        finally:
+            view.release()
+    return digest.hexdigest()
+
+
+def partial_hash(path, size):
+    """Hash of the first and last PARTIAL_BYTES; the whole file when it is no bigger than both"""
+    if size <= 2 * PARTIAL_BYTES:
+        return full_hash(path, size)
+    return _hash_mapped(path, size, [(0, PARTIAL_BYTES), (size - PARTIAL_BYTES, size)])
+
+
+def full_hash(path, size):
+    return _hash_mapped(path, size, [(0, size)])
+
+
+class _FileInfo:
+    __slots__ = ('path', 'key', 'size', 'mtime_ns')
+
+    def __init__(self, path, key, size, mtime_ns):
+        self.path = path
+        self.key = key              # 'device:inode' - hard links share it
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+
+class DuplicateGroup:
+    __slots__ = ('size', 'digest', 'files')
+
+    def __init__(self, size, digest, files):
+        self.size = size
+        self.digest = digest
+        # The oldest copy is the one kept; shorter paths win ties
+        self.files = sorted(files, key=lambda info: (info.mtime_ns, len(info.path), info.path))
+
+    @property
+    def keep(self):
+        return self.files[0].path
+
+    @property
+    def extras(self):
+        return [info.path for info in self.files[1:]]
+
+    @property
+    def reclaimable(self):
+        return self.size * (len(self.files) - 1)
+
+    def to_dict(self):
+        return {
+            'size': self.size,
+            'hash': self.digest,
+            'keep': self.keep,
+            'duplicates': self.extras,
+            'reclaimable': self.reclaimable,
+        }
+
+
+class DuplicateFinder:
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, max_workers=DEFAULT_WORKERS, journal=None):
+        """
+        Args:
+            cache_path: JSON file of hashes keyed by 'device:inode'; None keeps them in memory only
+            journal: OperationJournal that trashes removed duplicates, so 'undo' brings them back;
+                     defaults to the shared one
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_workers = max_workers
+        self.journal = journal if journal is not None else operation_journal
+        self._lock = Lock()
+        self._cache = {}            # 'device:inode' -> {'mtime_ns', 'size', 'partial', 'full', 'seen'}
+        self._cache_loaded = False
+        self._cache_dirty = False
+        self.last_groups = []
+        self.last_scan = None       # (roots, min_size) of the last finished scan
+        self.scanned_at = None
+        self._thread = None
+        self.stats = {'files': 0, 'partial_hashed': 0, 'full_hashed': 0, 'cache_hits': 0, 'bytes_read': 0}
+
+    # ------------------------------------------------------------------
+    # Hash cache
+    # ------------------------------------------------------------------
+
+    def _load_cache(self):
+        if self._cache_loaded:
+            return
+        self._cache_loaded = True
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self._cache = json.load(f)
+        except (OSError, ValueError):
+            self._cache = {}
+
+    def _save_cache(self):
+        if not self.cache_path or not self._cache_dirty:
+            return
+        cutoff = time.time() - CACHE_MAX_AGE
+        with self._lock:
+            self._cache = {key: entry for key, entry in self._cache.items() if entry.get('seen', 0) >= cutoff}
+            data = json.dumps(self._cache, separators=(',', ':'))
+            self._cache_dirty = False
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix('.tmp')
+            tmp.write_text(data, encoding='utf-8')
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"Duplicate hash cache write error: {e}")
+
+    def _hash(self, info, stage):
+        """Cached partial or full hash of a file; None if it can't be read"""
+        with self._lock:
+            entry = self._cache.get(info.key)
+            if entry is None or entry['mtime_ns'] != info.mtime_ns or entry['size'] != info.size:
+                entry = self._cache[info.key] = {'mtime_ns': info.mtime_ns, 'size': info.size}
+            entry['seen'] = int(time.time())
+            self._cache_dirty = True
+            if entry.get(stage):
+                self.stats['cache_hits'] += 1
+                return entry[stage]
+        try:
+            if stage == 'partial':
+                digest = partial_hash(info.path, info.size)
+                read = min(info.size, 2 * PARTIAL_BYTES)
+            else:
+                digest = full_hash(info.path, info.size)
+                read = info.size
+        except (OSError, ValueError) as e:
+            print(f"Duplicate scan skipped {info.path}: {e}")
+            return None
+        BYTES_HASHED.inc(read, stage=stage)
+        with self._lock:
+            entry[stage] = digest
+            if stage == 'partial' and info.size <= 2 * PARTIAL_BYTES:
+                # The partial hash already covered the whole file
+                entry['full'] = digest
+            self.stats[stage + '_hashed'] += 1
+            self.stats['bytes_read'] += read
+        return digest
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _walk(self, roots, min_size, show_hidden):
+        """One _FileInfo per distinct file (hard links counted once) under roots"""
+        seen = set()
+        stack = [str(root) for root in roots]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if not show_hidden and entry.name.startswith('.'):
+                            continue
+                        try:
+                            if entry.is_symlink():
+                                continue
+                            if entry.is_dir():
+                                if entry.name not in SKIPPED_DIRS:
+                                    stack.append(entry.path)
+                                continue
+                            if not entry.is_file():
+                                continue
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        key = f"{st.st_dev}:{st.st_ino}"
+                        if st.st_size < min_size or key in seen:
+                            continue
+                        seen.add(key)
+                        yield _FileInfo(entry.path, key, st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+
+    def _regroup(self, groups, stage, pool):
+        """Split each group by the stage's hash, keeping only hashes shared by two or more files"""
+        work = [info for group in groups for info in group]
+        digests = pool.map(lambda info: self._hash(info, stage), work)
+        regrouped = {}
+        for info, digest in zip(work, digests):
+            if digest is not None:
+                regrouped.setdefault((info.size, digest), []).append(info)
+        return {key: files for key, files in regrouped.items() if len(files) > 1}
+
+    @staticmethod
+    def _scan_key(roots, min_size):
+        return (tuple(sorted(str(Path(r).expanduser()) for r in (roots or DEFAULT_ROOTS))), max(min_size, 1))
+
+    def find(self, roots=None, min_size=MIN_SIZE, show_hidden=False):
+        """
+        Groups of identical files under roots, most reclaimable space first.
+        Within a group the oldest copy is 'keep' and the rest are 'extras'
+        """
+        started = time.perf_counter()
+        scan_key = self._scan_key(roots, min_size)
+        roots = [Path(r).expanduser() for r in (roots or DEFAULT_ROOTS)]
+        self._load_cache()
+
+        by_size = {}
+        files = 0
+        for info in self._walk(roots, max(min_size, 1), show_hidden):
+            by_size.setdefault(info.size, []).append(info)
+            files += 1
+        candidates = [group for group in by_size.values() if len(group) > 1]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='duplicate-hash') as pool:
+            partial = self._regroup(candidates, 'partial', pool)
+            # Small files were hashed whole already; only the big ones need a second read
+            settled = {key: group for key, group in partial.items() if key[0] <= 2 * PARTIAL_BYTES}
+            unsettled = [group for key, group in partial.items() if key[0] > 2 * PARTIAL_BYTES]
+            settled.update(self._regroup(unsettled, 'full', pool))
+
+        groups = [DuplicateGroup(size, digest, group) for (size, digest), group in settled.items()]
+        groups.sort(key=lambda group: (-group.reclaimable, group.keep))
+        self.last_groups = groups
+        self.last_scan = scan_key
+        self.scanned_at = time.monotonic()
+        self.stats['files'] = files
+        self._save_cache()
+        SCAN_SECONDS.observe(time.perf_counter() - started)
+        return groups
+
+    def start(self, roots=None, min_size=MIN_SIZE):
+        """Scan in a background thread unless one is already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+            self._thread = Thread(target=self._run_find, args=(roots, min_size), name='duplicate-scan', daemon=True)
+            self._thread.start()
+            return self._thread
+
+    def _run_find(self, roots, min_size):
+        try:
+            self.find(roots, min_size)
+        except OSError as e:
+            print(f"Duplicate scan failed: {e}")
+
+    @property
+    def scanning(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def results_for(self, roots=None, min_size=MIN_SIZE):
+        """
+        Groups from the last finished scan if it covered exactly these roots less than
+        RESULT_MAX_AGE seconds ago (minus anything trashed since), else None
+        """
+        if self.scanned_at is None or time.monotonic() - self.scanned_at > RESULT_MAX_AGE:
+            return None
+        if self.last_scan != self._scan_key(roots, min_size):
+            return None
+        return self.last_groups
+
+    # ------------------------------------------------------------------
+    # Reclaiming space
+    # ------------------------------------------------------------------
+
+    def trash_duplicates(self, groups=None, paths=None):
+        """
+        Move duplicate copies to the trash in one journal batch, so a single 'undo'
+        restores them all. Defaults to every extra copy from the last scan; 'paths'
+        limits it to those files. A file is only removed while another copy of it
+        remains and it is unchanged since it was hashed.
+        Returns {'trashed': [...], 'bytes': n, 'errors': [(path, message)]}
+        """
+        groups = self.last_groups if groups is None else groups
+        wanted = {os.path.abspath(p) for p in paths} if paths is not None else None
+        batch = f"dedupe-{int(time.time() * 1000)}"
+        result = {'trashed': [], 'bytes': 0, 'errors': []}
+        for group in groups:
+            remaining = len(group.files)
+            for info in group.files[1:] if wanted is None else group.files:
+                if wanted is not None and info.path not in wanted:
+                    continue
+                if remaining <= 1:
+                    result['errors'].append((info.path, 'it is the last remaining copy'))
+                    continue
+                try:
+                    st = os.stat(info.path)
+                    if st.st_size != info.size or st.st_mtime_ns != info.mtime_ns:
+                        raise OSError('it changed since the scan')
+                    self.journal.trash(info.path, batch=batch)
+                except OSError as e:
+                    result['errors'].append((info.path, getattr(e, 'strerror', None) or str(e)))
+                    continue
+                remaining -= 1
+                result['trashed'].append(info.path)
+                result['bytes'] += info.size
+        trashed = set(result['trashed'])
+        survivors = []
+        for group in self.last_groups:
+            files = [info for info in group.files if info.path not in trashed]
+            if len(files) > 1:
+                survivors.append(DuplicateGroup(group.size, group.digest, files))
+        self.last_groups = survivors
+        return result
+
+# Global instance
+duplicate_finder = DuplicateFinder(max_workers=int(os.environ.get('JARVIS_DUPLICATE_WORKERS', DEFAULT_WORKERS)))
+
+def find_duplicates(roots=None, min_size=MIN_SIZE):
+    return duplicate_finder.find(roots, min_size)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Image Output Pipeline for JARVIS AI Assistant
+Encodes and saves photos and screenshots on a worker pool so capture requests
+return immediately, with JPEG/WebP/PNG options, thumbnails and encode stats
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+
+from instrumentation import counter, histogram
+
+IMAGE_ENCODE_SECONDS = histogram('jarvis_image_encode_seconds', 'Time to encode and write one image', ['format'])
+IMAGE_BYTES = histogram('jarvis_image_bytes', 'Size of saved images', ['format'],
+                        buckets=(50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6, 25e6))
+IMAGE_SAVES = counter('jarvis_image_saves', 'Image saves by format and outcome', ['format', 'status'])
+# Shared by every photo and screenshot path, so each records its frame grab the same way
+CAPTURE_SECONDS = histogram('jarvis_capture_seconds', 'Time to grab a camera frame or screenshot', ['kind'])
+CAPTURES = counter('jarvis_captures', 'Photo and screenshot requests by outcome', ['kind', 'status'])
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+FORMAT_EXTENSIONS = {
+    'jpeg': '.jpg',
+    'jpg': '.jpg',
+    'webp': '.webp',
+    'png': '.png',
+}
+
+DEFAULT_QUALITY = 90
+DEFAULT_PNG_COMPRESS_LEVEL = 1   # zlib level 1 is several times faster than PIL's default 6
+DEFAULT_THUMBNAIL_SIZE = 320
+THUMBNAIL_QUALITY = 80
+
+
+def normalize_format(image_format):
+    image_format = (image_format or 'png').lower().lstrip('.')
+    if image_format not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unsupported image format '{image_format}' - use jpeg, webp or png")
+    return 'jpeg' if image_format == 'jpg' else image_format
+
+
+def _to_pil(image, bgr=True):
+    """PIL image from a PIL image or an OpenCV/NumPy array"""
+    if PIL_AVAILABLE and isinstance(image, Image.Image):
+        return image
+    if not PIL_AVAILABLE:
+        return None
+    array = image
+    if bgr and getattr(array, 'ndim', 0) == 3 and array.shape[2] >= 3:
+        # OpenCV frames are BGR(A)
+        array = array[:, :, [2, 1, 0] + ([3] if array.shape[2] == 4 else [])]
+    return Image.fromarray(array)
+
+
+def encode_image(image, path, image_format='png', quality=DEFAULT_QUALITY,
+                 compress_level=DEFAULT_PNG_COMPRESS_LEVEL, bgr=True):
+    """Write one image to path with PIL, falling back to OpenCV for arrays"""
+    image_format = normalize_format(image_format)
+    pil_image = _to_pil(image, bgr)
+
+    if pil_image is not None:
+        if image_format == 'jpeg':
+            if pil_image.mode not in ('RGB', 'L'):
+                pil_image = pil_image.convert('RGB')
+            pil_image.save(path, format='JPEG', quality=quality, optimize=False)
+        elif image_format == 'webp':
+            pil_image.save(path, format='WEBP', quality=quality, method=4)
+        else:
+            pil_image.save(path, format='PNG', compress_level=compress_level)
+        return pil_image.size
+
+    if CV2_AVAILABLE:
+        params = {
+            'jpeg': [cv2.IMWRITE_JPEG_QUALITY, quality],
+            'webp': [cv2.IMWRITE_WEBP_QUALITY, quality],
+            'png': [cv2.IMWRITE_PNG_COMPRESSION, compress_level],
+        }[image_format]
+        # cv2 picks the codec from the extension, so encode to memory first
+        ok, buffer = cv2.imencode(FORMAT_EXTENSIONS[image_format], image, params)
+        if not ok:
+            raise IOError(f"OpenCV could not encode {image_format}")
+        with open(path, 'wb') as f:
+            f.write(buffer.tobytes())
+        return (image.shape[1], image.shape[0])
+
+    raise RuntimeError("No image encoder available - install Pillow or opencv-python")
+
+
+def make_thumbnail(image, path, max_size=DEFAULT_THUMBNAIL_SIZE, bgr=True):
+    """Small JPEG preview for the UI"""
+    pil_image = _to_pil(image, bgr)
+    if pil_image is not None:
+        thumb = pil_image.copy()
+        thumb.thumbnail((max_size, max_size))
+        return encode_image(thumb, path, 'jpeg', THUMBNAIL_QUALITY)
+
+    height, width = image.shape[:2]
+    scale = max_size / float(max(height, width))
+    if scale < 1:
+        image = cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    return encode_image(image, path, 'jpeg', THUMBNAIL_QUALITY, bgr=bgr)
+
+
+class ImageJob:
+    """Handle for one queued save; path is known before encoding finishes"""
+
+    def __init__(self, path, image_format, thumbnail_path=None):
+        self.path = Path(path)
+        self.name = self.path.name
+        self.format = image_format
+        self.thumbnail_path = Path(thumbnail_path) if thumbnail_path else None
+        self.future = None
+
+    def result(self, timeout=None):
+        """Wait for the encode and return its report"""
+        return self.future.result(timeout)
+
+    def done(self):
+        return self.future.done()
+
+
+class ImageWriter:
+    def __init__(self, max_workers=2, history_size=50, encoder=None):
+        """
+        Args:
+            max_workers: encoder threads - PIL and OpenCV release the GIL while compressing
+            history_size: number of recent save reports kept for the status API
+            encoder: callable(image, path, format, quality, bgr=...) returning (width, height);
+                     defaults to encode_image
+        """
+        self.encoder = encoder or encode_image
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-writer')
+        self._lock = Lock()
+        self.recent = deque(maxlen=history_size)
+        self.pending = 0
+
+    def submit(self, image, directory, stem, image_format='png', quality=DEFAULT_QUALITY,
+               thumbnail=False, bgr=True, on_done=None):
+        """
+        Queue an image for encoding and return an ImageJob immediately
+        Args:
+            image: PIL image or OpenCV (BGR) / NumPy array - not modified afterwards by the caller
+            directory, stem: output location; the extension follows the format
+            image_format: 'jpeg', 'webp' or 'png'
+            thumbnail: also write a small '<stem>_thumb.jpg' preview
+            on_done: callback(report) run on the worker after the file is written
+        """
+        image_format = normalize_format(image_format)
+        directory = Path(directory)
+        path = directory / f"{stem}{FORMAT_EXTENSIONS[image_format]}"
+        thumbnail_path = directory / f"{stem}_thumb.jpg" if thumbnail else None
+        job = ImageJob(path, image_format, thumbnail_path)
+
+        with self._lock:
+            self.pending += 1
+        job.future = self._executor.submit(self._encode, job, image, quality, bgr, on_done)
+        return job
+
+    def _encode(self, job, image, quality, bgr, on_done):
+        start = time.perf_counter()
+        report = {
+            'path': str(job.path),
+            'name': job.name,
+            'format': job.format,
+            'success': False,
+        }
+        try:
+            job.path.parent.mkdir(parents=True, exist_ok=True)
+            # Write under a temporary name so nobody opens a half-written file
+            tmp_path = job.path.with_name(f".{job.name}.part")
+            width, height = self.encoder(image, tmp_path, job.format, quality, bgr=bgr)
+            os.replace(tmp_path, job.path)
+            report.update({
+                'success': True,
+                'width': width,
+                'height': height,
+                'file_size': job.path.stat().st_size,
+                'encode_ms': round((time.perf_counter() - start) * 1000, 1),
+            })
+            IMAGE_ENCODE_SECONDS.observe(report['encode_ms'] / 1000, format=job.format)
+            IMAGE_BYTES.observe(report['file_size'], format=job.format)
+
+            if job.thumbnail_path:
+                make_thumbnail(image, job.thumbnail_path, bgr=bgr)
+                report['thumbnail_path'] = str(job.thumbnail_path)
+        except Exception as e:
+            report['error'] = str(e)
+            print(f"❌ Image save failed for {job.name}: {e}")
+        finally:
+            report['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            IMAGE_SAVES.inc(format=job.format, status='success' if report['success'] else 'error')
+            with self._lock:
+                self.pending -= 1
+                self.recent.append(report)
+
+        if on_done:
+            try:
+                on_done(report)
+            except Exception as e:
+                print(f"Image callback error: {e}")
+        return report
+
+    def recent_reports(self, limit=10):
+        with self._lock:
+            return list(self.recent)[-limit:]
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+# Global instance
+image_writer = ImageWriter()
+
+def save_image_async(image, directory, stem, image_format='png', quality=DEFAULT_QUALITY,
+                     thumbnail=False, bgr=True, on_done=None):
+    return image_writer.submit(image, directory, stem, image_format, quality, thumbnail, bgr, on_done)
@@ -4,8 +4,12 @@ Improved Command Processor for JARVIS AI Assistant
 Handles file operations with better error handling and user interaction
 """
 
+import os
 import re
 from improved_file_operations import file_ops
+from content_index import content_index, parse_content_search
+from bulk_operations import format_size
+from duplicate_finder import duplicate_finder
 
 class ImprovedCommandProcessor:
     def __init__(self):
@@ -27,6 +31,17 @@ class ImprovedCommandProcessor:
         elif self._is_create_folder_command(command_lower):
             return self._handle_create_folder(command_lower, original_command)
         
+        # CONTENT SEARCH COMMANDS - "find the file that mentions invoice 2024"
+        elif self._is_content_search_command(command_lower):
+            return self._handle_content_search(command_lower, original_command)
+        
+        # DUPLICATE FILE COMMANDS - "find duplicate files in downloads", "delete the duplicates"
+        elif self._is_delete_duplicates_command(command_lower):
+            return self._handle_delete_duplicates(command_lower, original_command)
+        
+        elif self._is_find_duplicates_command(command_lower):
+            return self._handle_find_duplicates(command_lower, original_command)
+        
         # FIND FILE COMMANDS
         elif self._is_find_file_command(command_lower):
             return self._handle_find_file(command_lower, original_command)
@@ -53,6 +68,12 @@ class ImprovedCommandProcessor:
         
         return None
     
+    def request_confirmation(self, confirmation_type, data, question):
+        """Ask a yes/no question for another part of JARVIS; 'yes' calls data['confirm']()"""
+        self.awaiting_confirmation = confirmation_type
+        self.confirmation_data = data
+        return question
+    
     def _is_create_file_command(self, command):
         """Check if command is for creating a file"""
         patterns = [
@@ -75,6 +96,31 @@ class ImprovedCommandProcessor:
         ]
         return any(re.search(pattern, command) for pattern in patterns)
     
+    def _is_content_search_command(self, command):
+        """Check if command searches inside documents rather than by file name"""
+        return parse_content_search(command) is not None
+    
+    def _is_find_duplicates_command(self, command):
+        """
+        Check if command is for finding duplicate files - it must name files or a folder,
+        so 'remove duplicates from this list' is left to the AI
+        """
+        patterns = [
+            r'\b(duplicate|identical)\s+(files?|copies|photos|pictures|images|documents|songs|videos)\b',
+            r'\bduplicates?\b.*\b(in|from|on|across)\s+(my\s+|the\s+)?'
+            r'(desktop|documents|downloads|pictures|music|videos|computer|pc|laptop)\b',
+        ]
+        if any(re.search(pattern, command) for pattern in patterns):
+            return True
+        # "delete the duplicates" follows up on a scan that already ran
+        return (re.search(r'\bthe\s+duplicates\b', command) is not None and
+                (duplicate_finder.scanned_at is not None or duplicate_finder.scanning))
+    
+    def _is_delete_duplicates_command(self, command):
+        """Check if command is for removing duplicate files"""
+        return (self._is_find_duplicates_command(command) and
+                re.search(r'\b(delete|remove|trash|clean\s+up|get\s+rid\s+of|reclaim)\b', command) is not None)
+    
     def _is_find_file_command(self, command):
         """Check if command is for finding files"""
         patterns = [
@@ -210,6 +256,78 @@ class ImprovedCommandProcessor:
         else:
             return f"Sorry sir, I couldn't find any files matching '{search_term}'. I searched across all common locations including Desktop, Documents, Downloads, and system directories."
     
+    def _handle_content_search(self, command, original_command):
+        """Handle searches for files by what they contain"""
+        query = parse_content_search(command)
+        if not content_index.ready.is_set():
+            content_index.start()
+            return "I'm still indexing your documents, sir. Please ask me again in a moment."
+        
+        results = content_index.search(query)
+        if not results:
+            return f"Sorry sir, none of your documents mention '{query}'. I searched {len(content_index)} files in Desktop, Documents and Downloads."
+        
+        # Keep the matches so 'open 1' works just like after a file name search
+        self.file_ops.last_search_results = [{'name': r['name'], 'path': r['path'], 'type': 'file'} for r in results]
+        
+        response = f"I found {len(results)} file(s) mentioning '{query}', sir:\n\n"
+        for i, result in enumerate(results, 1):
+            response += f"{i}. 📄 {result['name']}\n   📍 {result['path']}\n"
+            if result['snippet']:
+                response += f"   💬 {result['snippet']}\n"
+            response += "\n"
+        response += "Would you like me to open any of these files, sir? Just say 'open 1' or 'open file 2' to open a specific file."
+        return response
+    
+    def _duplicate_scope(self, command):
+        """(roots, spoken name) for a duplicates command; roots None means the default folders"""
+        location = self._extract_location_from_command(command)
+        if location in self.file_ops.default_locations:
+            return [self.file_ops.default_locations[location]], location.title()
+        return None, "Desktop, Documents, Downloads and Pictures"
+    
+    def _handle_find_duplicates(self, command, original_command):
+        """Handle duplicate file search commands - the scan runs in the background"""
+        roots, where = self._duplicate_scope(command)
+        groups = duplicate_finder.results_for(roots)
+        if groups is None:
+            duplicate_finder.start(roots)
+            return f"I'm comparing the files in {where} now, sir. Ask me again in a moment and I'll tell you what I found."
+        if not groups:
+            return f"Good news, sir. I found no duplicate files in {where}."
+        
+        duplicates = sum(len(group.files) - 1 for group in groups)
+        reclaimable = sum(group.reclaimable for group in groups)
+        response = (f"I found {duplicates} duplicate file(s) in {where}, sir - "
+                    f"{format_size(reclaimable)} could be reclaimed:\n\n")
+        for i, group in enumerate(groups[:10], 1):
+            response += (f"{i}. 📄 {os.path.basename(group.keep)} - {len(group.files)} copies, "
+                         f"{format_size(group.reclaimable)} reclaimable\n   📍 keeping {group.keep}\n\n")
+        if len(groups) > 10:
+            response += f"... and {len(groups) - 10} more groups.\n\n"
+        response += "Say 'delete the duplicates' to move the extra copies to the trash, sir. The oldest copy of each file is kept."
+        return response
+    
+    def _handle_delete_duplicates(self, command, original_command):
+        """Handle duplicate removal - scans first if needed, then asks for confirmation"""
+        roots, where = self._duplicate_scope(command)
+        if roots:
+            groups = duplicate_finder.results_for(roots)
+        else:
+            groups = duplicate_finder.last_groups or duplicate_finder.results_for()
+        if groups is None:
+            duplicate_finder.start(roots)
+            return f"I need to look for duplicates in {where} first, sir. Say 'delete the duplicates' again in a moment."
+        if not groups:
+            return "There are no duplicate files to remove, sir."
+        
+        count = sum(len(group.files) - 1 for group in groups)
+        reclaimable = sum(group.reclaimable for group in groups)
+        self.awaiting_confirmation = 'delete_duplicates'
+        self.confirmation_data = {'count': count}
+        return (f"Shall I move {count} duplicate file(s) to the trash, freeing {format_size(reclaimable)}? "
+                f"The oldest copy of each file is kept, and you can say 'undo' afterwards, sir. (yes/no)")
+    
     def _handle_open_file(self, command, original_command):
         """Handle file opening commands"""
         # Check if it's a number from search results
@@ -307,6 +425,13 @@ class ImprovedCommandProcessor:
             result = self.file_ops.delete_file(data['filename'], data['permanent'])
             return result['message']
         
+        elif confirmation_type == 'bulk_delete' and is_yes:
+            return data['confirm']()
+        
+        elif confirmation_type == 'delete_duplicates' and is_yes:
+            result = self.file_ops.delete_duplicates()
+            return result['message']
+        
         elif is_no:
             return "Understood, sir. Operation cancelled."
         
@@ -6,13 +6,17 @@ Handles create, rename, delete, find, and open file operations with better error
 
 import os
 import shutil
-import subprocess
 import platform
 from pathlib import Path
 from datetime import datetime
-import json
 import webbrowser
 
+from spawn_service import spawn_service
+from operation_journal import operation_journal
+from template_engine import template_engine
+from duplicate_finder import duplicate_finder
+from bulk_operations import format_size
+
 # Detect operating system
 CURRENT_OS = platform.system().lower()
 IS_WINDOWS = CURRENT_OS == 'windows'
@@ -76,6 +80,7 @@ class ImprovedFileOperations:
             success = self._create_file_with_content(file_path, content_type)
             
             if success:
+                operation_journal.record('create', str(file_path), kind='file')
                 return {
                     'success': True,
                     'message': f"✅ Successfully created '{file_path.name}' in {location}",
@@ -103,82 +108,9 @@ class ImprovedFileOperations:
             }
     
     def _create_file_with_content(self, file_path, content_type='auto'):
-        """Create file with appropriate content based on extension"""
+        """Create file from the template for its extension (file_templates/<extension>.tmpl)"""
         try:
-            extension = file_path.suffix.lower()
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            base_name = file_path.stem
-            
-            # Content templates based on file type
-            content_templates = {
-                '.txt': f"# {base_name}\n\nCreated by JARVIS on {current_time}\n\nThis is a text document.\n",
-                '.md': f"# {base_name}\n\n**Created by JARVIS** on {current_time}\n\n## Content\n\nThis is a markdown document.\n\n- Item 1\n- Item 2\n- Item 3\n",
-                '.html': f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{base_name}</title>
-</head>
-<body>
-    <h1>{base_name}</h1>
-    <p>Created by JARVIS on {current_time}</p>
-    <p>This is an HTML document.</p>
-</body>
-</html>""",
-                '.css': f"""/* {base_name} - Created by JARVIS on {current_time} */
-
-body {{
-    font-family: Arial, sans-serif;
-    margin: 0;
-    padding: 20px;
-    background-color: #f5f5f5;
-}}
-
-.container {{
-    max-width: 800px;
-    margin: 0 auto;
-    background: white;
-    padding: 20px;
-    border-radius: 8px;
-    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-}}""",
-                '.js': f"""// {base_name} - Created by JARVIS on {current_time}
-
-console.log('Hello from {base_name}!');
-
-// Your JavaScript code here
-function main() {{
-    console.log('JARVIS created this file on {current_time}');
-}}
-
-main();""",
-                '.py': f"""#!/usr/bin/env python3
-# {base_name} - Created by JARVIS on {current_time}
-
-def main():
-    print("Hello from {base_name}!")
-    print("Created by JARVIS on {current_time}")
-
-if __name__ == "__main__":
-    main()""",
-                '.json': json.dumps({
-                    "name": base_name,
-                    "created_by": "JARVIS",
-                    "created_on": current_time,
-                    "description": "JSON file created by JARVIS",
-                    "data": {}
-                }, indent=2),
-                '.csv': f"Name,Value,Created By,Created On\n{base_name},Sample Data,JARVIS,{current_time}\n"
-            }
-            
-            # Get content or use default
-            content = content_templates.get(extension, content_templates['.txt'])
-            
-            # Write file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
+            template_engine.create(file_path)
             return True
             
         except Exception as e:
@@ -291,6 +223,46 @@ if __name__ == "__main__":
                 'count': 0
             }
     
+    def find_duplicates(self, location=None):
+        """
+        Find identical files in one location, or across Desktop, Documents, Downloads and Pictures
+        """
+        try:
+            roots = [self.default_locations[location]] if location in self.default_locations else None
+            groups = duplicate_finder.find(roots)
+            return {
+                'success': True,
+                'groups': groups,
+                'count': len(groups),
+                'duplicates': sum(len(group.files) - 1 for group in groups),
+                'reclaimable': sum(group.reclaimable for group in groups)
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f"Error searching for duplicate files: {str(e)}",
+                'groups': [],
+                'count': 0
+            }
+    
+    def delete_duplicates(self):
+        """
+        Move the extra copies from the last duplicate scan to the trash, keeping the oldest of each
+        """
+        result = duplicate_finder.trash_duplicates()
+        trashed = len(result['trashed'])
+        if not trashed and result['errors']:
+            return {
+                'success': False,
+                'message': f"I couldn't remove the duplicates, sir: {result['errors'][0][1]}."
+            }
+        message = f"Moved {trashed} duplicate file(s) to the trash, freeing {format_size(result['bytes'])}, sir."
+        if result['errors']:
+            message += f" {len(result['errors'])} file(s) were skipped because they changed or couldn't be moved."
+        if trashed:
+            message += " Say 'undo' to bring them back."
+        return {'success': True, 'message': message, **result}
+    
     def open_file(self, file_path_or_number):
         """
         Open file using system default application
@@ -325,16 +297,8 @@ if __name__ == "__main__":
                     'message': f"File not found: {file_path}"
                 }
             
-            # Open file based on OS
-            if IS_WINDOWS:
-                if Path(file_path).is_dir():
-                    subprocess.run(['explorer', file_path], check=True)
-                else:
-                    os.startfile(file_path)
-            elif IS_MACOS:
-                subprocess.run(['open', file_path], check=True)
-            else:  # Linux
-                subprocess.run(['xdg-open', file_path], check=True)
+            # Launched detached through the spawn service - never waits for the opener
+            spawn_service.open_path(file_path)
             
             return {
                 'success': True,
@@ -342,11 +306,6 @@ if __name__ == "__main__":
                 'path': file_path
             }
             
-        except subprocess.CalledProcessError as e:
-            return {
-                'success': False,
-                'message': f"Failed to open file: {str(e)}"
-            }
         except Exception as e:
             return {
                 'success': False,
@@ -399,49 +358,24 @@ if __name__ == "__main__":
                     shutil.rmtree(file_path)
                 else:
                     path_obj.unlink()
+                operation_journal.record('delete', file_path, kind=item_type)
                 return {
                     'success': True,
                     'message': f"✅ Permanently deleted {item_type} '{file_name}'"
                 }
             else:
-                # Move to trash
+                # Move to trash through the journal, so 'restore' and 'undo' know where it went
                 try:
-                    # Try using send2trash if available
-                    import send2trash
-                    send2trash.send2trash(file_path)
+                    operation_journal.trash(file_path)
+                except OSError as e:
                     return {
-                        'success': True,
-                        'message': f"✅ Moved {item_type} '{file_name}' to trash"
+                        'success': False,
+                        'message': f"Could not move '{file_name}' to trash ({e}). Use permanent deletion if needed."
                     }
-                except ImportError:
-                    # Fallback methods
-                    if IS_MACOS:
-                        # Use AppleScript
-                        script = f'tell application "Finder" to delete POSIX file "{file_path}"'
-                        result = subprocess.run(['osascript', '-e', script], 
-                                              capture_output=True, text=True, timeout=10)
-                        if result.returncode == 0:
-                            return {
-                                'success': True,
-                                'message': f"✅ Moved {item_type} '{file_name}' to trash"
-                            }
-                    
-                    # Manual trash folder method
-                    trash_path = Path.home() / '.Trash' if IS_MACOS else Path.home() / '.local/share/Trash/files'
-                    if trash_path.exists():
-                        import time
-                        timestamp = int(time.time())
-                        trash_item_path = trash_path / f"{file_name}_{timestamp}"
-                        shutil.move(file_path, str(trash_item_path))
-                        return {
-                            'success': True,
-                            'message': f"✅ Moved {item_type} '{file_name}' to trash"
-                        }
-                    else:
-                        return {
-                            'success': False,
-                            'message': f"Could not access trash. Use permanent deletion if needed."
-                        }
+                return {
+                    'success': True,
+                    'message': f"✅ Moved {item_type} '{file_name}' to trash"
+                }
                         
         except PermissionError:
             return {
@@ -497,6 +431,7 @@ if __name__ == "__main__":
                 }
             
             old_path.rename(new_path)
+            operation_journal.record('rename', str(old_path), str(new_path))
             
             return {
                 'success': True,
@@ -543,6 +478,7 @@ if __name__ == "__main__":
                     counter += 1
             
             folder_path.mkdir(parents=True, exist_ok=True)
+            operation_journal.record('create', str(folder_path), kind='folder')
             
             return {
                 'success': True,
@@ -565,78 +501,40 @@ if __name__ == "__main__":
     def take_photo_and_open(self):
         """
         Take a photo and automatically open it
+        Frames come from the shared warm camera session
         """
         try:
             import cv2
+            from camera_manager import camera_manager
+            from image_output import CAPTURE_SECONDS, CAPTURES, image_writer
             
-            # Try different camera indices
-            camera_indices = [0, 1, 2]
-            cam = None
-            
-            for index in camera_indices:
-                try:
-                    cam = cv2.VideoCapture(index)
-                    if cam.isOpened():
-                        ret, test_frame = cam.read()
-                        if ret and test_frame is not None:
-                            break
-                        else:
-                            cam.release()
-                            cam = None
-                except:
-                    if cam:
-                        cam.release()
-                    cam = None
-                    continue
+            with CAPTURE_SECONDS.time(kind='photo'):
+                frame = camera_manager.get_frame()
             
-            if cam is None:
+            if frame is None:
+                CAPTURES.inc(kind='photo', status='no_camera')
                 return {
                     'success': False,
                     'message': "No camera found or camera is not accessible"
                 }
             
-            # Set camera properties
-            cam.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            cam.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+            # Save to Pictures folder; encoding runs on the image writer pool
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            pictures_dir = self.default_locations['pictures']
             
-            # Capture frame
-            ret, frame = cam.read()
+            def open_when_saved(report):
+                if report['success']:
+                    self.open_file(report['path'])
             
-            if ret and frame is not None:
-                # Create filename with timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"JARVIS_photo_{timestamp}.jpg"
-                
-                # Save to Pictures folder
-                pictures_dir = self.default_locations['pictures']
-                pictures_dir.mkdir(parents=True, exist_ok=True)
-                photo_path = pictures_dir / filename
-                
-                # Save the image
-                success = cv2.imwrite(str(photo_path), frame)
-                cam.release()
-                
-                if success:
-                    # Automatically open the photo
-                    open_result = self.open_file(str(photo_path))
-                    
-                    return {
-                        'success': True,
-                        'message': f"✅ Photo captured and opened: {filename}",
-                        'path': str(photo_path),
-                        'opened': open_result['success']
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'message': "Failed to save the captured photo"
-                    }
-            else:
-                cam.release()
-                return {
-                    'success': False,
-                    'message': "Failed to capture photo from camera"
-                }
+            job = image_writer.submit(frame, pictures_dir, f"JARVIS_photo_{timestamp}",
+                                      image_format='jpeg', on_done=open_when_saved)
+            CAPTURES.inc(kind='photo', status='success')
+            
+            return {
+                'success': True,
+                'message': f"✅ Photo captured, opening: {job.name}",
+                'path': str(job.path)
+            }
                 
         except ImportError:
             return {
@@ -644,8 +542,7 @@ if __name__ == "__main__":
                 'message': "Camera functionality not available. Please install opencv-python: pip install opencv-python"
             }
         except Exception as e:
-            if 'cam' in locals() and cam:
-                cam.release()
+            CAPTURES.inc(kind='photo', status='error')
             return {
                 'success': False,
                 'message': f"Error capturing photo: {str(e)}"
@@ -661,6 +558,9 @@ def create_file(filename, location='desktop'):
 def find_files(search_term, max_results=20):
     return file_ops.find_files(search_term, max_results)
 
+def find_duplicates(location=None):
+    return file_ops.find_duplicates(location)
+
 def open_file(file_path_or_number):
     return file_ops.open_file(file_path_or_number)
 
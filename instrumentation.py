@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for JARVIS AI Assistant
+Counters, gauges and histograms with per-thread shards, rendered in the
+Prometheus text exposition format for the /metrics endpoint
+"""
+
+import math
+import time
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock, get_ident
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shards:
+    """
+    One float list per thread; each thread only writes its own list, so
+    updates need no lock. Readers sum the shards at scrape time.
+    """
+
+    def __init__(self, width):
+        self.width = width
+        self._by_thread = {}
+        self._lock = Lock()
+
+    def local(self):
+        shard = self._by_thread.get(get_ident())
+        if shard is None:
+            with self._lock:
+                shard = self._by_thread.setdefault(get_ident(), [0.0] * self.width)
+        return shard
+
+    def totals(self):
+        with self._lock:
+            shards = list(self._by_thread.values())
+        totals = [0.0] * self.width
+        for shard in shards:
+            for i in range(self.width):
+                totals[i] += shard[i]
+        return totals
+
+
+class _CounterChild:
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount=1):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._shards.local()[0] += amount
+
+    @property
+    def value(self):
+        return self._shards.totals()[0]
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._lock = Lock()
+
+    def set(self, value):
+        self._value = float(value)
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self):
+        return self._value
+
+
+class _Timer:
+    """Context manager and decorator that observes elapsed seconds"""
+
+    def __init__(self, child):
+        self._child = child
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(self._child):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # one slot per bucket, one for +Inf, one for the running sum
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value):
+        shard = self._shards.local()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self):
+        return _Timer(self)
+
+    def snapshot(self):
+        """(cumulative bucket counts including +Inf, count, sum)"""
+        totals = self._shards.totals()
+        cumulative = []
+        running = 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1]
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1, **labels):
+        self.labels(**labels).inc(amount)
+
+    def samples(self):
+        for key, child in self._items():
+            yield self.name + '_total', dict(zip(self.labelnames, key)), child.value
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        """function: optional callable returning the value at scrape time"""
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value, **labels):
+        self.labels(**labels).set(value)
+
+    def inc(self, amount=1, **labels):
+        self.labels(**labels).inc(amount)
+
+    def dec(self, amount=1, **labels):
+        self.labels(**labels).dec(amount)
+
+    def samples(self):
+        if self.function is not None:
+            try:
+                yield self.name, {}, float(self.function())
+            except Exception:
+                pass
+            return
+        for key, child in self._items():
+            yield self.name, dict(zip(self.labelnames, key)), child.value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value, **labels):
+        self.labels(**labels).observe(value)
+
+    def time(self, **labels):
+        return self.labels(**labels).time()
+
+    def samples(self):
+        for key, child in self._items():
+            labels = dict(zip(self.labelnames, key))
+            cumulative, count, total = child.snapshot()
+            for bound, value in zip(self.buckets + (math.inf,), cumulative):
+                yield self.name + '_bucket', dict(labels, le=_format_value(bound)), value
+            yield self.name + '_count', labels, count
+            yield self.name + '_sum', labels, total
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    if float(value).is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_sample(name, labels, value):
+    if labels:
+        label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+        return f"{name}{{{label_text}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        return self._register(Gauge, name, documentation, labelnames, function=function)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_collector(self, collector):
+        """
+        collector: callable returning [(name, kind, documentation, [(labels, value)])],
+        used for numbers that live in other modules (cache statistics etc.)
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(_format_sample(name, labels, value) for name, labels, value in metric.samples())
+
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {_escape(documentation)}")
+                lines.append(f"# TYPE {name} {kind}")
+                suffix = '_total' if kind == 'counter' else ''
+                lines.extend(_format_sample(name + suffix, labels, value) for labels, value in samples)
+
+        return '\n'.join(lines) + '\n'
+
+# Global instance
+registry = MetricsRegistry()
+
+def counter(name, documentation, labelnames=()):
+    return registry.counter(name, documentation, labelnames)
+
+def gauge(name, documentation, labelnames=(), function=None):
+    return registry.gauge(name, documentation, labelnames, function)
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return registry.histogram(name, documentation, labelnames, buckets)
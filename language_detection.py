@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Language Detection for JARVIS AI Assistant
+Deterministic English/Hindi/Gujarati detection: Unicode script counts decide
+native-script text in one pass, and a small character n-gram model handles
+romanized text like 'kya time hai' or 'ketla vagya che'
+"""
+
+import math
+from collections import Counter
+from functools import lru_cache
+
+DEVANAGARI = range(0x0900, 0x0980)
+GUJARATI = range(0x0A80, 0x0B00)
+
+NGRAM = 3
+MIN_MARGIN = 0.25      # mean log-likelihood per n-gram a romanized guess must beat English by
+MIN_NGRAMS = 6         # shorter Latin text is always English
+
+# Training sentences for the romanized model - short, command-like, as people type or say them
+TRAINING_TEXT = {
+    'en': [
+        "what time is it", "tell me a joke", "play some music", "turn the volume up",
+        "turn down the volume", "create a new file", "open the documents folder", "what is my name",
+        "how is the weather today", "who are you", "how are you doing", "i need some help",
+        "how much battery is left", "open youtube", "close chrome", "take a photo", "take a screenshot",
+        "remind me tomorrow morning", "set a timer for ten minutes", "what song is this",
+        "sing something nice", "that is great", "thank you", "thanks jarvis", "i did not understand",
+        "say that again", "please repeat that", "i am going home", "what can you do",
+        "search for python tutorials", "delete this file", "yes that is fine", "no thanks",
+        "what is the date today", "turn on the wifi", "is the internet down", "my computer is slow",
+        "what is the latest news", "find the report from last week", "rename the file to final report",
+        "show me my reminders", "what is the capital of france", "explain quantum computing",
+        "who won the match yesterday", "good morning", "good night", "where is my download folder",
+        "mute the sound", "start screen recording", "how many files are on the desktop",
+        "recognize this song", "open spotify and play my playlist", "check the system performance",
+    ],
+    'hi': [
+        "kya time hua hai", "abhi kitne baje hain", "mujhe ek joke sunao", "gaana bajao",
+        "awaaz badhao", "awaz kam karo", "ek file bana do", "folder khol do", "mera naam kya hai",
+        "aaj mausam kaisa hai", "tum kaun ho", "aap kaise ho", "mujhe madad chahiye",
+        "battery kitni bachi hai", "youtube kholo", "chrome band karo", "ek photo khincho",
+        "screenshot le lo", "mujhe kal subah yaad dilana", "das minute ka timer lagao",
+        "ye gaana kaunsa hai", "kuch accha sunao", "bahut badhiya", "dhanyavaad", "shukriya jarvis",
+        "mujhe samajh nahi aaya", "phir se bolo", "kripya dobara boliye", "main ghar ja raha hoon",
+        "aap kya kar sakte ho", "mere liye search karo", "isko delete kar do", "haan theek hai",
+        "nahi chahiye", "kitna baj gaya", "aaj ki tareekh kya hai", "wifi chalu karo",
+        "internet band hai kya", "mera computer dheema chal raha hai", "aur batao kya haal hai",
+        "suprabhat", "shubh ratri", "mera download folder kahan hai", "awaaz band karo",
+        "screen recording shuru karo", "desktop par kitni file hain", "ye gaana pehchano",
+        "spotify kholo aur mera gaana chalao", "system kaisa chal raha hai", "mujhe batao",
+    ],
+    'gu': [
+        "ketla vagya che", "samay shu thayo", "mane ek joke kaho", "gaanu vagado", "avaj vadharo",
+        "avaj ochho karo", "ek file banavo", "folder kholo", "maru naam shu che",
+        "aaje havaman kevu che", "tame kon cho", "kem cho", "majama cho", "mane madad joie che",
+        "battery ketli bachi che", "youtube kholo", "chrome bandh karo", "ek photo lo",
+        "screenshot lai lo", "mane kale savare yaad apavjo", "das minit nu timer muko",
+        "aa gaanu kayu che", "kaik saru sambhdavo", "khub saras", "aabhar", "aabhar jarvis",
+        "mane samjayu nahi", "fari thi bolo", "maherbani kari ne fari bolo", "hu ghare jau chu",
+        "tame shu kari shako cho", "mara mate search karo", "aane delete kari do", "ha barabar che",
+        "nathi joitu", "ketla vagi gaya", "aaje ni tarikh shu che", "wifi chalu karo",
+        "internet bandh che ke", "maru computer dhimu chale che", "biju shu chale che",
+        "suprabhat", "shubh ratri", "maru download folder kya che", "avaj bandh karo",
+        "screen recording chalu karo", "desktop par ketli file che", "aa gaanu olkho",
+        "spotify kholo ane maru gaanu vagado", "system kevu chale che", "mane kaho",
+    ],
+}
+
+
+def _ngrams(text):
+    for word in text.split():
+        padded = f" {word} "
+        for i in range(len(padded) - NGRAM + 1):
+            yield padded[i:i + NGRAM]
+
+
+class RomanizedModel:
+    def __init__(self, training_text=TRAINING_TEXT, smoothing=0.5):
+        """Add-k smoothed character n-gram model per language"""
+        counts = {lang: Counter(g for sentence in sentences for g in _ngrams(sentence))
+                  for lang, sentences in training_text.items()}
+        vocabulary = set().union(*counts.values())
+        size = len(vocabulary) + 1
+        self._log_probs = {}
+        self._unseen = {}
+        for lang, counter in counts.items():
+            total = sum(counter.values()) + smoothing * size
+            self._log_probs[lang] = {g: math.log((c + smoothing) / total) for g, c in counter.items()}
+            self._unseen[lang] = math.log(smoothing / total)
+
+    def _score(self, grams):
+        return {lang: sum(probs.get(g, self._unseen[lang]) for g in grams) / len(grams)
+                for lang, probs in self._log_probs.items()}
+
+    def scores(self, text):
+        """Mean log-likelihood per n-gram for each language"""
+        grams = list(_ngrams(text.lower()))
+        return self._score(grams) if grams else {}
+
+    def classify(self, text, default='en'):
+        """Romanized Hindi/Gujarati only when it clearly beats English"""
+        grams = list(_ngrams(text.lower()))
+        if len(grams) < MIN_NGRAMS:
+            return default
+        scores = self._score(grams)
+        best = max(scores, key=scores.get)
+        if best != default and scores[best] - scores[default] < MIN_MARGIN:
+            return default
+        return best
+
+
+def script_counts(text):
+    """Letters per script in one pass: {'devanagari', 'gujarati', 'latin'}"""
+    devanagari = gujarati = latin = 0
+    for char in text:
+        code = ord(char)
+        if code < 0x80:
+            if char.isalpha():
+                latin += 1
+        elif code in DEVANAGARI:
+            devanagari += 1
+        elif code in GUJARATI:
+            gujarati += 1
+        elif char.isalpha() and code < 0x250:
+            latin += 1
+    return {'devanagari': devanagari, 'gujarati': gujarati, 'latin': latin}
+
+# Global instance
+romanized_model = RomanizedModel()
+
+@lru_cache(maxsize=2048)
+def detect_language(text):
+    """'hi', 'gu' or 'en' - native script wins, romanized text goes through the n-gram model"""
+    counts = script_counts(text)
+    if counts['devanagari'] or counts['gujarati']:
+        return 'hi' if counts['devanagari'] >= counts['gujarati'] else 'gu'
+    if not counts['latin']:
+        return 'en'
+    return romanized_model.classify(text)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Lyrics Index for JARVIS AI Assistant
+Inverted index over a song catalog (titles, artists, lyric snippets) with
+phrase scoring and typo tolerance for identifying songs from lyrics
+"""
+
+import os
+import re
+import csv
+import json
+import math
+from pathlib import Path
+from threading import RLock
+
+import numpy as np
+
+DEFAULT_CATALOG_DIR = Path(os.getenv('JARVIS_SONG_CATALOG', Path.home() / '.jarvis' / 'song_catalog'))
+
+# Field weights - a title word says more about the song than a lyric word
+TITLE_WEIGHT = 3.0
+ARTIST_WEIGHT = 2.0
+LYRICS_WEIGHT = 1.0
+PHRASE_BOOST = 1.5
+TYPO_PENALTY = 0.7
+TITLE_PHRASE_BONUS = 10.0
+ARTIST_PHRASE_BONUS = 4.0
+
+# Terms in more than this share of songs only rescore candidates from rarer terms
+MAX_CANDIDATE_DF_RATIO = 0.02
+MIN_CANDIDATE_DF = 64
+MIN_COVERAGE = 0.35
+MIN_TYPO_LENGTH = 4
+RERANK_SIZE = 10
+
+TOKEN_PATTERN = re.compile(r"[^\s.,!?;:\"“”‘’()\[\]{}\-–—/|]+")
+
+
+def tokenize(text):
+    """Lowercase word tokens; apostrophes are dropped so "i'm" matches "im" """
+    return [token.replace("'", '') for token in TOKEN_PATTERN.findall(text.lower()) if token.strip("'")]
+
+
+def _deletes(word):
+    """All strings one deletion away from word (symmetric-delete typo lookup)"""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def edit_distance(a, b, max_distance=2):
+    """Optimal string alignment distance, stopping early past max_distance"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class _Postings:
+    """Sorted song ids with optional per-song weights for one term"""
+    __slots__ = ('ids', 'weights', 'idf')
+
+    def __init__(self, ids, weights, idf):
+        self.ids = ids
+        self.weights = weights
+        self.idf = idf
+
+
+class _PostingTable:
+    """
+    All postings for one kind of term in flat CSR arrays
+    Keeps a million phrases from turning into a million small numpy arrays
+    """
+
+    def __init__(self, weighted=True, idf_boost=1.0):
+        self.weighted = weighted
+        self.idf_boost = idf_boost
+        self.keys = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.ids = np.empty(0, dtype=np.int32)
+        self.weights = np.empty(0, dtype=np.float32)
+        self.idf = np.empty(0, dtype=np.float32)
+        self._pending_keys = []
+        self._pending_ids = []
+        self._pending_weights = []
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def add(self, key, song_id, weight=1.0):
+        key_id = self.keys.setdefault(key, len(self.keys))
+        self._pending_keys.append(key_id)
+        self._pending_ids.append(song_id)
+        self._pending_weights.append(weight)
+
+    def build(self, total_songs):
+        """Merge pending postings; ids end up sorted within each key"""
+        df = np.diff(self.offsets)
+        old_keys = np.repeat(np.arange(len(df), dtype=np.int64), df)
+        key_ids = np.concatenate([old_keys, np.asarray(self._pending_keys, dtype=np.int64)])
+        song_ids = np.concatenate([self.ids, np.asarray(self._pending_ids, dtype=np.int32)])
+        weights = np.concatenate([self.weights, np.asarray(self._pending_weights, dtype=np.float32)])
+
+        order = np.lexsort((song_ids, key_ids))
+        self.ids = song_ids[order]
+        self.weights = weights[order]
+        counts = np.bincount(key_ids, minlength=len(self.keys))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.idf = (self.idf_boost * np.log1p(total_songs / np.maximum(counts, 1))).astype(np.float32)
+
+        self._pending_keys = []
+        self._pending_ids = []
+        self._pending_weights = []
+
+    def get(self, key):
+        key_id = self.keys.get(key)
+        if key_id is None or key_id + 1 >= len(self.offsets):
+            return None
+        start, end = self.offsets[key_id], self.offsets[key_id + 1]
+        weights = self.weights[start:end] if self.weighted else None
+        return _Postings(self.ids[start:end], weights, float(self.idf[key_id]))
+
+    def document_frequency(self, key):
+        key_id = self.keys[key]
+        return int(self.offsets[key_id + 1] - self.offsets[key_id]) if key_id + 1 < len(self.offsets) else 0
+
+
+class LyricsIndex:
+    def __init__(self, catalog_dir=DEFAULT_CATALOG_DIR):
+        self.catalog_dir = Path(catalog_dir) if catalog_dir else None
+        self.songs = []
+        self._titles = {}
+        self._terms = _PostingTable(weighted=True)
+        self._phrases = _PostingTable(weighted=False, idf_boost=PHRASE_BOOST)
+        self._typo_map = {}
+        self._untyped_tokens = []
+        self._built = False
+        self._loaded = False
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self.songs)
+
+    def add_song(self, title, artist='', lyrics='', youtube_search=None):
+        """Add one song to the catalog; call build() after adding"""
+        title = title.strip()
+        key = title.lower()
+        if not key or (key, artist.lower()) in self._titles:
+            return None
+
+        song_id = len(self.songs)
+        self._titles[(key, artist.lower())] = song_id
+        self.songs.append({
+            'title': key,
+            'artist': artist.strip() or 'Unknown Artist',
+            'lyrics': lyrics.strip(),
+            'youtube_search': youtube_search or f"{artist} {title} official video".strip(),
+        })
+
+        token_weights = {}
+        phrases = set()
+        for field_text, weight in ((title, TITLE_WEIGHT), (artist, ARTIST_WEIGHT), (lyrics, LYRICS_WEIGHT)):
+            tokens = tokenize(field_text)
+            for token in tokens:
+                if weight > token_weights.get(token, 0.0):
+                    token_weights[token] = weight
+            phrases.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+
+        for token, weight in token_weights.items():
+            if token not in self._terms:
+                self._untyped_tokens.append(token)
+            self._terms.add(token, song_id, weight)
+        for phrase in phrases:
+            self._phrases.add(phrase, song_id)
+
+        self._built = False
+        return song_id
+
+    def add_songs(self, songs):
+        """Add songs from dicts with title/artist/lyrics (or keywords) fields"""
+        added = 0
+        for song in songs:
+            lyrics = song.get('lyrics') or ' '.join(song.get('keywords', []))
+            if self.add_song(song.get('title', ''), song.get('artist', ''), lyrics, song.get('youtube_search')) is not None:
+                added += 1
+        return added
+
+    def load_catalog(self, catalog_dir=None):
+        """
+        Load every .csv, .json and .jsonl file in the catalog folder
+        CSV needs title/artist/lyrics columns; JSON may be a list of songs
+        or a {title: {artist, keywords|lyrics}} mapping like the built-in database
+        """
+        folder = Path(catalog_dir) if catalog_dir else self.catalog_dir
+        if not folder or not folder.exists():
+            return 0
+
+        added = 0
+        for path in sorted(folder.iterdir()):
+            suffix = path.suffix.lower()
+            try:
+                if suffix == '.csv':
+                    with open(path, newline='', encoding='utf-8') as f:
+                        added += self.add_songs(csv.DictReader(f))
+                elif suffix == '.jsonl':
+                    with open(path, encoding='utf-8') as f:
+                        added += self.add_songs(json.loads(line) for line in f if line.strip())
+                elif suffix == '.json':
+                    with open(path, encoding='utf-8') as f:
+                        data = json.load(f)
+                    if isinstance(data, dict):
+                        data = [dict(info, title=title) for title, info in data.items()]
+                    added += self.add_songs(data)
+            except (OSError, ValueError) as e:
+                print(f"🎵 Could not load song catalog {path.name}: {e}")
+
+        print(f"🎵 Loaded {added} songs from {folder}")
+        return added
+
+    def build(self):
+        """Freeze pending postings into sorted arrays and extend the typo lookup table"""
+        with self._lock:
+            if self._built:
+                return
+            total = max(1, len(self.songs))
+            self._terms.build(total)
+            self._phrases.build(total)
+
+            for token in self._untyped_tokens:
+                if len(token) >= MIN_TYPO_LENGTH:
+                    for variant in _deletes(token):
+                        self._typo_map.setdefault(variant, []).append(token)
+            self._untyped_tokens = []
+            self._built = True
+
+    def correct_token(self, token):
+        """Closest known word within one or two edits, or None"""
+        if token in self._terms:
+            return token
+        if len(token) < MIN_TYPO_LENGTH:
+            return None
+
+        candidates = set(self._typo_map.get(token, ()))
+        for variant in _deletes(token):
+            if variant in self._terms:
+                candidates.add(variant)
+            candidates.update(self._typo_map.get(variant, ()))
+
+        max_distance = 1 if len(token) < 7 else 2
+        best = None
+        best_key = None
+        for candidate in candidates:
+            distance = edit_distance(token, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            # Prefer closer words, then more common ones
+            key = (distance, -self._terms.document_frequency(candidate))
+            if best_key is None or key < best_key:
+                best, best_key = candidate, key
+        return best
+
+    def search(self, text, limit=5):
+        """
+        Rank songs for a lyrics/title/artist query
+        Returns a list of result dicts, best first
+        """
+        self.ensure_loaded()
+        tokens = tokenize(text)
+        if not tokens or not self.songs:
+            return []
+
+        terms = []
+        query_weight = 0.0
+        resolved = []
+        for token in tokens:
+            word = self.correct_token(token)
+            resolved.append(word)
+            if word is None:
+                # Unknown words still count against coverage
+                query_weight += math.log(1.0 + len(self.songs))
+                continue
+            postings = self._terms.get(word)
+            scale = 1.0 if word == token else TYPO_PENALTY
+            terms.append((postings, scale))
+            query_weight += postings.idf
+
+        for first, second in zip(resolved, resolved[1:]):
+            if first and second:
+                phrase = self._phrases.get(f"{first} {second}")
+                if phrase is not None:
+                    terms.append((phrase, 1.0))
+
+        if not terms:
+            return []
+
+        # Candidates come from selective terms; common ones only rescore them
+        max_df = max(MIN_CANDIDATE_DF, int(len(self.songs) * MAX_CANDIDATE_DF_RATIO))
+        selective = [postings.ids for postings, _ in terms if len(postings.ids) <= max_df]
+        if selective:
+            candidates = np.unique(np.concatenate(selective))
+        else:
+            # Only common terms - songs containing several of them are the candidates
+            by_rarity = sorted((postings.ids for postings, _ in terms), key=len)
+            candidates = by_rarity[0]
+            for ids in by_rarity[1:]:
+                if len(candidates) <= max_df:
+                    break
+                narrowed = np.intersect1d(candidates, ids, assume_unique=True)
+                if len(narrowed) == 0:
+                    break
+                candidates = narrowed
+
+        scores = np.zeros(len(candidates), dtype=np.float32)
+        matched = np.zeros(len(candidates), dtype=np.float32)
+        for postings, scale in terms:
+            positions = np.searchsorted(postings.ids, candidates)
+            positions[positions == len(postings.ids)] = 0
+            hit = postings.ids[positions] == candidates
+            if not np.any(hit):
+                continue
+            weights = postings.weights[positions[hit]] if postings.weights is not None else 1.0
+            scores[hit] += postings.idf * scale * weights
+            if postings.weights is not None:
+                matched[hit] += postings.idf * scale
+
+        top = np.argsort(-scores)[:max(limit, RERANK_SIZE)]
+
+        # Re-rank the short list with exact title/artist phrase checks
+        query_text = ' '.join(tokens)
+        results = []
+        for position in top:
+            if scores[position] <= 0:
+                break
+            song_id = int(candidates[position])
+            song = self.songs[song_id]
+            score = float(scores[position])
+            title_text = ' '.join(tokenize(song['title']))
+            title_match = bool(title_text) and f" {title_text} " in f" {query_text} "
+            if title_match:
+                score += TITLE_PHRASE_BONUS
+            artist_text = ' '.join(tokenize(song['artist']))
+            if artist_text and f" {artist_text} " in f" {query_text} ":
+                score += ARTIST_PHRASE_BONUS
+            results.append({
+                'song_id': song_id,
+                'title': song['title'],
+                'artist': song['artist'],
+                'youtube_search': song['youtube_search'],
+                'score': round(score, 3),
+                'coverage': round(min(1.0, float(matched[position]) / query_weight), 3) if query_weight else 0.0,
+                'title_match': title_match,
+            })
+
+        results.sort(key=lambda result: -result['score'])
+        return results[:limit]
+
+    def best_match(self, text):
+        """Best confident match as (title, info) like the old song database, or (None, None)"""
+        results = self.search(text, limit=1)
+        if results and (results[0]['title_match'] or results[0]['coverage'] >= MIN_COVERAGE):
+            best = results[0]
+            return best['title'], {
+                'artist': best['artist'],
+                'youtube_search': best['youtube_search'],
+                'score': best['score'],
+            }
+        return None, None
+
+    def ensure_loaded(self):
+        """Load the catalog folder once, then build the index"""
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                self.load_catalog()
+            if not self._built:
+                self.build()
+
+# Global instance
+lyrics_index = LyricsIndex()
+
+def search_lyrics(text, limit=5):
+    return lyrics_index.search(text, limit)
+
+def find_song_by_lyrics(text):
+    return lyrics_index.best_match(text)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Metrics Sampler for JARVIS AI Assistant
+Samples CPU, memory, disk, battery and network on a background thread into
+fixed-size ring buffers so status commands answer instantly from memory
+"""
+
+import math
+import os
+import platform
+import time
+from array import array
+from threading import Thread, Event, Lock
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+METRIC_FIELDS = (
+    'cpu_percent',
+    'memory_percent',
+    'memory_available_gb',
+    'disk_percent',
+    'disk_free_gb',
+    'battery_percent',
+    'power_plugged',
+    'net_sent_kbps',
+    'net_recv_kbps',
+)
+
+DEFAULT_INTERVAL = 2.0      # seconds between samples
+DEFAULT_CAPACITY = 1800     # one hour at the default interval
+SUMMARY_WINDOWS = {'1m': 60, '5m': 300, '15m': 900}
+MIN_CPU_WINDOW = 0.1        # seconds of CPU time the first reading must cover to mean anything
+
+GB = 1024 ** 3
+
+
+class RingBuffer:
+    """
+    Fixed-size time series of float rows stored in flat arrays
+    Missing values are stored as NaN and skipped by summaries
+    """
+
+    def __init__(self, capacity, fields):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        width = len(self.fields)
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity * width))
+        self._next = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp, sample):
+        """Store one sample dict; fields missing from it become NaN"""
+        width = len(self.fields)
+        slot = self._next
+        self._times[slot] = timestamp
+        base = slot * width
+        for i, field in enumerate(self.fields):
+            value = sample.get(field)
+            self._values[base + i] = math.nan if value is None else float(value)
+        self._next = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _slots(self, since=None):
+        """Slot numbers from oldest to newest, optionally only those at or after since"""
+        start = (self._next - self.count) % self.capacity
+        slots = [(start + i) % self.capacity for i in range(self.count)]
+        if since is not None:
+            # Times are monotonic, so drop the old prefix
+            for position, slot in enumerate(slots):
+                if self._times[slot] >= since:
+                    return slots[position:]
+            return []
+        return slots
+
+    def latest(self):
+        if not self.count:
+            return None
+        slot = (self._next - 1) % self.capacity
+        return self._row(slot)
+
+    def _row(self, slot):
+        width = len(self.fields)
+        row = {'timestamp': self._times[slot]}
+        for i, field in enumerate(self.fields):
+            value = self._values[slot * width + i]
+            row[field] = None if math.isnan(value) else value
+        return row
+
+    def series(self, field, since=None):
+        """[(timestamp, value)] for one field"""
+        column = self.fields.index(field)
+        width = len(self.fields)
+        return [(self._times[slot], self._values[slot * width + column])
+                for slot in self._slots(since)
+                if not math.isnan(self._values[slot * width + column])]
+
+    def summary(self, since=None):
+        """{field: {'min', 'avg', 'max'}} over the samples at or after since"""
+        slots = self._slots(since)
+        width = len(self.fields)
+        result = {'samples': len(slots)}
+        for column, field in enumerate(self.fields):
+            values = [self._values[slot * width + column] for slot in slots]
+            values = [v for v in values if not math.isnan(v)]
+            if values:
+                result[field] = {
+                    'min': round(min(values), 2),
+                    'avg': round(sum(values) / len(values), 2),
+                    'max': round(max(values), 2),
+                }
+            else:
+                result[field] = None
+        return result
+
+
+def _disk_root():
+    return os.environ.get('SystemDrive', 'C:') + '\\' if platform.system() == 'Windows' else '/'
+
+
+class PsutilCollector:
+    """Reads one sample from psutil without blocking"""
+
+    def __init__(self):
+        self.disk_path = _disk_root()
+        self._last_net = None
+        self._cpu_primed_at = None
+        if PSUTIL_AVAILABLE:
+            # Prime the CPU counter - the first non-blocking call always returns 0.0
+            psutil.cpu_percent(interval=None)
+            self._cpu_primed_at = time.monotonic()
+
+    def __call__(self):
+        if self._cpu_primed_at is not None:
+            # A reading straight after priming covers a few microseconds and is noise
+            time.sleep(max(0.0, self._cpu_primed_at + MIN_CPU_WINDOW - time.monotonic()))
+            self._cpu_primed_at = None
+        sample = {'cpu_percent': psutil.cpu_percent(interval=None)}
+
+        memory = psutil.virtual_memory()
+        sample['memory_percent'] = memory.percent
+        sample['memory_available_gb'] = memory.available / GB
+
+        try:
+            disk = psutil.disk_usage(self.disk_path)
+            sample['disk_percent'] = disk.percent
+            sample['disk_free_gb'] = disk.free / GB
+        except OSError:
+            pass
+
+        try:
+            battery = psutil.sensors_battery()
+        except Exception:
+            battery = None
+        if battery:
+            sample['battery_percent'] = battery.percent
+            sample['power_plugged'] = 1.0 if battery.power_plugged else 0.0
+
+        try:
+            net = psutil.net_io_counters()
+        except Exception:
+            net = None
+        if net:
+            now = time.monotonic()
+            if self._last_net:
+                last_time, last_sent, last_recv = self._last_net
+                elapsed = max(now - last_time, 1e-6)
+                sample['net_sent_kbps'] = (net.bytes_sent - last_sent) / 1024 / elapsed
+                sample['net_recv_kbps'] = (net.bytes_recv - last_recv) / 1024 / elapsed
+            self._last_net = (now, net.bytes_sent, net.bytes_recv)
+
+        return sample
+
+
+class MetricsSampler:
+    def __init__(self, interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY, collector=None):
+        """
+        Args:
+            interval: seconds between samples
+            capacity: samples kept per metric (older ones are overwritten)
+            collector: callable returning a dict of METRIC_FIELDS values; defaults to psutil
+        """
+        self.interval = interval
+        self.buffer = RingBuffer(capacity, METRIC_FIELDS)
+        self._collector = collector
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        self._static_info = None
+        self.errors = 0
+
+    @property
+    def available(self):
+        return PSUTIL_AVAILABLE or self._collector is not None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background sampler once"""
+        with self._lock:
+            if self.running or not self.available:
+                return self.running
+            if self._collector is None:
+                self._collector = PsutilCollector()
+            self._stop.clear()
+            self._thread = Thread(target=self._loop, name='metrics-sampler', daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def _loop(self):
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            self.sample_now()
+            next_time += self.interval
+            # Don't try to catch up after a suspend - just carry on from now
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                next_time = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+    def sample_now(self):
+        """Take one sample immediately and store it"""
+        try:
+            sample = self._collector()
+        except Exception as e:
+            self.errors += 1
+            if self.errors <= 3:
+                print(f"⚠️ Metrics sample failed: {e}")
+            return None
+        with self._lock:
+            # Monotonic, so windows survive wall-clock jumps; reported times are converted back
+            self.buffer.append(time.monotonic(), sample)
+        return sample
+
+    def latest(self):
+        """Most recent sample, taking one synchronously if the sampler has not run yet"""
+        self.start()
+        with self._lock:
+            row = self.buffer.latest()
+        if row is None and self._collector is not None:
+            self.sample_now()
+            with self._lock:
+                row = self.buffer.latest()
+        if row is not None:
+            row['timestamp'] += time.time() - time.monotonic()
+        return row
+
+    def summary(self, window_seconds=300):
+        """min/avg/max per metric over the last window_seconds"""
+        with self._lock:
+            return self.buffer.summary(time.monotonic() - window_seconds)
+
+    def summaries(self, windows=None):
+        windows = windows or SUMMARY_WINDOWS
+        return {name: self.summary(seconds) for name, seconds in windows.items()}
+
+    def series(self, field, window_seconds=300):
+        with self._lock:
+            points = self.buffer.series(field, time.monotonic() - window_seconds)
+        offset = time.time() - time.monotonic()
+        return [(timestamp + offset, value) for timestamp, value in points]
+
+    def static_info(self):
+        """Platform facts that never change while the app runs - computed once"""
+        if self._static_info is None:
+            info = {
+                'os': platform.system(),
+                'os_version': platform.version(),
+                'architecture': platform.architecture()[0],
+                'processor': platform.processor(),
+                'hostname': platform.node(),
+                'python_version': platform.python_version(),
+            }
+            if PSUTIL_AVAILABLE:
+                info['cpu_count'] = psutil.cpu_count()
+                info['memory_total'] = round(psutil.virtual_memory().total / GB, 2)
+            self._static_info = info
+        return self._static_info
+
+# Global instance
+metrics_sampler = MetricsSampler(
+    interval=float(os.environ.get('JARVIS_METRICS_INTERVAL', DEFAULT_INTERVAL)),
+    capacity=int(os.environ.get('JARVIS_METRICS_CAPACITY', DEFAULT_CAPACITY))
+)
+
+def get_latest_metrics():
+    return metrics_sampler.latest()
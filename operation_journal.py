@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Operation Journal for JARVIS AI Assistant
+Append-only record of every create, rename, move, copy and delete with its
+original path, so the last operations can be undone and trashed items restored
+to exactly where they came from by name
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+from itertools import count
+from pathlib import Path
+from threading import Thread, RLock
+
+from instrumentation import counter
+from time_parser import parse_number
+from trash_store import FolderTrash, free_path, trash_store
+
+DEFAULT_JOURNAL_PATH = Path.home() / '.jarvis' / 'operations.jsonl'
+OPERATIONS = ('create', 'rename', 'move', 'copy', 'delete')
+MAX_HISTORY = 1000            # finished operations kept after compaction; restorable deletes are always kept
+COMPACT_MIN_RECORDS = 2000    # journal lines before a background compaction is considered
+
+# "undo", "undo that", "undo the last 3 operations", "undo last two changes"
+UNDO_RE = re.compile(r'^undo(?:\s+(?:that|it|this))?(?:\s+(?:the\s+)?last)?(.*?)'
+                     r'(?:\s*\b(?:file\s+)?(?:operations?|changes?|actions?))?\s*$')
+
+FILE_OPERATIONS = counter('jarvis_file_operations', 'File operations recorded in the journal', ['operation'])
+UNDOS = counter('jarvis_file_undos', 'Journal undo and restore attempts by outcome', ['status'])
+
+
+class JournalEntry:
+    __slots__ = ('seq', 'op', 'path', 'target', 'kind', 'time', 'batch', 'undoable', 'undone')
+
+    def __init__(self, seq, op, path, target=None, kind='file', created=None, batch=None, undoable=True,
+                 undone=False):
+        self.seq = seq
+        self.op = op
+        self.path = path            # original location
+        self.target = target        # where it went: new name, copy, or trash location; None if gone for good
+        self.kind = kind
+        self.time = created if created is not None else time.time()
+        self.batch = batch          # entries sharing a batch (a bulk job) are undone together
+        self.undoable = undoable
+        self.undone = undone
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    @property
+    def restorable(self):
+        return self.op == 'delete' and self.target is not None and not self.undone
+
+    def to_dict(self):
+        return {
+            'seq': self.seq,
+            'op': self.op,
+            'path': self.path,
+            'target': self.target,
+            'kind': self.kind,
+            'time': self.time,
+            'batch': self.batch,
+            'undoable': self.undoable,
+            'undone': self.undone,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['seq'], data['op'], data['path'], data.get('target'), data.get('kind', 'file'),
+                   data.get('time'), data.get('batch'), data.get('undoable', True), data.get('undone', False))
+
+
+class UndoError(Exception):
+    pass
+
+
+class OperationJournal:
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, trash=None, max_history=MAX_HISTORY):
+        """
+        Args:
+            path: append-only JSONL journal; None keeps everything in memory
+            trash: FreeDesktopTrash, RecycleBinTrash or FolderTrash that trash() moves items into, or a directory
+                   for a FolderTrash; defaults to the desktop's trash
+            max_history: finished operations kept when the journal is compacted
+        """
+        self.path = Path(path) if path else None
+        if trash is None:
+            trash = trash_store
+        self.trash_store = FolderTrash(trash) if isinstance(trash, (str, Path)) else trash
+        self.max_history = max_history
+        self.entries = {}           # seq -> JournalEntry, oldest first
+        self._stack = []            # seqs that can still be undone, newest last
+        self._deleted = {}          # lowercase original name -> seqs of restorable deletes
+        self._seq = count(1)
+        self._lock = RLock()
+        self._file = None
+        self._records = 0
+        self._compacting = None     # lines written while a compaction runs, else None
+        self._compactor = None
+        self.stats = {'recorded': 0, 'undone': 0, 'compactions': 0}
+        if self.path:
+            self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        last = 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line after a crash - everything before it is valid
+                    continue
+                if record.get('op') == 'record':
+                    entry = JournalEntry.from_dict(record['entry'])
+                    self.entries[entry.seq] = entry
+                    last = max(last, entry.seq)
+                elif record.get('op') == 'undone' and record.get('seq') in self.entries:
+                    self.entries[record['seq']].undone = True
+                self._records += 1
+        self._seq = count(last + 1)
+        for entry in self.entries.values():
+            self._index(entry)
+
+    def _write(self, record):
+        if not self.path:
+            return
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(line)
+        self._file.flush()
+        self._records += 1
+        if self._compacting is not None:
+            self._compacting.append(line)
+        elif self._records > max(COMPACT_MIN_RECORDS, 2 * len(self.entries)):
+            self.compact()
+
+    def _survivors(self):
+        """Entries worth keeping: recent live operations plus every restorable delete"""
+        live = [e for e in self.entries.values() if not e.undone]
+        recent = set(e.seq for e in live[-self.max_history:])
+        return [e for e in live if e.seq in recent or e.restorable]
+
+    def compact(self, wait=False):
+        """Rewrite the journal without undone and expired operations, on a background thread"""
+        with self._lock:
+            if self._compacting is not None:
+                compactor = self._compactor
+            else:
+                keep = self._survivors()
+                self.entries = {e.seq: e for e in keep}
+                self._rebuild_indexes()
+                if not self.path:
+                    return
+                snapshot = [json.dumps({'op': 'record', 'entry': e.to_dict()}, separators=(',', ':'),
+                                       ensure_ascii=False) + '\n' for e in keep]
+                self._compacting = []
+                compactor = self._compactor = Thread(target=self._rewrite, args=(snapshot,),
+                                                     name='journal-compact', daemon=True)
+                compactor.start()
+        if wait and compactor is not None:
+            compactor.join()
+
+    def _rewrite(self, snapshot):
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(snapshot)
+            with self._lock:
+                # Lines appended since the snapshot go on the end before the swap
+                with open(tmp_path, 'a', encoding='utf-8') as f:
+                    f.writelines(self._compacting)
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                os.replace(tmp_path, self.path)
+                self._records = len(snapshot) + len(self._compacting)
+                self.stats['compactions'] += 1
+        except OSError as e:
+            print(f"❌ Operation journal compaction failed: {e}")
+        finally:
+            with self._lock:
+                self._compacting = None
+
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+
+    def _index(self, entry):
+        if entry.undone:
+            return
+        if entry.undoable:
+            self._stack.append(entry.seq)
+        if entry.restorable:
+            self._deleted.setdefault(entry.name.lower(), []).append(entry.seq)
+
+    def _unindex(self, entry):
+        seqs = self._deleted.get(entry.name.lower())
+        if seqs and entry.seq in seqs:
+            seqs.remove(entry.seq)
+            if not seqs:
+                del self._deleted[entry.name.lower()]
+
+    def _rebuild_indexes(self):
+        self._stack = []
+        self._deleted = {}
+        for entry in self.entries.values():
+            self._index(entry)
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(self, op, path, target=None, kind=None, batch=None, undoable=True):
+        """Journal an operation that already happened"""
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{op}'")
+        path = os.path.abspath(path)
+        if target is not None:
+            target = os.path.abspath(target)
+        if kind is None:
+            existing = target if op != 'delete' and target else path
+            kind = 'folder' if os.path.isdir(existing) else 'file'
+        with self._lock:
+            entry = JournalEntry(next(self._seq), op, path, target, kind, batch=batch, undoable=undoable)
+            self.entries[entry.seq] = entry
+            self._index(entry)
+            self._write({'op': 'record', 'entry': entry.to_dict()})
+            self.stats['recorded'] += 1
+        FILE_OPERATIONS.inc(operation=op)
+        return entry
+
+    def trash(self, path, batch=None, undoable=True):
+        """Move path into the trash and journal where it went, so it can be restored exactly"""
+        path = os.path.abspath(path)
+        if not os.path.lexists(path):
+            raise FileNotFoundError(path)
+        kind = 'folder' if os.path.isdir(path) else 'file'
+        target = self.trash_store.trash(path)
+        return self.record('delete', path, target, kind, batch, undoable)
+
+    # ------------------------------------------------------------------
+    # Undo and restore
+    # ------------------------------------------------------------------
+
+    def _reverse(self, entry, destination=None):
+        """Undo one entry on disk; raises UndoError when that isn't possible"""
+        if entry.op == 'delete':
+            if entry.target is None:
+                raise UndoError(f"'{entry.name}' was deleted permanently")
+            if not os.path.lexists(entry.target):
+                raise UndoError(f"'{entry.name}' is no longer in the trash")
+            return self.trash_store.restore(entry.target, destination or free_path(entry.path))
+        if entry.op in ('rename', 'move'):
+            if not os.path.lexists(entry.target):
+                raise UndoError(f"'{os.path.basename(entry.target)}' no longer exists")
+            if os.path.lexists(entry.path):
+                raise UndoError(f"something else is now at {entry.path}")
+            os.makedirs(os.path.dirname(entry.path), exist_ok=True)
+            shutil.move(entry.target, entry.path)
+            return entry.path
+        # create and copy: the new item goes to the trash, never straight to deletion
+        created = entry.path if entry.op == 'create' else entry.target
+        if not os.path.lexists(created):
+            raise UndoError(f"'{os.path.basename(created)}' no longer exists")
+        self.trash(created, undoable=False)
+        return created
+
+    def _mark_undone(self, entry):
+        entry.undone = True
+        self._unindex(entry)
+        self._write({'op': 'undone', 'seq': entry.seq})
+
+    def undo(self, n=1):
+        """
+        Reverse the last n operations, newest first - a bulk job counts as one.
+        Returns [(entry, error)] with error None for each entry that was undone
+        """
+        results = []
+        with self._lock:
+            for _ in range(n):
+                batch = None
+                while self._stack:
+                    entry = self.entries.get(self._stack[-1])
+                    if entry is None or entry.undone:
+                        self._stack.pop()
+                        continue
+                    if batch is not None and entry.batch != batch:
+                        break
+                    self._stack.pop()
+                    try:
+                        self._reverse(entry)
+                        error = None
+                    except (UndoError, OSError) as e:
+                        error = str(e)
+                    # Irreversible entries are consumed too, so the next undo moves on
+                    self._mark_undone(entry)
+                    UNDOS.inc(status='error' if error else 'ok')
+                    if not error:
+                        self.stats['undone'] += 1
+                    results.append((entry, error))
+                    if entry.batch is None:
+                        break
+                    batch = entry.batch
+                if not self._stack:
+                    break
+        return results
+
+    def find_deleted(self, name, limit=10):
+        """Restorable deletes by original name, newest first - exact names before partial ones"""
+        key = name.strip().lower()
+        with self._lock:
+            seqs = list(self._deleted.get(key, ()))
+            if not seqs:
+                # Name without its extension, then a substring of the name
+                seqs = [s for k, group in self._deleted.items()
+                        if os.path.splitext(k)[0] == key for s in group]
+            if not seqs:
+                seqs = [s for k, group in self._deleted.items() if key in k for s in group]
+            return [self.entries[s] for s in sorted(seqs, reverse=True)[:limit]]
+
+    def restore(self, entry, destination=None):
+        """Put a trashed item back where it was deleted from (or at destination); returns its new path"""
+        with self._lock:
+            if isinstance(entry, int):
+                entry = self.entries.get(entry)
+            if entry is None or not entry.restorable:
+                UNDOS.inc(status='error')
+                raise UndoError("That item can't be restored")
+            try:
+                restored = self._reverse(entry, destination)
+            except OSError as e:
+                UNDOS.inc(status='error')
+                raise UndoError(str(e))
+            self._mark_undone(entry)
+            UNDOS.inc(status='ok')
+            return restored
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    def history(self, limit=20, include_undone=False):
+        with self._lock:
+            entries = [e for e in self.entries.values() if include_undone or not e.undone]
+        return [e.to_dict() for e in entries[-limit:][::-1]]
+
+    def undoable_count(self):
+        with self._lock:
+            return sum(1 for seq in self._stack if seq in self.entries and not self.entries[seq].undone)
+
+    def close(self):
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def describe(entry):
+    """Short spoken description of a journal entry"""
+    name = entry.name
+    if entry.op in ('rename', 'move') and entry.target:
+        return f"{entry.op} of '{name}' to '{os.path.basename(entry.target)}'"
+    return f"{entry.op} of '{name}'"
+
+def parse_undo_command(text):
+    """Number of operations an 'undo ...' command asks for, or None if it isn't one"""
+    match = UNDO_RE.match(text.strip().lower())
+    if not match:
+        return None
+    count_text = match.group(1).strip()
+    if not count_text:
+        return 1
+    n = int(parse_number(count_text))
+    return n if n > 0 else None
+
+# Global instance
+operation_journal = OperationJournal(os.environ.get('JARVIS_OPERATIONS_JOURNAL', DEFAULT_JOURNAL_PATH),
+                                     os.environ.get('JARVIS_TRASH_DIR'))
+
+def record_operation(op, path, target=None, kind=None):
+    return operation_journal.record(op, path, target, kind)
+
+def undo_operations(n=1):
+    return operation_journal.undo(n)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Sampling Profiler for JARVIS AI Assistant
+Samples the stacks of running threads at a fixed interval and reports them as
+flamegraph-compatible collapsed stacks, without restarting the app
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from threading import Thread, Event, Lock, get_ident, enumerate as enumerate_threads
+
+DEFAULT_INTERVAL = 0.005   # seconds between samples
+DEFAULT_DURATION = 10.0
+MAX_DURATION = 300.0
+MIN_INTERVAL = 0.001       # anything shorter just spins the sampler thread
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        self._stacks = Counter()
+        self._labels = {}
+        self.samples = 0
+        self.settings = {}
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration=DEFAULT_DURATION, interval=DEFAULT_INTERVAL,
+              include_lines=False, thread_prefix=None):
+        """
+        Begin sampling for duration seconds; previous results are discarded
+        Args:
+            interval: seconds between samples
+            include_lines: label frames with line numbers (finer but noisier graphs)
+            thread_prefix: only sample threads whose name starts with this
+        Returns False if a profile is already running
+        """
+        duration = min(max(float(duration), 0.1), MAX_DURATION)
+        interval = min(max(float(interval), MIN_INTERVAL), duration)
+        with self._lock:
+            if self.running:
+                return False
+            self._stacks = Counter()
+            self._labels = {}
+            self.samples = 0
+            self.settings = {'duration': duration, 'interval': interval,
+                             'include_lines': include_lines, 'thread_prefix': thread_prefix}
+            self.started_at = time.time()
+            self.finished_at = None
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _frame_label(self, frame):
+        code = frame.f_code
+        if self.settings['include_lines']:
+            return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)})"
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        own_id = get_ident()
+        interval = self.settings['interval']
+        prefix = self.settings['thread_prefix']
+        deadline = time.monotonic() + self.settings['duration']
+
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in enumerate_threads()}
+            frames = sys._current_frames()
+            batch = []
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                name = names.get(thread_id, f"thread-{thread_id}")
+                if prefix and not name.startswith(prefix):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_label(frame))
+                    frame = frame.f_back
+                stack.append(name)
+                batch.append(';'.join(reversed(stack)))
+            del frames
+
+            with self._lock:
+                self._stacks.update(batch)
+                self.samples += 1
+            self._stop.wait(interval)
+
+        self.finished_at = time.time()
+
+    def collapsed(self, min_count=1):
+        """Collapsed stacks ('thread;outer;inner count' per line) for flamegraph.pl / speedscope"""
+        with self._lock:
+            items = sorted(self._stacks.items(), key=lambda item: -item[1])
+        return '\n'.join(f"{stack} {count}" for stack, count in items if count >= min_count) + '\n'
+
+    def top_functions(self, limit=20):
+        """Functions by how often they were the innermost frame"""
+        leaves = Counter()
+        with self._lock:
+            for stack, count in self._stacks.items():
+                leaves[stack.rsplit(';', 1)[-1]] += count
+        return leaves.most_common(limit)
+
+    def status(self):
+        return {
+            'running': self.running,
+            'samples': self.samples,
+            'unique_stacks': len(self._stacks),
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            **self.settings
+        }
+
+# Global instance
+profiler = SamplingProfiler()
+
+def profile_for(duration=DEFAULT_DURATION, interval=DEFAULT_INTERVAL, **options):
+    """Run the profiler for duration seconds and return the collapsed stacks"""
+    if not profiler.start(duration, interval, **options):
+        return None
+    profiler.wait()
+    return profiler.collapsed()
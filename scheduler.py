@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Scheduler for JARVIS AI Assistant
+Runs every timer and reminder from one thread with a min-heap of deadlines,
+with cancel, snooze, recurring schedules and an on-disk journal
+"""
+
+import heapq
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from pathlib import Path
+from threading import Thread, Condition
+
+DEFAULT_STORE_PATH = Path.home() / '.jarvis' / 'schedule.jsonl'
+COMPACT_MIN_RECORDS = 1000    # don't bother compacting tiny journals
+RECENT_FIRED = 20             # fired tasks kept so they can still be snoozed
+
+
+class ScheduledTask:
+    __slots__ = ('id', 'due', 'message', 'kind', 'repeat', 'created', 'snoozes', 'version')
+
+    def __init__(self, task_id, due, message, kind='reminder', repeat=None, created=None, snoozes=0):
+        self.id = task_id
+        self.due = due
+        self.message = message
+        self.kind = kind
+        self.repeat = repeat
+        self.created = created if created is not None else time.time()
+        self.snoozes = snoozes
+        # Bumped on every reschedule so stale heap entries can be skipped
+        self.version = 0
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'due': self.due,
+            'message': self.message,
+            'kind': self.kind,
+            'repeat': self.repeat,
+            'created': self.created,
+            'snoozes': self.snoozes,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['id'], data['due'], data['message'], data.get('kind', 'reminder'),
+                   data.get('repeat'), data.get('created'), data.get('snoozes', 0))
+
+
+class Scheduler:
+    def __init__(self, store_path=DEFAULT_STORE_PATH, dispatcher=None, max_dispatch_workers=2, autostart=False):
+        """
+        Args:
+            store_path: append-only journal of schedule changes; None keeps everything in memory
+            dispatcher: callable(task) run when a task is due, e.g. speak + notify
+            max_dispatch_workers: threads running dispatchers, so a long TTS call
+                                  never delays the next deadline
+            autostart: start the scheduler thread on the first add or restored task
+                       instead of waiting for start()
+        """
+        self.store_path = Path(store_path) if store_path else None
+        self.dispatcher = dispatcher
+        self.tasks = {}
+        self.recent = deque(maxlen=RECENT_FIRED)
+        self._heap = []
+        self._seq = count()
+        self._next_id = 1
+        self._cond = Condition()
+        self._thread = None
+        self._running = False
+        self._journal = None
+        self._journal_records = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_dispatch_workers, thread_name_prefix='scheduler-dispatch')
+        self.stats = {'fired': 0, 'late': 0}
+        self.autostart = autostart
+        # The journal is replayed (and compacted) on first use rather than here, so a
+        # process that imports the scheduler but never uses it leaves the file alone
+        self._loaded = not self.store_path
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self):
+        """Replay the journal once; call with the lock held"""
+        if not self._loaded:
+            self._loaded = True
+            self._load()
+
+    def restore(self):
+        """Load saved tasks now, starting the thread if any are pending and autostart is on"""
+        with self._cond:
+            self._ensure_loaded()
+            pending = len(self.tasks)
+        if pending and self.autostart:
+            self.start()
+        return pending
+
+    def _load(self):
+        """Replay the journal, then rewrite it with only the live tasks"""
+        if not self.store_path.exists():
+            return
+        with open(self.store_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line after a crash - everything before it is valid
+                    continue
+                op = record.get('op')
+                if op in ('add', 'update'):
+                    task = ScheduledTask.from_dict(record['task'])
+                    self.tasks[task.id] = task
+                    self._next_id = max(self._next_id, task.id + 1)
+                elif op == 'remove':
+                    self.tasks.pop(record['id'], None)
+
+        for task in self.tasks.values():
+            heapq.heappush(self._heap, (task.due, next(self._seq), task.id, task.version))
+        self._compact()
+
+    def _write(self, record):
+        if not self.store_path:
+            return
+        if self._journal is None:
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.store_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._journal.flush()
+        self._journal_records += 1
+        if self._journal_records > max(COMPACT_MIN_RECORDS, 4 * len(self.tasks)):
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the journal as one 'add' per live task"""
+        if not self.store_path:
+            return
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.store_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for task in self.tasks.values():
+                f.write(json.dumps({'op': 'add', 'task': task.to_dict()}, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.store_path)
+        self._journal_records = len(self.tasks)
+
+    # ------------------------------------------------------------------
+    # Scheduling API
+    # ------------------------------------------------------------------
+
+    def _push(self, task):
+        heapq.heappush(self._heap, (task.due, next(self._seq), task.id, task.version))
+        # Wake the loop only if this became the earliest deadline
+        if self._heap[0][2] == task.id:
+            self._cond.notify()
+
+    def add(self, message, delay=None, at=None, kind='reminder', repeat=None):
+        """
+        Schedule a task - O(log n)
+        Args:
+            delay: seconds from now, or
+            at: absolute epoch time
+            repeat: seconds between recurrences, None for one-shot
+        """
+        if at is None:
+            if delay is None:
+                raise ValueError("Either delay or at is required")
+            at = time.time() + float(delay)
+        if repeat is not None and repeat <= 0:
+            raise ValueError("repeat must be a positive number of seconds")
+
+        with self._cond:
+            self._ensure_loaded()
+            task = ScheduledTask(self._next_id, float(at), message, kind, repeat)
+            self._next_id += 1
+            self.tasks[task.id] = task
+            self._push(task)
+            self._write({'op': 'add', 'task': task.to_dict()})
+        if self.autostart:
+            self.start()
+        return task
+
+    def cancel(self, task_id):
+        """Cancel a pending task - O(1); its heap entry is skipped when reached"""
+        with self._cond:
+            self._ensure_loaded()
+            task = self.tasks.pop(task_id, None)
+            if task is None:
+                return None
+            self._write({'op': 'remove', 'id': task_id})
+            if len(self._heap) > 2 * len(self.tasks) + COMPACT_MIN_RECORDS:
+                self._rebuild_heap()
+        return task
+
+    def _rebuild_heap(self):
+        """Drop entries left behind by cancels and snoozes - O(n)"""
+        self._heap = [(t.due, next(self._seq), t.id, t.version) for t in self.tasks.values()]
+        heapq.heapify(self._heap)
+
+    def snooze(self, task_id, seconds):
+        """Push a pending task back, or bring a recently fired one back, by seconds from now"""
+        with self._cond:
+            self._ensure_loaded()
+            task = self.tasks.get(task_id)
+            if task is None:
+                task = next((t for t in self.recent if t.id == task_id), None)
+                if task is None:
+                    return None
+                self.tasks[task.id] = task
+            task.due = time.time() + float(seconds)
+            task.snoozes += 1
+            task.version += 1
+            self._push(task)
+            self._write({'op': 'update', 'task': task.to_dict()})
+        if self.autostart:
+            self.start()
+        return task
+
+    def get(self, task_id):
+        with self._cond:
+            self._ensure_loaded()
+            return self.tasks.get(task_id)
+
+    def pending(self, limit=None, kind=None):
+        """Pending tasks ordered by due time"""
+        with self._cond:
+            self._ensure_loaded()
+            tasks = [t for t in self.tasks.values() if kind is None or t.kind == kind]
+        if limit:
+            return heapq.nsmallest(limit, tasks, key=lambda t: t.due)
+        return sorted(tasks, key=lambda t: t.due)
+
+    def last_fired(self, kind=None):
+        for task in reversed(self.recent):
+            if kind is None or task.kind == kind:
+                return task
+        return None
+
+    def __len__(self):
+        with self._cond:
+            self._ensure_loaded()
+            return len(self.tasks)
+
+    # ------------------------------------------------------------------
+    # Scheduler thread
+    # ------------------------------------------------------------------
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._ensure_loaded()
+            self._running = True
+            self._thread = Thread(target=self._loop, name='scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self._executor.shutdown(wait=False)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _pop_due(self, now):
+        """(task, scheduled time) pairs that are due, rescheduling recurring ones; call with the lock held"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, task_id, version = heapq.heappop(self._heap)
+            task = self.tasks.get(task_id)
+            if task is None or task.version != version:
+                continue    # cancelled or rescheduled since this entry was pushed
+            due.append((task, task.due))
+            if task.repeat:
+                # Skip occurrences missed while the app was closed
+                while task.due <= now:
+                    task.due += task.repeat
+                task.version += 1
+                heapq.heappush(self._heap, (task.due, next(self._seq), task.id, task.version))
+                self._write({'op': 'update', 'task': task.to_dict()})
+            else:
+                del self.tasks[task_id]
+                self.recent.append(task)
+                self._write({'op': 'remove', 'id': task_id})
+        return due
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                now = time.time()
+                due = self._pop_due(now)
+                if not due:
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    # Re-check at least every minute so clock changes are noticed
+                    self._cond.wait(min(timeout, 60.0) if timeout is not None else 60.0)
+                    continue
+
+            for task, scheduled_for in due:
+                self.stats['fired'] += 1
+                if now - scheduled_for > 5:
+                    self.stats['late'] += 1
+                if self.dispatcher:
+                    self._executor.submit(self._dispatch, task)
+
+    def _dispatch(self, task):
+        try:
+            self.dispatcher(task)
+        except Exception as e:
+            print(f"⏰ Scheduled task {task.id} failed: {e}")
+
+# Global instance
+scheduler = Scheduler(os.environ.get('JARVIS_SCHEDULE_PATH', DEFAULT_STORE_PATH))
+
+def schedule(message, delay=None, at=None, kind='reminder', repeat=None):
+    return scheduler.add(message, delay, at, kind, repeat)
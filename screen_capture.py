@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Screen Capture for JARVIS AI Assistant
+Region, window and per-monitor screenshots, plus a lightweight screen recorder
+that stores only the tiles that changed since the previous frame
+"""
+
+import json
+import platform
+import subprocess
+import time
+from pathlib import Path
+from threading import Thread, Event, Lock
+
+import numpy as np
+
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+try:
+    import pyautogui
+    PYAUTOGUI_AVAILABLE = True
+except Exception:
+    PYAUTOGUI_AVAILABLE = False
+
+DEFAULT_TILE_SIZE = 64
+DEFAULT_KEYFRAME_INTERVAL = 150   # frames between full snapshots
+DEFAULT_RECORD_INTERVAL = 1.0     # seconds between recorded frames
+ACTIVE_WINDOW = ':active'         # window= value meaning whichever window has focus
+
+
+# ---------------------------------------------------------------------------
+# Screen geometry
+# ---------------------------------------------------------------------------
+
+def list_monitors():
+    """
+    Physical monitors as dicts with left/top/width/height, numbered from 1
+    Falls back to a single monitor the size of the primary screen
+    """
+    if MSS_AVAILABLE:
+        with mss.mss() as sct:
+            # mss.monitors[0] is the combined virtual screen
+            return [dict(m) for m in sct.monitors[1:]]
+    if PYAUTOGUI_AVAILABLE:
+        width, height = pyautogui.size()
+        return [{'left': 0, 'top': 0, 'width': width, 'height': height}]
+    return []
+
+
+def find_active_window():
+    """Bounding box (left, top, width, height) of the focused window"""
+    if PYAUTOGUI_AVAILABLE and hasattr(pyautogui, 'getActiveWindow'):
+        window = pyautogui.getActiveWindow()
+        if window is not None and window.width > 0 and window.height > 0:
+            return (window.left, window.top, window.width, window.height)
+        return None
+
+    if platform.system() == 'Linux':
+        try:
+            geometry = subprocess.run(['xdotool', 'getactivewindow', 'getwindowgeometry', '--shell'],
+                                      capture_output=True, text=True, timeout=2).stdout
+            values = dict(line.split('=', 1) for line in geometry.splitlines() if '=' in line)
+            return (int(values['X']), int(values['Y']), int(values['WIDTH']), int(values['HEIGHT']))
+        except (OSError, subprocess.SubprocessError, KeyError, ValueError):
+            return None
+    return None
+
+
+def find_window(title):
+    """Bounding box (left, top, width, height) of the first window whose title contains title"""
+    if title == ACTIVE_WINDOW:
+        return find_active_window()
+    title_lower = title.lower()
+
+    if PYAUTOGUI_AVAILABLE and hasattr(pyautogui, 'getAllWindows'):
+        # pygetwindow backs this on Windows and macOS
+        for window in pyautogui.getAllWindows():
+            if title_lower in (window.title or '').lower() and window.width > 0 and window.height > 0:
+                return (window.left, window.top, window.width, window.height)
+        return None
+
+    if platform.system() == 'Linux':
+        try:
+            ids = subprocess.run(['xdotool', 'search', '--onlyvisible', '--name', title],
+                                 capture_output=True, text=True, timeout=2).stdout.split()
+            if not ids:
+                return None
+            geometry = subprocess.run(['xdotool', 'getwindowgeometry', '--shell', ids[0]],
+                                      capture_output=True, text=True, timeout=2).stdout
+            values = dict(line.split('=', 1) for line in geometry.splitlines() if '=' in line)
+            return (int(values['X']), int(values['Y']), int(values['WIDTH']), int(values['HEIGHT']))
+        except (OSError, subprocess.SubprocessError, KeyError, ValueError):
+            return None
+    return None
+
+
+def grab(region=None, monitor=None, window=None):
+    """
+    Capture part of the screen as an RGB uint8 array (height, width, 3)
+    Args:
+        region: (left, top, width, height) in virtual-screen coordinates
+        monitor: 1-based monitor number
+        window: window title (substring match), or ACTIVE_WINDOW for the focused one
+    With no arguments the whole virtual screen is captured.
+    """
+    if window:
+        region = find_window(window)
+        if region is None:
+            if window == ACTIVE_WINDOW:
+                raise LookupError("Couldn't find the active window")
+            raise LookupError(f"No visible window matching '{window}'")
+    elif monitor is not None:
+        monitors = list_monitors()
+        if not 1 <= int(monitor) <= len(monitors):
+            raise LookupError(f"Monitor {monitor} not found - {len(monitors)} available")
+        m = monitors[int(monitor) - 1]
+        region = (m['left'], m['top'], m['width'], m['height'])
+
+    if MSS_AVAILABLE:
+        with mss.mss() as sct:
+            if region:
+                left, top, width, height = region
+                area = {'left': int(left), 'top': int(top), 'width': int(width), 'height': int(height)}
+            else:
+                area = sct.monitors[0]
+            shot = sct.grab(area)
+            # BGRA -> RGB
+            return np.asarray(shot)[:, :, 2::-1].copy()
+
+    if PYAUTOGUI_AVAILABLE:
+        image = pyautogui.screenshot(region=tuple(int(v) for v in region) if region else None)
+        return np.asarray(image.convert('RGB'))
+
+    raise RuntimeError("No screen capture backend available - install mss or pyautogui")
+
+
+# ---------------------------------------------------------------------------
+# Tile delta recording
+# ---------------------------------------------------------------------------
+
+def _pad_to_tiles(frame, tile_size):
+    height, width = frame.shape[:2]
+    pad_h = -height % tile_size
+    pad_w = -width % tile_size
+    if pad_h or pad_w:
+        pad = [(0, pad_h), (0, pad_w)] + [(0, 0)] * (frame.ndim - 2)
+        frame = np.pad(frame, pad)
+    return frame
+
+
+def _tile_view(frame, tile_size):
+    """(rows, cols, tile, tile, channels) view of a padded frame"""
+    height, width = frame.shape[:2]
+    channels = frame.shape[2] if frame.ndim == 3 else 1
+    return (frame.reshape(height // tile_size, tile_size, width // tile_size, tile_size, channels)
+                 .swapaxes(1, 2))
+
+
+def changed_tiles(previous, current, tile_size=DEFAULT_TILE_SIZE, threshold=0):
+    """
+    Boolean (rows, cols) mask of tiles that differ between two padded frames
+    threshold ignores per-pixel differences up to that value (e.g. capture noise)
+    """
+    if threshold:
+        diff = np.abs(current.astype(np.int16) - previous.astype(np.int16)) > threshold
+    else:
+        diff = current != previous
+    return _tile_view(diff, tile_size).any(axis=(2, 3, 4))
+
+
+class TileDeltaRecorder:
+    """
+    Stores a sequence of frames as periodic keyframes plus changed tiles
+    Each stored entry holds the tile coordinates and pixels that changed, so a
+    mostly static screen costs almost nothing per frame.
+    """
+
+    def __init__(self, output_dir=None, tile_size=DEFAULT_TILE_SIZE,
+                 keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, threshold=0):
+        """
+        Args:
+            output_dir: write one .npz per frame there; None keeps entries in memory
+            tile_size: tile edge in pixels
+            keyframe_interval: store a full frame every N frames (0 = first frame only)
+            threshold: per-pixel difference ignored when detecting changes
+        """
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.tile_size = tile_size
+        self.keyframe_interval = keyframe_interval
+        self.threshold = threshold
+
+        self.entries = []
+        self.frame_count = 0
+        self.shape = None
+        self._previous = None
+        self.stats = {'frames': 0, 'keyframes': 0, 'tiles_stored': 0, 'tiles_total': 0, 'bytes': 0}
+
+        if self.output_dir:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def add_frame(self, frame, timestamp=None):
+        """Record one frame; returns the number of tiles stored for it"""
+        frame = np.ascontiguousarray(frame)
+        if self.shape is None:
+            self.shape = frame.shape
+        elif frame.shape != self.shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match recording shape {self.shape}")
+
+        padded = _pad_to_tiles(frame, self.tile_size)
+        tiles = _tile_view(padded, self.tile_size)
+        rows, cols = tiles.shape[:2]
+
+        keyframe = (self._previous is None or
+                    (self.keyframe_interval and self.frame_count % self.keyframe_interval == 0))
+        if keyframe:
+            mask = np.ones((rows, cols), dtype=bool)
+        else:
+            mask = changed_tiles(self._previous, padded, self.tile_size, self.threshold)
+
+        index = np.argwhere(mask).astype(np.int32)
+        entry = {
+            'keyframe': bool(keyframe),
+            'timestamp': time.time() if timestamp is None else timestamp,
+            'index': index,
+            'tiles': tiles[mask].copy(),
+        }
+        self._store(entry)
+
+        # Keep our own copy - capture backends may reuse their frame buffer
+        self._previous = padded.copy() if padded is frame else padded
+        self.frame_count += 1
+        self.stats['frames'] += 1
+        self.stats['keyframes'] += int(keyframe)
+        self.stats['tiles_stored'] += len(index)
+        self.stats['tiles_total'] += rows * cols
+        self.stats['bytes'] += entry['tiles'].nbytes + index.nbytes
+        return len(index)
+
+    def _store(self, entry):
+        if self.output_dir is None:
+            self.entries.append(entry)
+            return
+        if self.frame_count == 0:
+            meta = {'shape': list(self.shape), 'dtype': str(np.dtype(entry['tiles'].dtype)),
+                    'tile_size': self.tile_size}
+            (self.output_dir / 'recording.json').write_text(json.dumps(meta))
+        np.savez(self.output_dir / f"frame_{self.frame_count:06d}.npz",
+                 keyframe=entry['keyframe'], timestamp=entry['timestamp'],
+                 index=entry['index'], tiles=entry['tiles'])
+
+    @property
+    def changed_ratio(self):
+        return self.stats['tiles_stored'] / self.stats['tiles_total'] if self.stats['tiles_total'] else 0.0
+
+    def frames(self):
+        """Reconstruct the recorded frames in order"""
+        if self.output_dir is None:
+            return replay(self.entries, self.shape, self.tile_size)
+        return load_recording(self.output_dir)
+
+
+def replay(entries, shape, tile_size):
+    """Yield full frames from keyframe/delta entries"""
+    height, width = shape[:2]
+    canvas = None
+    for entry in entries:
+        if canvas is None:
+            padded_shape = (height + (-height % tile_size), width + (-width % tile_size)) + tuple(shape[2:])
+            canvas = np.zeros(padded_shape, dtype=entry['tiles'].dtype)
+        view = _tile_view(canvas, tile_size)
+        index = entry['index']
+        if len(index):
+            view[index[:, 0], index[:, 1]] = entry['tiles']
+        yield canvas[:height, :width].reshape(shape).copy()
+
+
+def load_recording(output_dir):
+    """Yield full frames from a recording directory written by TileDeltaRecorder"""
+    output_dir = Path(output_dir)
+    meta = json.loads((output_dir / 'recording.json').read_text())
+
+    def entries():
+        for path in sorted(output_dir.glob('frame_*.npz')):
+            with np.load(path) as data:
+                yield {'keyframe': bool(data['keyframe']), 'index': data['index'], 'tiles': data['tiles']}
+
+    return replay(entries(), tuple(meta['shape']), meta['tile_size'])
+
+
+class ScreenRecorder:
+    """Captures the screen periodically into a TileDeltaRecorder on a background thread"""
+
+    def __init__(self, capture=None):
+        """
+        Args:
+            capture: callable(region=, monitor=, window=) returning an RGB frame; defaults to grab
+        """
+        self.capture = capture or grab
+        self.recorder = None
+        self._thread = None
+        self._stop = Event()
+        self._lock = Lock()
+        self.settings = {}
+        self.started_at = None
+        self.last_error = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, output_dir, interval=DEFAULT_RECORD_INTERVAL, tile_size=DEFAULT_TILE_SIZE,
+              region=None, monitor=None, window=None, threshold=0):
+        with self._lock:
+            if self.running:
+                return False
+            self.recorder = TileDeltaRecorder(output_dir, tile_size=tile_size, threshold=threshold)
+            self.settings = {'interval': interval, 'region': region, 'monitor': monitor, 'window': window,
+                             'output_dir': str(output_dir) if output_dir else None}
+            self.started_at = time.time()
+            self.last_error = None
+            self._stop.clear()
+            self._thread = Thread(target=self._loop, name='screen-recorder', daemon=True)
+            self._thread.start()
+        return True
+
+    def _loop(self):
+        interval = self.settings['interval']
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                frame = self.capture(region=self.settings['region'], monitor=self.settings['monitor'],
+                                     window=self.settings['window'])
+                self.recorder.add_frame(frame)
+            except Exception as e:
+                # A window that closed or a resized screen ends the recording
+                self.last_error = str(e)
+                print(f"🎥 Screen recording stopped: {e}")
+                break
+            next_time += interval
+            self._stop.wait(max(0.0, next_time - time.monotonic()))
+
+    def stop(self):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5.0)
+        return self.status()
+
+    def status(self):
+        recorder = self.recorder
+        return {
+            'running': self.running,
+            'frames': recorder.stats['frames'] if recorder else 0,
+            'changed_ratio': round(recorder.changed_ratio, 4) if recorder else 0.0,
+            'bytes': recorder.stats['bytes'] if recorder else 0,
+            'duration': round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+            'error': self.last_error,
+            **self.settings
+        }
+
+# Global instance
+screen_recorder = ScreenRecorder()
+
+def capture_screen(region=None, monitor=None, window=None):
+    return grab(region=region, monitor=monitor, window=window)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Spawn Service for JARVIS AI Assistant
+Launches detached apps and file openers through a small helper process (a fork
+server) so request handlers return immediately; children are reaped in the
+background and their exit status is kept for inspection
+"""
+
+import json
+import os
+import select
+import subprocess
+import sys
+import time
+from collections import deque
+from itertools import count
+from pathlib import Path
+from threading import Thread, Lock
+
+from instrumentation import counter
+
+IS_WINDOWS = sys.platform.startswith('win')
+IS_MACOS = sys.platform == 'darwin'
+HISTORY_SIZE = 100          # finished children kept for /api/processes
+REAP_INTERVAL = 0.25        # seconds between exit checks while children are alive
+
+SPAWNS = counter('jarvis_spawns', 'Processes launched through the spawn service by outcome', ['status'])
+
+
+class SpawnedProcess:
+    __slots__ = ('id', 'argv', 'pid', 'status', 'returncode', 'error', 'started_at', 'ended_at', 'on_exit', 'helper')
+
+    def __init__(self, spawn_id, argv, on_exit=None):
+        self.id = spawn_id
+        self.argv = argv
+        self.pid = None
+        self.status = 'starting'    # starting -> running -> exited, or failed
+        self.returncode = None
+        self.error = None
+        self.started_at = time.time()
+        self.ended_at = None
+        self.on_exit = on_exit
+        self.helper = None          # the helper Popen that launched it, None if spawned directly
+
+    @property
+    def done(self):
+        return self.status in ('exited', 'failed')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'argv': self.argv,
+            'pid': self.pid,
+            'status': self.status,
+            'returncode': self.returncode,
+            'error': self.error,
+            'started_at': self.started_at,
+            'ended_at': self.ended_at,
+            'via': 'direct' if self.helper is None else 'helper',
+        }
+
+
+def _popen_detached(argv, cwd=None):
+    options = {'stdin': subprocess.DEVNULL, 'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL, 'cwd': cwd}
+    if IS_WINDOWS:
+        options['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        # Own session: no terminal signals from JARVIS, and it outlives the helper
+        options['start_new_session'] = True
+    return subprocess.Popen(argv, **options)
+
+
+def serve(requests=sys.stdin, events=sys.stdout):
+    """
+    Helper process loop: one JSON request per line in ({id, argv, cwd}), one JSON
+    event per line out ({id, pid} on start, {id, returncode} on exit, {id, error})
+    """
+    children = {}
+    fd = requests.fileno()
+    buffer = b''
+
+    def emit(event):
+        events.write(json.dumps(event) + '\n')
+        events.flush()
+
+    while True:
+        timeout = REAP_INTERVAL if children else None
+        readable, _, _ = select.select([fd], [], [], timeout)
+        if readable:
+            # Raw reads, so no request sits unseen in a file object's buffer
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return    # parent closed the pipe; children keep running
+            buffer += chunk
+            *lines, buffer = buffer.split(b'\n')
+            for line in lines:
+                request = json.loads(line)
+                try:
+                    proc = _popen_detached(request['argv'], request.get('cwd'))
+                except (OSError, ValueError) as e:
+                    emit({'id': request['id'], 'error': f"{type(e).__name__}: {e}"})
+                    continue
+                children[request['id']] = proc
+                emit({'id': request['id'], 'pid': proc.pid})
+
+        for spawn_id, proc in list(children.items()):
+            returncode = proc.poll()
+            if returncode is not None:
+                del children[spawn_id]
+                emit({'id': spawn_id, 'returncode': returncode})
+
+
+class SpawnService:
+    def __init__(self, use_helper=not IS_WINDOWS, history_size=HISTORY_SIZE):
+        """
+        Args:
+            use_helper: launch through the fork-server helper; otherwise (and on
+                        Windows, or if the helper can't start) spawn directly and
+                        reap from a background thread
+        """
+        self.use_helper = use_helper
+        self._lock = Lock()
+        self._ids = count(1)
+        self._live = {}
+        self._history = deque(maxlen=history_size)
+        self._helper = None
+        self._reader = None
+        self._direct = {}
+        self._reaper = None
+        self.stats = {'spawned': 0, 'failed': 0, 'helper_starts': 0}
+
+    # ------------------------------------------------------------------
+    # Helper process
+    # ------------------------------------------------------------------
+
+    def _ensure_helper(self):
+        """Start the helper if needed; call with the lock held. False if unavailable"""
+        if self._helper is not None and self._helper.poll() is None:
+            return True
+        try:
+            self._helper = subprocess.Popen(
+                [sys.executable, '-u', str(Path(__file__).resolve()), '--serve'],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        except OSError as e:
+            print(f"⚠️ Spawn helper unavailable, launching directly: {e}")
+            self.use_helper = False
+            return False
+        self.stats['helper_starts'] += 1
+        self._reader = Thread(target=self._read_events, args=(self._helper,), name='spawn-events', daemon=True)
+        self._reader.start()
+        return True
+
+    def _read_events(self, helper):
+        for line in helper.stdout:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            with self._lock:
+                record = self._live.get(event.get('id'))
+            if record is None:
+                continue
+            if 'pid' in event:
+                record.pid = event['pid']
+                record.status = 'running'
+            elif 'error' in event:
+                self._finish(record, error=event['error'])
+            elif 'returncode' in event:
+                self._finish(record, returncode=event['returncode'])
+
+        # Helper exited: nothing it launched can be tracked any more
+        with self._lock:
+            orphaned = [r for r in self._live.values() if r.helper is helper]
+        for record in orphaned:
+            self._finish(record, error='spawn helper exited')
+
+    # ------------------------------------------------------------------
+    # Direct spawning fallback
+    # ------------------------------------------------------------------
+
+    def _spawn_direct(self, record, cwd):
+        try:
+            proc = _popen_detached(record.argv, cwd)
+        except (OSError, ValueError) as e:
+            self._finish(record, error=f"{type(e).__name__}: {e}")
+            return
+        record.pid = proc.pid
+        record.status = 'running'
+        with self._lock:
+            self._direct[record.id] = proc
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper = Thread(target=self._reap_direct, name='spawn-reaper', daemon=True)
+                self._reaper.start()
+
+    def _reap_direct(self):
+        while True:
+            time.sleep(REAP_INTERVAL)
+            with self._lock:
+                if not self._direct:
+                    self._reaper = None
+                    return
+                finished = [(i, p.returncode) for i, p in self._direct.items() if p.poll() is not None]
+                for spawn_id, _ in finished:
+                    del self._direct[spawn_id]
+                records = [(self._live.get(i), code) for i, code in finished]
+            for record, returncode in records:
+                if record is not None:
+                    self._finish(record, returncode=returncode)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def _finish(self, record, returncode=None, error=None):
+        with self._lock:
+            if record.done:
+                return
+            record.returncode = returncode
+            record.error = error
+            record.status = 'failed' if error and record.pid is None else 'exited'
+            record.ended_at = time.time()
+            self._live.pop(record.id, None)
+            self._history.append(record)
+            if record.status == 'failed':
+                self.stats['failed'] += 1
+        if error:
+            SPAWNS.inc(status='failed' if record.status == 'failed' else 'lost')
+        else:
+            SPAWNS.inc(status='ok' if returncode == 0 else 'nonzero')
+        if record.on_exit:
+            try:
+                record.on_exit(record)
+            except Exception as e:
+                print(f"❌ Spawn exit callback failed: {e}")
+
+    def spawn(self, argv, cwd=None, on_exit=None):
+        """
+        Launch argv detached and return its SpawnedProcess at once;
+        on_exit(record) runs on a background thread when it exits or fails to start
+        """
+        argv = [str(arg) for arg in argv]
+        record = SpawnedProcess(next(self._ids), argv, on_exit)
+        with self._lock:
+            self._live[record.id] = record
+            self.stats['spawned'] += 1
+            sent = False
+            if self.use_helper and self._ensure_helper():
+                try:
+                    record.helper = self._helper
+                    self._helper.stdin.write(json.dumps({'id': record.id, 'argv': argv, 'cwd': cwd}) + '\n')
+                    self._helper.stdin.flush()
+                    sent = True
+                except (OSError, ValueError):
+                    record.helper = None
+                    self._helper = None
+        if not sent:
+            self._spawn_direct(record, cwd)
+        return record
+
+    def open_path(self, path, on_exit=None):
+        """Open a file or folder with the desktop's default handler"""
+        return self.spawn(opener_command(path), on_exit=on_exit)
+
+    def get(self, spawn_id):
+        with self._lock:
+            record = self._live.get(spawn_id)
+            if record is None:
+                record = next((r for r in self._history if r.id == spawn_id), None)
+        return record
+
+    def wait(self, record, timeout=None):
+        """Block until a record finishes - for tests and scripts, never request handlers"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not record.done:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def processes(self, limit=50):
+        with self._lock:
+            live = [r.to_dict() for r in self._live.values()]
+            finished = [r.to_dict() for r in list(self._history)[-limit:]]
+        return {'running': live, 'finished': finished[::-1], 'stats': dict(self.stats)}
+
+    def stop(self):
+        """Close the helper; launched apps keep running"""
+        with self._lock:
+            helper, self._helper = self._helper, None
+        if helper is not None and helper.poll() is None:
+            helper.stdin.close()
+            try:
+                helper.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                helper.kill()
+
+
+def opener_command(path):
+    """argv that opens path with the platform's default application"""
+    path = str(path)
+    if IS_WINDOWS:
+        if os.path.isdir(path):
+            return ['explorer', path]
+        return ['cmd', '/c', 'start', '', path]
+    if IS_MACOS:
+        return ['open', path]
+    return ['xdg-open', path]
+
+# Global instance
+spawn_service = SpawnService()
+
+def spawn(argv, cwd=None, on_exit=None):
+    return spawn_service.spawn(argv, cwd, on_exit)
+
+def open_path(path, on_exit=None):
+    return spawn_service.open_path(path, on_exit)
+
+
+if __name__ == '__main__' and '--serve' in sys.argv:
+    serve()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Template Engine for JARVIS AI Assistant
+New-file templates loaded once from file_templates/ (and any user directories),
+compiled into literal/placeholder parts, rendered with variables and written by
+per-format writers - PDF and Word writers keep their libraries loaded
+"""
+
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from threading import Thread, Lock
+
+from instrumentation import counter, histogram
+from time_parser import parse_number
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'file_templates'
+TEMPLATE_SUFFIX = '.tmpl'
+DEFAULT_TEMPLATE = 'default'
+MAX_BATCH = 100               # files one batch command may create
+BATCH_WORKERS = 4
+
+# Spoken or alternative extensions -> the template that serves them
+EXTENSION_ALIASES = {
+    'text': 'txt', 'markdown': 'md', 'htm': 'html', 'javascript': 'js', 'python': 'py',
+    'doc': 'docx', 'word': 'docx', 'spreadsheet': 'csv',
+}
+
+_PLACEHOLDER_RE = re.compile(r'\{\{\s*(\w+)((?:\s*\|\s*\w+)*)\s*\}\}')
+
+FILES_CREATED = counter('jarvis_files_created', 'Files created from templates by format and outcome',
+                        ['format', 'status'])
+RENDER_SECONDS = histogram('jarvis_file_create_seconds', 'Time to render and write a new file', ['format'],
+                           buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0))
+
+
+def _csv_field(value):
+    if any(char in value for char in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+FILTERS = {
+    'json': lambda value: json.dumps(value, ensure_ascii=False),
+    'html': lambda value: html.escape(value, quote=True),
+    'csv': _csv_field,
+    'upper': str.upper,
+    'lower': str.lower,
+}
+
+
+class Template:
+    __slots__ = ('name', 'parts', 'variables')
+
+    def __init__(self, name, source):
+        """Compile '{{ variable|filter }}' placeholders once; everything else is literal text"""
+        self.name = name
+        self.parts = []
+        self.variables = set()
+        position = 0
+        for match in _PLACEHOLDER_RE.finditer(source):
+            if match.start() > position:
+                self.parts.append(source[position:match.start()])
+            filters = [f.strip() for f in match.group(2).split('|') if f.strip()]
+            unknown = [f for f in filters if f not in FILTERS]
+            if unknown:
+                raise ValueError(f"Template '{name}': unknown filter '{unknown[0]}'")
+            self.parts.append((match.group(1), tuple(FILTERS[f] for f in filters)))
+            self.variables.add(match.group(1))
+            position = match.end()
+        if position < len(source):
+            self.parts.append(source[position:])
+
+    def render(self, variables):
+        """Missing variables render as empty text"""
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            value = str(variables.get(part[0], ''))
+            for apply in part[1]:
+                value = apply(value)
+            out.append(value)
+        return ''.join(out)
+
+
+class TextWriter:
+    def warm(self):
+        pass
+
+    def write(self, path, text):
+        # 'x' never clobbers a file created since the caller checked
+        with open(path, 'x', encoding='utf-8') as f:
+            f.write(text)
+
+
+class PdfWriter:
+    def __init__(self):
+        self._canvas = None
+        self._page_size = None
+        self._lock = Lock()
+        self.available = None
+
+    def warm(self):
+        """Import reportlab once; falls back to a small hand-written PDF without it"""
+        with self._lock:
+            if self.available is None:
+                try:
+                    from reportlab.pdfgen import canvas
+                    from reportlab.lib.pagesizes import letter
+                    self._canvas, self._page_size, self.available = canvas.Canvas, letter, True
+                except ImportError:
+                    self.available = False
+        return self.available
+
+    def write(self, path, text):
+        if os.path.exists(path):
+            raise FileExistsError(path)
+        lines = text.rstrip('\n').split('\n')
+        if not self.warm():
+            write_minimal_pdf(path, lines)
+            return
+        c = self._canvas(str(path), pagesize=self._page_size)
+        y = 750
+        for line in lines:
+            if not line.strip():
+                y -= 10
+                continue
+            c.drawString(100, y, line)
+            y -= 20
+        c.save()
+
+
+class DocxWriter:
+    def __init__(self):
+        self._document = None
+        self._lock = Lock()
+        self.available = None
+
+    def warm(self):
+        """Import python-docx once; falls back to plain text without it"""
+        with self._lock:
+            if self.available is None:
+                try:
+                    from docx import Document
+                    self._document, self.available = Document, True
+                except ImportError:
+                    self.available = False
+        return self.available
+
+    def write(self, path, text):
+        if os.path.exists(path):
+            raise FileExistsError(path)
+        lines = text.rstrip('\n').split('\n')
+        if not self.warm():
+            TextWriter().write(path, '\n\n'.join(line for line in lines if line))
+            return
+        doc = self._document()
+        doc.add_heading(lines[0], 0)
+        for line in lines[1:]:
+            if line.strip():
+                doc.add_paragraph(line)
+        doc.save(str(path))
+
+
+def _pdf_string(text):
+    escaped = text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return escaped.encode('latin-1', 'replace')
+
+
+def write_minimal_pdf(path, lines):
+    """A valid one-page Helvetica PDF of text lines, for when reportlab isn't installed"""
+    stream = b'BT /F1 12 Tf 14 TL 72 720 Td\n'
+    for line in lines:
+        stream += b'(' + _pdf_string(line) + b') Tj T*\n'
+    stream += b'ET'
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R '
+        b'/Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'xb') as f:
+        f.write(out)
+
+
+class TemplateEngine:
+    def __init__(self, template_dirs=(TEMPLATE_DIR,)):
+        """
+        Args:
+            template_dirs: directories of <extension>.tmpl files; later directories override
+                           earlier ones, so user templates replace the shipped ones
+        """
+        self.template_dirs = [Path(d) for d in template_dirs]
+        self.templates = {}
+        self.writers = {'pdf': PdfWriter(), 'docx': DocxWriter()}
+        self._text_writer = TextWriter()
+        self.reload()
+
+    def reload(self):
+        templates = {}
+        for directory in self.template_dirs:
+            self._load_directory(directory, templates)
+        self.templates = templates
+
+    def _load_directory(self, directory, templates):
+        if not directory.is_dir():
+            return
+        for path in sorted(directory.glob('*' + TEMPLATE_SUFFIX)):
+            try:
+                templates[path.stem.lower()] = Template(path.stem, path.read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Skipping file template {path.name}: {e}")
+
+    def register_writer(self, extension, writer):
+        """Writer with write(path, text) and warm() for a binary or structured format"""
+        self.writers[extension.lower()] = writer
+
+    def warm(self, background=True):
+        """Load the heavy document libraries now instead of on the first 'create file' command"""
+        def load():
+            for writer in self.writers.values():
+                writer.warm()
+        if background:
+            Thread(target=load, name='template-writers', daemon=True).start()
+        else:
+            load()
+
+    @staticmethod
+    def format_of(extension):
+        extension = extension.lower().lstrip('.')
+        return EXTENSION_ALIASES.get(extension, extension)
+
+    def template_for(self, extension):
+        return self.templates.get(self.format_of(extension)) or self.templates[DEFAULT_TEMPLATE]
+
+    def variables(self, path, extra=None):
+        path = Path(path)
+        now = datetime.now()
+        created = now.strftime('%Y-%m-%d %H:%M:%S')
+        variables = {
+            'name': path.stem,
+            'filename': path.name,
+            'extension': path.suffix.lstrip('.'),
+            'created': created,
+            'date': now.strftime('%Y-%m-%d'),
+            'author': 'JARVIS',
+            'greeting': f"Hello from {path.stem}!",
+            'created_message': f"JARVIS created this file on {created}",
+        }
+        if extra:
+            variables.update(extra)
+        return variables
+
+    def render(self, extension, variables):
+        return self.template_for(extension).render(variables)
+
+    def create(self, path, variables=None):
+        """Render the template for path's extension and write it; FileExistsError if path exists"""
+        path = Path(path)
+        file_format = self.format_of(path.suffix)
+        start = time.perf_counter()
+        text = self.render(file_format, self.variables(path, variables))
+        try:
+            self.writers.get(file_format, self._text_writer).write(path, text)
+        except Exception:
+            FILES_CREATED.inc(format=file_format, status='error')
+            raise
+        FILES_CREATED.inc(format=file_format, status='ok')
+        RENDER_SECONDS.observe(time.perf_counter() - start, format=file_format)
+        return path
+
+    def create_many(self, directory, filenames, variables=None):
+        """
+        Create several files in directory; each gets 'index' and 'count' variables.
+        Returns [{'path', 'success', 'error'}] in input order
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        filenames = list(filenames)[:MAX_BATCH]
+
+        def create_one(item):
+            index, filename = item
+            path = directory / filename
+            extra = {'index': index, 'count': len(filenames), **(variables or {})}
+            try:
+                self.create(path, extra)
+                return {'path': str(path), 'success': True, 'error': None}
+            except FileExistsError:
+                return {'path': str(path), 'success': False, 'error': 'already exists'}
+            except Exception as e:
+                return {'path': str(path), 'success': False, 'error': str(e)}
+
+        items = list(enumerate(filenames, 1))
+        if len(items) == 1:
+            return [create_one(items[0])]
+        with ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='template-batch') as pool:
+            return list(pool.map(create_one, items))
+
+
+# "create 5 text files called notes", "make three pdf files report"
+_COUNTED_RE = re.compile(r'^(?:create|make)\s+(\d+|[a-z]+)\s+(?:new\s+)?(?:(\w+)\s+)?files\s+'
+                         r'(?:(?:named|called)\s+)?(\S+)$')
+# "create files notes.txt, plan.md and budget.csv"
+_LISTED_RE = re.compile(r'^(?:create|make)\s+(?:new\s+)?files\s+(?:(?:named|called)\s+)?(.+)$')
+
+
+def parse_batch_create(text):
+    """Filenames a 'create N files' or 'create files a, b and c' command asks for, else None"""
+    text = text.strip().lower()
+    match = _COUNTED_RE.match(text)
+    if match:
+        count = int(parse_number(match.group(1)))
+        kind, name = match.group(2), match.group(3)
+        if count < 2:
+            return None
+        stem, ext = os.path.splitext(name)
+        if not ext:
+            # 'blank', 'empty' and other words that aren't a format make text files
+            file_format = TemplateEngine.format_of(kind or 'txt')
+            ext = '.' + (file_format if file_format in template_engine.templates else 'txt')
+        return [f"{stem}_{i}{ext}" for i in range(1, min(count, MAX_BATCH) + 1)]
+    match = _LISTED_RE.match(text)
+    if match:
+        names = [n.strip() for n in re.split(r',|\band\b', match.group(1)) if n.strip()]
+        if len(names) < 2 or any(' ' in n for n in names):
+            return None
+        return [n if '.' in n else n + '.txt' for n in names[:MAX_BATCH]]
+    return None
+
+# Global instance
+template_engine = TemplateEngine([TEMPLATE_DIR, *[Path(d) for d in
+                                                  os.environ.get('JARVIS_TEMPLATE_DIRS', '').split(os.pathsep) if d]])
+
+def create_from_template(path, variables=None):
+    return template_engine.create(path, variables)
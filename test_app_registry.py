@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the installed-application registry
+"""
+
+import os
+import stat
+
+from app_registry import AppRegistry, desktop_exec_argv
+
+
+def make_executable(directory, name):
+    path = directory / name
+    path.write_text('#!/bin/sh\n')
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+def make_registry(tmp_path):
+    bin_dir = tmp_path / 'bin'
+    apps_dir = tmp_path / 'applications'
+    bin_dir.mkdir()
+    apps_dir.mkdir()
+    make_executable(bin_dir, 'gnome-calculator')
+    make_executable(bin_dir, 'file')
+    (apps_dir / 'org.gnome.Calculator.desktop').write_text(
+        "[Desktop Entry]\nType=Application\nName=Calculator\nExec=gnome-calculator %U\n"
+        "Keywords=math;arithmetic;\n[Desktop Action new]\nName=Other\n")
+    (apps_dir / 'gimp.desktop').write_text(
+        "[Desktop Entry]\nType=Application\nName=GNU Image Manipulation Program\nExec=gimp-2.10 %f\n"
+        "GenericName=Image Editor\n")
+    (apps_dir / 'hidden.desktop').write_text("[Desktop Entry]\nName=Hidden\nExec=hidden\nNoDisplay=true\n")
+    registry = AppRegistry('Linux', path=str(bin_dir), app_dirs=[apps_dir], check_interval=0)
+    registry.add_aliases({'calculator': ['kcalc', 'gnome-calculator'], 'chrome': ['google-chrome']})
+    return registry, bin_dir, apps_dir
+
+
+def test_resolve_aliases_desktop_entries_and_path(tmp_path):
+    registry, bin_dir, _ = make_registry(tmp_path)
+    assert registry.resolve('calculator').command == [str(bin_dir / 'gnome-calculator')]
+    assert registry.resolve('GNU Image Manipulation Program').command == ['gimp-2.10']
+    assert registry.resolve('file').source == 'path'
+    assert registry.resolve('chrome') is None
+    assert registry.resolve('hidden') is None
+    assert len(registry) == 2
+
+
+def test_lookups_are_cached_until_something_changes(tmp_path):
+    registry, bin_dir, _ = make_registry(tmp_path)
+    registry.resolve('chrome')
+    registry.resolve('chrome')
+    assert registry.stats['scans'] == 1
+    assert registry.stats['hits'] == 1
+
+    chrome = make_executable(bin_dir, 'google-chrome')
+    # Make sure the directory mtime moves even on coarse-grained filesystems
+    st = os.stat(bin_dir)
+    os.utime(bin_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert registry.resolve('chrome').command == [str(chrome)]
+    assert registry.stats['scans'] == 2
+
+
+def test_search_and_spoken_commands(tmp_path):
+    registry, _, _ = make_registry(tmp_path)
+    assert [app.display_name for app in registry.search('image ed')] == ['GNU Image Manipulation Program']
+    assert [app.display_name for app in registry.search('calc')] == ['Calculator']
+    assert registry.search('math')[0].name == 'org.gnome.Calculator'
+    assert registry.find_in_command('please open calculator for me').display_name == 'Calculator'
+    # Plain PATH tools are never launched from speech
+    assert registry.find_in_command('open file 1') is None
+
+
+def test_desktop_exec_argv():
+    assert desktop_exec_argv('env FOO=1 "/opt/My App/app" --new-window %U') == \
+        ['env', 'FOO=1', '/opt/My App/app', '--new-window']
+    assert desktop_exec_argv('printf 100%%') == ['printf', '100%']
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared-STFT audio feature pipeline
+"""
+
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio_features import AudioFeatureExtractor, compute_features
+
+SR = 22050
+
+
+def sine(freq, seconds=3):
+    t = np.arange(SR * seconds) / SR
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SR)
+        wav_file.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+
+def test_features_of_pure_tone():
+    features = compute_features(sine(440), SR)
+    assert abs(features['avg_pitch'] - 440) < 5
+    assert abs(features['spectral_centroid'] - 440) < 30
+    assert features['mfccs'].shape == (13,)
+    # 440 Hz crosses zero 880 times per second
+    assert abs(features['zcr'] - 880 / SR) < 0.005
+
+
+def test_tempo_of_click_track():
+    clicks = np.zeros(SR * 10, dtype=np.float32)
+    rng = np.random.default_rng(0)
+    for start in range(0, len(clicks), SR // 2):
+        clicks[start:start + 200] = rng.normal(0, 0.5, len(clicks[start:start + 200]))
+    assert abs(compute_features(clicks, SR)['tempo'] - 120) < 6
+
+
+def test_cache_by_audio_hash(tmp_path):
+    extractor = AudioFeatureExtractor(cache_dir=tmp_path)
+    clip = sine(330)
+    first = extractor.extract(clip, SR)
+    second = extractor.extract(clip.copy(), SR)
+    assert second is first
+    assert extractor.stats == {'hits': 1, 'misses': 1}
+
+    # A fresh extractor picks the entry up from disk
+    reloaded = AudioFeatureExtractor(cache_dir=tmp_path).extract(clip, SR)
+    assert np.allclose(reloaded['mfccs'], first['mfccs'])
+
+
+def test_batch_extraction_uses_process_pool_and_cache(tmp_path):
+    paths = []
+    for i, freq in enumerate((220, 330, 440)):
+        path = tmp_path / f"clip{i}.wav"
+        write_wav(path, sine(freq, seconds=2))
+        paths.append(path)
+
+    extractor = AudioFeatureExtractor(cache_dir=tmp_path / "cache")
+    results = extractor.extract_batch(paths, sr=SR, max_workers=2)
+    assert [round(results[str(p)]['avg_pitch'] / 10) for p in paths] == [22, 33, 44]
+
+    extractor.extract_batch(paths, sr=SR, max_workers=2)
+    assert extractor.stats['hits'] == 3
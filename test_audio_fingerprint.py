@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the audio fingerprinting engine
+Uses synthetic tone sequences so no reference music is needed
+"""
+
+import time
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio_fingerprint import FingerprintIndex, SAMPLE_RATE, load_audio
+
+
+def make_track(seed, seconds=30, sr=SAMPLE_RATE):
+    """Random chord sequence - distinct enough to fingerprint"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(sr // 4) / sr
+    notes = []
+    for _ in range(seconds * 4):
+        freqs = rng.uniform(200, 3000, size=3)
+        notes.append(sum(np.sin(2 * np.pi * f * t) for f in freqs))
+    return (np.concatenate(notes) * 0.2).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def index_and_tracks(tmp_path_factory):
+    tracks = [make_track(seed) for seed in range(8)]
+    index = FingerprintIndex(tmp_path_factory.mktemp("fp") / "index.npz", library_dir="/nonexistent")
+    for i, samples in enumerate(tracks):
+        index.add_track(samples, metadata={'title': f"song {i}", 'artist': "Synth"})
+    index.finalize()
+    return index, tracks
+
+
+def test_matches_noisy_clip(index_and_tracks):
+    index, tracks = index_and_tracks
+    rng = np.random.default_rng(42)
+    clip = tracks[5][SAMPLE_RATE * 12:SAMPLE_RATE * 19]
+    clip = 0.5 * clip + rng.normal(0, 0.05, len(clip)).astype(np.float32)
+
+    start = time.perf_counter()
+    result = index.match(clip)
+    elapsed = time.perf_counter() - start
+
+    assert result is not None
+    assert result['song_title'] == "song 5"
+    assert abs(result['offset_seconds'] - 12) < 0.1
+    assert elapsed < 1.0
+
+
+def test_noise_does_not_match(index_and_tracks):
+    index, _ = index_and_tracks
+    noise = np.random.default_rng(7).normal(0, 0.3, SAMPLE_RATE * 7).astype(np.float32)
+    assert index.match(noise) is None
+
+
+def test_save_and_load_roundtrip(index_and_tracks, tmp_path):
+    index, tracks = index_and_tracks
+    path = index.save(tmp_path / "saved.npz")
+
+    loaded = FingerprintIndex(path)
+    assert loaded.load()
+    assert len(loaded) == len(index)
+    assert loaded.match(tracks[2][SAMPLE_RATE * 3:SAMPLE_RATE * 9])['song_title'] == "song 2"
+
+
+def test_index_folder_reads_wav_and_metadata(tmp_path):
+    samples = make_track(99, seconds=10, sr=22050)
+    with wave.open(str(tmp_path / "Test Artist - Test Song.wav"), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(22050)
+        wav_file.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+    index = FingerprintIndex(tmp_path / "index.npz", library_dir=tmp_path)
+    assert index.index_folder() == 1
+    assert index.index_folder() == 0  # already indexed
+
+    clip = load_audio(tmp_path / "Test Artist - Test Song.wav")[SAMPLE_RATE * 2:SAMPLE_RATE * 8]
+    result = index.match(clip)
+    assert result['song_title'] == "test song"
+    assert result['song_info']['artist'] == "Test Artist"
+
+
+def write_wav(path, samples, sr=22050):
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sr)
+        wav_file.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+
+def test_library_is_indexed_in_the_background_and_refreshed(tmp_path):
+    library = tmp_path / "music"
+    library.mkdir()
+    write_wav(library / "A - First.wav", make_track(11, seconds=10, sr=22050))
+
+    index = FingerprintIndex(tmp_path / "index.npz", library_dir=library)
+    index.ensure_loaded()
+    index._build_thread.join(30)
+    assert [track['title'] for track in index.tracks] == ["first"]
+    assert (tmp_path / "index.npz").exists()
+
+    # A new track is picked up by the next rebuild; a removed one drops out
+    write_wav(library / "B - Second.wav", make_track(12, seconds=10, sr=22050))
+    assert index.rebuild() == 1
+    (library / "A - First.wav").unlink()
+    index.rebuild()
+    assert [track['title'] for track in index.tracks] == ["second"]
+
+    reloaded = FingerprintIndex(tmp_path / "index.npz", library_dir=library)
+    assert reloaded.load()
+    clip = load_audio(library / "B - Second.wav")[SAMPLE_RATE * 2:SAMPLE_RATE * 8]
+    assert reloaded.match(clip)['song_title'] == "second"
+
+
+def test_library_is_fingerprinted_across_processes(tmp_path):
+    for seed in range(4):
+        write_wav(tmp_path / f"Synth - Tune {seed}.wav", make_track(20 + seed, seconds=8, sr=22050))
+    (tmp_path / "Synth - Broken.wav").write_bytes(b"not a wav")
+
+    index = FingerprintIndex(tmp_path / "index.npz", library_dir=tmp_path)
+    assert index.index_folder(max_workers=2) == 4
+    clip = load_audio(tmp_path / "Synth - Tune 3.wav")[SAMPLE_RATE * 2:SAMPLE_RATE * 7]
+    assert index.match(clip)['song_title'] == "tune 3"
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for planning and running bulk file operations
+"""
+
+import os
+from pathlib import Path
+
+import bulk_operations
+from bulk_operations import BulkOperations, Selection, copy_file, parse_bulk_command, plan
+
+
+def make_tree(root):
+    (root / 'sub').mkdir(parents=True)
+    for i in range(12):
+        (root / f'report_{i}.pdf').write_bytes(os.urandom(50000 + i))
+    (root / 'sub' / 'nested.pdf').write_bytes(b'nested')
+    (root / 'notes.txt').write_text('notes')
+    (root / '.hidden.pdf').write_text('hidden')
+
+
+def test_selection_filters_and_plan_conflicts(tmp_path):
+    source, dest = tmp_path / 'src', tmp_path / 'dst'
+    make_tree(source)
+    dest.mkdir()
+    (dest / 'report_0.pdf').write_text('existing')
+
+    names = [p.name for p, _ in Selection(source, extensions=['PDF']).files()]
+    assert len(names) == 12 and 'nested.pdf' not in names and '.hidden.pdf' not in names
+    assert len(list(Selection(source, extensions=['.pdf'], recursive=True).files())) == 13
+    assert len(list(Selection(source, pattern='report_1*', min_size=50010).files())) == 2
+
+    ops, skipped = plan('copy', Selection(source, pattern='report_0.pdf'), dest)
+    assert ops[0].target == dest / 'report_0 (1).pdf'
+    ops, skipped = plan('copy', Selection(source, pattern='report_0.pdf'), dest, conflict='skip')
+    assert not ops and skipped == [source / 'report_0.pdf']
+
+
+def test_copy_move_and_progress_events(tmp_path):
+    source, dest = tmp_path / 'src', tmp_path / 'dst'
+    make_tree(source)
+    manager = BulkOperations(max_workers=3)
+
+    job = manager.start('copy', Selection(source, extensions=['pdf'], recursive=True), dest, background=False)
+    assert job.status == 'completed'
+    assert job.done_files == 13 and job.done_bytes == job.total_bytes
+    assert (dest / 'sub' / 'nested.pdf').read_bytes() == b'nested'
+    assert (dest / 'report_3.pdf').read_bytes() == (source / 'report_3.pdf').read_bytes()
+    events = job.events()
+    assert events[0]['type'] == 'started' and events[-1]['type'] == 'completed'
+    assert [e['seq'] for e in events] == sorted(e['seq'] for e in events)
+    assert not list(dest.rglob('*.part'))
+
+    job = manager.start('move', {'root': str(source), 'pattern': '*.txt'}, dest / 'texts', background=False)
+    assert job.done_files == 1
+    assert not (source / 'notes.txt').exists() and (dest / 'texts' / 'notes.txt').exists()
+
+    job = manager.start('rename', Selection(dest, pattern='report_*'), rename_template='doc_{n:02d}{suffix}',
+                        background=False)
+    assert sorted(p.name for p in dest.glob('doc_*')) == [f'doc_{i:02d}.pdf' for i in range(1, 13)]
+
+
+def test_stream_always_ends_with_the_terminal_event(tmp_path):
+    source = tmp_path / 'src'
+    make_tree(source)
+    manager = BulkOperations(max_workers=2)
+    for i in range(10):
+        job = manager.start('copy', Selection(source, extensions=['pdf']), tmp_path / f'dst{i}')
+        events = [event for event in job.stream(heartbeat=0.01) if event is not None]
+        assert events[-1]['type'] == 'completed' and job.finished
+
+
+def test_cancellation_stops_copies_and_cleans_up(tmp_path, monkeypatch):
+    source = tmp_path / 'src'
+    make_tree(source)
+    monkeypatch.setattr(bulk_operations, 'COPY_CHUNK', 1024)
+    manager = BulkOperations(max_workers=1)
+    job = manager.prepare('copy', Selection(source, extensions=['pdf']), tmp_path / 'dst')
+    job._add_bytes = lambda amount, _add=job._add_bytes: (_add(amount), job.cancel())
+    manager.launch(job, background=False)
+    assert job.status == 'cancelled'
+    assert job.done_files == 0
+    assert not list((tmp_path / 'dst').glob('*'))
+
+
+def test_copy_file_fallback_without_kernel_copy(tmp_path, monkeypatch):
+    data = os.urandom(300000)
+    (tmp_path / 'a.bin').write_bytes(data)
+    monkeypatch.setattr(bulk_operations, '_copy_methods', lambda: ['read'])
+    monkeypatch.setattr(bulk_operations, 'COPY_CHUNK', 65536)
+    assert copy_file(tmp_path / 'a.bin', tmp_path / 'b.bin') == len(data)
+    assert (tmp_path / 'b.bin').read_bytes() == data
+
+
+def test_parse_bulk_command():
+    locations = {'downloads': Path('/dl'), 'documents': Path('/docs'), 'desktop': Path('/desk')}
+    operation, selection, destination = parse_bulk_command('move all PDFs from Downloads to Documents', locations)
+    assert (operation, selection.root, selection.extensions, destination) == \
+        ('move', Path('/dl'), {'.pdf'}, Path('/docs'))
+    operation, selection, destination = parse_bulk_command('delete all screenshots from my desktop', locations)
+    assert operation == 'delete' and '.png' in selection.extensions and destination is None
+    assert parse_bulk_command('copy txt files from desktop to documents', locations)[1].extensions == {'.txt'}
+    assert parse_bulk_command('move all pdfs from downloads to mars', locations) is None
+    assert parse_bulk_command('open all the doors', locations) is None
+    # One named item, or 'file' with no type, is never a bulk job
+    for command in ('delete the file in downloads', 'delete my file from desktop', 'delete all files in downloads',
+                    'delete test from downloads', 'move todo from downloads to documents',
+                    'move pdf from downloads to documents'):
+        assert parse_bulk_command(command, locations) is None, command
+    assert parse_bulk_command('move images from desktop to documents', locations)[1].extensions
+    assert parse_bulk_command('delete log files from desktop', locations)[1].extensions == {'.log'}
+    assert parse_bulk_command('delete all mp4s from desktop', locations)[1].extensions == {'.mp4'}
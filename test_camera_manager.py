@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the warm camera session, using a fake frame source instead of a device
+"""
+
+import time
+
+from camera_manager import CameraManager
+
+
+class FakeCamera:
+    """Frame source that returns increasing frame numbers"""
+
+    def __init__(self, index, log, frame_interval=0.005):
+        self.index = index
+        self.log = log
+        self.frame_interval = frame_interval
+        self.counter = 0
+        self.released = False
+
+    def read(self):
+        time.sleep(self.frame_interval)
+        self.counter += 1
+        return True, [self.index, self.counter]
+
+    def release(self):
+        self.released = True
+        self.log.append(('release', self.index))
+
+
+def make_factory(working_index, log):
+    def factory(index):
+        log.append(('open', index))
+        if index != working_index:
+            return None
+        return FakeCamera(index, log)
+    return factory
+
+
+def test_discovers_device_once_and_reuses_session():
+    log = []
+    manager = CameraManager(source_factory=make_factory(1, log), indices=(0, 1, 2))
+    try:
+        first = manager.get_frame()
+        assert first[0] == 1
+        assert manager.device_index == 1
+
+        start = time.perf_counter()
+        for _ in range(20):
+            assert manager.get_frame() is not None
+        assert (time.perf_counter() - start) / 20 < 0.05
+
+        # Probed 0 and 1 once; never reopened afterwards
+        assert log.count(('open', 0)) == 1
+        assert log.count(('open', 1)) == 1
+        assert manager.status()['opens'] == 1
+    finally:
+        manager.stop()
+    assert ('release', 1) in log
+
+
+def test_frames_keep_advancing_in_background():
+    manager = CameraManager(source_factory=make_factory(0, []))
+    try:
+        first = manager.get_frame()
+        time.sleep(0.05)
+        assert manager.get_frame()[1] > first[1]
+    finally:
+        manager.stop()
+
+
+def test_idle_timeout_releases_and_reopens_remembered_device():
+    log = []
+    manager = CameraManager(source_factory=make_factory(2, log), idle_timeout=0.05)
+    try:
+        assert manager.get_frame() is not None
+        time.sleep(0.2)
+        assert not manager.status()['running']
+        assert ('release', 2) in log
+
+        log.clear()
+        assert manager.get_frame() is not None
+        # Remembered index is tried first - no re-probing of 0 and 1
+        assert log[0] == ('open', 2)
+    finally:
+        manager.stop()
+
+
+def test_no_camera_returns_none():
+    manager = CameraManager(source_factory=lambda index: None)
+    assert manager.get_frame(timeout=0.1) is None
+    assert manager.device_index is None
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the trie-based multilingual command normalizer
+"""
+
+import json
+import time
+
+from command_normalizer import CommandNormalizer, PhraseTrie, normalize_command
+
+
+def test_longest_phrase_wins_regardless_of_order():
+    trie = PhraseTrie()
+    trie.add('समय', 'time')
+    trie.add('समय क्या है', 'what time is it')
+    assert trie.replace('समय क्या है') == 'what time is it'
+    assert trie.replace('अभी समय बताओ') == 'अभी time बताओ'
+
+
+def test_single_pass_and_word_boundaries():
+    trie = PhraseTrie()
+    trie.add('a', 'b')
+    trie.add('b', 'c')
+    # Replacements are never re-scanned
+    assert trie.replace('a b') == 'b c'
+    trie.add('समय', 'time')
+    assert trie.replace('समयसीमा') == 'समयसीमा'
+
+
+def test_bundled_mappings():
+    assert normalize_command('समय क्या है') == 'what time is it'
+    assert normalize_command('સમય શું છે') == 'what time is it'
+    assert normalize_command('फोटो खींचो और बैटरी स्टेटस') == 'take photo और battery status'
+    # Precomposed and decomposed nukta spellings match the same mapping
+    assert normalize_command('आवाज ब\u095dाओ') == 'volume up'
+    assert normalize_command('आवाज ब\u0922\u093cाओ') == 'volume up'
+
+
+def test_extra_language_directory(tmp_path):
+    (tmp_path / 'mr.json').write_text(json.dumps({'वेळ काय आहे': 'what time is it'}, ensure_ascii=False),
+                                      encoding='utf-8')
+    normalizer = CommandNormalizer([tmp_path])
+    assert normalizer.languages == {'mr': 1}
+    assert normalizer.normalize('वेळ काय आहे') == 'what time is it'
+
+
+def test_cost_does_not_grow_with_mapping_count():
+    small = PhraseTrie()
+    large = PhraseTrie()
+    for trie, count in ((small, 10), (large, 20000)):
+        for i in range(count):
+            trie.add(f'शब्द{i} वाक्यांश', f'phrase {i}')
+    text = 'मेरे लिए फाइल बनाओ और फोटो खींचो ' * 4
+
+    def cost(trie):
+        start = time.perf_counter()
+        for _ in range(500):
+            trie.replace(text)
+        return time.perf_counter() - start
+
+    assert cost(large) < cost(small) * 3 + 0.05
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the document content index: extraction, incremental updates and search
+"""
+
+import os
+import time
+import zipfile
+
+import content_index
+from content_index import ContentIndex, extract_text, parse_content_search
+
+
+def write_docx(path, paragraphs):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml',
+                         '<?xml version="1.0"?><w:document xmlns:w="urn:w"><w:body>'
+                         f'{body}</w:body></w:document>')
+
+
+def make_docs(root):
+    (root / 'work').mkdir(parents=True)
+    (root / 'work' / 'billing.txt').write_text('Please pay invoice 2024-117 by Friday.\nThanks')
+    (root / 'work' / 'notes.md').write_text('# Notes\nThe 2024 plan mentions an invoice template later on.')
+    (root / 'page.html').write_text('<html><style>.invoice{}</style><body><p>Quarterly &amp; annual '
+                                    'report</p><script>var invoice = 2024;</script></body></html>')
+    write_docx(root / 'letter.docx', ['Dear Tom,', 'Invoice &amp; receipt attached.'])
+    (root / '.hidden').mkdir()
+    (root / '.hidden' / 'secret.txt').write_text('invoice 2024')
+    (root / 'photo.jpg').write_bytes(b'invoice 2024')
+
+
+def test_extracts_html_and_docx_text(tmp_path):
+    make_docs(tmp_path)
+    html = extract_text(str(tmp_path / 'page.html'))
+    assert 'Quarterly & annual report' in html and 'invoice' not in html
+    assert 'Invoice & receipt attached.' in extract_text(str(tmp_path / 'letter.docx'))
+
+
+def test_search_ranks_phrase_matches_first(tmp_path):
+    make_docs(tmp_path)
+    index = ContentIndex([tmp_path], cache_dir=tmp_path / 'cache', max_workers=1)
+    assert index.update() == 4 and len(index) == 4
+
+    results = index.search('invoice 2024')
+    assert [r['name'] for r in results] == ['billing.txt', 'notes.md']
+    assert results[0]['phrase'] and not results[1]['phrase']
+    assert 'invoice 2024-117' in results[0]['snippet']
+    assert [r['name'] for r in index.search('RECEIPT')] == ['letter.docx']
+    assert index.search('invoice 1999') == []
+    assert index.search('report annual')[0]['name'] == 'page.html'
+
+
+def test_update_is_incremental_and_uses_the_text_cache(tmp_path, monkeypatch):
+    docs = tmp_path / 'docs'
+    make_docs(docs)
+    index = ContentIndex([docs], cache_dir=tmp_path / 'cache', max_workers=1)
+    index.update()
+    assert index.stats['extracted'] == 4
+    assert index.update() == 0
+
+    billing = docs / 'work' / 'billing.txt'
+    billing.write_text('Paid in full, no invoice outstanding')
+    os.utime(billing, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+    (docs / 'page.html').unlink()
+    assert index.update() == 2
+    assert index.stats['extracted'] == 5 and index.stats['removed'] == 1
+    assert [r['name'] for r in index.search('outstanding')] == ['billing.txt']
+    assert index.search('2024 invoice')[0]['name'] == 'notes.md'
+    assert index.search('quarterly') == []
+
+    # A fresh index over the same folders reads cached text instead of extracting again
+    calls = []
+    monkeypatch.setattr(content_index, 'extract_text', calls.append)
+    fresh = ContentIndex([docs], cache_dir=tmp_path / 'cache', max_workers=1)
+    fresh.update()
+    assert calls == [] and fresh.stats['cached'] == 3
+    assert len(list((tmp_path / 'cache').rglob('*.txt'))) == 3
+
+
+def test_process_pool_extraction_and_search_speed(tmp_path):
+    for i in range(400):
+        words = ' '.join(f'word{(i * 7 + j) % 997}' for j in range(300))
+        (tmp_path / f'doc{i}.txt').write_text(f'{words} invoice {2000 + i % 30} {words}')
+    index = ContentIndex([tmp_path], cache_dir=None, max_workers=2)
+    index.update()
+    assert len(index) == 400 and index.stats['failed'] == 0
+
+    started = time.perf_counter()
+    for _ in range(20):
+        results = index.search('invoice 2024', limit=5)
+    assert (time.perf_counter() - started) / 20 < 0.01
+    assert len(results) == 5 and all(r['phrase'] for r in results)
+
+
+def test_parse_content_search():
+    assert parse_content_search('find the file that mentions invoice 2024') == 'invoice 2024'
+    assert parse_content_search('which document contains "quarterly budget"?') == 'quarterly budget'
+    assert parse_content_search('search my files for project apollo') == 'project apollo'
+    assert parse_content_search('grep for TODO') == 'todo'
+    assert parse_content_search('grep "fixme"') == 'fixme'
+    assert parse_content_search('grep is a unix tool') is None
+    assert parse_content_search('find file report.pdf') is None
+    assert parse_content_search('search for pizza near me') is None
+
+
+def test_pdfs_are_skipped_without_a_pdf_library(tmp_path, monkeypatch):
+    monkeypatch.delitem(content_index.EXTRACTORS, '.pdf', raising=False)
+    (tmp_path / 'scan.pdf').write_bytes(b'%PDF-1.4 not really')
+    (tmp_path / 'notes.txt').write_text('budget figures')
+    index = ContentIndex(roots=[tmp_path], cache_dir=tmp_path / 'cache', max_workers=1)
+    index.update()
+    assert len(index) == 1
+    # Only the text file reaches the cache, so installing pypdf later picks the PDF up
+    assert [p.read_text() for p in (tmp_path / 'cache').rglob('*.txt')] == ['budget figures']
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for paginated directory listings
+"""
+
+import os
+import time
+
+import pytest
+
+from directory_browser import DirectoryBrowser, InvalidCursor
+
+
+def make_dir(root, files=250):
+    root.mkdir()
+    for i in range(files):
+        (root / f'file{i:03d}.{"txt" if i % 2 else "md"}').write_bytes(b'x' * (i * 7 % 101))
+    for name in ('Beta', 'alpha', '.git'):
+        (root / name).mkdir()
+    (root / '.env').write_text('secret')
+
+
+def all_pages(browser, path, **options):
+    names, cursor = [], None
+    while True:
+        page = browser.list(path, cursor=cursor, **options)
+        names += [item['name'] for item in page['items']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            return names, page['total']
+
+
+def test_pages_cover_the_directory_once_in_order(tmp_path):
+    make_dir(tmp_path / 'd')
+    browser = DirectoryBrowser()
+    names, total = all_pages(browser, tmp_path / 'd', limit=40)
+    visible = sorted(n for n in os.listdir(tmp_path / 'd') if not n.startswith('.'))
+    assert total == len(visible) == 252 and len(names) == 252
+    assert names[:2] == ['alpha', 'Beta'] and names[2:] == sorted(n for n in visible if n.startswith('file'))
+
+    names, total = all_pages(browser, tmp_path / 'd', limit=33, show_hidden=True, reverse=True)
+    # Descending still lists folders first
+    assert total == 254 and len(set(names)) == 254
+    assert names[:5] == ['Beta', 'alpha', '.git', 'file249.txt', 'file248.md'] and names[-1] == '.env'
+
+
+@pytest.mark.parametrize('sort', ['size', 'modified', 'type'])
+def test_sorted_pages_match_a_full_sort(tmp_path, sort):
+    make_dir(tmp_path / 'd')
+    browser = DirectoryBrowser()
+    names, _ = all_pages(browser, tmp_path / 'd', sort=sort, reverse=True, limit=17, folders_first=False)
+    entries = [e for e in os.scandir(tmp_path / 'd') if not e.name.startswith('.')]
+    key = {'size': lambda e: 0 if e.is_dir() else e.stat().st_size,
+           'modified': lambda e: e.stat().st_mtime,
+           'type': lambda e: os.path.splitext(e.name)[1].lower()}[sort]
+    assert names == [e.name for e in sorted(entries, key=lambda e: (key(e), e.name), reverse=True)]
+
+
+def test_stat_cache_and_invalidation(tmp_path):
+    make_dir(tmp_path / 'd', files=50)
+    browser = DirectoryBrowser(ttl=60)
+    first = browser.list(tmp_path / 'd', sort='size', limit=10)
+    calls = browser.stats['stat_calls']
+    browser.list(tmp_path / 'd', sort='size', limit=10, cursor=first['next_cursor'])
+    assert browser.stats['stat_calls'] == calls
+
+    # Adding an entry changes the directory's mtime, so sizes are read again
+    time.sleep(0.01)
+    (tmp_path / 'd' / 'new.bin').write_bytes(b'y' * 5000)
+    page = browser.list(tmp_path / 'd', sort='size', reverse=True, limit=1, folders_first=False)
+    assert page['items'][0]['name'] == 'new.bin' and page['items'][0]['size'] == 5000
+
+
+def test_bad_requests(tmp_path):
+    make_dir(tmp_path / 'd', files=5)
+    browser = DirectoryBrowser()
+    cursor = browser.list(tmp_path / 'd', limit=2)['next_cursor']
+    with pytest.raises(InvalidCursor):
+        browser.list(tmp_path / 'd', sort='size', cursor=cursor)
+    with pytest.raises(InvalidCursor):
+        browser.list(tmp_path / 'd', cursor='not-a-cursor')
+    with pytest.raises(ValueError):
+        browser.list(tmp_path / 'd', sort='colour')
+    with pytest.raises(NotADirectoryError):
+        browser.list(tmp_path / 'd' / 'file000.md')
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the disk usage analyzer: subtree totals, incremental rescans and voice parsing
+"""
+
+import os
+from pathlib import Path
+
+from disk_usage import DiskUsage, parse_disk_usage_command
+
+
+def write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'x' * size)
+
+
+def make_tree(root):
+    write(root / 'top.bin', 100)
+    write(root / 'videos' / 'a.mp4', 5000)
+    write(root / 'videos' / 'raw' / 'b.mov', 20000)
+    write(root / 'docs' / 'c.pdf', 300)
+    write(root / 'docs' / 'old' / 'd.txt', 40)
+    (root / 'empty').mkdir()
+    os.symlink(root / 'videos', root / 'videos-link')
+
+
+def test_totals_and_largest(tmp_path):
+    root = tmp_path / 'home'
+    make_tree(root)
+    usage = DiskUsage(cache_path=None, max_workers=3)
+    summary = usage.scan(root)
+
+    assert summary['size'] == 25440 and summary['files'] == 5
+    assert [(f['path'], f['size']) for f in summary['folders']] == [
+        (str(root / 'videos'), 25000), (str(root / 'docs'), 340), (str(root / 'empty'), 0)]
+    assert [f['size'] for f in summary['largest_files']] == [20000, 5000, 300, 100, 40]
+    assert usage.largest_folders(root, limit=2, depth=2) == [(25000, str(root / 'videos')),
+                                                             (20000, str(root / 'videos' / 'raw'))]
+    assert usage.largest_files(root / 'docs', limit=1) == [(300, str(root / 'docs' / 'c.pdf'))]
+    assert usage.summary(root / 'docs')['size'] == 340
+    assert usage.summary(tmp_path / 'elsewhere') is None
+
+
+def test_rescan_only_lists_changed_directories(tmp_path):
+    root = tmp_path / 'home'
+    make_tree(root)
+    cache = tmp_path / 'usage.json'
+    DiskUsage(cache_path=cache).scan(root)
+
+    # A new process loads the tree cache; only docs/old changed
+    write(root / 'docs' / 'old' / 'e.iso', 100000)
+    usage = DiskUsage(cache_path=cache)
+    summary = usage.scan(root)
+    assert usage.stats['listed'] == 1 and usage.stats['reused'] == 5
+    assert summary['size'] == 125440
+    assert summary['folders'][0] == {'path': str(root / 'docs'), 'size': 100340}
+    assert summary['largest_files'][0]['path'] == str(root / 'docs' / 'old' / 'e.iso')
+
+    # Removed subtrees drop out of the cache; a file grown in place needs a full rescan
+    for name in os.listdir(root / 'videos' / 'raw'):
+        os.unlink(root / 'videos' / 'raw' / name)
+    os.rmdir(root / 'videos' / 'raw')
+    write(root / 'top.bin', 1100)
+    assert usage.scan(root)['size'] == 105440
+    assert not usage.covered(root / 'videos' / 'raw')
+    assert usage.scan(root, full=True)['size'] == 106440
+
+
+def test_subtree_rescan_updates_parent_totals(tmp_path):
+    root = tmp_path / 'home'
+    make_tree(root)
+    usage = DiskUsage(cache_path=None)
+    usage.scan(root)
+    write(root / 'videos' / 'c.mkv', 1000)
+    assert usage.scan(root / 'videos')['size'] == 26000
+    assert usage.summary(root)['size'] == 26440
+
+
+def test_background_full_rescan(tmp_path):
+    root = tmp_path / 'home'
+    make_tree(root)
+    usage = DiskUsage(cache_path=None, max_workers=2)
+    assert not usage.covered(root)
+    usage.start(root).join(10)
+    assert usage.covered(root) and not usage.scanning
+    write(root / 'docs' / 'new.txt', 60)
+    usage.start(root, full=True).join(10)
+    assert usage.summary(root)['size'] == 25500
+
+
+def test_parse_disk_usage_command():
+    locations = {'home': Path('/h'), 'downloads': Path('/h/Downloads'), 'documents': Path('/h/Documents')}
+    assert parse_disk_usage_command("what's taking space", locations) == ('summary', Path('/h'))
+    assert parse_disk_usage_command('what is taking up space in downloads?', locations) == \
+        ('summary', Path('/h/Downloads'))
+    assert parse_disk_usage_command('what is using my disk space', locations) == ('summary', Path('/h'))
+    assert parse_disk_usage_command('show the biggest files in my documents folder', locations) == \
+        ('files', Path('/h/Documents'))
+    assert parse_disk_usage_command('largest folders on my disk', locations) == ('folders', Path('/h'))
+    assert parse_disk_usage_command('largest files in narnia', locations) is None
+    assert parse_disk_usage_command('what is the capital of france', locations) is None
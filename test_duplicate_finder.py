@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the staged duplicate file finder and reclaiming space through the journal
+"""
+
+import os
+
+import duplicate_finder
+from duplicate_finder import DuplicateFinder
+from operation_journal import OperationJournal
+
+
+def make_finder(tmp_path, **options):
+    journal = OperationJournal(tmp_path / 'operations.jsonl', trash=tmp_path / 'trash')
+    return DuplicateFinder(cache_path=tmp_path / 'hashes.json', max_workers=3, journal=journal, **options)
+
+
+def make_files(root):
+    big = os.urandom(300 * 1024)
+    (root / 'a').mkdir(parents=True)
+    (root / 'b').mkdir()
+    (root / 'a' / 'movie.bin').write_bytes(big)
+    (root / 'b' / 'movie copy.bin').write_bytes(big)
+    # Same size, same first and last 64 KB, different middle: only the full hash tells them apart
+    (root / 'b' / 'tricky.bin').write_bytes(big[:150 * 1024] + b'x' + big[150 * 1024 + 1:])
+    for name in ('note.txt', 'note (1).txt', 'note (2).txt'):
+        (root / 'a' / name).write_text('same small note')
+    (root / 'a' / 'other.txt').write_text('same small nope')
+    (root / 'a' / 'empty1').write_bytes(b'')
+    (root / 'a' / 'empty2').write_bytes(b'')
+    os.link(root / 'a' / 'other.txt', root / 'b' / 'other-link.txt')
+    os.utime(root / 'a' / 'movie.bin', (1_000_000, 1_000_000))
+
+
+def test_finds_groups_in_stages(tmp_path):
+    root = tmp_path / 'files'
+    make_files(root)
+    finder = make_finder(tmp_path)
+    groups = finder.find([root])
+
+    assert [(g.size, len(g.files)) for g in groups] == [(300 * 1024, 2), (15, 3)]
+    movie = groups[0]
+    assert movie.keep == str(root / 'a' / 'movie.bin')
+    assert movie.extras == [str(root / 'b' / 'movie copy.bin')]
+    assert groups[1].reclaimable == 30
+    # Three big files were partially hashed, but the full hash only ran for them, not the notes
+    assert finder.stats['full_hashed'] == 3
+    assert finder.stats['bytes_read'] == 3 * 128 * 1024 + 4 * 15 + 3 * 300 * 1024
+
+
+def test_repeat_scan_reads_only_changed_files(tmp_path):
+    root = tmp_path / 'files'
+    make_files(root)
+    make_finder(tmp_path).find([root])
+
+    (root / 'a' / 'note (2).txt').write_text('a different note')
+    finder = make_finder(tmp_path)
+    groups = finder.find([root])
+    assert [len(g.files) for g in groups] == [2, 2]
+    assert finder.stats['bytes_read'] == 0
+    assert finder.stats['partial_hashed'] == finder.stats['full_hashed'] == 0
+
+
+def test_trash_duplicates_keeps_one_copy_and_undoes_as_one(tmp_path):
+    root = tmp_path / 'files'
+    make_files(root)
+    finder = make_finder(tmp_path)
+    finder.find([root])
+
+    # Asking for every copy of the notes still leaves one behind
+    notes = [str(root / 'a' / name) for name in ('note.txt', 'note (1).txt', 'note (2).txt')]
+    result = finder.trash_duplicates(paths=notes)
+    assert len(result['trashed']) == 2 and result['bytes'] == 30
+    assert result['errors'] == [(result['errors'][0][0], 'it is the last remaining copy')]
+    assert sum(os.path.exists(p) for p in notes) == 1
+    assert len(finder.last_groups) == 1
+
+    (root / 'b' / 'movie copy.bin').write_bytes(b'changed')
+    result = finder.trash_duplicates()
+    assert result['trashed'] == [] and 'changed since the scan' in result['errors'][0][1]
+
+    assert len(finder.journal.undo()) == 2
+    assert all(os.path.exists(p) for p in notes)
+
+
+def test_min_size_and_unreadable_files(tmp_path, monkeypatch):
+    root = tmp_path / 'files'
+    make_files(root)
+    finder = make_finder(tmp_path)
+    assert [g.size for g in finder.find([root], min_size=1024)] == [300 * 1024]
+
+    real = duplicate_finder.full_hash
+
+    def flaky(path, size):
+        if path.endswith('movie copy.bin'):
+            raise PermissionError('denied')
+        return real(path, size)
+    monkeypatch.setattr(duplicate_finder, 'full_hash', flaky)
+    assert make_finder(tmp_path / 'fresh').find([root], min_size=1024) == []
+
+
+def test_background_scan_results_are_reused_for_the_same_roots(tmp_path):
+    root = tmp_path / 'files'
+    make_files(root)
+    finder = make_finder(tmp_path)
+    assert finder.results_for([root]) is None
+    finder.start([root]).join(10)
+    assert not finder.scanning
+    assert [len(g.files) for g in finder.results_for([root])] == [2, 3]
+    # A different folder or size floor needs its own scan
+    assert finder.results_for([root / 'a']) is None
+    assert finder.results_for([root], min_size=1024) is None
+
+
+def test_only_file_duplicates_are_file_commands():
+    from improved_command_processor import ImprovedCommandProcessor
+    processor = ImprovedCommandProcessor()
+    for command in ("find duplicate files in downloads", "delete duplicate photos",
+                    "clean up duplicates in my downloads"):
+        assert processor._is_find_duplicates_command(command), command
+    for command in ("how do i remove duplicates from a python list",
+                    "remove duplicates from this array"):
+        assert not processor._is_find_duplicates_command(command), command
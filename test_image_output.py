@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the background image encode/save pipeline
+"""
+
+import threading
+import time
+
+import pytest
+
+from image_output import ImageWriter, normalize_format
+
+
+def test_submit_returns_before_encoding_finishes(tmp_path):
+    release = threading.Event()
+
+    def slow_encoder(image, path, image_format, quality, bgr=True):
+        release.wait(2)
+        with open(path, 'wb') as f:
+            f.write(b'x' * 1000)
+        return (4, 3)
+
+    writer = ImageWriter(encoder=slow_encoder)
+    try:
+        start = time.perf_counter()
+        job = writer.submit(object(), tmp_path, "shot", image_format='jpg')
+        assert time.perf_counter() - start < 0.1
+        assert job.name == "shot.jpg"
+        assert not job.done() and not job.path.exists()
+        assert writer.pending == 1
+
+        release.set()
+        report = job.result(timeout=2)
+        assert report['success']
+        assert report['file_size'] == 1000
+        assert report['width'] == 4 and report['height'] == 3
+        assert 'encode_ms' in report
+        assert writer.pending == 0
+        assert writer.recent_reports()[-1]['name'] == "shot.jpg"
+        # Only the final file is left behind
+        assert [p.name for p in tmp_path.iterdir()] == ["shot.jpg"]
+    finally:
+        writer.shutdown()
+
+
+def test_failure_is_reported_and_callback_runs(tmp_path):
+    def broken_encoder(image, path, image_format, quality, bgr=True):
+        raise IOError("disk full")
+
+    seen = []
+    writer = ImageWriter(encoder=broken_encoder)
+    try:
+        report = writer.submit(object(), tmp_path, "photo", on_done=seen.append).result(timeout=2)
+    finally:
+        writer.shutdown()
+    assert not report['success']
+    assert report['error'] == "disk full"
+    assert seen == [report]
+
+
+def test_unknown_format_rejected():
+    assert normalize_format('JPG') == 'jpeg'
+    with pytest.raises(ValueError):
+        normalize_format('bmp')
+
+
+def test_real_encode_formats_and_thumbnail(tmp_path):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("PIL")
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, size=(480, 640, 3), dtype=np.uint8)
+    writer = ImageWriter()
+    try:
+        jobs = [writer.submit(frame, tmp_path, f"img_{fmt}", image_format=fmt, quality=70, thumbnail=(fmt == 'jpeg'))
+                for fmt in ('png', 'jpeg', 'webp')]
+        reports = [job.result(timeout=10) for job in jobs]
+    finally:
+        writer.shutdown()
+
+    assert all(r['success'] for r in reports), reports
+    assert {r['name'] for r in reports} == {"img_png.png", "img_jpeg.jpg", "img_webp.webp"}
+    assert all(r['width'] == 640 and r['height'] == 480 for r in reports)
+
+    from PIL import Image
+    with Image.open(reports[1]['thumbnail_path']) as thumb:
+        assert max(thumb.size) == 320
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the counters/histograms behind /metrics
+"""
+
+from threading import Thread
+
+import pytest
+
+from instrumentation import MetricsRegistry
+
+
+def test_counter_is_consistent_across_threads():
+    registry = MetricsRegistry()
+    requests = registry.counter('jarvis_test_requests', 'Requests', ['intent'])
+
+    def work():
+        for _ in range(10000):
+            requests.inc(intent='screenshot')
+
+    threads = [Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert requests.labels(intent='screenshot').value == 80000
+    assert 'jarvis_test_requests_total{intent="screenshot"} 80000' in registry.render()
+    with pytest.raises(ValueError):
+        requests.inc(-1, intent='screenshot')
+
+
+def test_histogram_exposition():
+    registry = MetricsRegistry()
+    latency = registry.histogram('jarvis_test_seconds', 'Latency', ['source'], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value, source='groq')
+
+    text = registry.render()
+    assert '# TYPE jarvis_test_seconds histogram' in text
+    assert 'jarvis_test_seconds_bucket{source="groq",le="0.1"} 1' in text
+    assert 'jarvis_test_seconds_bucket{source="groq",le="1"} 3' in text
+    assert 'jarvis_test_seconds_bucket{source="groq",le="+Inf"} 4' in text
+    assert 'jarvis_test_seconds_count{source="groq"} 4' in text
+    assert 'jarvis_test_seconds_sum{source="groq"} 4.05' in text
+
+
+def test_timer_decorator_and_gauges():
+    registry = MetricsRegistry()
+    latency = registry.histogram('jarvis_test_call_seconds', 'Call latency')
+
+    @latency.time()
+    def call():
+        return 42
+
+    assert call() == 42
+    assert latency.labels().snapshot()[1] == 1
+
+    depth = registry.gauge('jarvis_test_depth', 'Depth')
+    depth.inc()
+    depth.inc()
+    depth.dec()
+    registry.gauge('jarvis_test_live', 'Live value', function=lambda: 7)
+    text = registry.render()
+    assert 'jarvis_test_depth 1' in text
+    assert 'jarvis_test_live 7' in text
+
+
+def test_same_name_returns_same_metric_and_collectors_render():
+    registry = MetricsRegistry()
+    assert registry.counter('jarvis_test_x', 'X') is registry.counter('jarvis_test_x', 'X')
+    with pytest.raises(ValueError):
+        registry.histogram('jarvis_test_x', 'X')
+
+    registry.register_collector(lambda: [
+        ('jarvis_test_cache_hits', 'counter', 'Cache hits', [({'cache': 'lyrics'}, 3)])
+    ])
+    assert 'jarvis_test_cache_hits_total{cache="lyrics"} 3' in registry.render()
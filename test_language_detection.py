@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests for script-based and romanized language detection
+"""
+
+import pytest
+
+from language_detection import detect_language, script_counts, romanized_model
+
+
+def test_script_counts():
+    assert script_counts('youtube खोलो') == {'devanagari': 4, 'gujarati': 0, 'latin': 7}
+    assert script_counts('સમય 12!') == {'devanagari': 0, 'gujarati': 3, 'latin': 0}
+
+
+@pytest.mark.parametrize("text,language", [
+    ('समय क्या है', 'hi'),
+    ('સમય શું છે', 'gu'),
+    ('chrome खोलो', 'hi'),
+    ('what is the weather like in london', 'en'),
+    ('who is the prime minister of india', 'en'),
+    ('hello', 'en'),
+    ('12:30', 'en'),
+    ('mujhe gaana sunao yaar', 'hi'),
+    ('kal ka mausam kaisa rahega', 'hi'),
+    ('aaje shu karvanu che', 'gu'),
+    ('tamaru naam shu che', 'gu'),
+])
+def test_detect_language(text, language):
+    assert detect_language(text) == language
+
+
+def test_detection_is_deterministic_and_memoized():
+    detect_language.cache_clear()
+    results = {detect_language('kitna paisa bacha hai') for _ in range(20)}
+    assert results == {'hi'}
+    assert detect_language.cache_info().hits == 19
+
+
+def test_short_latin_text_defaults_to_english():
+    assert romanized_model.classify('kem') == 'en'
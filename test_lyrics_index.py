@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the inverted lyrics index
+"""
+
+import json
+import random
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from lyrics_index import LyricsIndex, edit_distance
+
+SEED_SONGS = {
+    "shape of you": {"artist": "Ed Sheeran", "keywords": ["shape", "you", "love", "body", "crazy"]},
+    "bohemian rhapsody": {"artist": "Queen", "keywords": ["bohemian", "rhapsody", "mama", "killed", "man"]},
+    "hotel california": {"artist": "Eagles", "keywords": ["hotel", "california", "dark", "highway"]},
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    (tmp_path / "seed.json").write_text(json.dumps(SEED_SONGS))
+    (tmp_path / "extra.csv").write_text(
+        "title,artist,lyrics\n"
+        "Let It Be,The Beatles,when i find myself in times of trouble mother mary comes to me\n"
+    )
+    lyrics = LyricsIndex(tmp_path)
+    lyrics.ensure_loaded()
+    return lyrics
+
+
+def test_loads_catalog_files(index):
+    assert len(index) == 4
+
+
+def test_phrase_and_title_matching(index):
+    title, info = index.best_match("the song goes mother mary comes to me")
+    assert title == "let it be"
+    assert info['artist'] == "The Beatles"
+
+    assert index.best_match("play shape of you by ed sheeran")[0] == "shape of you"
+
+
+def test_typo_tolerance(index):
+    assert edit_distance("shpae", "shape") == 1
+    assert index.best_match("bohemain rapsody")[0] == "bohemian rhapsody"
+
+
+def test_unrelated_text_has_no_match(index):
+    assert index.best_match("completely unrelated words here") == (None, None)
+
+
+def test_lookup_stays_fast_on_large_catalog():
+    rng = random.Random(3)
+    vocabulary = [''.join(rng.choice('abcdefghiklmnoprstuw') for _ in range(rng.randint(3, 8))) for _ in range(5000)]
+    common = ['you', 'i', 'love', 'the', 'me', 'my', 'baby', 'in', 'your', 'night']
+
+    def word():
+        return rng.choice(common) if rng.random() < 0.5 else rng.choice(vocabulary)
+
+    index = LyricsIndex(None)
+    for _ in range(20000):
+        index.add_song(' '.join(word() for _ in range(3)), rng.choice(vocabulary), ' '.join(word() for _ in range(15)))
+    index.add_songs([dict(info, title=title) for title, info in SEED_SONGS.items()])
+    index.build()
+
+    queries = ["shape of you im in love with your body", "i love you baby", "hotle califrnia"]
+    start = time.perf_counter()
+    for _ in range(20):
+        for query in queries:
+            index.search(query)
+    per_query_ms = (time.perf_counter() - start) * 1000 / (20 * len(queries))
+
+    assert index.best_match("hotle califrnia")[0] == "hotel california"
+    assert per_query_ms < 5
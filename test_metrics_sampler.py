@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the background metrics sampler and its ring buffers
+"""
+
+import itertools
+import time
+
+from metrics_sampler import MetricsSampler, RingBuffer
+
+
+def test_ring_buffer_overwrites_oldest():
+    buffer = RingBuffer(3, ('cpu_percent', 'battery_percent'))
+    for t in range(5):
+        buffer.append(float(t), {'cpu_percent': t * 10})
+
+    assert len(buffer) == 3
+    assert [v for _, v in buffer.series('cpu_percent')] == [20, 30, 40]
+    latest = buffer.latest()
+    assert latest['timestamp'] == 4.0 and latest['cpu_percent'] == 40
+    # Missing fields are None rather than 0
+    assert latest['battery_percent'] is None
+
+
+def test_summary_over_window():
+    buffer = RingBuffer(10, ('cpu_percent',))
+    for t, value in enumerate([50, 10, 20, 30]):
+        buffer.append(float(t), {'cpu_percent': value})
+
+    everything = buffer.summary()
+    assert everything['samples'] == 4
+    assert everything['cpu_percent'] == {'min': 10, 'avg': 27.5, 'max': 50}
+
+    recent = buffer.summary(since=1.5)
+    assert recent['samples'] == 2
+    assert recent['cpu_percent'] == {'min': 20, 'avg': 25, 'max': 30}
+    assert buffer.summary(since=100)['cpu_percent'] is None
+
+
+def test_latest_answers_without_waiting_for_interval():
+    counter = itertools.count()
+    sampler = MetricsSampler(interval=60, capacity=5, collector=lambda: {'cpu_percent': next(counter)})
+    try:
+        start = time.perf_counter()
+        latest = sampler.latest()
+        assert time.perf_counter() - start < 0.5
+        assert latest['cpu_percent'] is not None
+        assert sampler.running
+    finally:
+        sampler.stop()
+
+
+def test_background_sampling_fills_buffer():
+    sampler = MetricsSampler(interval=0.01, capacity=4, collector=lambda: {'memory_percent': 42.0})
+    try:
+        sampler.start()
+        time.sleep(0.15)
+    finally:
+        sampler.stop()
+    assert len(sampler.buffer) == 4
+    assert sampler.summary(60)['memory_percent']['avg'] == 42.0
+
+
+def test_collector_errors_are_counted_not_raised():
+    def broken():
+        raise OSError("sensor gone")
+
+    sampler = MetricsSampler(collector=broken)
+    assert sampler.sample_now() is None
+    assert sampler.errors == 1
+    assert sampler.buffer.latest() is None
+
+
+def test_windows_ignore_wall_clock_jumps(monkeypatch):
+    sampler = MetricsSampler(collector=lambda: {'cpu_percent': 10.0})
+    sampler.sample_now()
+    # Setting the clock back an hour must not empty the last-minute window
+    wall = time.time()
+    monkeypatch.setattr(time, 'time', lambda: wall - 3600)
+    try:
+        assert sampler.summary(60)['samples'] == 1
+        assert abs(sampler.latest()['timestamp'] - (wall - 3600)) < 1
+    finally:
+        sampler.stop()
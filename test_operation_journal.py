@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the file operation journal: undo, restore by name and compaction
+"""
+
+import os
+
+import operation_journal
+from bulk_operations import BulkOperations, Selection
+from operation_journal import OperationJournal, parse_undo_command
+
+
+def make_journal(tmp_path, **options):
+    return OperationJournal(tmp_path / 'operations.jsonl', trash=tmp_path / 'trash', **options)
+
+
+def test_undo_reverses_operations_newest_first(tmp_path):
+    journal = make_journal(tmp_path)
+    work = tmp_path / 'work'
+    work.mkdir()
+
+    created = work / 'notes.txt'
+    created.write_text('notes')
+    journal.record('create', created)
+    renamed = work / 'final.txt'
+    created.rename(renamed)
+    journal.record('rename', created, renamed)
+    journal.trash(renamed)
+    assert not renamed.exists() and len(os.listdir(tmp_path / 'trash')) == 1
+
+    results = journal.undo(2)
+    assert [entry.op for entry, error in results] == ['delete', 'rename']
+    assert all(error is None for _, error in results)
+    assert created.read_text() == 'notes' and not renamed.exists()
+
+    # Undoing the create sends the file to the trash rather than deleting it
+    entry, error = journal.undo()[0]
+    assert entry.op == 'create' and error is None and not created.exists()
+    assert journal.find_deleted('notes.txt')
+    assert journal.undo() == []
+
+
+def test_permanent_delete_is_consumed_but_not_reversed(tmp_path):
+    journal = make_journal(tmp_path)
+    path = tmp_path / 'gone.txt'
+    path.write_text('x')
+    journal.record('create', path)
+    path.unlink()
+    journal.record('delete', path)
+
+    entry, error = journal.undo()[0]
+    assert entry.op == 'delete' and 'permanently' in error
+    # The next undo moves on to the operation before it
+    entry, error = journal.undo()[0]
+    assert entry.op == 'create' and 'no longer exists' in error
+
+
+def test_restore_by_name_returns_to_original_folder(tmp_path):
+    journal = make_journal(tmp_path)
+    for folder in ('a', 'b'):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / 'report.pdf').write_text(folder)
+        journal.trash(tmp_path / folder / 'report.pdf')
+    (tmp_path / 'a' / 'summary.txt').write_text('s')
+    journal.trash(tmp_path / 'a' / 'summary.txt')
+
+    matches = journal.find_deleted('REPORT.PDF')
+    assert [os.path.dirname(e.path) for e in matches] == [str(tmp_path / 'b'), str(tmp_path / 'a')]
+    assert [e.name for e in journal.find_deleted('summary')] == ['summary.txt']
+    assert len(journal.find_deleted('port')) == 2
+
+    # Something new at the original path: restore beside it
+    (tmp_path / 'b' / 'report.pdf').write_text('new')
+    restored = journal.restore(matches[0])
+    assert restored == str(tmp_path / 'b' / 'report (restored 1).pdf')
+    assert open(restored).read() == 'b'
+    assert len(journal.find_deleted('report.pdf')) == 1
+
+
+def test_replay_and_background_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(operation_journal, 'COMPACT_MIN_RECORDS', 50)
+    journal = make_journal(tmp_path, max_history=10)
+    work = tmp_path / 'work'
+    work.mkdir()
+    for i in range(40):
+        (work / f'f{i}.txt').write_text(str(i))
+        journal.record('create', work / f'f{i}.txt')
+    journal.trash(work / 'f0.txt')
+    journal.undo()      # restores f0.txt
+    journal.trash(work / 'f1.txt')
+    for i in range(2, 20):
+        journal.record('rename', work / f'f{i}.txt', work / f'g{i}.txt')
+    journal.compact(wait=True)
+    journal.close()
+
+    lines = (tmp_path / 'operations.jsonl').read_text().splitlines()
+    assert len(lines) < 40 and journal.stats['compactions'] >= 1
+
+    reloaded = make_journal(tmp_path, max_history=10)
+    assert [e.name for e in reloaded.find_deleted('f1.txt')] == ['f1.txt']
+    assert not reloaded.find_deleted('f0.txt')
+    assert reloaded.history(1)[0]['op'] == 'rename'
+    seq = reloaded.record('create', work / 'f0.txt').seq
+    assert seq > max(e.seq for e in journal.entries.values())
+
+
+def test_bulk_job_undoes_as_one_operation(tmp_path):
+    journal = make_journal(tmp_path)
+    source, dest = tmp_path / 'src', tmp_path / 'dst'
+    source.mkdir()
+    for i in range(6):
+        (source / f'doc{i}.pdf').write_text(str(i))
+    (tmp_path / 'before.txt').write_text('x')
+    journal.record('create', tmp_path / 'before.txt')
+
+    manager = BulkOperations(max_workers=3, journal=journal)
+    job = manager.start('move', Selection(source, extensions=['pdf']), dest, background=False)
+    assert job.done_files == 6 and not list(source.iterdir())
+
+    results = journal.undo()
+    assert len(results) == 6 and all(error is None for _, error in results)
+    assert sorted(p.name for p in source.iterdir()) == [f'doc{i}.pdf' for i in range(6)]
+    assert (tmp_path / 'before.txt').exists()
+
+
+def test_parse_undo_command():
+    assert parse_undo_command('undo') == 1
+    assert parse_undo_command('undo that') == 1
+    assert parse_undo_command('undo the last 3 operations') == 3
+    assert parse_undo_command('undo last two changes') == 2
+    assert parse_undo_command('undo my homework') is None
+    assert parse_undo_command('what is undo') is None
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the runtime sampling profiler
+"""
+
+import time
+from threading import Thread, Event
+
+from sampling_profiler import MIN_INTERVAL, SamplingProfiler
+
+
+def busy_hot_path(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(200))
+
+
+def test_collapsed_stacks_show_hot_function():
+    stop = Event()
+    worker = Thread(target=busy_hot_path, args=(stop,), name='worker-busy')
+    worker.start()
+    profiler = SamplingProfiler()
+    try:
+        assert profiler.start(duration=0.3, interval=0.002, thread_prefix='worker-')
+        assert not profiler.start()
+        profiler.wait(2)
+    finally:
+        stop.set()
+        worker.join()
+
+    status = profiler.status()
+    assert not status['running']
+    assert status['samples'] > 10
+
+    lines = profiler.collapsed().strip().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0
+        # Root frame is the thread name, only the filtered thread is sampled
+        assert stack.startswith('worker-busy;')
+    assert any('busy_hot_path (test_sampling_profiler.py)' in line for line in lines)
+    assert profiler.top_functions(1)
+
+
+def test_stop_ends_profile_early():
+    profiler = SamplingProfiler()
+    profiler.start(duration=30, interval=0.01)
+    time.sleep(0.05)
+    start = time.perf_counter()
+    profiler.stop()
+    assert time.perf_counter() - start < 1
+    assert not profiler.running
+    assert profiler.samples >= 1
+
+
+def test_interval_has_a_floor():
+    profiler = SamplingProfiler()
+    profiler.start(duration=0.2, interval=0)
+    profiler.wait(2)
+    assert profiler.settings['interval'] == MIN_INTERVAL
+    assert profiler.samples <= 0.2 / MIN_INTERVAL + 5
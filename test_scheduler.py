@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the heap-based timer/reminder scheduler
+"""
+
+import time
+from threading import Event
+
+from scheduler import Scheduler
+
+
+def collecting_scheduler(store_path=None):
+    fired = []
+    event = Event()
+
+    def dispatcher(task):
+        fired.append((task.id, task.message))
+        event.set()
+
+    return Scheduler(store_path, dispatcher=dispatcher), fired, event
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_fires_in_deadline_order_and_cancel():
+    scheduler, fired, _ = collecting_scheduler()
+    scheduler.start()
+    try:
+        late = scheduler.add("second", delay=0.15)
+        scheduler.add("first", delay=0.05)
+        cancelled = scheduler.add("never", delay=0.1)
+        assert scheduler.cancel(cancelled.id) is cancelled
+        assert scheduler.cancel(cancelled.id) is None
+
+        assert wait_for(lambda: len(fired) == 2)
+        assert [message for _, message in fired] == ["first", "second"]
+        assert late.id not in scheduler.tasks
+        time.sleep(0.05)
+        assert len(fired) == 2
+    finally:
+        scheduler.stop()
+
+
+def test_recurring_and_snooze():
+    scheduler, fired, _ = collecting_scheduler()
+    scheduler.start()
+    try:
+        recurring = scheduler.add("drink water", delay=0.02, repeat=0.05)
+        assert wait_for(lambda: len(fired) >= 3)
+        scheduler.cancel(recurring.id)
+
+        fired.clear()
+        one_shot = scheduler.add("stretch", delay=0.01)
+        assert wait_for(lambda: fired == [(one_shot.id, "stretch")])
+        # A task that already fired can still be snoozed
+        snoozed = scheduler.snooze(one_shot.id, 0.05)
+        assert snoozed.snoozes == 1
+        assert wait_for(lambda: len(fired) == 2)
+        assert scheduler.snooze(999, 10) is None
+    finally:
+        scheduler.stop()
+
+
+def test_schedule_survives_restart(tmp_path):
+    store = tmp_path / "schedule.jsonl"
+    first, _, _ = collecting_scheduler(store)
+    keep = first.add("pay rent", delay=3600)
+    gone = first.add("cancelled", delay=3600)
+    first.cancel(gone.id)
+    first.snooze(keep.id, 7200)
+    first.add("missed while closed", at=time.time() - 30)
+    first.stop()
+
+    second, fired, _ = collecting_scheduler(store)
+    assert {t.message for t in second.pending()} == {"pay rent", "missed while closed"}
+    assert second.get(keep.id).snoozes == 1
+    new_task = second.add("next", delay=3600)
+    assert new_task.id > keep.id
+
+    second.start()
+    try:
+        # Tasks that came due while the app was closed fire right away
+        assert wait_for(lambda: [m for _, m in fired] == ["missed while closed"])
+        assert second.stats['late'] == 1
+    finally:
+        second.stop()
+
+
+def test_hundred_thousand_pending_timers():
+    scheduler, _, _ = collecting_scheduler()
+    now = time.time()
+    start = time.perf_counter()
+    for i in range(100000):
+        scheduler.add(f"timer {i}", at=now + 3600 + (i * 7919) % 100000)
+    elapsed = time.perf_counter() - start
+
+    assert len(scheduler) == 100000
+    assert elapsed < 5
+    earliest = scheduler.pending(limit=3)
+    assert [t.due for t in earliest] == sorted(t.due for t in earliest)
+    assert earliest[0].due == now + 3600
+
+
+def test_autostart_on_add_and_restore_without_touching_journal_early(tmp_path):
+    store = tmp_path / "schedule.jsonl"
+    first, fired, _ = collecting_scheduler(store)
+    first.autostart = True
+    assert not store.exists()
+    first.add("tea", delay=0.02)
+    try:
+        assert wait_for(lambda: [m for _, m in fired] == ["tea"])
+        first.add("later", at=time.time() + 0.05)
+    finally:
+        first.stop()
+
+    journal = store.read_text()
+    second, fired, _ = collecting_scheduler(store)
+    second.autostart = True
+    # Constructing a scheduler doesn't compact the journal; restore() does and starts the thread
+    assert store.read_text() == journal
+    try:
+        assert second.restore() == 1
+        assert wait_for(lambda: [m for _, m in fired] == ["later"])
+    finally:
+        second.stop()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for tile delta screen recording, using synthetic frames
+"""
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from screen_capture import TileDeltaRecorder, ScreenRecorder, changed_tiles, load_recording
+
+
+def synthetic_frames(count, height=200, width=300, seed=0):
+    """A static 'desktop' with a small moving cursor block"""
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    for i in range(count):
+        frame = background.copy()
+        x = 10 + i * 7
+        frame[50:60, x:x + 10] = 255
+        yield frame
+
+
+def test_only_changed_tiles_are_stored():
+    recorder = TileDeltaRecorder(tile_size=32)
+    frames = list(synthetic_frames(10))
+    counts = [recorder.add_frame(frame) for frame in frames]
+
+    rows, cols = -(-200 // 32), -(-300 // 32)
+    assert counts[0] == rows * cols
+    # The cursor block touches at most four tiles and leaves at most four behind
+    assert all(0 < c <= 4 for c in counts[1:])
+    assert recorder.changed_ratio < 0.2
+
+
+def test_replay_reconstructs_frames_exactly(tmp_path):
+    frames = list(synthetic_frames(12, height=130, width=170))
+
+    in_memory = TileDeltaRecorder(tile_size=64, keyframe_interval=5)
+    on_disk = TileDeltaRecorder(tmp_path / "rec", tile_size=64, keyframe_interval=5)
+    for frame in frames:
+        in_memory.add_frame(frame)
+        on_disk.add_frame(frame)
+
+    for replayed in (list(in_memory.frames()), list(load_recording(tmp_path / "rec"))):
+        assert len(replayed) == len(frames)
+        for original, rebuilt in zip(frames, replayed):
+            assert np.array_equal(original, rebuilt)
+    assert in_memory.stats['keyframes'] == 3
+
+
+def test_threshold_ignores_noise():
+    base = np.full((64, 64, 3), 100, dtype=np.uint8)
+    noisy = base + 2
+    assert changed_tiles(base, noisy, 32).all()
+    assert not changed_tiles(base, noisy, 32, threshold=3).any()
+
+
+def test_screen_recorder_runs_with_injected_capture():
+    frames = synthetic_frames(1000, height=64, width=64)
+    recorder = ScreenRecorder(capture=lambda **kwargs: next(frames))
+    assert recorder.start(None, interval=0.01, tile_size=16)
+    assert not recorder.start(None)
+    time.sleep(0.1)
+    status = recorder.stop()
+    assert not status['running']
+    assert status['frames'] >= 3
+    assert status['error'] is None
+
+
+def test_mismatched_frame_size_rejected():
+    recorder = TileDeltaRecorder(tile_size=16)
+    recorder.add_frame(np.zeros((32, 32, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        recorder.add_frame(np.zeros((16, 32, 3), dtype=np.uint8))
+
+
+def test_active_window_is_not_a_title_search(monkeypatch):
+    import screen_capture
+    monkeypatch.setattr(screen_capture, 'find_active_window', lambda: (10, 20, 300, 200))
+    assert screen_capture.find_window(screen_capture.ACTIVE_WINDOW) == (10, 20, 300, 200)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the detached process spawn service
+"""
+
+import sys
+import time
+
+import pytest
+
+from spawn_service import SpawnService
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith('win'), reason="POSIX process semantics")
+
+
+@pytest.mark.parametrize("use_helper", [True, False])
+def test_spawn_returns_immediately_and_reaps_exit_status(use_helper):
+    service = SpawnService(use_helper=use_helper)
+    try:
+        start = time.perf_counter()
+        slow = service.spawn([sys.executable, '-c', 'import time, sys; time.sleep(0.5); sys.exit(3)'])
+        assert time.perf_counter() - start < 0.4
+        exited = []
+        quick = service.spawn([sys.executable, '-c', 'pass'], on_exit=exited.append)
+
+        assert service.wait(quick, timeout=10)
+        assert service.wait(slow, timeout=10)
+        assert (quick.status, quick.returncode) == ('exited', 0)
+        assert (slow.status, slow.returncode) == ('exited', 3)
+        assert exited == [quick]
+        assert slow.pid and slow.pid != quick.pid
+        assert [p['id'] for p in service.processes()['finished']] == [slow.id, quick.id]
+    finally:
+        service.stop()
+
+
+@pytest.mark.parametrize("use_helper", [True, False])
+def test_missing_executable_fails_without_raising(use_helper):
+    service = SpawnService(use_helper=use_helper)
+    try:
+        record = service.spawn(['/nonexistent/jarvis-opener', 'file.txt'])
+        assert service.wait(record, timeout=10)
+        assert record.status == 'failed'
+        assert 'FileNotFoundError' in record.error
+        assert service.stats['failed'] == 1
+    finally:
+        service.stop()
+
+
+def test_helper_is_restarted_after_it_dies():
+    service = SpawnService()
+    try:
+        first = service.spawn([sys.executable, '-c', 'pass'])
+        assert service.wait(first, timeout=10)
+        service._helper.kill()
+        service._helper.wait()
+        second = service.spawn([sys.executable, '-c', 'pass'])
+        assert service.wait(second, timeout=10)
+        assert second.returncode == 0
+        assert service.stats['helper_starts'] == 2
+    finally:
+        service.stop()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for file templates: compilation, rendering, writers and batch creation
+"""
+
+import json
+
+import pytest
+
+from template_engine import Template, TemplateEngine, parse_batch_create
+
+
+def test_template_compiles_once_and_renders_filters():
+    template = Template('js', 'console.log({{ greeting|json }}); /* {{ name | upper }} */ {{ missing }}{ }')
+    assert template.variables == {'greeting', 'name', 'missing'}
+    assert template.render({'greeting': 'say "hi"', 'name': 'app'}) == \
+        'console.log("say \\"hi\\""); /* APP */ { }'
+    with pytest.raises(ValueError):
+        Template('bad', '{{ name|shout }}')
+
+
+def test_shipped_templates_create_every_format(tmp_path):
+    engine = TemplateEngine()
+    results = engine.create_many(tmp_path, ['notes.txt', 'data.json', 'page.html', 'report.pdf', 'memo.docx',
+                                            'table.csv', 'odd.zzz', 'notes.txt'])
+    assert [r['success'] for r in results] == [True] * 7 + [False]
+    assert results[-1]['error'] == 'already exists'
+
+    assert json.loads((tmp_path / 'data.json').read_text())['name'] == 'data'
+    assert (tmp_path / 'report.pdf').read_bytes().startswith(b'%PDF-')
+    assert (tmp_path / 'report.pdf').read_bytes().rstrip().endswith(b'%%EOF')
+    assert 'File type: ZZZ' in (tmp_path / 'odd.zzz').read_text()
+    assert '<title>page</title>' in (tmp_path / 'page.html').read_text()
+
+
+def test_user_templates_override_shipped_ones(tmp_path):
+    custom = tmp_path / 'templates'
+    custom.mkdir()
+    (custom / 'md.tmpl').write_text('# {{ name }} ({{ index }} of {{ count }}) by {{ author }}\n')
+    engine = TemplateEngine([TemplateEngine().template_dirs[0], custom])
+    engine.create_many(tmp_path, ['a.md', 'b.markdown'], {'author': 'Tony'})
+    assert (tmp_path / 'a.md').read_text() == '# a (1 of 2) by Tony\n'
+    assert (tmp_path / 'b.markdown').read_text() == '# b (2 of 2) by Tony\n'
+
+
+def test_parse_batch_create():
+    assert parse_batch_create('create 3 text files called notes') == ['notes_1.txt', 'notes_2.txt', 'notes_3.txt']
+    assert parse_batch_create('make two pdf files report') == ['report_1.pdf', 'report_2.pdf']
+    assert parse_batch_create('create files plan.md, budget.csv and todo') == ['plan.md', 'budget.csv', 'todo.txt']
+    assert parse_batch_create('create file notes') is None
+    assert parse_batch_create('create a text file called notes') is None
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Corpus and throughput tests for the time expression parser
+"""
+
+import time
+from datetime import datetime
+
+import pytest
+
+from time_parser import parse_schedule_command, parse_number
+
+# Monday 19 October 2026, 3 pm
+NOW = datetime(2026, 10, 19, 15, 0)
+
+# text, kind, delay seconds, absolute time, repeat seconds, message
+CORPUS = [
+    ("set a timer for 90 seconds", 'timer', 90, None, None, ''),
+    ("set timer 5 min", 'timer', 300, None, None, ''),
+    ("timer for twenty five minutes", 'timer', 1500, None, None, ''),
+    ("set a timer for an hour and a half", 'timer', 5400, None, None, ''),
+    ("remind me in 2 hours to call mom", 'reminder', 7200, None, None, 'call mom'),
+    ("remind me in half an hour to stretch", 'reminder', 1800, None, None, 'stretch'),
+    ("remind me in a quarter of an hour to leave", 'reminder', 900, None, None, 'leave'),
+    ("remind me in 3 days to renew the passport", 'reminder', 259200, None, None, 'renew the passport'),
+    ("remind me to call mom at 5pm", 'reminder', None, datetime(2026, 10, 19, 17, 0), None, 'call mom'),
+    ("remind me at 5 to check the oven", 'reminder', None, datetime(2026, 10, 19, 17, 0), None, 'check the oven'),
+    ("remind me at 2:30 pm about the meeting", 'reminder', None, datetime(2026, 10, 20, 14, 30), None, 'the meeting'),
+    ("remind me at noon to eat lunch", 'reminder', None, datetime(2026, 10, 20, 12, 0), None, 'eat lunch'),
+    ("remind me tomorrow morning to pay rent", 'reminder', None, datetime(2026, 10, 20, 9, 0), None, 'pay rent'),
+    ("remind me tonight at 8 to call dad", 'reminder', None, datetime(2026, 10, 19, 20, 0), None, 'call dad'),
+    ("remind me on friday at 10 am to submit the report", 'reminder', None, datetime(2026, 10, 23, 10, 0), None,
+     'submit the report'),
+    ("remind me every day at 9am to take medicine", 'reminder', None, datetime(2026, 10, 20, 9, 0), 86400,
+     'take medicine'),
+    ("remind me every 2 hours to drink water", 'reminder', 7200, None, 7200, 'drink water'),
+    ("wake me up at 7", 'reminder', None, datetime(2026, 10, 19, 19, 0), None, 'Alarm'),
+    # Hindi
+    ("मुझे 2 घंटे में माँ को फोन करने की याद दिलाना", 'reminder', 7200, None, None, 'माँ को फोन करने'),
+    ("10 मिनट बाद याद दिलाना", 'reminder', 600, None, None, 'Reminder'),
+    ("आधे घंटे में याद दिलाना", 'reminder', 1800, None, None, 'Reminder'),
+    ("५ मिनट का टाइमर लगाओ", 'timer', 300, None, None, ''),
+    ("कल सुबह 9 बजे याद दिलाना दवा लेनी है", 'reminder', None, datetime(2026, 10, 20, 9, 0), None, 'दवा लेनी है'),
+    ("शाम 6 बजे मीटिंग की याद दिलाना", 'reminder', None, datetime(2026, 10, 19, 18, 0), None, 'मीटिंग'),
+    # Gujarati
+    ("મને 10 મિનિટ પછી દવા લેવાનું યાદ અપાવજે", 'reminder', 600, None, None, 'દવા લેવાનું'),
+    ("5 મિનિટનું ટાઈમર સેટ કરો", 'timer', 300, None, None, ''),
+    ("કાલે સવારે 9 વાગ્યે યાદ અપાવજે", 'reminder', None, datetime(2026, 10, 20, 9, 0), None, 'Reminder'),
+    ("દરરોજ સાંજે 7 વાગ્યે ચાલવા જવાનું યાદ અપાવજે", 'reminder', None, datetime(2026, 10, 19, 19, 0), 86400,
+     'ચાલવા જવાનું'),
+]
+
+
+@pytest.mark.parametrize("text,kind,delay,at,repeat,message", CORPUS)
+def test_corpus(text, kind, delay, at, repeat, message):
+    parsed = parse_schedule_command(text, NOW)
+    assert parsed is not None
+    assert parsed['kind'] == kind
+    assert parsed['delay'] == delay
+    assert parsed['at'] == at
+    assert parsed['repeat'] == repeat
+    assert parsed['message'] == message
+
+
+@pytest.mark.parametrize("text", [
+    "what time is it",
+    "open chrome",
+    "remind me in the office",
+    "tell me a joke about timers",
+])
+def test_non_schedule_commands(text):
+    assert parse_schedule_command(text, NOW) is None
+
+
+def test_number_words():
+    assert parse_number("twenty five") == 25
+    assert parse_number("one hundred") == 100
+    assert parse_number("डेढ़") == 1.5
+    assert parse_number("અઢી") == 2.5
+
+
+def test_throughput():
+    texts = [row[0] for row in CORPUS] + ["open chrome", "what is the weather in london today"]
+    start = time.perf_counter()
+    rounds = 100
+    for _ in range(rounds):
+        for text in texts:
+            parse_schedule_command(text, NOW)
+    per_second = rounds * len(texts) / (time.perf_counter() - start)
+    assert per_second > 2000
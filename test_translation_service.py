@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, batched translation service
+"""
+
+import time
+from threading import Thread
+
+from translation_service import StubTranslator, TranslationCache, TranslationService
+
+
+class SlowStub(StubTranslator):
+    def translate_batch(self, texts, target_lang):
+        time.sleep(0.05)
+        return super().translate_batch(texts, target_lang)
+
+
+def test_batch_dedup_and_cache(tmp_path):
+    stub = StubTranslator()
+    service = TranslationService(stub, TranslationCache(tmp_path / 'cache.jsonl'))
+
+    result = service.translate_many(['open chrome', 'hello', 'open chrome', ''], 'hi')
+    assert result == ['[hi] open chrome', '[hi] hello', '[hi] open chrome', '']
+    assert (stub.calls, stub.translated) == (1, 2)
+
+    assert service.translate('hello', 'hi') == '[hi] hello'
+    assert service.translate('hello', 'en') == 'hello'
+    assert stub.calls == 1
+
+    # The cache survives a restart
+    reloaded = TranslationService(StubTranslator(), TranslationCache(tmp_path / 'cache.jsonl'))
+    assert reloaded.translate('open chrome', 'hi') == '[hi] open chrome'
+    assert reloaded.backend.calls == 0
+
+
+def test_precomputed_responses_skip_the_translator():
+    stub = StubTranslator()
+    service = TranslationService(stub)
+    service.add_response_table({
+        'en': {'greeting': 'Hello! I am JARVIS, your AI assistant.'},
+        'hi': {'greeting': 'नमस्ते! मैं जार्विस हूं, आपका AI सहायक।'},
+    })
+    assert service.translate('Hello! I am JARVIS, your AI assistant.', 'hi') == 'नमस्ते! मैं जार्विस हूं, आपका AI सहायक।'
+    # Shipped with the app
+    assert service.translate('Volume muted, sir.', 'gu') == 'વોલ્યુમ મ્યુટ કરી દીધું, સર.'
+    assert stub.calls == 0
+
+
+def test_concurrent_identical_requests_share_one_call():
+    stub = SlowStub()
+    service = TranslationService(stub)
+    results = []
+    threads = [Thread(target=lambda: results.append(service.translate('good morning', 'gu'))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ['[gu] good morning'] * 8
+    assert stub.translated == 1
+
+
+def test_failures_fall_back_to_the_original_and_are_not_cached():
+    class Broken:
+        def translate_batch(self, texts, target_lang):
+            raise ConnectionError("offline")
+
+    service = TranslationService(Broken())
+    assert service.translate_many(['a', 'b'], 'hi') == ['a', 'b']
+    assert len(service.cache) == 0
+    assert TranslationService(None).translate('hello', 'hi') == 'hello'
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the FreeDesktop trash store and its index
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import trash_store
+from operation_journal import OperationJournal
+from trash_store import FreeDesktopTrash, format_trashinfo, parse_trashinfo
+
+
+def test_trash_writes_trashinfo_and_restores_exactly(tmp_path):
+    trash = FreeDesktopTrash(tmp_path / 'Trash')
+    docs = tmp_path / 'My Documents'
+    docs.mkdir()
+    (docs / 'report.pdf').write_text('first')
+    first = trash.trash(docs / 'report.pdf')
+    (docs / 'report.pdf').write_text('second')
+    second = trash.trash(docs / 'report.pdf')
+
+    assert os.path.basename(first) == 'report.pdf' and os.path.basename(second) == 'report.2.pdf'
+    info = (tmp_path / 'Trash' / 'info' / 'report.2.pdf.trashinfo').read_text()
+    assert info.startswith('[Trash Info]\n') and 'Path=' + str(docs).replace(' ', '%20') in info
+    original, deleted = parse_trashinfo(info)
+    assert original == str(docs / 'report.pdf') and abs(deleted - time.time()) < 5
+
+    items = trash.find('REPORT.PDF')
+    assert len(items) == 2 and {i.original_path for i in items} == {str(docs / 'report.pdf')}
+    assert trash.restore(first) == str(docs / 'report.pdf')
+    assert (docs / 'report.pdf').read_text() == 'first'
+    assert not (tmp_path / 'Trash' / 'info' / 'report.pdf.trashinfo').exists()
+    # Restoring over an existing file lands beside it
+    assert trash.restore(second) == str(docs / 'report (restored 1).pdf')
+    assert len(trash) == 0
+
+
+def test_index_picks_up_items_trashed_by_other_programs(tmp_path):
+    trash = FreeDesktopTrash(tmp_path / 'Trash', check_interval=0)
+    (tmp_path / 'notes.txt').write_text('mine')
+    trash.trash(tmp_path / 'notes.txt')
+    assert len(trash) == 1
+
+    # A file manager trashes a folder, then empties one item behind our back
+    files, info = tmp_path / 'Trash' / 'files', tmp_path / 'Trash' / 'info'
+    (files / 'Photos').mkdir()
+    (info / 'Photos.trashinfo').write_text(
+        format_trashinfo('/home/user/Pictures/Photos', time.time() - 3600))
+    os.unlink(files / 'notes.txt')
+    os.unlink(info / 'notes.txt.trashinfo')
+    time.sleep(0.01)
+    os.utime(info)
+
+    assert [i.original_name for i in trash.items()] == ['Photos']
+    assert trash.find_path('/home/user/Pictures/Photos')[0].to_dict()['kind'] == 'folder'
+    assert trash.items(since=time.time() - 60) == []
+    restored = trash.restore('Photos', destination=str(tmp_path / 'Photos'))
+    assert os.path.isdir(restored) and not trash.find('photos')
+
+
+def test_large_trash_lookups_stay_fast(tmp_path):
+    trash = FreeDesktopTrash(tmp_path / 'Trash')
+    info = tmp_path / 'Trash' / 'info'
+    info.mkdir(parents=True)
+    (tmp_path / 'Trash' / 'files').mkdir()
+    for i in range(20000):
+        (info / f'file{i}.txt.trashinfo').write_text(format_trashinfo(f'/home/user/docs/file{i}.txt', 1e9 + i))
+    assert len(trash) == 20000
+
+    start = time.perf_counter()
+    for i in range(0, 20000, 20):
+        assert trash.find(f'file{i}.txt')[0].original_path == f'/home/user/docs/file{i}.txt'
+    exact = (time.perf_counter() - start) / 1000
+    assert exact < 0.001
+    assert [i.name for i in trash.items(3)] == ['file19999.txt', 'file19998.txt', 'file19997.txt']
+    assert trash.stats['parsed'] == 20000
+
+
+def test_journal_uses_freedesktop_trash(tmp_path):
+    trash = FreeDesktopTrash(tmp_path / 'Trash')
+    journal = OperationJournal(None, trash=trash)
+    (tmp_path / 'draft.md').write_text('draft')
+    journal.trash(tmp_path / 'draft.md')
+    assert (tmp_path / 'Trash' / 'info' / 'draft.md.trashinfo').exists()
+    assert trash.find('draft.md')
+
+    entry, error = journal.undo()[0]
+    assert error is None and (tmp_path / 'draft.md').read_text() == 'draft'
+    assert not (tmp_path / 'Trash' / 'info' / 'draft.md.trashinfo').exists()
+
+
+def recycle_info(original, deleted):
+    name = (original + '\0').encode('utf-16-le')
+    filetime = int((deleted + trash_store.FILETIME_EPOCH) * 10 ** 7)
+    return ((2).to_bytes(8, 'little') + (5).to_bytes(8, 'little') + filetime.to_bytes(8, 'little') +
+            (len(name) // 2).to_bytes(4, 'little') + name)
+
+
+def test_recycle_bin_items_are_found_and_restored(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'S-1-5-21'
+    bin_dir.mkdir()
+
+    def fake_send2trash(path):
+        # What Windows does: the item becomes $R<id>, described by a matching $I<id> record
+        os.rename(path, bin_dir / '$RAB12CD.txt')
+        (bin_dir / '$IAB12CD.txt').write_bytes(recycle_info(path, time.time()))
+
+    monkeypatch.setattr(trash_store, 'send2trash', SimpleNamespace(send2trash=fake_send2trash), raising=False)
+    (bin_dir / '$IOLD000.txt').write_bytes(recycle_info(str(tmp_path / 'notes.txt'), time.time() - 3600))
+    (tmp_path / 'notes.txt').write_text('keep me')
+
+    journal = OperationJournal(None, trash=trash_store.RecycleBinTrash([bin_dir]))
+    entry = journal.trash(tmp_path / 'notes.txt')
+    assert entry.target == str(bin_dir / '$RAB12CD.txt')
+    assert journal.restore(entry) == str(tmp_path / 'notes.txt')
+    assert (tmp_path / 'notes.txt').read_text() == 'keep me'
+    assert not (bin_dir / '$IAB12CD.txt').exists()
+    assert trash_store.parse_recycle_info(b'short') is None
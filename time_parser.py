@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Time Expression Parser for JARVIS AI Assistant
+Extracts durations, clock times and recurrences from English, Hindi and
+Gujarati commands with a grammar compiled once at import
+"""
+
+import re
+from datetime import datetime, timedelta
+
+# ---------------------------------------------------------------------------
+# Lexicon
+# ---------------------------------------------------------------------------
+
+NUMBER_WORDS = {
+    # English
+    'zero': 0, 'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12,
+    'thirteen': 13, 'fourteen': 14, 'fifteen': 15, 'sixteen': 16, 'seventeen': 17,
+    'eighteen': 18, 'nineteen': 19, 'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90, 'hundred': 100,
+    'half': 0.5, 'half a': 0.5, 'half an': 0.5, 'quarter': 0.25, 'a quarter of': 0.25,
+    'a couple of': 2, 'couple of': 2, 'a few': 3, 'few': 3,
+    # Hindi
+    'एक': 1, 'दो': 2, 'तीन': 3, 'चार': 4, 'पांच': 5, 'पाँच': 5, 'छह': 6, 'छः': 6,
+    'सात': 7, 'आठ': 8, 'नौ': 9, 'दस': 10, 'ग्यारह': 11, 'बारह': 12, 'पंद्रह': 15,
+    'बीस': 20, 'पच्चीस': 25, 'तीस': 30, 'चालीस': 40, 'पैंतालीस': 45, 'पचास': 50, 'साठ': 60,
+    'आधा': 0.5, 'आधे': 0.5, 'डेढ़': 1.5, 'डेढ': 1.5, 'ढाई': 2.5,
+    # Romanized Hindi
+    'ek': 1, 'do': 2, 'teen': 3, 'char': 4, 'paanch': 5, 'panch': 5, 'das': 10,
+    'pandrah': 15, 'bees': 20, 'tees': 30, 'aadha': 0.5, 'aadhe': 0.5, 'dedh': 1.5, 'dhai': 2.5,
+    # Gujarati
+    'એક': 1, 'બે': 2, 'ત્રણ': 3, 'ચાર': 4, 'પાંચ': 5, 'છ': 6, 'સાત': 7, 'આઠ': 8, 'નવ': 9,
+    'દસ': 10, 'અગિયાર': 11, 'બાર': 12, 'પંદર': 15, 'વીસ': 20, 'પચીસ': 25, 'ત્રીસ': 30,
+    'ચાલીસ': 40, 'પિસ્તાળીસ': 45, 'પચાસ': 50, 'સાઠ': 60,
+    'અડધો': 0.5, 'અડધા': 0.5, 'અડધી': 0.5, 'દોઢ': 1.5, 'અઢી': 2.5,
+}
+
+UNIT_WORDS = {
+    1: ['seconds', 'second', 'secs', 'sec', 's', 'सेकंड', 'सेकेंड', 'सैकंड', 'second', 'સેકન્ડ', 'સેકંડ'],
+    60: ['minutes', 'minute', 'mins', 'min', 'm', 'मिनट', 'मिनिट', 'minat', 'મિનિટ', 'મિનીટ'],
+    3600: ['hours', 'hour', 'hrs', 'hr', 'h', 'घंटे', 'घंटा', 'घण्टे', 'ghante', 'ghanta', 'કલાક', 'કલાકે'],
+    86400: ['days', 'day', 'दिन', 'din', 'દિવસ', 'દિવસે'],
+    604800: ['weeks', 'week', 'हफ्ते', 'हफ़्ते', 'हफ्ता', 'સપ્તાહ', 'અઠવાડિયા', 'અઠવાડિયું'],
+}
+
+DAY_OFFSETS = {
+    'today': 0, 'tonight': 0, 'tomorrow': 1, 'day after tomorrow': 2,
+    'आज': 0, 'कल': 1, 'परसों': 2, 'aaj': 0, 'kal': 1, 'parso': 2,
+    'આજે': 0, 'આજ': 0, 'કાલે': 1, 'કાલ': 1, 'પરમ દિવસે': 2, 'પરમદિવસે': 2,
+}
+
+WEEKDAYS = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4, 'saturday': 5, 'sunday': 6,
+    'सोमवार': 0, 'मंगलवार': 1, 'बुधवार': 2, 'गुरुवार': 3, 'शुक्रवार': 4, 'शनिवार': 5, 'रविवार': 6,
+    'સોમવાર': 0, 'મંગળવાર': 1, 'બુધવાર': 2, 'ગુરુવાર': 3, 'શુક્રવાર': 4, 'શનિવાર': 5, 'રવિવાર': 6,
+}
+
+# period word -> (is_pm, default hour)
+PERIODS = {
+    'morning': (False, 9), 'afternoon': (True, 14), 'evening': (True, 18), 'night': (True, 21), 'tonight': (True, 21),
+    'सुबह': (False, 9), 'दोपहर': (True, 14), 'शाम': (True, 18), 'रात': (True, 21),
+    'subah': (False, 9), 'dopahar': (True, 14), 'shaam': (True, 18), 'raat': (True, 21),
+    'સવારે': (False, 9), 'સવાર': (False, 9), 'બપોરે': (True, 14), 'સાંજે': (True, 18), 'સાંજ': (True, 18),
+    'રાત્રે': (True, 21), 'રાતે': (True, 21),
+}
+
+NAMED_TIMES = {'noon': 12, 'midday': 12, 'midnight': 0}
+
+EVERY_WORDS = ['every', 'each', 'हर', 'har', 'દર']
+DAILY_WORDS = {'daily': 86400, 'everyday': 86400, 'hourly': 3600, 'weekly': 604800,
+               'रोज़': 86400, 'रोज': 86400, 'roz': 86400, 'रोजाना': 86400, 'દરરોજ': 86400, 'રોજ': 86400}
+
+TIMER_WORDS = ['timer', 'टाइमर', 'ટાઈમર', 'ટાઇમર']
+REMINDER_WORDS = ['remind', 'reminder', 'alarm', 'wake me', 'याद', 'रिमाइंडर', 'yaad', 'યાદ', 'રિમાઇન્ડર', 'રીમાઇન્ડર']
+
+# Words stripped from the reminder text once the time expression is removed
+FILLER_PATTERNS = [
+    r'\b(?:please|hey|jarvis)\b',
+    r'\b(?:set|create|add|make)\s+(?:a\s+|an\s+|the\s+)?(?:reminder|timer|alarm)\b',
+    r'\bremind\s+me\b', r'\breminder\b', r'\btimer\b', r'\balarm\b', r'\bwake\s+me(?:\s+up)?\b',
+    # prepositions only where they introduced the (now blanked) time expression
+    r'\b(?:in|after|for|at|on|by)\b(?=\s{2,}|\s*$)', r'\b(?:from\s+now|later|o\'?clock)\b',
+    r'मुझे', r'याद\s*(?:दिलाना|दिला\s*दो|दिलाओ|दिला\s*देना|कराना|करा\s*दो)', r'रिमाइंडर\s*(?:सेट\s*करो|लगाओ)?',
+    r'टाइमर\s*(?:सेट\s*करो|लगाओ)?', r'(?<=\s\s)(?:में|बाद)(?!\S)',
+    r'મને', r'યાદ\s*(?:અપાવજે|અપાવો|કરાવજે|કરાવો|દેવડાવજે)', r'રિમાઇન્ડર\s*(?:સેટ\s*કરો|મૂકો)?',
+    r'ટા[ઈઇ]મર\s*(?:સેટ\s*કરો|મૂકો)?', r'(?<=\s\s)(?:માં|પછી)(?!\S)',
+]
+
+INDIC_DIGITS = str.maketrans('०१२३४५६७८९૦૧૨૩૪૫૬૭૮૯', '01234567890123456789')
+
+
+def _alternation(words):
+    """Regex alternation, longest first; Latin words get letter boundaries"""
+    parts = []
+    for word in sorted(set(words), key=len, reverse=True):
+        pattern = r'\s+'.join(re.escape(piece) for piece in word.split())
+        if word.isascii():
+            pattern = rf'(?<![a-z]){pattern}(?![a-z])'
+        parts.append(pattern)
+    return '(?:' + '|'.join(parts) + ')'
+
+
+# ---------------------------------------------------------------------------
+# Compiled grammar
+# ---------------------------------------------------------------------------
+
+_UNIT_LOOKUP = {word: seconds for seconds, words in UNIT_WORDS.items() for word in words}
+_NUMBER_WORD = _alternation(NUMBER_WORDS)
+_NUMBER = rf'(?:\d+(?:\.\d+)?|{_NUMBER_WORD}(?:[\s-]+{_NUMBER_WORD})*)'
+_UNIT = _alternation(_UNIT_LOOKUP)
+
+DURATION_RE = re.compile(
+    rf'(?P<num>{_NUMBER})(?P<half1>\s+and\s+a\s+half)?\s*(?P<unit>{_UNIT})(?P<half2>\s+and\s+a\s+half)?'
+)
+RECURRENCE_RE = re.compile(
+    rf'(?:{_alternation(EVERY_WORDS)})\s+(?:(?P<num>{_NUMBER})\s*)?(?P<unit>{_UNIT})'
+    rf'|(?:{_alternation(EVERY_WORDS)})\s+(?P<weekday>{_alternation(WEEKDAYS)})'
+    rf'|(?P<daily>{_alternation(DAILY_WORDS)})'
+)
+CLOCK_AMPM_RE = re.compile(
+    r'(?:(?<![a-z])at\s+)?(?P<hour>\d{1,2})(?:[:.](?P<minute>\d{2}))?\s*(?P<ampm>a\.?\s?m\.?|p\.?\s?m\.?)(?![a-z])'
+)
+CLOCK_INDIC_RE = re.compile(
+    r'(?P<hour>\d{1,2})(?:[:.](?P<minute>\d{2}))?\s*(?:बजे|baje|વાગ્યે|વાગે)'
+)
+CLOCK_AT_RE = re.compile(r'(?<![a-z])at\s+(?P<hour>\d{1,2})(?:[:.](?P<minute>\d{2}))?(?![\d.:])(?:\s*o\'?clock)?')
+NAMED_TIME_RE = re.compile(rf'(?:(?<![a-z])at\s+)?(?P<named>{_alternation(NAMED_TIMES)})')
+DAY_RE = re.compile(rf'(?:(?<![a-z])(?:on|next)\s+)?(?P<day>{_alternation(list(DAY_OFFSETS) + list(WEEKDAYS))})')
+PERIOD_RE = re.compile(rf'(?:(?<![a-z])(?:in\s+the|this)\s+)?(?P<period>{_alternation(PERIODS)})')
+TIMER_RE = re.compile(_alternation(TIMER_WORDS))
+REMINDER_RE = re.compile(_alternation(REMINDER_WORDS))
+FILLER_RE = re.compile('|'.join(FILLER_PATTERNS))
+LEADING_GLUE_RE = re.compile(r'^(?:to|that|about|of|का|की|के|નું|ની|નો)(?:\s+|$)')
+TRAILING_GLUE_RE = re.compile(r'\s+(?:to|that|about|of|की|का|के|ની|નો|ના)$')
+
+
+def parse_number(text):
+    """Value of a numeric phrase like '90', 'twenty five', 'डेढ़' or 'half an'"""
+    text = text.strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if text in NUMBER_WORDS:
+        return float(NUMBER_WORDS[text])
+
+    total = 0.0
+    current = 0.0
+    for word in re.split(r'[\s-]+', text):
+        value = NUMBER_WORDS.get(word)
+        if value is None or (word in ('a', 'an') and current):
+            # 'a quarter of an hour' - the article after a number is not another one
+            continue
+        if value == 100:
+            current = (current or 1) * 100
+        elif value < 1 and current:
+            # 'one half' style fractions
+            current *= value
+        else:
+            current += value
+    total += current
+    return total
+
+
+def _mask(text, match):
+    """Blank out a matched span so later rules don't match it again"""
+    start, end = match.span()
+    return text[:start] + ' ' * (end - start) + text[end:]
+
+
+def _parse_recurrence(text):
+    match = RECURRENCE_RE.search(text)
+    if not match:
+        return None, None, text
+    if match.group('daily'):
+        return DAILY_WORDS[match.group('daily')], None, _mask(text, match)
+    if match.group('weekday'):
+        return 604800, WEEKDAYS[match.group('weekday')], _mask(text, match)
+    count = parse_number(match.group('num')) if match.group('num') else 1
+    return count * _UNIT_LOOKUP[match.group('unit')], None, _mask(text, match)
+
+
+def _parse_durations(text):
+    total = 0.0
+    found = False
+    for match in DURATION_RE.finditer(text):
+        value = parse_number(match.group('num'))
+        if match.group('half1') or match.group('half2'):
+            value += 0.5
+        total += value * _UNIT_LOOKUP[match.group('unit')]
+        found = True
+        text = _mask(text, match)
+    return (total if found else None), text
+
+
+def _parse_clock(text):
+    """(hour, minute, is_pm or None, text) for the first clock expression"""
+    for regex in (CLOCK_AMPM_RE, CLOCK_INDIC_RE, CLOCK_AT_RE):
+        match = regex.search(text)
+        if match:
+            hour = int(match.group('hour'))
+            minute = int(match.group('minute') or 0)
+            is_pm = None
+            if 'ampm' in match.groupdict() and match.group('ampm'):
+                is_pm = match.group('ampm').startswith('p')
+            if hour > 23 or minute > 59:
+                continue
+            return hour, minute, is_pm, _mask(text, match)
+
+    match = NAMED_TIME_RE.search(text)
+    if match:
+        return NAMED_TIMES[match.group('named')], 0, None, _mask(text, match)
+    return None, None, None, text
+
+
+def _resolve_clock(now, hour, minute, is_pm, day_offset, weekday, period):
+    explicit_day = day_offset is not None or weekday is not None
+    if period is not None:
+        period_pm, default_hour = period
+        if hour is None:
+            hour, minute = default_hour, 0
+        elif is_pm is None:
+            is_pm = period_pm
+            # '12 at night' is midnight, '12 in the afternoon' is noon
+            if period_pm and hour == 12 and default_hour >= 21:
+                hour = 0
+                is_pm = False
+
+    if hour is None:
+        hour, minute = 9, 0
+
+    ambiguous = is_pm is None and 1 <= hour <= 12
+    if is_pm is True and hour < 12:
+        hour += 12
+    elif is_pm is False and hour == 12:
+        hour = 0
+
+    base = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if weekday is not None:
+        days_ahead = (weekday - now.weekday()) % 7
+        candidate = base + timedelta(days=days_ahead)
+        if candidate <= now:
+            candidate += timedelta(days=7)
+        return candidate
+    if day_offset:
+        return base + timedelta(days=day_offset)
+
+    if base <= now:
+        # '5' said at 3 pm means 5 pm; otherwise roll over to tomorrow
+        if ambiguous and hour < 12 and base + timedelta(hours=12) > now:
+            return base + timedelta(hours=12)
+        if not explicit_day:
+            return base + timedelta(days=1)
+    return base
+
+
+def parse_time_expression(text, now=None):
+    """
+    Extract timing from text
+    Returns {'delay': seconds | None, 'at': datetime | None, 'repeat': seconds | None,
+             'remainder': text with the time words removed} or None if nothing was found
+    """
+    now = now or datetime.now()
+    work = text.lower().translate(INDIC_DIGITS)
+
+    repeat, repeat_weekday, work = _parse_recurrence(work)
+    delay, work = _parse_durations(work)
+    hour, minute, is_pm, work = _parse_clock(work)
+
+    day_offset = None
+    weekday = repeat_weekday
+    match = DAY_RE.search(work)
+    if match:
+        day = match.group('day')
+        if day in WEEKDAYS:
+            weekday = WEEKDAYS[day]
+        else:
+            day_offset = DAY_OFFSETS[day]
+        work = _mask(work, match)
+
+    period = PERIODS['tonight'] if match and match.group('day') == 'tonight' else None
+    match = PERIOD_RE.search(work)
+    if match:
+        period = PERIODS[match.group('period')]
+        work = _mask(work, match)
+
+    has_clock = hour is not None or day_offset is not None or weekday is not None or period is not None
+    if delay is None and not has_clock and repeat is None:
+        return None
+
+    at = None
+    if has_clock and delay is None:
+        at = _resolve_clock(now, hour, minute, is_pm, day_offset, weekday, period)
+    elif repeat is not None and delay is None:
+        # 'every 2 hours' starts one interval from now
+        delay = repeat
+
+    return {'delay': delay, 'at': at, 'repeat': repeat, 'remainder': work}
+
+
+def _clean_message(remainder):
+    message = FILLER_RE.sub(' ', remainder)
+    message = re.sub(r'\s+', ' ', message).strip(' ,.!?')
+    for _ in range(2):
+        message = LEADING_GLUE_RE.sub('', message)
+        message = TRAILING_GLUE_RE.sub('', message)
+    return message.strip(' ,.!?')
+
+
+def parse_schedule_command(text, now=None):
+    """
+    Recognize 'set a timer for 90 seconds', 'remind me in 2 hours to call mom',
+    '10 मिनट बाद याद दिलाना', 'કાલે સવારે 9 વાગ્યે યાદ અપાવજે' and similar
+    Returns {'kind': 'timer'|'reminder', 'delay', 'at', 'repeat', 'message'} or None
+    """
+    lowered = text.lower()
+    if TIMER_RE.search(lowered):
+        kind = 'timer'
+    elif REMINDER_RE.search(lowered):
+        kind = 'reminder'
+    else:
+        return None
+
+    parsed = parse_time_expression(text, now)
+    if parsed is None:
+        return None
+
+    message = _clean_message(parsed['remainder'])
+    if kind == 'reminder' and not message:
+        message = 'Alarm' if 'alarm' in lowered or 'wake me' in lowered else 'Reminder'
+    return {
+        'kind': kind,
+        'delay': parsed['delay'],
+        'at': parsed['at'],
+        'repeat': parsed['repeat'],
+        'message': message,
+    }
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Request Tracing for JARVIS AI Assistant
+Lightweight sampled spans through the command pipeline, kept in a bounded
+ring and exportable as JSON or Chrome trace format
+"""
+
+import os
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from itertools import count
+from threading import Lock, get_ident
+
+DEFAULT_SAMPLE_RATE = 0.1
+DEFAULT_CAPACITY = 200   # finished traces kept in memory
+
+_current_span = ContextVar('jarvis_current_span', default=None)
+_ids = count(1)
+
+
+class _NoopSpan:
+    """Returned when the request is not sampled - every operation is free"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attributes):
+        return self
+
+    @property
+    def sampled(self):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'attributes', 'thread_id',
+                 'start', 'end', '_token')
+
+    def __init__(self, trace, name, parent_id, attributes):
+        self.trace = trace
+        self.span_id = next(_ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.thread_id = get_ident()
+        self.start = None
+        self.end = None
+        self._token = None
+
+    @property
+    def sampled(self):
+        return True
+
+    def set(self, **attributes):
+        """Attach attributes, e.g. span.set(intent='screenshot')"""
+        self.attributes.update(attributes)
+        return self
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attributes['error'] = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.trace.spans.append(self)
+        if self.parent_id is None:
+            self.trace.tracer._finish(self.trace)
+        return False
+
+    @property
+    def duration_ms(self):
+        return (self.end - self.start) * 1000 if self.end is not None else None
+
+    def to_dict(self, origin):
+        return {
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round(self.duration_ms, 3),
+            'thread_id': self.thread_id,
+            'attributes': {key: _jsonable(value) for key, value in self.attributes.items()},
+        }
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+class Trace:
+    __slots__ = ('tracer', 'trace_id', 'wall_time', 'spans')
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.trace_id = next(_ids)
+        self.wall_time = time.time()
+        self.spans = []
+
+    @property
+    def root(self):
+        # The root closes last
+        return self.spans[-1] if self.spans else None
+
+    def to_dict(self):
+        root = self.root
+        origin = root.start
+        return {
+            'trace_id': self.trace_id,
+            'name': root.name,
+            'timestamp': self.wall_time,
+            'duration_ms': round(root.duration_ms, 3),
+            'spans': [span.to_dict(origin) for span in sorted(self.spans, key=lambda s: s.start)],
+        }
+
+
+class Tracer:
+    def __init__(self, sample_rate=DEFAULT_SAMPLE_RATE, capacity=DEFAULT_CAPACITY):
+        """
+        Args:
+            sample_rate: fraction of root spans (requests) that are recorded
+            capacity: finished traces kept; the oldest are dropped
+        """
+        self.sample_rate = sample_rate
+        self._traces = deque(maxlen=capacity)
+        self._lock = Lock()
+        self.stats = {'started': 0, 'sampled': 0}
+
+    def trace(self, name, force=False, **attributes):
+        """
+        Root span for one request; child spans opened inside it are recorded
+        only if this request is sampled (or force is set)
+        """
+        self.stats['started'] += 1
+        if not force and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+            return NOOP_SPAN
+        self.stats['sampled'] += 1
+        return Span(Trace(self), name, None, attributes)
+
+    def span(self, name, **attributes):
+        """Child of the current span, or a no-op outside a sampled trace"""
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(parent.trace, name, parent.span_id, attributes)
+
+    def current(self):
+        return _current_span.get() or NOOP_SPAN
+
+    def _finish(self, trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def traces(self, limit=None, min_duration_ms=0):
+        with self._lock:
+            traces = list(self._traces)
+        if min_duration_ms:
+            traces = [t for t in traces if t.root.duration_ms >= min_duration_ms]
+        if limit:
+            traces = traces[-limit:]
+        return traces
+
+    def export_json(self, limit=None, min_duration_ms=0):
+        return [trace.to_dict() for trace in self.traces(limit, min_duration_ms)]
+
+    def export_chrome(self, limit=None, min_duration_ms=0):
+        """Chrome trace event format - load in chrome://tracing or Perfetto"""
+        events = []
+        pid = os.getpid()
+        for trace in self.traces(limit, min_duration_ms):
+            for span in trace.spans:
+                args = {key: _jsonable(value) for key, value in span.attributes.items()}
+                args['trace_id'] = trace.trace_id
+                events.append({
+                    'name': span.name,
+                    'cat': 'jarvis',
+                    'ph': 'X',
+                    'ts': round(span.start * 1e6, 1),
+                    'dur': round((span.end - span.start) * 1e6, 1),
+                    'pid': pid,
+                    'tid': span.thread_id,
+                    'args': args,
+                })
+        events.sort(key=lambda event: event['ts'])
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+
+def traced(name=None):
+    """Decorator that wraps a function call in a child span of the current trace"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            parent = _current_span.get()
+            if parent is None:
+                return func(*args, **kwargs)
+            with Span(parent.trace, span_name, parent.span_id, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Global instance
+tracer = Tracer(
+    sample_rate=float(os.environ.get('JARVIS_TRACE_SAMPLE_RATE', DEFAULT_SAMPLE_RATE)),
+    capacity=int(os.environ.get('JARVIS_TRACE_CAPACITY', DEFAULT_CAPACITY))
+)
+
+def trace_span(name, **attributes):
+    return tracer.span(name, **attributes)
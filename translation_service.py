@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Translation Service for JARVIS AI Assistant
+Cached, batched translation: shipped translations for common replies, a
+persistent (text, language) cache, and one translator call per distinct string
+even when many requests ask for it at once
+"""
+
+import json
+import os
+from concurrent.futures import Future
+from pathlib import Path
+from threading import Lock
+
+from instrumentation import counter
+
+DEFAULT_CACHE_PATH = Path.home() / '.jarvis' / 'translations.jsonl'
+PRECOMPUTED_PATH = Path(__file__).resolve().parent / 'translations' / 'responses.json'
+MAX_CACHED_LENGTH = 500    # long one-off AI answers aren't worth keeping on disk
+TRANSLATE_TIMEOUT = 30.0   # seconds a caller waits for someone else's in-flight translation
+
+TRANSLATIONS = counter('jarvis_translations', 'Translated strings by where the result came from', ['source'])
+
+
+class StubTranslator:
+    """Offline translator for development and tests - marks text instead of translating it"""
+
+    def __init__(self):
+        self.calls = 0
+        self.translated = 0
+
+    def translate_batch(self, texts, target_lang):
+        self.calls += 1
+        self.translated += len(texts)
+        return [f"[{target_lang}] {text}" for text in texts]
+
+
+class GoogletransBackend:
+    def __init__(self, translator):
+        self.translator = translator
+
+    def translate_batch(self, texts, target_lang):
+        # googletrans accepts a list and returns one result per item
+        results = self.translator.translate(list(texts), dest=target_lang)
+        return [result.text for result in results]
+
+
+class TranslationCache:
+    def __init__(self, path=None):
+        """Translations keyed by (target language, text); path=None keeps them in memory only"""
+        self.path = Path(path) if path else None
+        self._entries = {}
+        self._lock = Lock()
+        self._file = None
+        if self.path and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self._entries[(record['lang'], record['text'])] = record['translation']
+                    except (ValueError, KeyError):
+                        continue
+
+    def get(self, text, target_lang):
+        return self._entries.get((target_lang, text))
+
+    def put(self, text, target_lang, translation):
+        key = (target_lang, text)
+        with self._lock:
+            if self._entries.get(key) == translation:
+                return
+            self._entries[key] = translation
+            if not self.path:
+                return
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            record = {'lang': target_lang, 'text': text, 'translation': translation}
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TranslationService:
+    def __init__(self, backend=None, cache=None, precomputed_path=PRECOMPUTED_PATH):
+        """
+        Args:
+            backend: object with translate_batch(texts, target_lang) -> list of str;
+                     None returns untranslated text unless it is precomputed or cached
+            cache: TranslationCache, in memory by default
+            precomputed_path: JSON {"hi": {"English text": "translation"}} shipped with the app
+        """
+        self.backend = backend
+        self.cache = cache if cache is not None else TranslationCache()
+        self._precomputed = {}
+        self._inflight = {}
+        self._lock = Lock()
+        if precomputed_path and Path(precomputed_path).exists():
+            table = json.loads(Path(precomputed_path).read_text(encoding='utf-8'))
+            for target_lang, translations in table.items():
+                self.add_precomputed(translations, target_lang)
+
+    @property
+    def available(self):
+        return self.backend is not None
+
+    def add_precomputed(self, translations, target_lang):
+        for text, translation in translations.items():
+            self._precomputed[(target_lang, text)] = translation
+
+    def add_response_table(self, responses, source_lang='en'):
+        """Register a {lang: {key: text}} table like app.RESPONSES as precomputed translations"""
+        source = responses.get(source_lang, {})
+        for target_lang, table in responses.items():
+            if target_lang == source_lang:
+                continue
+            self.add_precomputed({source[key]: text for key, text in table.items() if key in source},
+                                 target_lang)
+
+    def _lookup(self, text, target_lang):
+        if target_lang == 'en' or not text.strip():
+            return text
+        translation = self._precomputed.get((target_lang, text))
+        if translation is not None:
+            TRANSLATIONS.inc(source='precomputed')
+            return translation
+        translation = self.cache.get(text, target_lang)
+        if translation is not None:
+            TRANSLATIONS.inc(source='cache')
+        return translation
+
+    def translate(self, text, target_lang):
+        return self.translate_many([text], target_lang)[0]
+
+    def translate_many(self, texts, target_lang):
+        """
+        Translate a batch in input order; repeated strings, and strings another thread
+        is already translating, cost one translator call
+        """
+        results = [None] * len(texts)
+        owned = {}      # text -> Future this call resolves
+        waiting = {}    # text -> (Future, indexes in results)
+        for index, text in enumerate(texts):
+            hit = self._lookup(text, target_lang)
+            if hit is not None:
+                results[index] = hit
+                continue
+            if self.backend is None:
+                results[index] = text
+                continue
+            if text not in waiting:
+                key = (target_lang, text)
+                with self._lock:
+                    future = self._inflight.get(key)
+                    if future is None:
+                        # Re-check: another call may have finished since the lookup
+                        cached = self.cache.get(text, target_lang)
+                        if cached is not None:
+                            results[index] = cached
+                            continue
+                        future = self._inflight[key] = Future()
+                        owned[text] = future
+                waiting[text] = (future, [])
+            waiting[text][1].append(index)
+
+        if owned:
+            self._translate_owned(owned, target_lang)
+
+        for text, (future, indexes) in waiting.items():
+            try:
+                translation = future.result(timeout=TRANSLATE_TIMEOUT)
+            except Exception:
+                translation = text
+            for index in indexes:
+                results[index] = translation
+        return results
+
+    def _translate_owned(self, owned, target_lang):
+        texts = list(owned)
+        try:
+            translations = self.backend.translate_batch(texts, target_lang)
+            if len(translations) != len(texts):
+                raise ValueError(f"expected {len(texts)} translations, got {len(translations)}")
+            TRANSLATIONS.inc(len(texts), source='translator')
+        except Exception as e:
+            print(f"❌ Translation error: {e}")
+            TRANSLATIONS.inc(len(texts), source='error')
+            # Fall back to the original text, and don't cache the failure
+            translations = None
+
+        for index, text in enumerate(texts):
+            translation = text if translations is None else translations[index]
+            if translations is not None and len(text) <= MAX_CACHED_LENGTH:
+                self.cache.put(text, target_lang, translation)
+            owned[text].set_result(translation)
+        # Only after the cache is filled, so a new caller can't start a duplicate request
+        with self._lock:
+            for text in texts:
+                self._inflight.pop((target_lang, text), None)
+
+# Global instance
+translation_service = TranslationService(
+    backend=StubTranslator() if os.environ.get('JARVIS_TRANSLATOR') == 'stub' else None,
+    cache=TranslationCache(os.environ.get('JARVIS_TRANSLATION_CACHE', DEFAULT_CACHE_PATH))
+)
+
+def translate(text, target_lang):
+    return translation_service.translate(text, target_lang)
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Trash Store for JARVIS AI Assistant
+FreeDesktop.org trash on Linux - files/ plus .trashinfo records with the
+original path and deletion date - kept in an in-memory index so finding and
+restoring an item stays fast with tens of thousands of trashed files. On Windows
+items go to the Recycle Bin through send2trash
+"""
+
+import os
+import platform
+import shutil
+import time
+from bisect import insort
+from datetime import datetime
+from pathlib import Path
+from threading import RLock
+from urllib.parse import quote, unquote
+
+try:
+    import send2trash
+    SEND2TRASH_AVAILABLE = True
+except ImportError:
+    SEND2TRASH_AVAILABLE = False
+
+CHECK_INTERVAL = 1.0          # seconds between checks of the info directory for outside changes
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
+INFO_SUFFIX = '.trashinfo'
+FILETIME_EPOCH = 11644473600  # seconds from 1601-01-01 (Windows FILETIME) to the Unix epoch
+
+
+def free_path(path):
+    """path itself, or 'name (restored n).ext' beside it if something is already there"""
+    if not os.path.lexists(path):
+        return path
+    stem, ext = os.path.splitext(path)
+    n = 1
+    while os.path.lexists(f"{stem} (restored {n}){ext}"):
+        n += 1
+    return f"{stem} (restored {n}){ext}"
+
+
+def _move_back(source, destination):
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    shutil.move(source, destination)
+
+
+def parse_trashinfo(text):
+    """(original path, deletion time) from .trashinfo contents, or None if malformed"""
+    in_group = False
+    original = deleted = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('['):
+            in_group = line == '[Trash Info]'
+            continue
+        if not in_group or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        if key == 'Path':
+            original = unquote(value)
+        elif key == 'DeletionDate':
+            try:
+                deleted = datetime.strptime(value, DATE_FORMAT).timestamp()
+            except ValueError:
+                deleted = None
+    if not original:
+        return None
+    return original, deleted
+
+
+def format_trashinfo(original, deleted):
+    return (f"[Trash Info]\nPath={quote(original)}\n"
+            f"DeletionDate={datetime.fromtimestamp(deleted).strftime(DATE_FORMAT)}\n")
+
+
+class TrashItem:
+    __slots__ = ('name', 'original_path', 'deleted_at', 'files_path')
+
+    def __init__(self, name, original_path, deleted_at, files_path):
+        self.name = name                    # entry name inside files/, unique within the trash
+        self.original_path = original_path
+        self.deleted_at = deleted_at or 0.0
+        self.files_path = files_path
+
+    @property
+    def original_name(self):
+        return os.path.basename(self.original_path)
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'original_path': self.original_path,
+            'original_name': self.original_name,
+            'deleted_at': self.deleted_at,
+            'kind': 'folder' if os.path.isdir(self.files_path) else 'file',
+        }
+
+
+class FolderTrash:
+    def __init__(self, directory):
+        """A plain folder of '<name>_<timestamp>' items - macOS ~/.Trash, or JARVIS' own elsewhere"""
+        self.directory = Path(directory)
+        self._reserved = set()
+        self._lock = RLock()
+
+    def _location(self, name):
+        stamped = self.directory / f"{name}_{int(time.time())}"
+        candidate, n = stamped, 1
+        while candidate in self._reserved or os.path.lexists(candidate):
+            candidate = Path(f"{stamped}_{n}")
+            n += 1
+        self._reserved.add(candidate)
+        return candidate
+
+    def trash(self, path):
+        """Move path into the trash; returns where it went"""
+        path = os.path.abspath(path)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            target = self._location(os.path.basename(path))
+        try:
+            # A rename on the same filesystem, a copy and delete across devices
+            shutil.move(path, str(target))
+        finally:
+            with self._lock:
+                self._reserved.discard(target)
+        return str(target)
+
+    def restore(self, trashed_path, destination):
+        if not os.path.lexists(trashed_path):
+            raise FileNotFoundError(trashed_path)
+        _move_back(trashed_path, destination)
+        return destination
+
+
+def parse_recycle_info(data):
+    """(original path, deletion time) from a Recycle Bin $I record, or None if malformed"""
+    if len(data) < 28:
+        return None
+    version = int.from_bytes(data[0:8], 'little')
+    filetime = int.from_bytes(data[16:24], 'little')
+    if version == 1:
+        raw = data[24:24 + 520]
+    elif version == 2:
+        length = int.from_bytes(data[24:28], 'little')
+        raw = data[28:28 + 2 * length]
+    else:
+        return None
+    original = raw.decode('utf-16-le', errors='replace').split('\0', 1)[0]
+    if not original:
+        return None
+    return original, filetime / 10 ** 7 - FILETIME_EPOCH
+
+
+class RecycleBinTrash:
+    def __init__(self, bin_dirs=None):
+        """
+        The Windows Recycle Bin. send2trash does the deleting; where an item landed is
+        read back from the bin's $I records so the journal can restore it exactly
+        Args:
+            bin_dirs: per-user bin folders to search; defaults to $Recycle.Bin on the item's drive
+        """
+        self.bin_dirs = [Path(d) for d in bin_dirs] if bin_dirs is not None else None
+
+    def _bins(self, path):
+        if self.bin_dirs is not None:
+            return self.bin_dirs
+        root = Path(os.path.splitdrive(path)[0] + os.sep) / '$Recycle.Bin'
+        try:
+            # One folder per user SID; only our own is readable
+            return [entry for entry in root.iterdir() if os.access(entry, os.R_OK | os.X_OK)]
+        except OSError:
+            return []
+
+    def _locate(self, path, since):
+        """The $R item holding path if it was recycled at or after since, else None"""
+        wanted = os.path.normcase(path)
+        best = None
+        for directory in self._bins(path):
+            try:
+                infos = list(directory.glob('$I*'))
+            except OSError:
+                continue
+            for info in infos:
+                try:
+                    parsed = parse_recycle_info(info.read_bytes())
+                except OSError:
+                    continue
+                if parsed is None or os.path.normcase(parsed[0]) != wanted or parsed[1] < since:
+                    continue
+                if best is None or parsed[1] > best[0]:
+                    best = (parsed[1], info.with_name('$R' + info.name[2:]))
+        return str(best[1]) if best is not None else None
+
+    def trash(self, path):
+        """Send path to the Recycle Bin; returns where it went, or None if that can't be found"""
+        path = os.path.abspath(path)
+        # $I records store whole seconds on some versions, so allow for the rounding
+        since = time.time() - 2
+        send2trash.send2trash(path)
+        return self._locate(path, since)
+
+    def restore(self, trashed_path, destination):
+        if not os.path.lexists(trashed_path):
+            raise FileNotFoundError(trashed_path)
+        _move_back(trashed_path, destination)
+        directory, name = os.path.split(trashed_path)
+        try:
+            os.remove(os.path.join(directory, '$I' + name[2:]))
+        except OSError:
+            pass
+        return destination
+
+
+class FreeDesktopTrash:
+    def __init__(self, root=None, check_interval=CHECK_INTERVAL):
+        """
+        Args:
+            root: trash directory holding files/ and info/; defaults to $XDG_DATA_HOME/Trash
+        """
+        if root is None:
+            data_home = os.environ.get('XDG_DATA_HOME') or str(Path.home() / '.local' / 'share')
+            root = Path(data_home) / 'Trash'
+        self.root = Path(root)
+        self.files_dir = self.root / 'files'
+        self.info_dir = self.root / 'info'
+        self.check_interval = check_interval
+        self._lock = RLock()
+        self._items = {}            # name in files/ -> TrashItem
+        self._by_name = {}          # lowercase original file name -> set of names
+        self._by_path = {}          # original path -> set of names
+        self._by_date = []          # sorted (deleted_at, name); removed names are skipped lazily
+        self._info_mtime = None
+        self._checked_at = 0.0
+        self.stats = {'scans': 0, 'parsed': 0, 'trashed': 0, 'restored': 0}
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _add(self, item):
+        self._items[item.name] = item
+        self._by_name.setdefault(item.original_name.lower(), set()).add(item.name)
+        self._by_path.setdefault(item.original_path, set()).add(item.name)
+        insort(self._by_date, (item.deleted_at, item.name))
+
+    def _remove(self, name):
+        item = self._items.pop(name, None)
+        if item is None:
+            return
+        for index, key in ((self._by_name, item.original_name.lower()), (self._by_path, item.original_path)):
+            names = index.get(key)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del index[key]
+
+    def _refresh(self, force=False):
+        """Pick up items trashed or restored by other programs; call with the lock held"""
+        now = time.monotonic()
+        if not force and self._info_mtime is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.info_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._info_mtime and not force:
+            return
+        self._info_mtime = mtime
+        names = set()
+        if mtime is not None:
+            with os.scandir(self.info_dir) as it:
+                names = {entry.name[:-len(INFO_SUFFIX)] for entry in it if entry.name.endswith(INFO_SUFFIX)}
+        for name in set(self._items) - names:
+            self._remove(name)
+        # Only records that appeared since the last scan are read
+        for name in names - set(self._items):
+            try:
+                with open(self.info_dir / (name + INFO_SUFFIX), 'r', encoding='utf-8', errors='replace') as f:
+                    parsed = parse_trashinfo(f.read())
+            except OSError:
+                continue
+            if parsed:
+                self._add(TrashItem(name, parsed[0], parsed[1], str(self.files_dir / name)))
+                self.stats['parsed'] += 1
+        if len(self._by_date) > 2 * len(self._items) + 64:
+            self._by_date = sorted((item.deleted_at, item.name) for item in self._items.values())
+        self.stats['scans'] += 1
+
+    # ------------------------------------------------------------------
+    # Trashing and restoring
+    # ------------------------------------------------------------------
+
+    def _claim(self, original):
+        """Create the .trashinfo record first - O_EXCL makes the name ours, as the spec requires"""
+        stem, ext = os.path.splitext(os.path.basename(original))
+        if os.path.isdir(original):
+            stem, ext = os.path.basename(original), ''
+        n = 1
+        while True:
+            name = f"{stem}{ext}" if n == 1 else f"{stem}.{n}{ext}"
+            info_path = self.info_dir / (name + INFO_SUFFIX)
+            if not os.path.lexists(self.files_dir / name):
+                try:
+                    fd = os.open(info_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                except FileExistsError:
+                    fd = None
+                if fd is not None:
+                    return name, info_path, fd
+            n += 1
+
+    def trash(self, path):
+        """Move path into the trash with its .trashinfo record; returns where it went"""
+        path = os.path.abspath(path)
+        if not os.path.lexists(path):
+            raise FileNotFoundError(path)
+        self.files_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self.info_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        deleted = time.time()
+        name, info_path, fd = self._claim(path)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(format_trashinfo(path, deleted))
+            # A rename on the same filesystem, a copy and delete across devices
+            shutil.move(path, str(self.files_dir / name))
+        except BaseException:
+            os.unlink(info_path)
+            raise
+        item = TrashItem(name, path, int(deleted), str(self.files_dir / name))
+        with self._lock:
+            self._add(item)
+            self.stats['trashed'] += 1
+        return item.files_path
+
+    def restore(self, item, destination=None):
+        """
+        Move a trashed item (TrashItem, name or files/ path) back to where it was deleted from,
+        or to destination; returns the restored path
+        """
+        with self._lock:
+            if not isinstance(item, TrashItem):
+                name = os.path.basename(str(item))
+                if name not in self._items:
+                    self._refresh(force=True)
+                item = self._items.get(name)
+            if item is None or not os.path.lexists(item.files_path):
+                raise FileNotFoundError("That item is no longer in the trash")
+            destination = destination or free_path(item.original_path)
+            _move_back(item.files_path, destination)
+            try:
+                os.unlink(self.info_dir / (item.name + INFO_SUFFIX))
+            except FileNotFoundError:
+                pass
+            self._remove(item.name)
+            self.stats['restored'] += 1
+            return destination
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def find(self, name, limit=10):
+        """Trashed items by original file name, newest first - exact, then without extension, then partial"""
+        key = name.strip().lower()
+        with self._lock:
+            self._refresh()
+            names = self._by_name.get(key)
+            if not names:
+                names = {n for k, group in self._by_name.items() if os.path.splitext(k)[0] == key for n in group}
+            if not names:
+                names = {n for k, group in self._by_name.items() if key in k for n in group}
+            items = sorted((self._items[n] for n in names), key=lambda i: i.deleted_at, reverse=True)
+            return items[:limit]
+
+    def find_path(self, original_path):
+        """Trashed items that were deleted from exactly original_path, newest first"""
+        with self._lock:
+            self._refresh()
+            names = self._by_path.get(os.path.abspath(original_path), ())
+            return sorted((self._items[n] for n in names), key=lambda i: i.deleted_at, reverse=True)
+
+    def items(self, limit=50, since=None):
+        """Most recently trashed items, optionally only those deleted after 'since' (epoch seconds)"""
+        with self._lock:
+            self._refresh()
+            result = []
+            seen = set()
+            for deleted_at, name in reversed(self._by_date):
+                if since is not None and deleted_at < since:
+                    break
+                item = self._items.get(name)
+                if item is not None and item.deleted_at == deleted_at and name not in seen:
+                    seen.add(name)
+                    result.append(item)
+                    if len(result) >= limit:
+                        break
+            return result
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._items)
+
+
+def default_trash(root=None):
+    """
+    The desktop's trash: the Recycle Bin on Windows, ~/.Trash on macOS, FreeDesktop elsewhere.
+    A root (JARVIS_TRASH_DIR) replaces the Recycle Bin or ~/.Trash with that folder
+    """
+    system = platform.system()
+    if system == 'Windows' and root is None:
+        if SEND2TRASH_AVAILABLE:
+            return RecycleBinTrash()
+        print("⚠️ send2trash is not installed - deleted files go to ~/.jarvis/trash, not the Recycle Bin")
+        return FolderTrash(Path.home() / '.jarvis' / 'trash')
+    if system in ('Windows', 'Darwin'):
+        return FolderTrash(root or Path.home() / '.Trash')
+    return FreeDesktopTrash(root)
+
+# Global instance
+trash_store = default_trash(os.environ.get('JARVIS_TRASH_DIR'))
+
+def find_in_trash(name, limit=10):
+    return trash_store.find(name, limit) if isinstance(trash_store, FreeDesktopTrash) else []